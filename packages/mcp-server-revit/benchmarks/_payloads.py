@@ -0,0 +1,147 @@
+"""Synthetic bridge results shaped like the add-in's real responses."""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+
+# Importing revit_mcp_server instantiates Config, which needs a workspace.
+_scratch = tempfile.gettempdir()
+os.environ.setdefault("MCP_REVIT_WORKSPACE_DIR", _scratch)
+os.environ.setdefault("MCP_REVIT_ALLOWED_DIRECTORIES", _scratch)
+
+
+def geometry_result(faces: int, seed: int = 7) -> dict:
+    """``revit.get_element_faces``-style result: faces with nested vertex dicts."""
+    rng = random.Random(seed)
+    return {
+        "element_id": 314159,
+        "faces": [
+            {
+                "face_index": index,
+                "area": round(rng.uniform(1, 40), 4),
+                "normal": {"x": 0.0, "y": 0.0, "z": 1.0},
+                "vertices": [
+                    {
+                        "x": round(rng.uniform(-100, 100), 6),
+                        "y": round(rng.uniform(-100, 100), 6),
+                        "z": round(rng.uniform(0, 30), 6),
+                    }
+                    for _ in range(6)
+                ],
+            }
+            for index in range(faces)
+        ],
+    }
+
+
+def schedule_result(rows: int, seed: int = 11) -> dict:
+    """``revit.batch_export_to_csv``-style result: repetitive parameter rows."""
+    rng = random.Random(seed)
+    levels = ["L1", "L2", "L3", "Roof"]
+    types = ["Basic Wall: Generic - 200mm", "Basic Wall: Exterior - Brick", "Curtain Wall: Storefront"]
+    return {
+        "success": True,
+        "rowCount": rows,
+        "data": [
+            {
+                "ElementId": 100000 + index,
+                "Category": "Walls",
+                "Type": rng.choice(types),
+                "Base Constraint": rng.choice(levels),
+                "Length": f"{rng.uniform(1, 30):.3f} m",
+                "Area": f"{rng.uniform(2, 90):.3f} m²",
+                "Fire Rating": rng.choice(["N/A", "1 HR", "2 HR"]),
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+def listing_result(elements: int, seed: int = 13) -> dict:
+    """``revit.list_elements_by_category``-style result."""
+    rng = random.Random(seed)
+    return {
+        "category": "Walls",
+        "count": elements,
+        "elements": [
+            {
+                "id": 200000 + index,
+                "name": f"Wall {index}",
+                "category": "Walls",
+                "type": rng.choice(["Generic - 200mm", "Exterior - Brick"]),
+            }
+            for index in range(elements)
+        ],
+    }
+
+
+def baseline_elements(count: int, seed: int = 17) -> list[dict]:
+    """``revit.get_elements_by_type`` records with the snapshot fields filled in."""
+    rng = random.Random(seed)
+    categories = ["Walls", "Doors", "Windows", "Floors", "Furniture"]
+    return [
+        {
+            "id": 300000 + index,
+            "unique_id": f"{rng.getrandbits(128):032x}-{index:08x}",
+            "name": f"Element {index}",
+            "category": rng.choice(categories),
+            "type_id": rng.randrange(50),
+            "level": rng.choice(["L1", "L2", "L3"]),
+            "length": round(rng.uniform(0, 30), 4),
+            "area": None,
+            "volume": None,
+            "parameters": {
+                "Mark": f"M-{index}",
+                "Comments": rng.choice(["", "Check", "Approved"]),
+                "Fire Rating": rng.choice(["N/A", "1 HR", "2 HR"]),
+                "Phase Created": "New Construction",
+            },
+        }
+        for index in range(count)
+    ]
+
+
+def mep_boxes(count: int, seed: int = 23):
+    """Bounding boxes shaped like an MEP model: mostly short runs, a few long mains.
+
+    Returns an ``(count, 6)`` NumPy array in feet over a 600 x 400 x 120 ft site.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    lows = rng.uniform((0, 0, 0), (600, 400, 120), (count, 3))
+    sizes = rng.uniform(0.3, 2.0, (count, 3))
+    runs = rng.integers(0, 2, count)
+    sizes[np.arange(count), runs] = rng.uniform(2, 20, count)  # segments run along x or y
+    mains = rng.random(count) < 0.002
+    sizes[mains, runs[mains]] = rng.uniform(100, 400, int(mains.sum()))
+    return np.hstack([lows, lows + sizes])
+
+
+def quantity_elements(count: int, seed: int = 31) -> list[dict]:
+    """``revit.get_elements_by_type`` records with the take-off fields."""
+    rng = random.Random(seed)
+    categories = ["Walls", "Floors", "Roofs", "Structural Columns", "Structural Framing", "Ceilings"]
+    materials = ["Concrete", "Steel", "Gypsum", "Insulation", "Brick", "Timber", "Glass", "Aluminium"]
+    levels = [f"Level {index}" for index in range(1, 25)]
+    phases = ["Existing", "New Construction", "Demolition"]
+    records = []
+    for index in range(count):
+        layers = rng.sample(materials, rng.randint(0, 3))
+        records.append(
+            {
+                "id": 100_000 + index,
+                "category": rng.choice(categories),
+                "level": rng.choice(levels),
+                "phase": rng.choice(phases),
+                "length": round(rng.uniform(1, 40), 3),
+                "area": round(rng.uniform(5, 400), 3),
+                "volume": round(rng.uniform(1, 80), 3),
+                "materials": [
+                    {"material": name, "area": round(rng.uniform(5, 400), 3), "volume": round(rng.uniform(0.1, 40), 3)}
+                    for name in layers
+                ],
+            }
+        )
+    return records
@@ -0,0 +1,99 @@
+"""Rule audits over a synthetic model: per-element loop versus the rule engine.
+
+The loop checks each element record in turn, as a hand-written audit over
+the bridge's JSON would: a regex per name, a lookup per parameter, a set of
+seen keys for duplicates. The engine runs the ``model_health_summary`` and
+``naming_standards_audit`` rules plus a required parameter over
+:class:`AuditData`, in process and then across a process pool (pool start-up
+included).
+
+Usage::
+
+    python benchmarks/bench_audit.py [--elements 300000] [--workers 4] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server.tools import audit  # noqa: E402
+from revit_mcp_server.tools.audit import AUDITS, AuditData, audit_rules, run_audit  # noqa: E402
+
+CATEGORIES = ("Walls", "Doors", "Windows", "Floors", "Furniture", "Generic Models")
+
+
+def model(count: int, seed: int = 11) -> tuple[list[dict], dict[int, dict]]:
+    rng = np.random.default_rng(seed)
+    names = [f"Type {n:03d}" for n in range(400)] + ["Type 7 Copy", " Padded"]
+    records, parameters = [], {}
+    for element_id in range(1, count + 1):
+        x, y = rng.integers(0, 500, 2).tolist()
+        records.append(
+            {
+                "id": element_id,
+                "category": CATEGORIES[element_id % len(CATEGORIES)],
+                "name": names[int(rng.integers(0, len(names)))],
+                "level": None if element_id % 97 == 0 else f"L{element_id % 12}",
+                "type_id": element_id % 400,
+                "length": float(rng.uniform(0, 30)),
+                "bounding_box": [x, y, 0, x + 1, y + 1, 3],
+            }
+        )
+        parameters[element_id] = {"Comments": "" if element_id % 13 == 0 else "ok"}
+    return records, parameters
+
+
+def loop_audit(records: list[dict], parameters: dict[int, dict]) -> int:
+    trimmed = re.compile(r"^\S(.*\S)?$")
+    copied = re.compile(r"(?i)\bcopy\b|\s{2,}")
+    found = 0
+    seen: set[tuple] = set()
+    for record in records:
+        model_category = record["category"] in audit.MODEL_CATEGORIES
+        found += model_category and not record.get("level")
+        found += record["category"] == "Walls" and record["length"] < 0.5
+        found += not trimmed.search(record["name"]) or bool(copied.search(record["name"]))
+        found += not parameters[record["id"]].get("Comments")
+        key = (record["category"], record["type_id"], *record["bounding_box"])
+        found += model_category and key in seen
+        seen.add(key)
+    return found
+
+
+def best_of(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=300_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records, parameters = model(args.elements)
+    data = AuditData.from_records(records, parameters)
+    specs = [*AUDITS["model_health_summary"], *AUDITS["naming_standards_audit"]]
+    rules = audit_rules(None, specs, required_parameters=["Comments"])
+    print(f"{len(data)} elements, {len(rules)} rules")
+    print(f"{'path':12s} {'ms':>10s}")
+    print(f"{'loop':12s} {best_of(lambda: loop_audit(records, parameters), args.repeat) * 1e3:10.1f}")
+    print(f"{'engine':12s} {best_of(lambda: run_audit(rules, data, workers=1), args.repeat) * 1e3:10.1f}")
+    print(f"{'engine pool':12s} {best_of(lambda: run_audit(rules, data, workers=args.workers), args.repeat) * 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
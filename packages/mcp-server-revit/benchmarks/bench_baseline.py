@@ -0,0 +1,74 @@
+"""Export two baseline snapshots and diff them.
+
+The second snapshot edits, removes and adds about 1% of the elements each.
+The diff is timed once plainly and once under ``tracemalloc`` to report the
+peak heap memory the join allocates (mapped file pages are not counted; they
+belong to the page cache). Finally a handful of elements are looked up by
+UniqueId, as ``revit.baseline_history`` does once per nightly snapshot.
+
+Usage::
+
+    python benchmarks/bench_baseline.py [--elements 500000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import baseline_elements  # noqa: E402
+
+from revit_mcp_server.tools.baseline import Snapshot, SnapshotWriter, diff_snapshots  # noqa: E402
+
+
+def _write(path: Path, records: list[dict]) -> float:
+    start = time.perf_counter()
+    with SnapshotWriter(path) as writer:
+        writer.add_many(records)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=500_000)
+    args = parser.parse_args()
+
+    records = baseline_elements(args.elements)
+    step = 100
+    edited = [
+        {**record, "parameters": {**record["parameters"], "Comments": "Revised"}} if index % step == 0 else record
+        for index, record in enumerate(records)
+        if index % step != 1
+    ]
+    edited += baseline_elements(args.elements // step, seed=99)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        before, after = Path(scratch) / "a.rmcpb", Path(scratch) / "b.rmcpb"
+        print(f"write before  {_write(before, records):6.2f}s  {before.stat().st_size / 2**20:7.1f} MB")
+        print(f"write after   {_write(after, edited):6.2f}s  {after.stat().st_size / 2**20:7.1f} MB")
+        wanted = [records[index]["unique_id"] for index in range(0, args.elements, args.elements // 20)]
+        del records, edited
+        start = time.perf_counter()
+        summary = diff_snapshots(before, after)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        diff_snapshots(before, after)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"diff          {elapsed:6.2f}s  added={summary.added} removed={summary.removed} "
+            f"changed={summary.changed} peak allocated {peak / 2**20:.1f} MB"
+        )
+        start = time.perf_counter()
+        with Snapshot(after) as snapshot:
+            found = sum(snapshot.find(unique_id) is not None for unique_id in wanted)
+        elapsed = time.perf_counter() - start
+        print(f"open + {len(wanted)} lookups {elapsed * 1000:6.2f}ms  found={found}")
+
+
+if __name__ == "__main__":
+    main()
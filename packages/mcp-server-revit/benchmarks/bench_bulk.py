@@ -0,0 +1,135 @@
+"""Client-side cost of placing a 10k-element wall grid and column grid.
+
+The per-element path builds one ``revit.create_wall`` / ``revit.create_column``
+payload per element, with nested point dicts as ``call_tool`` does, and
+encodes each as a request body. The bulk path runs ``plan_walls`` /
+``plan_columns`` (unit conversion, filtering, de-duplication) and encodes
+one columnar body per chunk. Both report wall time, request count and bytes
+on the wire. ``--rtt-ms`` adds an assumed per-request round trip, so the
+totals show what the request count costs against a real bridge.
+
+Usage::
+
+    python benchmarks/bench_bulk.py [--elements 10000] [--rtt-ms 15]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server import codec  # noqa: E402
+from revit_mcp_server.tools.bulk import plan_columns, plan_walls  # noqa: E402
+
+
+def wall_grid(count: int, spacing: float = 6.0) -> dict:
+    """Horizontal and vertical grid lines in metres, with every 50th repeated."""
+    side = int(np.sqrt(count / 2)) + 1
+    i, j = np.divmod(np.arange(count // 2), side)
+    start_x = np.concatenate([i * spacing, j * spacing])
+    start_y = np.concatenate([j * spacing, i * spacing])
+    end_x = np.concatenate([i * spacing + spacing, j * spacing])
+    end_y = np.concatenate([j * spacing, i * spacing + spacing])
+    repeated = np.arange(0, len(start_x) - 1, 50)
+    for column in (start_x, start_y, end_x, end_y):
+        column[repeated] = column[repeated + 1]
+    return {
+        "start_x": start_x.tolist(),
+        "start_y": start_y.tolist(),
+        "end_x": end_x.tolist(),
+        "end_y": end_y.tolist(),
+        "height": 3.2,
+        "units": "m",
+        "level": "L1",
+    }
+
+
+def column_grid(count: int, spacing: float = 6.0) -> dict:
+    side = int(np.sqrt(count)) + 1
+    i, j = np.divmod(np.arange(count), side)
+    return {
+        "x": (i * spacing).tolist(),
+        "y": (j * spacing).tolist(),
+        "units": "m",
+        "level": "L1",
+        "family_name": "W-Wide Flange-Column",
+        "type_name": "W10X33",
+    }
+
+
+def per_element_walls(arguments: dict) -> list[bytes]:
+    scale = 1 / 0.3048
+    return [
+        codec.dumps(
+            {
+                "tool": "revit.create_wall",
+                "payload": {
+                    "start_point": {"x": sx * scale, "y": sy * scale, "z": 0},
+                    "end_point": {"x": ex * scale, "y": ey * scale, "z": 0},
+                    "height": arguments["height"] * scale,
+                    "level": arguments["level"],
+                },
+            }
+        )
+        for sx, sy, ex, ey in zip(arguments["start_x"], arguments["start_y"], arguments["end_x"], arguments["end_y"])
+    ]
+
+
+def per_element_columns(arguments: dict) -> list[bytes]:
+    scale = 1 / 0.3048
+    return [
+        codec.dumps(
+            {
+                "tool": "revit.create_column",
+                "payload": {
+                    "location": {"x": x * scale, "y": y * scale, "z": 0},
+                    "level": arguments["level"],
+                    "family_name": arguments["family_name"],
+                    "type_name": arguments["type_name"],
+                },
+            }
+        )
+        for x, y in zip(arguments["x"], arguments["y"])
+    ]
+
+
+def bulk(plan_for, arguments: dict) -> list[bytes]:
+    plan = plan_for(arguments)
+    return [codec.dumps({"tool": plan.tool, "payload": payload}) for payload in plan.payloads()]
+
+
+def measure(label: str, build, rtt: float) -> None:
+    start = time.perf_counter()
+    bodies = build()
+    elapsed = time.perf_counter() - start
+    size = sum(len(body) for body in bodies)
+    total = elapsed + len(bodies) * rtt
+    print(f"{label:28s} {elapsed * 1e3:9.1f} {len(bodies):9d} {size / 1e6:9.2f} {total:10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=10_000)
+    parser.add_argument("--rtt-ms", type=float, default=15.0, help="assumed bridge round trip per request")
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1e3
+
+    walls = wall_grid(args.elements)
+    columns = column_grid(args.elements)
+    print(f"codec backend: {codec.BACKEND}; {args.elements} elements; {args.rtt_ms:g} ms per request")
+    print(f"{'path':28s} {'ms':>9s} {'requests':>9s} {'MB':>9s} {'+rtt (s)':>10s}")
+    measure("walls, per element", lambda: per_element_walls(walls), rtt)
+    measure("walls, bulk", lambda: bulk(plan_walls, walls), rtt)
+    measure("columns, per element", lambda: per_element_columns(columns), rtt)
+    measure("columns, bulk", lambda: bulk(plan_columns, columns), rtt)
+    print("wall rows skipped:", {reason: len(rows) for reason, rows in plan_walls(walls).skipped.items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Encode/decode throughput of each installed JSON backend on large results.
+
+Covers the hops that matter: decoding a bridge response, re-encoding it
+compactly (audit log, stdio server) and pretty-printing it for the MCP reply.
+
+Usage::
+
+    python benchmarks/bench_codec.py [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import geometry_result, listing_result, schedule_result  # noqa: E402
+
+from revit_mcp_server import codec  # noqa: E402
+
+PAYLOADS = {
+    "listing-100k": listing_result(100_000),
+    "geometry-5k-faces": geometry_result(5_000),
+    "schedule-50k-rows": schedule_result(50_000),
+}
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20}{'backend':<10}{'MB':>7}{'loads ms':>11}{'dumps ms':>11}{'pretty ms':>11}")
+    for name, result in PAYLOADS.items():
+        for backend in codec.available_backends():
+            codec.use_backend(backend)
+            wire = codec.dumps({"status": "ok", "result": result})
+            loads_ms = _best_ms(lambda: codec.loads(wire), args.repeat)
+            dumps_ms = _best_ms(lambda: codec.dumps(result), args.repeat)
+            pretty_ms = _best_ms(lambda: codec.dumps_pretty(result), args.repeat)
+            print(
+                f"{name:<20}{backend:<10}{len(wire) / 1e6:>7.1f}"
+                f"{loads_ms:>11.1f}{dumps_ms:>11.1f}{pretty_ms:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
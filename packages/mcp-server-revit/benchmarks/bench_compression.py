@@ -0,0 +1,118 @@
+"""Loopback latency/CPU tradeoff of bridge body compression.
+
+Runs a tiny in-process HTTP server that mimics the add-in's ``/execute``
+endpoint (gzip request bodies in, gzip/zstd responses out above a threshold)
+and times ``BridgeClient``-style round trips for representative payloads.
+
+CPU time is ``time.process_time()`` and therefore covers both the client and
+the in-process server, which is the total cost paid on a workstation where
+Revit and the MCP server share cores.
+
+Usage::
+
+    python benchmarks/bench_compression.py [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import geometry_result, schedule_result  # noqa: E402
+
+from revit_mcp_server.bridge import compression  # noqa: E402
+
+PAYLOADS = {
+    "geometry-200-faces": geometry_result(200),
+    "geometry-5k-faces": geometry_result(5_000),
+    "schedule-1k-rows": schedule_result(1_000),
+    "schedule-50k-rows": schedule_result(50_000),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    response_body = b"{}"
+    threshold = 8192
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        encoding = self.headers.get("Content-Encoding")
+        if encoding:
+            raw = compression.decompress(raw, encoding)
+        json.loads(raw)
+
+        body = self.response_body
+        accepted = self.headers.get("Accept-Encoding", "")
+        chosen = compression.negotiate([part.strip() for part in accepted.split(",") if part.strip()])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if chosen and len(body) >= self.threshold:
+            body = compression.compress(body, chosen)
+            self.send_header("Content-Encoding", chosen)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # silence per-request logging
+        pass
+
+
+def _round_trip(client: httpx.Client, url: str, request_body: bytes, encoding: str | None) -> int:
+    headers = {"Content-Type": "application/json"}
+    body = request_body
+    if encoding:
+        headers["Accept-Encoding"] = encoding
+        if len(body) >= _Handler.threshold:
+            body = compression.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+    else:
+        headers["Accept-Encoding"] = "identity"
+    resp = client.post(url, content=body, headers=headers)
+    resp.raise_for_status()
+    resp.json()
+    return len(resp.content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/execute"
+
+    modes = [None, *compression.supported_encodings()]
+    print(f"{'payload':<22}{'mode':<8}{'raw KB':>10}{'wire KB':>10}{'p50 ms':>10}{'cpu ms':>10}")
+    with httpx.Client() as client:
+        for name, result in PAYLOADS.items():
+            raw = json.dumps({"status": "ok", "result": result}).encode()
+            _Handler.response_body = raw
+            # Echo-sized request bodies stand in for bulk write payloads.
+            request_body = json.dumps({"tool": "revit.x", "payload": result}).encode()
+            for mode in modes:
+                wire = compression.compress(raw, mode) if mode and len(raw) >= _Handler.threshold else raw
+                latencies = []
+                cpu_start = time.process_time()
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    _round_trip(client, url, request_body, mode)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                cpu_ms = (time.process_time() - cpu_start) * 1000 / args.repeat
+                print(
+                    f"{name:<22}{mode or 'none':<8}{len(raw) / 1024:>10.1f}{len(wire) / 1024:>10.1f}"
+                    f"{statistics.median(latencies):>10.2f}{cpu_ms:>10.2f}"
+                )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Per-call overhead of ``MCPServer.handle_tool`` before the bridge round trip.
+
+For each tool answered by Revit in bridge mode, this compares three paths:
+running the mock handler (mock mode, and what bridge mode used to do before
+forwarding), validating the payload only (bridge mode now), and the whole
+``handle_tool`` call in each mode with a no-op bridge and the audit log on a
+scratch file. Python-implemented tools (exports, baselines, sheets, publish)
+run their handler in both modes and are left out.
+
+Usage::
+
+    python benchmarks/bench_handlers.py [--calls 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server.config import BridgeMode, Config  # noqa: E402
+from revit_mcp_server.security.workspace import WorkspaceMonitor  # noqa: E402
+from revit_mcp_server.server import MCPServer  # noqa: E402
+from revit_mcp_server.tools.handlers import LOCAL_TOOLS, TOOL_HANDLERS, validate_payload  # noqa: E402
+
+
+class NullBridge:
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        return {}
+
+
+def payloads(scratch: Path) -> dict[str, dict]:
+    base = {"request_id": "bench"}
+    special = {
+        "revit.health": {**base, "check_interval": 10},
+        "revit.open_document": {**base, "file_path": str(scratch / "Tower.rvt")},
+        "revit.list_views": {**base, "document_id": "Tower"},
+    }
+    return {
+        tool: special.get(tool, {**base, "document_id": "Tower"})
+        for tool in TOOL_HANDLERS
+        if tool not in LOCAL_TOOLS
+    }
+
+
+def per_call(run, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch)
+        workspace = WorkspaceMonitor([root])
+        servers = {
+            mode: MCPServer(
+                config=Config(
+                    workspace_dir=root,
+                    allowed_directories=[root],
+                    audit_log=root / f"audit-{mode.value}.log",
+                    bridge_url="http://bench",
+                    mode=mode,
+                ),
+                bridge_factory=lambda _: NullBridge(),
+            )
+            for mode in BridgeMode
+        }
+
+        print(f"{'tool':36s} {'handler':>9s} {'validate':>9s} {'mock call':>10s} {'bridge call':>12s}  (us/call)")
+        totals = [0.0, 0.0]
+        for tool, payload in payloads(root).items():
+            handler = TOOL_HANDLERS[tool]
+            handled = per_call(lambda: handler(payload, workspace), args.calls)
+            validated = per_call(lambda: validate_payload(tool, payload, workspace), args.calls)
+            mock = per_call(lambda: servers[BridgeMode.mock].handle_tool(tool, payload), args.calls // 10)
+            bridged = per_call(lambda: servers[BridgeMode.bridge].handle_tool(tool, payload), args.calls // 10)
+            totals[0] += handled
+            totals[1] += validated
+            print(f"{tool:36s} {handled:9.2f} {validated:9.2f} {mock:10.2f} {bridged:12.2f}")
+        print(f"{'mean':36s} {totals[0] / len(payloads(root)):9.2f} {totals[1] / len(payloads(root)):9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Nested-JSON geometry versus welded binary meshes.
+
+A triangulated surface is encoded two ways: as the add-in's JSON geometry
+style (one ``{"x", "y", "z"}`` object per triangle corner, so shared vertices
+repeat) and as a ``revit.get_element_mesh`` result (welded float32 vertices
+and uint32 indices, base64). For each, the benchmark reports the response
+size and the time to decode it into NumPy arrays.
+
+Usage::
+
+    python benchmarks/bench_mesh.py [--triangles 200000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server import codec  # noqa: E402
+from revit_mcp_server.geometry import ElementMesh  # noqa: E402
+
+
+def grid_surface(triangles: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """A wavy height field: ``side`` x ``side`` vertices, two triangles per cell."""
+    side = int(np.sqrt(triangles / 2)) + 1
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.arange(side, dtype=np.float64), np.arange(side, dtype=np.float64))
+    z = np.sin(x / 7) + np.cos(y / 5) + rng.normal(0, 0.01, x.shape)
+    vertices = np.column_stack([x.ravel(), y.ravel(), z.ravel()]).astype("<f4")
+    cell = (np.arange(side - 1)[:, None] * side + np.arange(side - 1)[None, :]).ravel()
+    lower = np.column_stack([cell, cell + 1, cell + side])
+    upper = np.column_stack([cell + 1, cell + side + 1, cell + side])
+    return vertices, np.concatenate([lower, upper]).astype("<u4")
+
+
+def json_result(vertices: np.ndarray, triangles: np.ndarray) -> bytes:
+    corners = vertices[triangles].astype(np.float64).round(6)
+    return codec.dumps(
+        {
+            "element_id": 1,
+            "triangles": [
+                [{"x": float(x), "y": float(y), "z": float(z)} for x, y, z in triangle]
+                for triangle in corners.tolist()
+            ],
+        }
+    )
+
+
+def binary_result(vertices: np.ndarray, triangles: np.ndarray) -> bytes:
+    return codec.dumps(
+        {
+            "encoding": "base64",
+            "vertex_count": len(vertices),
+            "triangle_count": len(triangles),
+            "elements": [{"element_id": 1, "first_triangle": 0, "triangle_count": len(triangles)}],
+            "vertices": base64.b64encode(vertices.tobytes()).decode(),
+            "indices": base64.b64encode(triangles.tobytes()).decode(),
+        }
+    )
+
+
+def decode_json(body: bytes) -> np.ndarray:
+    result = codec.loads(body)
+    return np.array(
+        [[(corner["x"], corner["y"], corner["z"]) for corner in triangle] for triangle in result["triangles"]],
+        dtype=np.float32,
+    )
+
+
+def decode_binary(body: bytes) -> ElementMesh:
+    return ElementMesh.from_result(codec.loads(body))
+
+
+def best_of(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--triangles", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    vertices, triangles = grid_surface(args.triangles)
+    nested = json_result(vertices, triangles)
+    binary = binary_result(vertices, triangles)
+    print(f"codec backend: {codec.BACKEND}; {len(triangles)} triangles, {len(vertices)} welded vertices")
+    print(f"{'format':10s} {'MB':>8s} {'decode ms':>10s}")
+    print(f"{'json':10s} {len(nested) / 1e6:8.2f} {best_of(lambda: decode_json(nested), args.repeat) * 1e3:10.1f}")
+    print(f"{'binary':10s} {len(binary) / 1e6:8.2f} {best_of(lambda: decode_binary(binary), args.repeat) * 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cost of element-ID normalization next to decoding the same result.
+
+``plan`` is the per-tool path plan used by ``decode_response``; ``full-walk``
+is a generic recursive pass over every dict and list in the result, which is
+what a schema-less normalizer would have to do. Both are compared with the
+time it takes to decode the body in the first place.
+
+Usage::
+
+    python benchmarks/bench_normalize.py [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import geometry_result, listing_result  # noqa: E402
+
+from revit_mcp_server import codec  # noqa: E402
+from revit_mcp_server.bridge.catalog import RECORD_ID_KEYS, element_id_plan  # noqa: E402
+from revit_mcp_server.bridge.responses import normalize_element_ids  # noqa: E402
+
+CASES = {
+    "revit.list_elements_by_category": listing_result(100_000),
+    "revit.get_element_faces": geometry_result(20_000),
+}
+
+
+def full_walk(node):
+    if isinstance(node, list):
+        for item in node:
+            full_walk(item)
+    elif isinstance(node, dict):
+        if "element_id" not in node:
+            for key in RECORD_ID_KEYS:
+                if key in node:
+                    node["element_id"] = node[key]
+                    break
+        for value in node.values():
+            full_walk(value)
+
+
+def _best(fn, body: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        result = codec.loads(body)
+        start = time.perf_counter()
+        fn(result)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"codec backend: {codec.BACKEND}")
+    print(f"{'tool':<34}{'decode ms':>11}{'plan ms':>10}{'full-walk ms':>14}")
+    for tool, result in CASES.items():
+        body = codec.dumps(result)
+        plan = element_id_plan(tool)
+        decode = _best(lambda _: codec.loads(body), body, args.repeat)
+        planned = _best(lambda value: normalize_element_ids(value, plan), body, args.repeat)
+        walked = _best(full_walk, body, args.repeat)
+        print(f"{tool:<34}{decode:>11.1f}{planned:>10.1f}{walked:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
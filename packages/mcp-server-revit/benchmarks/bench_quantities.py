@@ -0,0 +1,83 @@
+"""Quantity take-off: NumPy group-by versus a dict-of-totals loop.
+
+Element records are flattened into (element, material) rows once; the
+aggregation by category, level, material and phase is then timed on that
+table and compared with accumulating the same totals in a Python dict.
+
+Usage::
+
+    python benchmarks/bench_quantities.py [--elements 750000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import quantity_elements  # noqa: E402
+
+from revit_mcp_server.tools.quantities import (  # noqa: E402
+    DIMENSIONS,
+    MEASURES,
+    QuantityTable,
+    aggregate,
+    write_quantities,
+)
+
+
+def dict_totals(records: list[dict]) -> dict:
+    totals: dict = defaultdict(lambda: [set(), 0.0, 0.0, 0.0])
+    for record in records:
+        for position, material in enumerate(record["materials"] or [None]):
+            key = (record["category"], record["level"], material and material["material"], record["phase"])
+            entry = totals[key]
+            entry[0].add(record["id"])
+            entry[1] += record["length"] if position == 0 else 0.0
+            source = material or record
+            entry[2] += source["area"]
+            entry[3] += source["volume"]
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=750_000)
+    args = parser.parse_args()
+
+    records = quantity_elements(args.elements)
+    pages = [records[start : start + 500] for start in range(0, len(records), 500)]
+
+    start = time.perf_counter()
+    table = QuantityTable()
+    for page in pages:
+        table.add(page)
+    table.column("element_id")
+    flatten = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = aggregate(table, DIMENSIONS)
+    grouped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = dict_totals(records)
+    looped = time.perf_counter() - start
+    assert len(expected) == len(rows)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        write_quantities(Path(scratch) / "takeoff.csv", rows, [*DIMENSIONS, "elements", *MEASURES])
+        written = time.perf_counter() - start
+
+    print(f"{args.elements} elements -> {len(table)} rows -> {len(rows)} groups")
+    print(f"flatten pages   {flatten:7.2f}s")
+    print(f"numpy group-by  {grouped:7.2f}s")
+    print(f"dict loop       {looped:7.2f}s")
+    print(f"write csv       {written:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
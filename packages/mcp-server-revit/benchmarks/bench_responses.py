@@ -0,0 +1,65 @@
+"""Cost of turning an ``/execute`` body into a result, old path vs typed decode.
+
+``dict-probe`` is the previous client logic: decode to a dict, then probe
+``status``/``Status`` and ``result``/``Result``. ``typed`` is
+``decode_response``; for geometry tools with ``msgspec`` installed it leaves
+the face/edge arrays undecoded until read, and ``typed+forward`` re-encodes
+the result the way the MCP reply does.
+
+Usage::
+
+    python benchmarks/bench_responses.py [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import geometry_result, listing_result  # noqa: E402
+
+from revit_mcp_server import codec  # noqa: E402
+from revit_mcp_server.bridge.responses import decode_response  # noqa: E402
+
+CASES = {
+    "revit.list_elements_by_category": listing_result(100_000),
+    "revit.get_element_faces": geometry_result(20_000),
+}
+
+
+def _dict_probe(body: bytes):
+    response = codec.loads(body)
+    status = response.get("status") or response.get("Status", "ok")
+    if status == "error":
+        raise RuntimeError(status)
+    return response.get("result") or response.get("Result", {})
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"codec backend: {codec.BACKEND}")
+    print(f"{'tool':<34}{'MB':>6}{'dict-probe':>12}{'typed':>10}{'typed+forward':>15}")
+    for tool, result in CASES.items():
+        body = codec.dumps({"Status": "ok", "Tool": tool, "Result": result})
+        probe_ms = _best_ms(lambda: _dict_probe(body), args.repeat)
+        typed_ms = _best_ms(lambda: decode_response(body, tool), args.repeat)
+        forward_ms = _best_ms(lambda: codec.dumps(decode_response(body, tool).result), args.repeat)
+        print(f"{tool:<34}{len(body) / 1e6:>6.1f}{probe_ms:>12.1f}{typed_ms:>10.1f}{forward_ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
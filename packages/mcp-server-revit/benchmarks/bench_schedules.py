@@ -0,0 +1,81 @@
+"""Schedule export: streamed pages versus buffering the whole table.
+
+A fake bridge serves schedule pages shaped like ``revit.get_schedule_data``.
+The streamed export writes each page as it arrives; the buffered baseline
+collects every row, then writes them and pretty-prints the table the way a
+full MCP reply would. Peak memory is measured with ``tracemalloc``.
+
+Usage::
+
+    python benchmarks/bench_schedules.py [--rows 200000] [--columns 12]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server import codec  # noqa: E402
+from revit_mcp_server.tools.schedules import iter_schedule_pages, stream_schedules  # noqa: E402
+
+
+def schedule_bridge(total: int, columns: int):
+    headings = [f"Field {index}" for index in range(columns)]
+
+    def call(tool_name: str, payload: dict) -> dict:
+        stop = min(payload["offset"] + payload["limit"], total)
+        rows = [[f"{row}-{column}" for column in range(columns)] for row in range(payload["offset"], stop)]
+        return {"columns": headings, "rows": rows, "total": total, "truncated": stop < total}
+
+    return call
+
+
+def buffered(call, path: Path) -> None:
+    pages = list(iter_schedule_pages(call, 1))
+    rows = [row for page in pages for row in page["rows"]]
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(pages[0]["columns"])
+        writer.writerows(rows)
+    codec.dumps_pretty({"columns": pages[0]["columns"], "rows": rows})
+
+
+def measure(run) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=12)
+    args = parser.parse_args()
+
+    call = schedule_bridge(args.rows, args.columns)
+    schedule = [{"id": 1, "name": "Bench"}]
+    with tempfile.TemporaryDirectory() as scratch:
+        results = {
+            "stream csv": measure(lambda: stream_schedules(call, schedule, Path(scratch) / "s.csv")),
+            "stream xlsx": measure(lambda: stream_schedules(call, schedule, Path(scratch) / "s.xlsx")),
+            "buffered csv+reply": measure(lambda: buffered(call, Path(scratch) / "b.csv")),
+        }
+
+    print(f"{args.rows} rows x {args.columns} columns (timings include tracemalloc overhead)")
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:20s} {elapsed:7.2f}s  peak {peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
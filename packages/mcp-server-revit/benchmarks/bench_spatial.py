@@ -0,0 +1,69 @@
+"""Clash sweep between two element sets: grid index versus the nested loop.
+
+The nested loop is what ``revit.check_clashes`` does on the Revit UI thread
+for every pair of categories; it is timed on a slice and extrapolated, since
+running it in full takes minutes. The index time includes building it.
+
+Usage::
+
+    python benchmarks/bench_spatial.py [--elements 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _payloads import mep_boxes  # noqa: E402
+
+from revit_mcp_server.replica.spatial import BoxIndex  # noqa: E402
+
+
+def nested_loop(left, right) -> int:
+    """Vectorized over ``right`` only, one ``left`` box at a time."""
+    hits = 0
+    for box in left:
+        hits += int(
+            ((right[:, :3] <= box[3:]).all(axis=1) & (right[:, 3:] >= box[:3]).all(axis=1)).sum()
+        )
+    return hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=200_000)
+    args = parser.parse_args()
+
+    boxes = mep_boxes(args.elements)
+    ducts, pipes = boxes[: args.elements // 2], boxes[args.elements // 2 :]
+
+    start = time.perf_counter()
+    left, _ = BoxIndex(ducts).pairs(BoxIndex(pipes))
+    indexed = time.perf_counter() - start
+
+    sample = 500
+    start = time.perf_counter()
+    nested_loop(ducts[:sample], pipes)
+    looped = (time.perf_counter() - start) * len(ducts) / sample
+
+    index = BoxIndex(boxes)
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.overlapping((300, 200, 60, 310, 210, 70))
+    window = (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.nearest((300, 200, 60), 10)
+    knn = (time.perf_counter() - start)
+
+    print(f"{len(ducts)} x {len(pipes)} boxes, {len(left)} overlapping pairs")
+    print(f"grid index join   {indexed:8.2f}s")
+    print(f"nested loop       {looped:8.2f}s  (extrapolated from {sample} rows)")
+    print(f"box query         {window:8.3f}ms")
+    print(f"10 nearest        {knn:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Throughput of compiled MCP argument validation.
+
+Schemas shaped like the ``list_tools`` declarations (flat scalars, point
+lists, nested filters) are compiled once with ``validation.compile_schema``
+and checked against valid and invalid arguments. When ``jsonschema`` is
+installed, its cached ``Draft202012Validator`` is timed on the same inputs
+for comparison.
+
+Usage::
+
+    python benchmarks/bench_validation.py [--calls 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _payloads  # noqa: E402,F401  (sets the workspace environment)
+
+from revit_mcp_server.validation import ArgumentValidator  # noqa: E402
+
+try:
+    import jsonschema
+except ImportError:  # pragma: no cover - depends on the environment
+    jsonschema = None
+
+_POINT = {"type": "object", "properties": {"x": {"type": "number"}, "y": {"type": "number"}, "z": {"type": "number"}}}
+
+SCHEMAS = {
+    "revit_create_wall": {
+        "type": "object",
+        "properties": {
+            **{f"{end}_{axis}": {"type": "number"} for end in ("start", "end") for axis in "xyz"},
+            "height": {"type": "number", "default": 10},
+            "level": {"type": "string", "default": "L1"},
+        },
+        "required": ["start_x", "start_y", "end_x", "end_y"],
+    },
+    "revit_create_floor": {
+        "type": "object",
+        "properties": {"points": {"type": "array", "items": _POINT}, "level": {"type": "string"}},
+        "required": ["points"],
+    },
+    "revit_replica_query": {
+        "type": "object",
+        "properties": {
+            "filters": {"type": "object"},
+            "fields": {"type": "array", "items": {"type": "string"}},
+            "sort": {"type": "string"},
+            "limit": {"type": "integer", "default": 100},
+            "offset": {"type": "integer", "default": 0},
+            "count_only": {"type": "boolean", "default": False},
+        },
+    },
+    "revit_export_schedules": {
+        "type": "object",
+        "properties": {
+            "output_path": {"type": "string"},
+            "schedule_ids": {"type": "array", "items": {"type": "integer"}},
+            "page_size": {"type": "integer", "minimum": 1, "maximum": 2000},
+            "format": {"type": "string", "enum": ["csv", "xlsx"]},
+        },
+        "required": ["output_path"],
+    },
+}
+
+CASES = {
+    "revit_create_wall": (
+        {"start_x": 0, "start_y": 0, "end_x": 20.5, "end_y": 0, "height": 12, "level": "L2"},
+        {"start_x": "0", "end_x": 20.5, "end_y": None, "height": 12},
+    ),
+    "revit_create_floor": (
+        {"points": [{"x": i, "y": i * 2.0, "z": 0} for i in range(12)], "level": "L1"},
+        {"points": [{"x": i, "y": "2"} for i in range(12)]},
+    ),
+    "revit_replica_query": (
+        {"filters": {"category": "Walls", "length": {"min": 10}}, "fields": ["id", "name"], "limit": 50},
+        {"filters": [], "limit": "50"},
+    ),
+    "revit_export_schedules": (
+        {"output_path": "C:/exports/doors.xlsx", "schedule_ids": [101, 102], "page_size": 500},
+        {"page_size": 5000, "format": "pdf"},
+    ),
+}
+
+
+def per_call(run, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validator = ArgumentValidator(SCHEMAS)
+    print(f"compiled {len(SCHEMAS)} schemas in {(time.perf_counter() - start) * 1e3:.2f} ms")
+    reference = {name: jsonschema.Draft202012Validator(schema) for name, schema in SCHEMAS.items()} if jsonschema else {}
+
+    print(f"{'tool':24s} {'case':8s} {'compiled':>10s} {'jsonschema':>11s}  (us/call)")
+    for name, (good, bad) in CASES.items():
+        assert not validator.errors(name, good), validator.errors(name, good)
+        assert validator.errors(name, bad)
+        for label, arguments in (("valid", good), ("invalid", bad)):
+            compiled = per_call(lambda: validator.errors(name, arguments), args.calls)
+            baseline = (
+                f"{per_call(lambda: list(reference[name].iter_errors(arguments)), args.calls // 10):11.2f}"
+                if reference
+                else f"{'n/a':>11s}"
+            )
+            print(f"{name:24s} {label:8s} {compiled:10.2f} {baseline}")
+    print("example:", "; ".join(validator.errors("revit_create_floor", CASES["revit_create_floor"][1])[:2]))
+
+
+if __name__ == "__main__":
+    main()
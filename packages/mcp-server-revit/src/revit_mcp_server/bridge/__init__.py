@@ -1,4 +1,7 @@
+from .cache import QueryCache
 from .client import BridgeClient
 from .mock import MockBridge
+from .pool import BridgePool
+from .session import WriteBatch
 
-__all__ = ["BridgeClient", "MockBridge"]
+__all__ = ["BridgeClient", "BridgePool", "MockBridge", "QueryCache", "WriteBatch"]
@@ -0,0 +1,143 @@
+"""Read-only bridge results persisted across server restarts.
+
+Entries live in one SQLite file and are keyed by a *scope* as well as the tool
+and payload. The scope names the open document and its version, as reported
+by the add-in's ``/health``. Any edit in Revit changes the version, so stale
+entries are never served; they simply stop being read and age out. Once the
+file grows past ``max_bytes``, the least recently used entries are evicted.
+
+Several server processes may share the file; SQLite serializes their writes.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .. import codec
+from .metrics import BridgeMetrics, metrics as default_metrics
+from .singleflight import request_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "query-cache.sqlite3"
+MAX_BYTES = 64 * 1024 * 1024
+# After eviction the cache is this fraction of ``max_bytes``, so one insert
+# over the limit does not trigger an eviction per call.
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    value BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+
+
+class QueryCache:
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = MAX_BYTES,
+        metrics: BridgeMetrics | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.metrics = metrics or default_metrics
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Bridge calls arrive on worker threads; one connection behind a lock
+        # is simpler than a connection per thread and fast enough.
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._bytes = self._stored_bytes()
+        self.metrics.set_gauge("cache.bytes", self._bytes)
+
+    @staticmethod
+    def key(scope: str, tool: str, payload: dict[str, Any]) -> str:
+        tool, body = request_key(tool, payload)
+        return hashlib.sha256(f"{scope}\0{tool}\0{body}".encode("utf-8")).hexdigest()
+
+    def get(self, scope: str, tool: str, payload: dict[str, Any]) -> Any | None:
+        key = self.key(scope, tool, payload)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            self.metrics.increment("cache.misses")
+            return None
+        self.metrics.increment("cache.hits")
+        return codec.loads(row[0])
+
+    def put(self, scope: str, tool: str, payload: dict[str, Any], value: Any) -> bool:
+        """Store ``value``; returns False when it is too large to be worth keeping."""
+        data = codec.dumps(value)
+        # One huge geometry result must not flush everything else.
+        if len(data) > self.max_bytes // 8:
+            return False
+        key = self.key(scope, tool, payload)
+        with self._lock:
+            previous = self._db.execute("SELECT bytes FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, scope, tool, value, bytes, used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, scope, tool, data, len(data), time.time()),
+            )
+            self._bytes += len(data) - (previous[0] if previous else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self.metrics.set_gauge("cache.bytes", self._bytes)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._bytes = 0
+            self.metrics.set_gauge("cache.bytes", 0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, scopes = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT scope) FROM entries").fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "scopes": scopes,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _stored_bytes(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        # Other processes sharing the file may have added or evicted entries.
+        self._bytes = self._stored_bytes()
+        excess = self._bytes - int(self.max_bytes * _EVICT_TO)
+        if excess <= 0:
+            return
+        victims: list[tuple[str]] = []
+        freed = 0
+        for key, size in self._db.execute("SELECT key, bytes FROM entries ORDER BY used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._bytes -= freed
+        self.metrics.increment("cache.evictions", len(victims))
+        logger.debug("Query cache evicted %d entries (%d bytes)", len(victims), freed)
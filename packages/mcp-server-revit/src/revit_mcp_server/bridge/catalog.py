@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+# Tool-name conventions used by the add-in. Anything matching these only reads
+# the model and can be routed to any instance that has the right document open.
+READ_ONLY_PREFIXES = (
+    "revit.get_",
+    "revit.list_",
+    "revit.find_",
+    "revit.filter_",
+    "revit.check_",
+    "revit.analyze_",
+    "revit.validate_",
+    "revit.calculate_",
+)
+
+READ_ONLY_TOOLS = frozenset(
+    {
+        "revit.health",
+        "revit.reflect_get",
+    }
+)
+
+
+def is_read_only(tool: str) -> bool:
+    """Return True when ``tool`` never modifies the Revit document."""
+    return tool in READ_ONLY_TOOLS or tool.startswith(READ_ONLY_PREFIXES)
+
+
+# Read-only tools whose result depends on more than the document's contents
+# (UI state, the caller's cursor, the add-in itself), so the query cache
+# must not answer them.
+UNCACHEABLE_TOOLS = frozenset(
+    {
+        "revit.health",
+        "revit.get_selection",
+        "revit.get_document_changes",
+        "revit.reflect_get",
+    }
+)
+
+
+def is_cacheable(tool: str) -> bool:
+    """Return True when results of ``tool`` are fixed by the document version."""
+    return is_read_only(tool) and tool not in UNCACHEABLE_TOOLS
+
+
+# The add-in command that runs many writes in one transaction, and the write
+# tools it refuses: they open, close or export documents, or run user code,
+# and need the document outside any transaction. Mirrors the add-in's list.
+BATCH_TOOL = "revit.execute_batch"
+UNBATCHABLE_TOOLS = frozenset(
+    {
+        BATCH_TOOL,
+        "revit.open_document",
+        "revit.close_document",
+        "revit.create_new_document",
+        "revit.save_document",
+        "revit.sync_to_central",
+        "revit.relinquish_all",
+        "revit.edit_family",
+        "revit.execute_python",
+        "revit.export_schedules",
+        "revit.export_pdf_by_sheet_set",
+        "revit.export_dwg_by_view",
+        "revit.export_ifc_with_settings",
+        "revit.export_navisworks",
+        "revit.export_image",
+        "revit.render_3d_view",
+    }
+)
+
+
+def is_batchable(tool: str) -> bool:
+    """Return True when ``tool`` is a write that can run inside a batch."""
+    return not is_read_only(tool) and tool not in UNBATCHABLE_TOOLS
+
+
+# Result fields that can carry megabytes of coordinates. They are kept as raw
+# JSON and only decoded when something actually reads them.
+LAZY_RESULT_FIELDS = {
+    "revit.get_element_geometry": frozenset({"faces", "edges", "solids", "mesh"}),
+    "revit.get_element_faces": frozenset({"faces"}),
+    "revit.get_element_edges": frozenset({"edges"}),
+}
+
+
+def lazy_fields(tool: str) -> frozenset[str]:
+    return LAZY_RESULT_FIELDS.get(tool, frozenset())
+
+
+# Type-specific ID keys the add-in returns for the element a command created
+# or touched, in priority order. Results gain a generic ``element_id`` alias.
+ELEMENT_ID_KEYS = (
+    "wall_id", "floor_id", "roof_id", "door_id", "window_id",
+    "column_id", "beam_id", "level_id", "view_id", "sheet_id",
+    "room_id", "grid_id", "family_instance_id",
+)
+# Records inside listings carry their own ID as plain ``id``.
+RECORD_ID_KEYS = ("id", *ELEMENT_ID_KEYS)
+
+# Where element records sit inside a result, per tool. A path is a tuple of
+# field names; lists along the way are walked item by item. Nothing outside
+# these paths is visited, so large geometry or schedule payloads cost nothing.
+IdPaths = dict[tuple[str, ...], tuple[str, ...]]
+
+_RESULT_ROOT: IdPaths = {(): ELEMENT_ID_KEYS}
+
+
+def _listing(*fields: str) -> IdPaths:
+    return {**_RESULT_ROOT, **{(field,): RECORD_ID_KEYS for field in fields}}
+
+
+ELEMENT_ID_PATHS: dict[str, IdPaths] = {
+    "revit.list_views": _listing("views"),
+    "revit.list_levels": _listing("levels"),
+    "revit.list_sheets": _listing("sheets"),
+    "revit.list_elements_by_category": _listing("elements"),
+    "revit.get_elements_by_type": _listing("elements"),
+    "revit.get_view_templates": _listing("templates"),
+    "revit.get_rvt_links": _listing("links"),
+    "revit.get_link_instances": _listing("instances"),
+    "revit.list_families": {
+        **_RESULT_ROOT,
+        ("families",): ("family_id",),
+        ("families", "types"): ("type_id",),
+    },
+    # Category, phase and workset IDs are not element IDs; only the root applies.
+    "revit.get_categories": _RESULT_ROOT,
+    "revit.get_phases": _RESULT_ROOT,
+    "revit.get_worksets": _RESULT_ROOT,
+}
+# Tools without an entry (reflection, newer command sets) get the common
+# listing fields; absent fields are a single dict lookup each.
+DEFAULT_ID_PATHS = _listing(
+    "elements", "views", "levels", "sheets", "rooms", "walls", "doors", "windows", "instances"
+)
+
+for _tool, _fields in LAZY_RESULT_FIELDS.items():
+    ELEMENT_ID_PATHS.setdefault(_tool, _RESULT_ROOT)
+
+# Compiled form of a path map: (id keys at this node, {field: child plan}).
+IdPlan = tuple[tuple[str, ...], dict[str, "IdPlan"]]
+
+
+def _compile(paths: IdPaths) -> IdPlan:
+    root: IdPlan = ((), {})
+    for path, keys in sorted(paths.items(), key=lambda item: len(item[0])):
+        node = root
+        for field in path[:-1]:
+            node = node[1].setdefault(field, ((), {}))
+        if path:
+            children = node[1].get(path[-1], ((), {}))[1]
+            node[1][path[-1]] = (keys, children)
+        else:
+            root = (keys, root[1])
+    return root
+
+
+_ID_PLANS = {tool: _compile(paths) for tool, paths in ELEMENT_ID_PATHS.items()}
+_DEFAULT_ID_PLAN = _compile(DEFAULT_ID_PATHS)
+
+
+def element_id_plan(tool: str) -> IdPlan:
+    """Precompiled element-ID normalization plan for ``tool``."""
+    return _ID_PLANS.get(tool, _DEFAULT_ID_PLAN)
@@ -5,30 +5,81 @@ import time
 import uuid
 from typing import Any
 
-from ..errors import BridgeError
+from .. import codec
+from ..errors import BridgeError, BridgeUnavailable
+from . import compression
+from .cache import QueryCache
+from .catalog import is_cacheable, is_read_only
+from .metrics import metrics
+from .responses import decode_response
+from .singleflight import SingleFlight, request_key
 
 
 class BridgeClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:3000", timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:3000",
+        timeout: int = 30,
+        retries: int = 3,
+        compression_min_bytes: int | None = None,
+        cache: QueryCache | None = None,
+        cache_max_staleness: float = 1.0,
+    ):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.retries = max(1, retries)
+        # None disables compression entirely: on loopback the CPU spent
+        # compressing usually outweighs the bytes saved (see benchmarks/).
+        self.compression_min_bytes = compression_min_bytes
+        self._accept_encoding = (
+            compression.accept_encoding_header() if compression_min_bytes is not None else "identity"
+        )
         self._tool_catalog: list[str] | None = None
+        # Request bodies are only compressed once /health advertised support.
+        self._request_encoding: str | None = None
+        # Identical read-only calls in flight at once share one request.
+        self._flights = SingleFlight()
+        # Read-only results are cached under the open document's version,
+        # re-read from /health at most every ``cache_max_staleness`` seconds.
+        self.cache = cache
+        self.cache_max_staleness = cache_max_staleness
+        self._scope: str | None = None
+        self._scope_checked = 0.0
 
     def initialize(self) -> None:
         """Check bridge health and fetch tool catalog on startup."""
         try:
-            health = self._get("/health")
+            health = self.health()
             if health.get("status") != "healthy":
                 raise BridgeError(f"Bridge unhealthy: {health}")
 
-            tools_resp = self._get("/tools")
-            self._tool_catalog = tools_resp.get("tools", [])
+            self._tool_catalog = self._load_catalog(health)
 
         except httpx.RequestError as e:
-            raise BridgeError(
+            raise BridgeUnavailable(
                 f"Bridge unreachable at {self.base_url}. "
                 f"Ensure Revit is running with RevitMCP add-in loaded. Error: {e}"
             ) from e
+        except (httpx.HTTPStatusError, ValueError) as e:
+            raise BridgeUnavailable(f"Bridge at {self.base_url} sent a bad tool catalog: {e}") from e
+
+    def health(self, timeout: float | None = None) -> dict[str, Any]:
+        """Return the add-in's ``/health`` document without retrying."""
+        try:
+            health = self._get("/health", timeout=timeout)
+        except httpx.RequestError as e:
+            raise BridgeUnavailable(f"Bridge unreachable at {self.base_url}: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise BridgeUnavailable(f"Bridge at {self.base_url} answered /health with {e.response.status_code}") from e
+        except ValueError as e:  # the body was not JSON
+            raise BridgeUnavailable(f"Bridge at {self.base_url} sent an unreadable /health: {e}") from e
+        if self.compression_min_bytes is not None:
+            self._request_encoding = compression.negotiate(health.get("compression"))
+        # Add-ins predating document versions report none: nothing is cached.
+        document, version = health.get("active_document"), health.get("document_version")
+        self._scope = f"{document}|{version}" if document and document != "none" and version else None
+        self._scope_checked = time.monotonic()
+        return health
 
     def call_tool(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
         """Execute a tool with retry logic."""
@@ -37,43 +88,84 @@ class BridgeClient:
                 f"Tool '{tool}' not available in bridge. "
                 f"Available tools: {', '.join(self._tool_catalog)}"
             )
-
+        metrics.increment("bridge.calls")
+        if self.cache is not None and is_cacheable(tool):
+            return self._call_cached(tool, payload)
+        if is_read_only(tool):
+            return self._flights.do(request_key(tool, payload), lambda: self._execute(tool, payload))
+        # A write moves the document version on; look it up again before the
+        # next cached read rather than serving results from before the write.
+        self._scope = None
+        return self._execute(tool, payload)
+
+    def _call_cached(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
+        scope = self._cache_scope()
+        if scope is None:
+            return self._flights.do(request_key(tool, payload), lambda: self._execute(tool, payload))
+        cached = self.cache.get(scope, tool, payload)
+        if cached is not None:
+            return cached
+        result = self._flights.do(request_key(tool, payload), lambda: self._execute(tool, payload))
+        self.cache.put(scope, tool, payload, result)
+        return result
+
+    def _cache_scope(self) -> str | None:
+        """Open document and its version, or None when results cannot be cached."""
+        if self._scope is None or time.monotonic() - self._scope_checked > self.cache_max_staleness:
+            try:
+                self.health()
+            except BridgeError:
+                return None
+        return self._scope
+
+    def _load_catalog(self, health: dict[str, Any]) -> list[str]:
+        # The catalog only changes when the add-in is reloaded, which starts a new session.
+        scope = f"addin|{health.get('version')}|{health.get('session')}" if health.get("session") else None
+        if self.cache is not None and scope is not None:
+            cached = self.cache.get(scope, "/tools", {})
+            if cached is not None:
+                return cached
+        tools = self._get("/tools").get("tools", [])
+        if self.cache is not None and scope is not None:
+            self.cache.put(scope, "/tools", {}, tools)
+        return tools
+
+    def _execute(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
+        metrics.increment("bridge.requests")
+        with metrics.track("bridge.in_flight", "bridge.request"):
+            return self._execute_with_retries(tool, payload)
+
+    def _execute_with_retries(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
         request_id = str(uuid.uuid4())
         last_error = None
 
-        for attempt in range(3):
+        for attempt in range(self.retries):
             try:
-                response = self._post(
+                body = self._post(
                     "/execute",
                     {"tool": tool, "payload": payload, "request_id": request_id}
                 )
-
-                # Handle both lowercase (status) and Pascal case (Status) from C# server
-                status = response.get("status") or response.get("Status", "ok")
-                if status == "error":
-                    message = response.get("message") or response.get("Message", "Unknown error")
-                    stack = response.get("stack_trace") or response.get("StackTrace", "N/A")
+                response = decode_response(body, tool)
+                if response.is_error:
                     raise BridgeError(
-                        f"Bridge error: {message}\n"
-                        f"Stack: {stack}"
+                        f"Bridge error: {response.message or 'Unknown error'}\n"
+                        f"Stack: {response.stack_trace or 'N/A'}"
                     )
 
-                # Handle both lowercase and Pascal case for Result
-                result = response.get("result") or response.get("Result", {})
-
-                # Normalize element ID keys from specific types to generic element_id
-                self._normalize_element_ids(result)
-
-                return result
+                # Element IDs were already normalized while decoding.
+                return response.result if response.result is not None else {}
 
             except httpx.RequestError as e:
                 last_error = e
-                if attempt < 2:
+                if attempt < self.retries - 1:
                     delay = 2 ** attempt  # 1s, 2s
                     time.sleep(delay)
                     continue
-                raise BridgeError(
-                    f"Bridge request failed after 3 attempts: {e}"
+                # Connection failures never reached Revit, so callers may safely
+                # replay the request elsewhere, even for write tools.
+                raise BridgeUnavailable(
+                    f"Bridge request failed after {self.retries} attempts: {e}",
+                    request_sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
                 ) from e
 
         raise BridgeError(f"Bridge request failed: {last_error}") from last_error
@@ -82,32 +174,34 @@ class BridgeClient:
         """Legacy method for backward compatibility."""
         return self.call_tool(tool_name, payload)
 
-    def _get(self, path: str) -> dict[str, Any]:
+    def _get(self, path: str, timeout: float | None = None) -> dict[str, Any]:
         with httpx.Client() as client:
-            resp = client.get(f"{self.base_url}{path}", timeout=self.timeout)
+            resp = client.get(
+                f"{self.base_url}{path}",
+                headers={"Accept-Encoding": self._accept_encoding},
+                timeout=timeout or self.timeout,
+            )
             resp.raise_for_status()
-            return resp.json()
+            return codec.loads(resp.content)
+
+    def _post(self, path: str, data: dict[str, Any]) -> bytes:
+        body = codec.dumps(data)
+        headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": self._accept_encoding,
+        }
+        # Small bodies cost more CPU to compress than they save on loopback.
+        if self._request_encoding and len(body) >= self.compression_min_bytes:
+            body = compression.compress(body, self._request_encoding)
+            headers["Content-Encoding"] = self._request_encoding
 
-    def _post(self, path: str, data: dict[str, Any]) -> dict[str, Any]:
         with httpx.Client() as client:
             resp = client.post(
                 f"{self.base_url}{path}",
-                json=data,
+                content=body,
+                headers=headers,
                 timeout=self.timeout
             )
             resp.raise_for_status()
-            return resp.json()
-
-    def _normalize_element_ids(self, result: dict[str, Any]) -> None:
-        """Normalize specific element ID keys to generic element_id for consistency."""
-        # Map specific element type IDs to generic element_id
-        id_keys = [
-            'wall_id', 'floor_id', 'roof_id', 'door_id', 'window_id',
-            'column_id', 'beam_id', 'level_id', 'view_id', 'sheet_id',
-            'room_id', 'grid_id', 'family_instance_id', 'element_id'
-        ]
-
-        for key in id_keys:
-            if key in result and 'element_id' not in result:
-                result['element_id'] = result[key]
-                break
+            # httpx transparently decodes gzip (and zstd when zstandard is installed).
+            return resp.content
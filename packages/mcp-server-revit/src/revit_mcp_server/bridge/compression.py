@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import gzip
+from typing import Iterable
+
+try:  # zstd is optional; gzip ships with the stdlib and the add-in.
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# Fastest gzip level: on loopback the wire is cheap, so CPU is what we trade.
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce and decode, most preferred first."""
+    return (ZSTD, GZIP) if zstandard is not None else (GZIP,)
+
+
+def accept_encoding_header() -> str:
+    return ", ".join(supported_encodings())
+
+
+def negotiate(server_encodings: Iterable[str] | None) -> str | None:
+    """Pick the best request encoding both sides understand, if any."""
+    if not server_encodings:
+        return None
+    offered = {encoding.lower() for encoding in server_encodings}
+    for encoding in supported_encodings():
+        if encoding in offered:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == GZIP:
+        return gzip.decompress(data)
+    if encoding == ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,76 @@
+"""Process-wide counters for bridge traffic.
+
+Counters only ever grow; gauges go up and down (e.g. requests in flight);
+timings accumulate seconds and a count per name. Everything is guarded by one
+lock, which is cheap next to an HTTP round trip to Revit.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class BridgeMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._gauges: defaultdict[str, int] = defaultdict(int)
+        self._seconds: defaultdict[str, float] = defaultdict(float)
+        self._timed: defaultdict[str, int] = defaultdict(int)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> int:
+        with self._lock:
+            return self._gauges.get(name, 0)
+
+    def set_gauge(self, name: str, value: int) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    @contextmanager
+    def track(self, gauge: str, timing: str | None = None) -> Iterator[None]:
+        """Raise ``gauge`` for the duration of the block and time it under ``timing``."""
+        start = time.perf_counter()
+        with self._lock:
+            self._gauges[gauge] += 1
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._gauges[gauge] -= 1
+                if timing is not None:
+                    self._seconds[timing] += elapsed
+                    self._timed[timing] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            timings = {
+                name: {"count": self._timed[name], "seconds": round(seconds, 6)}
+                for name, seconds in sorted(self._seconds.items())
+            }
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+                "timings": timings,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._seconds.clear()
+            self._timed.clear()
+
+
+# Shared by every client, pool and cache in the process.
+metrics = BridgeMetrics()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from ..errors import BridgeError, BridgeUnavailable
+from .catalog import is_read_only
+from .client import BridgeClient
+from .singleflight import SingleFlight, request_key
+
+logger = logging.getLogger(__name__)
+
+
+def _document_key(name: str | None) -> str | None:
+    if not name or name == "none":
+        return None
+    key = name.strip().lower()
+    return key[:-4] if key.endswith(".rvt") else key
+
+
+@dataclass
+class PoolMember:
+    client: BridgeClient
+    healthy: bool = False
+    active_document: str | None = None
+    last_checked: float = 0.0
+    failures: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def url(self) -> str:
+        return self.client.base_url
+
+
+class BridgePool:
+    """Routes bridge calls across several Revit sessions.
+
+    Each member is a :class:`BridgeClient` pointing at one add-in port. A
+    background thread polls ``/health`` to learn which instances are up and
+    which document each has open. Calls naming a document go to the instance
+    that has it open; other read-only calls are spread round-robin; writes
+    without a document stick to the first healthy instance. Transport
+    failures mark the member unhealthy and fail over to the next candidate
+    whenever replaying the request is safe.
+    """
+
+    def __init__(self, clients: Sequence[BridgeClient], health_interval: float = 5.0):
+        if not clients:
+            raise ValueError("BridgePool needs at least one bridge client")
+        self.members = [PoolMember(client) for client in clients]
+        self.health_interval = health_interval
+        self._round_robin = itertools.count()
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        # Round-robin would send identical concurrent reads to different
+        # members, where the clients' own collapsing cannot see them.
+        self._flights = SingleFlight()
+
+    @classmethod
+    def from_urls(
+        cls,
+        urls: Sequence[str],
+        health_interval: float = 5.0,
+        **client_options: Any,
+    ) -> "BridgePool":
+        # One attempt per member: the pool's failover replaces the client's backoff.
+        client_options.setdefault("retries", 1)
+        return cls([BridgeClient(url, **client_options) for url in urls], health_interval)
+
+    def initialize(self) -> None:
+        """Fetch each member's tool catalog and start health monitoring."""
+        for member in self.members:
+            try:
+                member.client.initialize()
+            except BridgeError as exc:
+                logger.warning("Bridge %s unavailable at startup: %s", member.url, exc)
+                self._mark_down(member)
+        self.check_health()
+        if not any(member.healthy for member in self.members):
+            urls = ", ".join(member.url for member in self.members)
+            raise BridgeUnavailable(f"No healthy bridge instance among: {urls}")
+        self.start()
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._monitor is not None:
+                return
+            self._stop.clear()
+            self._monitor = threading.Thread(
+                target=self._monitor_loop, name="revit-bridge-health", daemon=True
+            )
+            self._monitor.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            monitor.join(timeout=self.health_interval + 1)
+
+    def check_health(self) -> None:
+        """Refresh health and active document for every member."""
+        for member in self.members:
+            try:
+                health = member.client.health(timeout=min(self.health_interval, 5.0) or None)
+            except BridgeError as exc:
+                logger.debug("Health check failed for %s: %s", member.url, exc)
+                self._mark_down(member)
+                continue
+            with member.lock:
+                member.healthy = health.get("status") == "healthy"
+                member.active_document = _document_key(health.get("active_document"))
+                member.last_checked = time.monotonic()
+                if member.healthy:
+                    member.failures = 0
+
+    def call_tool(
+        self,
+        tool: str,
+        payload: dict[str, Any],
+        document: str | None = None,
+    ) -> dict[str, Any]:
+        if self._monitor is None:
+            self.check_health()
+            self.start()
+
+        document = document or payload.get("document_id")
+        read_only = is_read_only(tool)
+        if read_only:
+            key = (document, *request_key(tool, payload))
+            return self._flights.do(key, lambda: self._route(tool, payload, document, read_only))
+        return self._route(tool, payload, document, read_only)
+
+    def _route(self, tool: str, payload: dict[str, Any], document: str | None, read_only: bool) -> dict[str, Any]:
+        last_error: BridgeError | None = None
+
+        for member in self._candidates(read_only, _document_key(document)):
+            try:
+                return member.client.call_tool(tool, payload)
+            except BridgeUnavailable as exc:
+                self._mark_down(member)
+                last_error = exc
+                if exc.request_sent and not read_only:
+                    # The instance may have applied the write before dying;
+                    # replaying it elsewhere could duplicate elements.
+                    raise
+                logger.warning("Bridge %s failed for %s, failing over: %s", member.url, tool, exc)
+
+        if last_error is not None:
+            raise BridgeUnavailable(f"All bridge instances failed for {tool}: {last_error}") from last_error
+        raise BridgeError(f"No bridge instance has document '{document}' open")
+
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        return self.call_tool(tool_name, payload)
+
+    def _candidates(self, read_only: bool, document: str | None) -> list[PoolMember]:
+        if document is not None:
+            return [
+                member
+                for member in self._by_health()
+                if member.active_document == document
+            ]
+        ordered = self._by_health()
+        if read_only:
+            healthy = [member for member in ordered if member.healthy]
+            if healthy:
+                offset = next(self._round_robin) % len(healthy)
+                rotated = healthy[offset:] + healthy[:offset]
+                return rotated + [member for member in ordered if not member.healthy]
+        return ordered
+
+    def _by_health(self) -> list[PoolMember]:
+        # Healthy members in configured order first; stale-unhealthy ones are
+        # still tried last in case they recovered since the previous probe.
+        return sorted(self.members, key=lambda member: not member.healthy)
+
+    def _mark_down(self, member: PoolMember) -> None:
+        with member.lock:
+            member.healthy = False
+            member.failures += 1
+            member.last_checked = time.monotonic()
+
+    def _monitor_loop(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            try:
+                self.check_health()
+            except Exception:  # noqa: BLE001
+                logger.exception("Bridge health monitor failed")
@@ -0,0 +1,270 @@
+"""Speculative prefetch of the queries agents usually make next.
+
+Agent sessions repeat themselves: levels are followed by views, a category
+listing by the parameters of its first elements, sheets by sheet details. A
+:class:`TransitionModel` counts which bridge tool follows which. It learns
+from the tail of the audit log at startup and from live calls after that.
+After each real call, the :class:`Prefetcher` queues the likely follow-ups. A
+background thread issues them only while the bridge is idle, one at a time,
+so their results land in the query cache before the agent asks.
+
+Only cacheable read-only tools are ever prefetched. Without a query cache
+the results would have nowhere to go, so the server only enables prefetch
+alongside it.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+from .. import codec
+from ..errors import BridgeError
+from .catalog import is_cacheable
+from .metrics import BridgeMetrics, metrics as default_metrics
+from .singleflight import request_key
+
+logger = logging.getLogger(__name__)
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+# A follow-up is prefetched once it has been seen this often after a tool
+# and makes up at least this share of what came next.
+MIN_OBSERVATIONS = 3
+MIN_PROBABILITY = 0.25
+# Calls further apart than this belong to different tasks, not one sequence.
+SESSION_GAP = 300.0
+# Only the end of the audit log is read at startup.
+AUDIT_TAIL_BYTES = 8 * 1024 * 1024
+# Records of a listing whose IDs are used for per-element follow-ups.
+FAN_OUT = 5
+# The bridge must have been idle this long before a speculative call.
+IDLE_SECONDS = 0.25
+# Queued guesses older than this are dropped; the agent has moved on.
+JOB_TTL = 30.0
+QUEUE_LIMIT = 32
+# Prefetched keys remembered for hit accounting.
+WARMED_LIMIT = 1024
+
+# Follow-ups that take one record of the preceding listing, and the argument
+# its ID goes in. Other follow-ups replay the last payload seen for the tool.
+FOLLOW_UP_ARGUMENTS = {
+    "revit.get_element_parameters": "element_id",
+    "revit.get_element_bounding_box": "element_id",
+    "revit.get_sheet_info": "sheet_id",
+}
+_VOLATILE_KEYS = ("request_id",)
+
+
+def _clean(payload: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in payload.items() if key not in _VOLATILE_KEYS}
+
+
+def _identifying(payload: dict[str, Any]) -> bool:
+    # Replaying someone else's element ID is a guess, not a prediction.
+    return any(key.endswith(("_id", "_ids")) for key in payload)
+
+
+class TransitionModel:
+    """Counts of which bridge tool followed which, within one working session."""
+
+    def __init__(self, session_gap: float = SESSION_GAP) -> None:
+        self.session_gap = session_gap
+        self.counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.payloads: dict[str, dict[str, Any]] = {}
+        self._last: tuple[str, float] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_audit_log(cls, path: Path, tail_bytes: int = AUDIT_TAIL_BYTES) -> "TransitionModel":
+        """Learn from the last ``tail_bytes`` of a JSON-lines audit log, if present."""
+        model = cls()
+        try:
+            with open(path, "rb") as handle:
+                size = handle.seek(0, os.SEEK_END)
+                handle.seek(max(0, size - tail_bytes))
+                if size > tail_bytes:
+                    handle.readline()  # partial line
+                lines = handle.read().splitlines()
+        except OSError:
+            return model
+        for line in lines:
+            try:
+                entry = codec.loads(line)
+                at = datetime.fromisoformat(entry["timestamp"]).timestamp()
+                model.observe(entry["tool"], entry.get("payload") or {}, at)
+            except (ValueError, KeyError, TypeError):
+                continue
+        logger.info("Prefetch model learned %d transitions from %s", model.transitions(), path)
+        return model
+
+    def observe(self, tool: str, payload: dict[str, Any], at: float | None = None) -> None:
+        at = time.time() if at is None else at
+        with self._lock:
+            if self._last is not None and 0 <= at - self._last[1] <= self.session_gap:
+                self.counts[self._last[0]][tool] += 1
+            self._last = (tool, at)
+            self.payloads[tool] = _clean(payload)
+
+    def predict(
+        self,
+        tool: str,
+        min_probability: float = MIN_PROBABILITY,
+        min_observations: int = MIN_OBSERVATIONS,
+    ) -> list[tuple[str, float]]:
+        """Likely next tools after ``tool``, most likely first."""
+        with self._lock:
+            following = self.counts.get(tool)
+            if not following:
+                return []
+            total = sum(following.values())
+            return [
+                (name, count / total)
+                for name, count in following.most_common()
+                if count >= min_observations and count / total >= min_probability
+            ]
+
+    def transitions(self) -> int:
+        with self._lock:
+            return sum(sum(following.values()) for following in self.counts.values())
+
+
+def _record_ids(result: Any, limit: int) -> list[Any]:
+    """IDs of the first records in the first listing field of ``result``."""
+    if not isinstance(result, dict):
+        return []
+    for value in result.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict) and "id" in value[0]:
+            return [record["id"] for record in value[:limit] if isinstance(record, dict) and "id" in record]
+    return []
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        call: ToolCall,
+        model: TransitionModel | None = None,
+        metrics: BridgeMetrics | None = None,
+        fan_out: int = FAN_OUT,
+        idle_seconds: float = IDLE_SECONDS,
+    ) -> None:
+        self.call = call
+        self.model = model or TransitionModel()
+        self.metrics = metrics or default_metrics
+        self.fan_out = fan_out
+        self.idle_seconds = idle_seconds
+        self._jobs: deque[tuple[float, str, dict[str, Any]]] = deque(maxlen=QUEUE_LIMIT)
+        self._warmed: OrderedDict[Hashable, None] = OrderedDict()
+        self._wake = threading.Condition()
+        self._last_activity = 0.0
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="revit-bridge-prefetch", daemon=True)
+        self._worker.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join(timeout=5)
+
+    def observe(self, tool: str, payload: dict[str, Any]) -> None:
+        """Record a real call before it is made; counts it as a hit if it was prefetched."""
+        self._last_activity = time.monotonic()
+        key = request_key(tool, _clean(payload))
+        with self._wake:
+            hit = key in self._warmed
+            if hit:
+                del self._warmed[key]
+        if hit:
+            self.metrics.increment("prefetch.hits")
+        self.model.observe(tool, payload)
+
+    def after(self, tool: str, payload: dict[str, Any], result: Any) -> None:
+        """Queue the likely follow-ups of a real call that just returned ``result``."""
+        self._last_activity = time.monotonic()
+        deadline = time.monotonic() + JOB_TTL
+        jobs = [
+            (deadline, follow_up, follow_payload)
+            for follow_up, _ in self.model.predict(tool)
+            if is_cacheable(follow_up)
+            for follow_payload in self._payloads(follow_up, result)
+        ]
+        if not jobs:
+            return
+        with self._wake:
+            # Newer guesses first: they follow what the agent is doing now.
+            self._jobs.extendleft(reversed(jobs))
+            self._wake.notify()
+
+    def stats(self) -> dict[str, Any]:
+        issued = self.metrics.count("prefetch.requests")
+        hits = self.metrics.count("prefetch.hits")
+        return {
+            "issued": issued,
+            "hits": hits,
+            "hit_rate": round(hits / issued, 4) if issued else None,
+            "queued": len(self._jobs),
+            "transitions": self.model.transitions(),
+        }
+
+    def _payloads(self, tool: str, result: Any) -> list[dict[str, Any]]:
+        argument = FOLLOW_UP_ARGUMENTS.get(tool)
+        if argument is not None:
+            return [{argument: record_id} for record_id in _record_ids(result, self.fan_out)]
+        payload = self.model.payloads.get(tool, {})
+        return [] if _identifying(payload) else [payload]
+
+    def _run(self) -> None:
+        _lower_priority()
+        while not self._stop.is_set():
+            with self._wake:
+                while not self._jobs and not self._stop.is_set():
+                    self._wake.wait()
+                if self._stop.is_set():
+                    return
+                deadline, tool, payload = self._jobs.popleft()
+            if time.monotonic() > deadline:
+                self.metrics.increment("prefetch.expired")
+                continue
+            self._wait_idle()
+            try:
+                self.call(tool, payload)
+            except BridgeError as exc:
+                self.metrics.increment("prefetch.errors")
+                logger.debug("Prefetch of %s failed: %s", tool, exc)
+                continue
+            self.metrics.increment("prefetch.requests")
+            with self._wake:
+                self._warmed[request_key(tool, payload)] = None
+                while len(self._warmed) > WARMED_LIMIT:
+                    self._warmed.popitem(last=False)
+
+    def _wait_idle(self) -> None:
+        # Real calls always go first: wait until none is in flight and none
+        # has started for a moment, so a burst is not interleaved with guesses.
+        while not self._stop.is_set():
+            quiet = time.monotonic() - self._last_activity
+            if self.metrics.gauge("bridge.in_flight") == 0 and quiet >= self.idle_seconds:
+                return
+            self._stop.wait(self.idle_seconds / 4)
+
+
+def _lower_priority() -> None:
+    # On Linux, niceness is per thread; elsewhere this is best effort.
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+
+from .. import codec
+from .catalog import IdPlan, element_id_plan, lazy_fields
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+class LazyJSON:
+    """A JSON value held as raw bytes and decoded on first access.
+
+    Re-encoding through :mod:`revit_mcp_server.codec` splices the original
+    bytes back in, so a geometry array that is only forwarded is never parsed.
+    """
+
+    __slots__ = ("_raw", "_value", "_decoded")
+
+    def __init__(self, raw: bytes | memoryview) -> None:
+        self._raw = raw
+        self._value: Any = None
+        self._decoded = False
+
+    @property
+    def value(self) -> Any:
+        if not self._decoded:
+            self._value = codec.loads(memoryview(self._raw))
+            self._decoded = True
+        return self._value
+
+    @property
+    def decoded(self) -> bool:
+        return self._decoded
+
+    def __raw_json__(self) -> bytes:
+        # Once decoded the value may have been modified, so re-encode it.
+        return codec.dumps(self._value) if self._decoded else bytes(self._raw)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyJSON):
+            other = other.value
+        return self.value == other
+
+    def __repr__(self) -> str:
+        state = repr(self._value) if self._decoded else f"<{len(self._raw)} raw bytes>"
+        return f"LazyJSON({state})"
+
+
+class BridgeResponse(BaseModel):
+    """Envelope returned by ``POST /execute``.
+
+    The add-in serializes ``CommandResponse`` in PascalCase while older builds
+    and hand-written handlers use snake_case; both spellings are accepted.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    status: str = Field("ok", validation_alias=AliasChoices("status", "Status"))
+    tool: str | None = Field(None, validation_alias=AliasChoices("tool", "Tool"))
+    result: Any = Field(None, validation_alias=AliasChoices("result", "Result"))
+    message: str | None = Field(None, validation_alias=AliasChoices("message", "Message"))
+    stack_trace: str | None = Field(
+        None, validation_alias=AliasChoices("stack_trace", "StackTrace")
+    )
+
+    @property
+    def is_error(self) -> bool:
+        return self.status == "error"
+
+
+if msgspec is not None:
+
+    class _Envelope(msgspec.Struct):
+        status: str | None = None
+        Status: str | None = None
+        tool: str | None = None
+        Tool: str | None = None
+        message: str | None = None
+        Message: str | None = None
+        stack_trace: str | None = None
+        StackTrace: str | None = None
+        result: msgspec.Raw = msgspec.Raw()
+        Result: msgspec.Raw = msgspec.Raw()
+
+    _ENVELOPE_DECODER = msgspec.json.Decoder(_Envelope)
+    _FIELDS_DECODER = msgspec.json.Decoder(dict[str, msgspec.Raw])
+    _VALUE_DECODER = msgspec.json.Decoder()
+
+
+def _decode_with_lazy_fields(body: bytes, lazy: frozenset[str]) -> BridgeResponse:
+    envelope = _ENVELOPE_DECODER.decode(body)
+    raw = envelope.result if len(envelope.result) else envelope.Result
+    result: Any = None
+    if len(raw):
+        if bytes(memoryview(raw)[:1]) == b"{":
+            result = {
+                key: LazyJSON(value) if key in lazy else _VALUE_DECODER.decode(value)
+                for key, value in _FIELDS_DECODER.decode(raw).items()
+            }
+        else:
+            result = _VALUE_DECODER.decode(raw)
+    # Field types were already enforced by the msgspec struct.
+    return BridgeResponse.model_construct(
+        status=envelope.status or envelope.Status or "ok",
+        tool=envelope.tool or envelope.Tool,
+        result=result,
+        message=envelope.message or envelope.Message,
+        stack_trace=envelope.stack_trace or envelope.StackTrace,
+    )
+
+
+def _alias_element_id(record: dict[str, Any], keys: tuple[str, ...]) -> None:
+    if "element_id" in record:
+        return
+    for key in keys:
+        if key in record:
+            record["element_id"] = record[key]
+            return
+
+
+def normalize_element_ids(node: Any, plan: IdPlan) -> None:
+    """Add a generic ``element_id`` to every record ``plan`` points at.
+
+    Only the fields named by the plan are visited. Lists of records at the end
+    of a path are handled in a flat loop rather than one call per record.
+    """
+    keys, children = plan
+    if isinstance(node, list):
+        if children:
+            for item in node:
+                normalize_element_ids(item, plan)
+        elif keys:
+            for item in node:
+                if type(item) is dict and "element_id" not in item:
+                    for key in keys:
+                        if key in item:
+                            item["element_id"] = item[key]
+                            break
+        return
+    if type(node) is not dict:
+        return
+    if keys:
+        _alias_element_id(node, keys)
+    for field, child in children.items():
+        value = node.get(field)
+        if value is not None:
+            normalize_element_ids(value, child)
+
+
+def decode_response(body: bytes, tool: str = "") -> BridgeResponse:
+    """Decode, validate and normalize an ``/execute`` body.
+
+    Tools with large coordinate payloads keep those fields as :class:`LazyJSON`
+    when ``msgspec`` is installed; everything else is decoded eagerly. Element
+    records located by the tool's ID plan gain an ``element_id`` alias.
+    """
+    lazy = lazy_fields(tool)
+    if lazy and msgspec is not None:
+        response = _decode_with_lazy_fields(body, lazy)
+    else:
+        # The codec's native parser beats pydantic's JSON mode on large ``Any``
+        # payloads; validating the decoded envelope does not walk ``result``.
+        response = BridgeResponse.model_validate(codec.loads(body))
+    if not response.is_error:
+        normalize_element_ids(response.result, element_id_plan(tool))
+    return response
@@ -0,0 +1,113 @@
+"""Write batches: many bridge writes, one Revit transaction.
+
+Each write command normally commits a Transaction of its own, so Revit
+regenerates the model and adds an undo step per call. A :class:`WriteBatch`
+buffers write calls instead and sends them as one ``revit.execute_batch``
+request. The add-in runs them as sub-transactions of a single Transaction,
+so the batch commits and regenerates once and undoes as one step.
+
+Reads are never buffered. They go to the bridge at once and see the model
+as it was before the batch. Buffered writes only return their position in
+the batch, so a write that needs the ID of an element created earlier in
+the same batch has to wait for the commit.
+"""
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+from ..errors import BatchError
+from .catalog import BATCH_TOOL, is_batchable, is_read_only
+
+# Upper bound on buffered commands. The add-in runs a batch as one queued
+# request, which must finish within its 30 s command timeout.
+MAX_COMMANDS = 500
+
+
+class ToolBridge(Protocol):
+    def call_tool(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
+        ...
+
+
+class WriteBatch:
+    """Buffered bridge writes, sent and committed together.
+
+    Used as a context manager, the batch commits on a clean exit and is
+    discarded if the block raises::
+
+        with WriteBatch(bridge, "Grid walls") as batch:
+            for start, end in segments:
+                batch.add("revit.create_wall", {...})
+        print(batch.result["results"])
+    """
+
+    def __init__(
+        self,
+        bridge: ToolBridge,
+        name: str = "MCP Batch",
+        atomic: bool = True,
+        max_commands: int = MAX_COMMANDS,
+    ) -> None:
+        self.bridge = bridge
+        self.name = name
+        # Atomic batches roll back entirely when any command fails; others
+        # keep the commands that succeeded.
+        self.atomic = atomic
+        self.max_commands = max_commands
+        self.commands: list[dict[str, Any]] = []
+        self.result: dict[str, Any] | None = None
+        self.committing = False
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __enter__(self) -> "WriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def add(self, tool: str, payload: dict[str, Any]) -> int:
+        """Buffer a write and return its index in the batch results."""
+        if is_read_only(tool):
+            raise BatchError(f"{tool} only reads the model; call it directly instead of batching it")
+        if not is_batchable(tool):
+            raise BatchError(f"{tool} cannot run inside a batch")
+        if self.committing:
+            # The index would point into the commit already on its way, not
+            # into the results the caller will see next.
+            raise BatchError(f"Batch '{self.name}' is committing; add the write once the commit returns")
+        if len(self.commands) >= self.max_commands:
+            raise BatchError(f"Batch '{self.name}' is full ({self.max_commands} commands); commit it first")
+        self.commands.append({"tool": tool, "payload": payload})
+        return len(self.commands) - 1
+
+    def payload(self) -> dict[str, Any]:
+        return {"name": self.name, "atomic": self.atomic, "commands": list(self.commands)}
+
+    def commit(self) -> dict[str, Any]:
+        """Send the buffered writes as one batch and return the add-in's report.
+
+        The report lists every command's result by index and whether the
+        batch was committed. An empty batch commits without a round trip.
+        If the bridge call raises, the writes stay buffered for another try.
+        :meth:`add` is refused until the call returns.
+        """
+        if not self.commands:
+            self.result = {"committed": True, "name": self.name, "executed": 0, "failed": 0, "results": []}
+            return self.result
+        self.committing = True
+        try:
+            self.result = self.bridge.call_tool(BATCH_TOOL, self.payload())
+        finally:
+            self.committing = False
+        self.commands = []
+        return self.result
+
+    def discard(self) -> int:
+        """Drop the buffered writes without sending them; returns how many there were."""
+        dropped = len(self.commands)
+        self.commands = []
+        return dropped
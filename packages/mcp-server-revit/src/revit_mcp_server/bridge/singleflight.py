@@ -0,0 +1,69 @@
+"""Collapse identical concurrent bridge calls into one request.
+
+While a read-only call is in flight, an identical call (same tool, same
+payload) waits for it instead of sending its own request, and both get the
+same result or the same exception. Nothing is kept once the call finishes:
+this covers the burst of identical cold reads that a cache cannot, because
+none of them has a result to cache yet.
+
+Waiters share the leader's result object; callers must treat results as
+read-only.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable, Hashable
+
+from .metrics import BridgeMetrics, metrics as default_metrics
+
+
+def request_key(tool: str, payload: dict[str, Any]) -> tuple[str, str]:
+    """Identity of a call: the tool and its payload with keys sorted."""
+    return tool, json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, metrics: BridgeMetrics | None = None) -> None:
+        self.metrics = metrics or default_metrics
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` unless a call with ``key`` is already running; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            self.metrics.increment("bridge.singleflight.collapsed")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            # Later callers start a fresh request rather than reusing this one.
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,133 @@
+"""JSON codec shared by the bridge client, both servers and the audit log.
+
+``orjson`` is used when installed, then ``msgspec``, then the stdlib. Every
+backend encodes straight to UTF-8 ``bytes`` so bodies go onto the wire or into
+files without an intermediate ``str``. ``MCP_REVIT_JSON_BACKEND`` pins a
+backend, which is mainly useful for benchmarks and bug reports.
+"""
+from __future__ import annotations
+
+import json
+import os
+from enum import Enum
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+Decodable = bytes | bytearray | memoryview | str
+_Backend = tuple[Callable[[Any], bytes], Callable[[Any], str], Callable[[Decodable], Any]]
+
+
+def _raw_json(obj: Any) -> bytes | None:
+    """Pre-encoded JSON carried by lazily decoded values, if any."""
+    hook = getattr(type(obj), "__raw_json__", None)
+    return hook(obj) if hook is not None else None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for values no backend serializes natively."""
+    if isinstance(obj, os.PathLike):
+        return os.fspath(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "tolist"):  # NumPy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _backend_stdlib() -> _Backend:
+    def stdlib_default(obj: Any) -> Any:
+        raw = _raw_json(obj)
+        return json.loads(raw) if raw is not None else _default(obj)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=stdlib_default).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=stdlib_default)
+
+    def loads(data: Decodable) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    return dumps, dumps_pretty, loads
+
+
+def _backend_orjson() -> _Backend:
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    fragment = getattr(orjson, "Fragment", orjson.loads)  # Fragment needs orjson>=3.9
+
+    def orjson_default(obj: Any) -> Any:
+        raw = _raw_json(obj)
+        return fragment(raw) if raw is not None else _default(obj)
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=orjson_default, option=options)
+
+    def dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, default=orjson_default, option=options | orjson.OPT_INDENT_2).decode("utf-8")
+
+    return dumps, dumps_pretty, orjson.loads
+
+
+def _backend_msgspec() -> _Backend:
+    def msgspec_default(obj: Any) -> Any:
+        raw = _raw_json(obj)
+        return msgspec.Raw(raw) if raw is not None else _default(obj)
+
+    encoder = msgspec.json.Encoder(enc_hook=msgspec_default)
+    decoder = msgspec.json.Decoder()
+
+    def dumps_pretty(obj: Any) -> str:
+        return msgspec.json.format(encoder.encode(obj), indent=2).decode("utf-8")
+
+    return encoder.encode, dumps_pretty, decoder.decode
+
+
+_BACKENDS = {
+    "orjson": (lambda: orjson is not None, _backend_orjson),
+    "msgspec": (lambda: msgspec is not None, _backend_msgspec),
+    "json": (lambda: True, _backend_stdlib),
+}
+
+BACKEND = "json"
+dumps: Callable[[Any], bytes]
+dumps_pretty: Callable[[Any], str]
+loads: Callable[[Decodable], Any]
+
+
+def available_backends() -> list[str]:
+    return [name for name, (available, _) in _BACKENDS.items() if available()]
+
+
+def use_backend(name: str | None = None) -> str:
+    """Switch the active backend; ``None`` picks the fastest one installed."""
+    global BACKEND, dumps, dumps_pretty, loads
+    if name is None:
+        name = available_backends()[0]
+    available, build = _BACKENDS.get(name, (lambda: False, None))
+    if not available():
+        raise ValueError(f"JSON backend '{name}' is not installed; choose from {available_backends()}")
+    dumps, dumps_pretty, loads = build()
+    BACKEND = name
+    return name
+
+
+def dumps_str(obj: Any) -> str:
+    """Compact encoding for text streams."""
+    return dumps(obj).decode("utf-8")
+
+
+use_backend(os.environ.get("MCP_REVIT_JSON_BACKEND") or None)
@@ -11,6 +11,9 @@ from pydantic import DirectoryPath, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic_settings.sources.providers import env as env_source
 
+from .errors import SchemaValidationError
+from .units import PROJECT, unit_factor
+
 # Load .env file - search in multiple locations
 # 1. Repository root (when running from source)
 # 2. Current working directory
@@ -50,6 +53,14 @@ class Config(BaseSettings):
     workspace_dir: Path = Field(...)
     allowed_directories: List[DirectoryPath] = Field(...)
     bridge_url: str | None = Field(default=None)
+    bridge_urls: List[str] = Field(default_factory=list)
+    bridge_health_interval: float = Field(5.0)
+    bridge_compression_min_bytes: int | None = Field(default=None)
+    replica_max_age: float = Field(30.0)
+    query_cache: bool = Field(False)
+    query_cache_max_bytes: int = Field(64 * 1024 * 1024)
+    prefetch: bool = Field(False)
+    input_units: str = Field("ft")
     mode: BridgeMode = Field(default=BridgeMode.mock)
     audit_log: Path = Field(default_factory=lambda: Path("audit.log"))
     log_level: str = Field("INFO")
@@ -66,6 +77,22 @@ class Config(BaseSettings):
             return [Path(p.strip()) for p in value.split(";") if p.strip()]
         return value
 
+    @field_validator("bridge_urls", mode="before")
+    def split_bridge_urls(cls, value):
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(";") if url.strip()]
+        return value
+
+    @field_validator("input_units")
+    def check_input_units(cls, value):
+        value = value.strip().lower()
+        if value != PROJECT:
+            try:
+                unit_factor(value, "length")
+            except SchemaValidationError as exc:
+                raise ValueError(str(exc)) from None
+        return value
+
     @classmethod
     def settings_customise_sources(
         cls,
@@ -91,5 +118,12 @@ class Config(BaseSettings):
         path = path.resolve()
         return any(path.is_relative_to(allowed.resolve()) for allowed in self.allowed_directories)
 
+    def resolved_bridge_urls(self) -> List[str]:
+        """Return every configured bridge URL, with ``bridge_url`` first when set."""
+        urls = [url.rstrip("/") for url in self.bridge_urls]
+        if self.bridge_url and self.bridge_url.rstrip("/") not in urls:
+            urls.insert(0, self.bridge_url.rstrip("/"))
+        return urls
+
 
 config = Config()
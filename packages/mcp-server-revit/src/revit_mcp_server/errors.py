@@ -12,3 +12,19 @@ class SchemaValidationError(RevitMCPError):
 
 class BridgeError(RevitMCPError):
     """Signals communication or response issues with the bridge."""
+
+
+class BridgeUnavailable(BridgeError):
+    """Raised when the bridge could not be reached at the transport level."""
+
+    def __init__(self, message: str, *, request_sent: bool = False) -> None:
+        super().__init__(message)
+        self.request_sent = request_sent
+
+
+class ReplicaError(RevitMCPError):
+    """Raised when the local model replica cannot answer a query."""
+
+
+class BatchError(RevitMCPError):
+    """Raised when a write cannot join a batch or the batch cannot be committed."""
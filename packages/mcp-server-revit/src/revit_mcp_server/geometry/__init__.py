@@ -0,0 +1,4 @@
+from .mesh import ElementMesh
+from .rooms import RoomBoundaryCache, RoomSet, completeness_report
+
+__all__ = ["ElementMesh", "RoomBoundaryCache", "RoomSet", "completeness_report"]
@@ -0,0 +1,134 @@
+"""Indexed triangle meshes of element geometry, kept as flat binary buffers.
+
+``revit.get_element_mesh`` triangulates an element's solids and welds
+vertices shared by faces and elements. It returns a float32 vertex buffer
+(x, y, z in feet) and a uint32 index buffer (three per triangle), each as
+base64. A :class:`ElementMesh` wraps the decoded bytes with ``np.frombuffer``,
+so ``vertices`` and ``triangles`` are zero-copy NumPy views.
+
+Meshes can be written to a file laid out for the same zero-copy read, with
+all integers little-endian::
+
+    header | element table | vertices (f4 x 3) | triangles (u4 x 3)
+
+The element table gives each element's first triangle and triangle count.
+:meth:`ElementMesh.read` maps the file and views it in place.
+"""
+from __future__ import annotations
+
+import base64
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+
+MAGIC = b"RMCPMESH"
+FORMAT_VERSION = 1
+# magic, version, vertex count, triangle count, element count, reserved
+_HEADER = struct.Struct("<8sIIIII")
+
+ELEMENT_DTYPE = np.dtype([("element_id", "<i8"), ("first_triangle", "<u4"), ("triangle_count", "<u4")])
+VERTEX_DTYPE = np.dtype("<f4")
+INDEX_DTYPE = np.dtype("<u4")
+
+
+@dataclass
+class ElementMesh:
+    """Welded triangles of one or more elements.
+
+    ``vertices`` is ``(n, 3)`` float32 and ``triangles`` is ``(m, 3)``
+    uint32. Both may be read-only views of a response buffer or a mapped
+    file.
+    """
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+    elements: np.ndarray
+
+    @classmethod
+    def from_result(cls, result: Mapping[str, Any]) -> "ElementMesh":
+        """Decode the base64 buffers of a ``revit.get_element_mesh`` result."""
+        vertices = base64.b64decode(result.get("vertices") or "")
+        indices = base64.b64decode(result.get("indices") or "")
+        elements = np.array(
+            [(item["element_id"], item["first_triangle"], item["triangle_count"]) for item in result.get("elements") or []],
+            dtype=ELEMENT_DTYPE,
+        )
+        mesh = cls(
+            vertices=np.frombuffer(memoryview(vertices), VERTEX_DTYPE).reshape(-1, 3),
+            triangles=np.frombuffer(memoryview(indices), INDEX_DTYPE).reshape(-1, 3),
+            elements=elements,
+        )
+        if len(mesh.vertices) != result.get("vertex_count", len(mesh.vertices)) or len(mesh.triangles) != result.get(
+            "triangle_count", len(mesh.triangles)
+        ):
+            raise ValueError("Mesh buffers do not match the reported vertex and triangle counts")
+        return mesh
+
+    @classmethod
+    def read(cls, path: Path) -> "ElementMesh":
+        """Map a mesh file; the arrays view the mapping without copying."""
+        with open(path, "rb") as handle:
+            try:
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise ValueError(f"{path} is not a mesh file") from exc
+        magic, version, vertex_count, triangle_count, element_count, _ = _HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a mesh file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} uses mesh format {version}; fetch it again")
+        offset = _HEADER.size
+        elements = np.frombuffer(mapping, ELEMENT_DTYPE, element_count, offset)
+        offset += elements.nbytes
+        vertices = np.frombuffer(mapping, VERTEX_DTYPE, vertex_count * 3, offset).reshape(-1, 3)
+        offset += vertices.nbytes
+        triangles = np.frombuffer(mapping, INDEX_DTYPE, triangle_count * 3, offset).reshape(-1, 3)
+        return cls(vertices=vertices, triangles=triangles, elements=elements)
+
+    def write(self, path: Path) -> int:
+        """Write the mesh file; returns its size in bytes."""
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(self.vertices), len(self.triangles), len(self.elements), 0)
+        with open(path, "wb") as handle:
+            handle.write(header)
+            for array, dtype in ((self.elements, ELEMENT_DTYPE), (self.vertices, VERTEX_DTYPE), (self.triangles, INDEX_DTYPE)):
+                handle.write(np.ascontiguousarray(array, dtype=dtype).data)
+        return _HEADER.size + self.elements.nbytes + self.vertices.nbytes + self.triangles.nbytes
+
+    def element(self, element_id: int) -> "ElementMesh":
+        """The triangles of one element; vertices stay shared with this mesh."""
+        match = np.flatnonzero(self.elements["element_id"] == element_id)
+        if not len(match):
+            raise KeyError(element_id)
+        row = self.elements[match[0]]
+        first = int(row["first_triangle"])
+        return ElementMesh(
+            vertices=self.vertices,
+            triangles=self.triangles[first : first + int(row["triangle_count"])],
+            elements=self.elements[match[:1]],
+        )
+
+    def bounds(self) -> dict[str, list[float]] | None:
+        if not len(self.vertices):
+            return None
+        return {"min": self.vertices.min(axis=0).tolist(), "max": self.vertices.max(axis=0).tolist()}
+
+    def area(self) -> float:
+        """Total triangle area in square feet."""
+        if not len(self.triangles):
+            return 0.0
+        a, b, c = (self.vertices[self.triangles[:, corner]].astype(np.float64) for corner in range(3))
+        return float(np.linalg.norm(np.cross(b - a, c - a), axis=1).sum() / 2)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "elements": len(self.elements),
+            "vertices": len(self.vertices),
+            "triangles": len(self.triangles),
+            "bytes": self.vertices.nbytes + self.triangles.nbytes,
+            "surface_area": round(self.area(), 6),
+            "bounds": self.bounds(),
+        }
@@ -0,0 +1,394 @@
+"""Room boundary polygons, measured and queried locally with NumPy.
+
+``revit.get_room_boundaries`` returns every room of the document in one
+call. Each room comes with its boundary loops as flat ``[x0, y0, x1, y1,
+...]`` rings in feet, with curves tessellated. :class:`RoomSet` packs all
+loops into one vertex array. Edge ``k`` runs from vertex ``k`` to the next
+vertex of its loop. Every measure is then a reduction over that array:
+
+* area, perimeter and centroid per room (shoelace sums over loops, holes
+  subtracted);
+* which room contains each of many points (crossing-number test against all
+  edges at once);
+* which rooms are adjacent: antiparallel edges on the same level, facing each
+  other across at most a wall's thickness, whose extents overlap.
+
+:class:`RoomBoundaryCache` keeps the last pull per document, so room
+questions after the first are answered without a bridge round trip.
+:func:`completeness_report` is the room audit built on top.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Sequence
+
+import numpy as np
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+# Edges whose directions differ by less than this (radians) are parallel.
+ANGLE_TOLERANCE = 1e-3
+# Facing edges further apart than this (feet) are not one shared wall. Finish
+# boundaries of adjacent rooms are a wall's thickness apart.
+ADJACENCY_GAP = 1.5
+# Rooms must share at least this length of wall (feet) to be adjacent.
+MIN_SHARED_LENGTH = 0.5
+# Boundaries are pulled at wall finish faces, as Revit measures room areas.
+BOUNDARY_LOCATION = "finish"
+# Point-edge pairs tested per sweep in :meth:`RoomSet.contains`, bounding memory.
+_LOCATE_CELLS = 4_000_000
+
+
+@dataclass
+class RoomSet:
+    """Rooms of one document and their boundary loops, as flat arrays.
+
+    Rooms are indexed ``0..n-1`` in pull order. ``vertices`` is ``(v, 2)``;
+    loop ``i`` owns ``vertices[loop_offsets[i]:loop_offsets[i + 1]]`` and
+    belongs to room ``loop_room[i]``, loops of a room being contiguous.
+    Outer loops are counter-clockwise and holes clockwise, so a room's
+    interior is always left of its edges.
+    """
+
+    ids: np.ndarray
+    numbers: list[str]
+    names: list[str]
+    levels: list[str]
+    placed: np.ndarray
+    revit_areas: np.ndarray
+    vertices: np.ndarray
+    loop_offsets: np.ndarray
+    loop_room: np.ndarray
+    # Element bounding each edge, or -1 for room separation lines and unknowns.
+    edge_elements: np.ndarray
+    document: str | None = None
+
+    @classmethod
+    def from_result(cls, result: Mapping[str, Any]) -> "RoomSet":
+        """Pack a ``revit.get_room_boundaries`` result."""
+        rooms = result.get("rooms") or []
+        rings: list[np.ndarray] = []
+        bounding: list[np.ndarray] = []
+        loop_room: list[int] = []
+        for index, room in enumerate(rooms):
+            for ring, elements in zip(room.get("loops") or [], room.get("elements") or [[]] * len(room.get("loops") or [])):
+                points = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+                if len(points) < 3:
+                    continue
+                rings.append(points)
+                edge_ids = np.full(len(points), -1, dtype=np.int64)
+                edge_ids[: len(elements)] = elements[: len(points)]
+                bounding.append(edge_ids)
+                loop_room.append(index)
+        sizes = np.fromiter(map(len, rings), dtype=np.int64, count=len(rings))
+        rooms_set = cls(
+            ids=np.fromiter((room["id"] for room in rooms), dtype=np.int64, count=len(rooms)),
+            numbers=[room.get("number") or "" for room in rooms],
+            names=[room.get("name") or "" for room in rooms],
+            levels=[room.get("level") or "" for room in rooms],
+            placed=np.fromiter((bool(room.get("placed", True)) for room in rooms), dtype=bool, count=len(rooms)),
+            revit_areas=np.fromiter((float(room.get("area") or 0.0) for room in rooms), dtype=np.float64, count=len(rooms)),
+            vertices=np.concatenate(rings) if rings else np.empty((0, 2)),
+            loop_offsets=np.concatenate([[0], np.cumsum(sizes)]),
+            loop_room=np.asarray(loop_room, dtype=np.int64),
+            edge_elements=np.concatenate(bounding) if bounding else np.empty(0, dtype=np.int64),
+            document=result.get("document"),
+        )
+        rooms_set._orient()
+        return rooms_set
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -- edges and loops ---------------------------------------------------
+
+    @property
+    def edge_loop(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.loop_room)), np.diff(self.loop_offsets))
+
+    @property
+    def edge_room(self) -> np.ndarray:
+        return self.loop_room[self.edge_loop] if len(self.loop_room) else np.empty(0, dtype=np.int64)
+
+    def _next(self) -> np.ndarray:
+        """Index of each edge's end vertex: the next one, wrapping per loop."""
+        following = np.arange(1, len(self.vertices) + 1)
+        if len(self.loop_room):
+            following[self.loop_offsets[1:] - 1] = self.loop_offsets[:-1]
+        return following
+
+    def edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """Start and end points of every edge, each ``(v, 2)``."""
+        return self.vertices, self.vertices[self._next()]
+
+    def _loop_sums(self, values: np.ndarray) -> np.ndarray:
+        if not len(self.loop_room):
+            return np.zeros(0)
+        return np.add.reduceat(values, self.loop_offsets[:-1])
+
+    def _room_sums(self, values: np.ndarray, per: np.ndarray) -> np.ndarray:
+        return np.bincount(per, weights=values, minlength=len(self))
+
+    def _cross(self) -> np.ndarray:
+        start, end = self.edges()
+        return start[:, 0] * end[:, 1] - end[:, 0] * start[:, 1]
+
+    def loop_areas(self) -> np.ndarray:
+        """Signed loop areas: positive for outer loops, negative for holes."""
+        return self._loop_sums(self._cross()) / 2
+
+    def _orient(self) -> None:
+        """Make each room's largest loop counter-clockwise and the rest clockwise."""
+        if not len(self.loop_room):
+            return
+        signed = self.loop_areas()
+        outer = np.zeros(len(signed), dtype=bool)
+        # Loops of a room are contiguous, so the outer one is its largest by |area|.
+        order = np.lexsort((-np.abs(signed), self.loop_room))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = self.loop_room[order][1:] != self.loop_room[order][:-1]
+        outer[order[first]] = True
+        flip = np.flatnonzero((signed < 0) == outer)
+        for loop in flip.tolist():
+            start, stop = self.loop_offsets[loop], self.loop_offsets[loop + 1]
+            self.vertices[start:stop] = self.vertices[start:stop][::-1]
+            # Reversed, edge k runs backwards along what was edge k - 1.
+            self.edge_elements[start:stop] = np.roll(self.edge_elements[start:stop][::-1], -1)
+
+    # -- measures ------------------------------------------------------------
+
+    def areas(self) -> np.ndarray:
+        """Net area of each room in square feet."""
+        return self._room_sums(self.loop_areas(), self.loop_room)
+
+    def perimeters(self) -> np.ndarray:
+        """Boundary length of each room (holes included) in feet."""
+        start, end = self.edges()
+        return self._room_sums(np.hypot(*(end - start).T), self.edge_room)
+
+    def centroids(self) -> np.ndarray:
+        """Area centroid of each room, ``(n, 2)``; NaN for rooms without area."""
+        start, end = self.edges()
+        cross = self._cross()
+        room = self.edge_room
+        area = self.areas()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x = self._room_sums((start[:, 0] + end[:, 0]) * cross, room) / (6 * area)
+            y = self._room_sums((start[:, 1] + end[:, 1]) * cross, room) / (6 * area)
+        centroids = np.column_stack([x, y])
+        centroids[area <= 0] = np.nan
+        return centroids
+
+    # -- queries -------------------------------------------------------------
+
+    def contains(self, points: Any, level: str | None = None) -> np.ndarray:
+        """``(p, n)`` booleans: whether room ``j`` contains point ``i``.
+
+        Crossings of a rightward ray are counted against every edge and summed
+        per room; an odd count is inside, so holes fall out. With ``level``,
+        only rooms on that level can contain anything.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        inside = np.zeros((len(points), len(self)), dtype=bool)
+        start, end = self.edges()
+        room = self.edge_room
+        if level is not None and len(room):
+            on_level = np.asarray(self.levels, dtype=object)[room] == level
+            start, end, room = start[on_level], end[on_level], room[on_level]
+        if not len(room) or not len(points):
+            return inside
+        (x1, y1), (x2, y2) = start.T, end.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = (x2 - x1) / (y2 - y1)
+        # Edges are ordered by room, so each room's crossings are one slice.
+        owners, first_edge = np.unique(room, return_index=True)
+        step = max(1, _LOCATE_CELLS // len(room))
+        for first in range(0, len(points), step):
+            px, py = points[first : first + step, :1], points[first : first + step, 1:]
+            with np.errstate(invalid="ignore"):
+                crosses = ((y1 > py) != (y2 > py)) & (px < x1 + (py - y1) * slope)
+            parity = np.add.reduceat(crosses, first_edge, axis=1, dtype=np.int64) % 2
+            inside[first : first + step, owners] = parity == 1
+        return inside
+
+    def locate(self, points: Any, level: str | None = None) -> np.ndarray:
+        """Index of the room containing each ``(x, y)`` point, or -1.
+
+        A point inside several rooms (overlapping rooms are a model error)
+        gets the first.
+        """
+        return _first(self.contains(points, level))
+
+    def adjacency(self, gap: float = ADJACENCY_GAP, min_shared: float = MIN_SHARED_LENGTH) -> tuple[np.ndarray, np.ndarray]:
+        """Pairs of adjacent rooms, ``(k, 2)`` indices with ``i < j``, and the wall length they share.
+
+        Two edges face each other when they run in opposite directions along
+        parallel lines at most ``gap`` apart, the second lying outside the
+        first's room. Edges are grouped by level and direction, sorted by
+        offset, and compared only within ``gap`` of each other.
+        """
+        start, end = self.edges()
+        vector = end - start
+        length = np.hypot(*vector.T)
+        keep = length > 0
+        if not keep.any():
+            return np.empty((0, 2), dtype=np.int64), np.empty(0)
+        index = np.flatnonzero(keep)
+        room = self.edge_room[index]
+        start, vector, length = start[index], vector[index], length[index]
+        direction = np.arctan2(vector[:, 1], vector[:, 0])
+        # Undirected line angle in [0, pi) and which way along it the edge runs.
+        line = np.mod(direction, np.pi)
+        buckets = int(round(np.pi / ANGLE_TOLERANCE))
+        bucket = np.round(line / ANGLE_TOLERANCE).astype(np.int64) % buckets
+        forward = np.abs(np.mod(direction - line + np.pi, 2 * np.pi) - np.pi) < np.pi / 2
+        unit = np.column_stack([np.cos(line), np.sin(line)])
+        normal = np.column_stack([-unit[:, 1], unit[:, 0]])
+        offset = np.einsum("ij,ij->i", start, normal)
+        along = np.einsum("ij,ij->i", start, unit)
+        extent = np.sort(np.column_stack([along, along + np.einsum("ij,ij->i", vector, unit)]), axis=1)
+        levels = np.unique(np.asarray(self.levels, dtype=object), return_inverse=True)[1].astype(np.int64)[room]
+
+        order = np.lexsort((offset, bucket, levels))
+        group = np.column_stack([levels[order], bucket[order]])
+        breaks = np.flatnonzero(np.any(group[1:] != group[:-1], axis=1)) + 1
+        first_rooms: list[np.ndarray] = []
+        second_rooms: list[np.ndarray] = []
+        shared: list[np.ndarray] = []
+        for members in np.split(order, breaks):
+            if len(members) < 2:
+                continue
+            sorted_offset = offset[members]
+            stop = np.searchsorted(sorted_offset, sorted_offset + gap, side="right")
+            counts = stop - np.arange(1, len(members) + 1)
+            if not counts.sum():
+                continue
+            a = np.repeat(np.arange(len(members)), counts)
+            b = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + a + 1
+            a, b = members[a], members[b]
+            overlap = np.minimum(extent[a, 1], extent[b, 1]) - np.maximum(extent[a, 0], extent[b, 0])
+            # Interior is left of an edge: +normal for forward edges. The
+            # other edge must be on the far side, not inside this room.
+            side = np.where(forward[a], 1.0, -1.0) * (offset[b] - offset[a])
+            facing = (forward[a] != forward[b]) & (side <= 1e-9) & (overlap > 0) & (room[a] != room[b])
+            first_rooms.append(room[a][facing])
+            second_rooms.append(room[b][facing])
+            shared.append(overlap[facing])
+        if not first_rooms:
+            return np.empty((0, 2), dtype=np.int64), np.empty(0)
+        pairs = np.sort(np.column_stack([np.concatenate(first_rooms), np.concatenate(second_rooms)]), axis=1)
+        unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=np.concatenate(shared), minlength=len(unique))
+        enough = totals >= min_shared
+        return unique[enough].reshape(-1, 2), totals[enough]
+
+    def summary(self, index: int) -> dict[str, Any]:
+        return {
+            "id": int(self.ids[index]),
+            "number": self.numbers[index],
+            "name": self.names[index],
+            "level": self.levels[index],
+        }
+
+
+def _first(inside: np.ndarray) -> np.ndarray:
+    """Column of each row's first True, or -1."""
+    if not inside.shape[1]:
+        return np.full(len(inside), -1, dtype=np.int64)
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+
+class RoomBoundaryCache:
+    """Room boundaries of the active document, pulled once per document.
+
+    :meth:`invalidate` is called when a tool opens, creates or closes a
+    document, or writes to the model. Edits made in the Revit UI are only
+    seen after that, or after an explicit :meth:`refresh`.
+    """
+
+    def __init__(self, call: ToolCall, boundary_location: str = BOUNDARY_LOCATION) -> None:
+        self.call = call
+        self.boundary_location = boundary_location
+        self._rooms: RoomSet | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> RoomSet:
+        with self._lock:
+            if self._rooms is None:
+                result = self.call("revit.get_room_boundaries", {"boundary_location": self.boundary_location})
+                self._rooms = RoomSet.from_result(result)
+            return self._rooms
+
+    def refresh(self) -> RoomSet:
+        self.invalidate()
+        return self.get()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rooms = None
+
+
+def completeness_report(
+    rooms: RoomSet,
+    *,
+    levels: Sequence[str] | None = None,
+    min_area: float = 1.0,
+    area_tolerance: float = 0.02,
+) -> dict[str, Any]:
+    """Room completeness issues, found from boundary data alone.
+
+    ``unplaced``, ``not_enclosed``, ``too_small`` and ``overlapping`` rooms
+    are errors. A missing or duplicate number or a missing name is a
+    warning. So is ``area_mismatch``, where the boundary polygon's area
+    differs from Revit's by more than ``area_tolerance``; that points to a
+    boundary Revit failed to close cleanly.
+    """
+    selected = np.ones(len(rooms), dtype=bool)
+    if levels:
+        selected = np.isin(np.asarray(rooms.levels, dtype=object), list(levels))
+    areas = rooms.areas()
+    enclosed = rooms.placed & (areas > 0)
+    issues: list[dict[str, Any]] = []
+
+    def flag(mask: np.ndarray, issue: str, severity: str, detail: Callable[[int], str] | None = None) -> None:
+        for index in np.flatnonzero(mask & selected).tolist():
+            issues.append({**rooms.summary(index), "issue": issue, "severity": severity, **({"detail": detail(index)} if detail else {})})
+
+    flag(~rooms.placed, "unplaced", "error")
+    flag(rooms.placed & ~enclosed, "not_enclosed", "error")
+    flag(enclosed & (areas < min_area), "too_small", "error", lambda i: f"{areas[i]:.2f} sq ft")
+
+    # A room whose centroid lies inside another room on its level overlaps it.
+    level_names = np.asarray(rooms.levels, dtype=object)
+    centroids = np.nan_to_num(rooms.centroids(), nan=np.inf)
+    inside = rooms.contains(centroids) & enclosed[None, :] & (level_names[:, None] == level_names[None, :])
+    np.fill_diagonal(inside, False)
+    containing = np.where(enclosed, _first(inside), -1)
+    flag(containing >= 0, "overlapping", "error", lambda i: f"centroid inside room {int(rooms.ids[containing[i]])}")
+
+    numbers = np.asarray(rooms.numbers, dtype=object)
+    flag(numbers == "", "missing_number", "warning")
+    flag(np.asarray(rooms.names, dtype=object) == "", "missing_name", "warning")
+    counts = Counter(number for number in rooms.numbers if number)
+    flag(np.fromiter((counts[n] > 1 for n in rooms.numbers), dtype=bool, count=len(rooms)), "duplicate_number", "warning")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drift = np.abs(areas - rooms.revit_areas) / rooms.revit_areas
+    flag(enclosed & (rooms.revit_areas > 0) & (drift > area_tolerance), "area_mismatch", "warning",
+         lambda i: f"boundary {areas[i]:.2f} sq ft, Revit {rooms.revit_areas[i]:.2f} sq ft")
+
+    by_issue = Counter(issue["issue"] for issue in issues)
+    severity = "error" if any(i["severity"] == "error" for i in issues) else "warning" if issues else "info"
+    return {
+        "document": rooms.document,
+        "rooms": int(selected.sum()),
+        "issues_found": len(issues),
+        "severity": severity,
+        "by_issue": dict(by_issue),
+        "area_by_level": {
+            str(level): round(float(areas[selected & enclosed & (level_names == level)].sum()), 3)
+            for level in sorted(set(level_names[selected].tolist()))
+        },
+        "issues": issues,
+    }
@@ -4,22 +4,130 @@ MCP Server for Revit - Enables Claude Desktop to control Revit through natural l
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from . import codec
+from .bridge.cache import CACHE_FILE, QueryCache
+from .bridge.catalog import BATCH_TOOL, is_read_only
 from .bridge.client import BridgeClient
+from .bridge.metrics import metrics
+from .bridge.pool import BridgePool
+from .bridge.prefetch import Prefetcher, TransitionModel
+from .bridge.session import WriteBatch
 from .config import config
-from .errors import BridgeError
+from .errors import BatchError, BridgeError, ReplicaError, SchemaValidationError
+from .geometry import ElementMesh, RoomBoundaryCache, RoomSet, completeness_report
+from .replica import ModelReplica, find_clashes, pull_full, sync_changes
+from .security.audit import AuditRecorder
+from .security.workspace import WorkspaceMonitor
+from .tools.audit import AUDITS, AuditData, audit_rules, parameter_columns, run_audit
+from .tools.bulk import BulkPlan, create_bulk, plan_columns, plan_family_instances, plan_walls
+from .tools.handlers import TOOL_HANDLERS, export_schedules, sheet_batch_from_csv
+from .units import LENGTH_ARGUMENTS, PROJECT, ProjectUnits, ProjectUnitsSource, from_internal, scale_lengths, to_internal, unit_factor
+from .validation import ArgumentValidator
+
+logger = logging.getLogger(__name__)
 
 # Initialize the MCP server
 app = Server("revit-mcp")
 
-# Initialize bridge client
-bridge = BridgeClient(config.bridge_url) if config.bridge_url else None
+# Initialize bridge client (a pool when several Revit sessions are configured)
+_bridge_urls = config.resolved_bridge_urls()
+# Read-only results kept in the workspace, so a restarted server starts warm.
+query_cache = (
+    QueryCache(config.workspace_dir / CACHE_FILE, config.query_cache_max_bytes)
+    if config.query_cache and _bridge_urls
+    else None
+)
+if len(_bridge_urls) > 1:
+    bridge = BridgePool.from_urls(
+        _bridge_urls,
+        health_interval=config.bridge_health_interval,
+        compression_min_bytes=config.bridge_compression_min_bytes,
+        cache=query_cache,
+    )
+elif _bridge_urls:
+    bridge = BridgeClient(
+        _bridge_urls[0],
+        compression_min_bytes=config.bridge_compression_min_bytes,
+        cache=query_cache,
+    )
+else:
+    bridge = None
+
+# With prefetch on, bridge calls (tool and payload only) are logged so the
+# prefetcher can learn what follows what, this session and the next.
+audit = AuditRecorder(config.audit_log) if config.prefetch else None
+# Warms the query cache with likely follow-up queries while the bridge is idle.
+prefetcher = (
+    Prefetcher(bridge.call_tool, TransitionModel.from_audit_log(config.audit_log))
+    if config.prefetch and query_cache is not None and bridge is not None
+    else None
+)
+
+# Display units of the open document, fetched once per document.
+project_units = ProjectUnitsSource(bridge.call_tool) if bridge is not None else None
+# Bridge tools after which the active document, and so its units, may differ.
+_DOCUMENT_SWITCHES = frozenset({"revit.open_document", "revit.create_new_document", "revit.close_document"})
+
+# Room boundary polygons of the open document, pulled once and measured locally.
+room_boundaries = RoomBoundaryCache(bridge.call_tool) if bridge is not None else None
+
+# Writes buffered between revit_begin_batch and revit_commit_batch.
+write_batch: WriteBatch | None = None
+
+# Columnar copy of element data, answered locally without touching Revit.
+replica = ModelReplica()
+
+# File-writing tools answered here stay inside the configured directories.
+workspace = WorkspaceMonitor(config.allowed_directories)
+
+_FILTERS_SCHEMA = {
+    "type": "object",
+    "description": (
+        "Column filters, e.g. {\"category\": \"Walls\", \"level\": [\"L1\", \"L2\"], "
+        "\"length\": {\"min\": 10}}. Scalars match exactly, lists match any, "
+        "{min, max} is an inclusive numeric range. Pulled parameters are columns too."
+    ),
+}
+
+_POINT_SCHEMA = {
+    "type": "array", "items": {"type": "number"}, "minItems": 3, "maxItems": 3,
+    "description": "[x, y, z] in Revit internal units (feet)",
+}
+
+
+_LENGTH_UNITS_SCHEMA = {
+    "type": "string",
+    "enum": ["ft", "in", "m", "cm", "mm", "project"],
+    "description": "Unit of the coordinates; 'project' uses the document's length unit. Default: MCP_REVIT_INPUT_UNITS",
+}
+
+
+def _bulk_instance_schema() -> dict:
+    numbers = {"type": "array", "items": {"type": "number"}}
+    number_or_numbers = {"anyOf": [{"type": "number"}, numbers]}
+    return {
+        "type": "object",
+        "properties": {
+            "x": numbers,
+            "y": numbers,
+            "z": {**number_or_numbers, "default": 0},
+            "rotation": {**number_or_numbers, "default": 0, "description": "Degrees about the vertical axis"},
+            "family_name": {"type": "string"},
+            "type_name": {"type": "string"},
+            "level": {"type": "string", "default": "L1"},
+            "units": _LENGTH_UNITS_SCHEMA,
+        },
+        "required": ["x", "y", "family_name", "type_name"],
+    }
 
 
 @app.list_tools()
@@ -398,9 +506,21 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="revit_batch_create_sheets_from_csv",
-            description="Create multiple sheets from a CSV file",
+            description=(
+                "Create sheets from a CSV file (sheet_number, sheet_name, optional titleblock_name columns). "
+                "Rows are validated as they are read, sheet numbers already in the model are skipped, and "
+                "sheets are created in chunks sized to stay within the bridge timeout. Progress is "
+                "checkpointed; pass resume to continue a batch that stopped part way."
+            ),
             inputSchema={
-                "type": "object", "properties": {"csv_path": {"type": "string"}, "titleblock_name": {"type": "string"}},
+                "type": "object",
+                "properties": {
+                    "csv_path": {"type": "string"},
+                    "titleblock_name": {"type": "string", "description": "Default titleblock family"},
+                    "chunk_size": {"type": "integer", "default": 50, "description": "Initial sheets per transaction"},
+                    "resume": {"type": "boolean", "default": False, "description": "Continue from the checkpoint"},
+                    "checkpoint_path": {"type": "string", "description": "Default: <csv_path>.progress.json"}
+                },
                 "required": ["csv_path"]
             }
         ),
@@ -447,6 +567,41 @@ async def list_tools() -> list[Tool]:
         Tool(name="revit_create_tag", description="Tag an element", inputSchema={"type": "object", "properties": {"element_id": {"type": "integer"}, "x": {"type": "number"}, "y": {"type": "number"}, "view_id": {"type": "integer"}}, "required": ["element_id", "x", "y"]}),
         # Batch 2: Structure
         Tool(name="revit_create_column", description="Create structural column", inputSchema={"type": "object", "properties": {"family_name": {"type": "string"}, "type_name": {"type": "string"}, "level": {"type": "string"}, "x": {"type": "number"}, "y": {"type": "number"}}, "required": ["family_name", "type_name", "level", "x", "y"]}),
+        Tool(
+            name="revit_create_walls",
+            description=(
+                "Create many straight walls in one call. Coordinates are parallel arrays (wall i runs from "
+                "start_x[i], start_y[i] to end_x[i], end_y[i]). Zero-length, non-finite and repeated walls are "
+                "skipped; ids[i] is the wall created for row i."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **{name: {"type": "array", "items": {"type": "number"}} for name in ("start_x", "start_y", "end_x", "end_y")},
+                    "height": {"anyOf": [{"type": "number"}, {"type": "array", "items": {"type": "number"}}], "default": 10},
+                    "level": {"type": "string", "default": "L1"},
+                    "wall_type": {"type": "string"},
+                    "units": _LENGTH_UNITS_SCHEMA,
+                },
+                "required": ["start_x", "start_y", "end_x", "end_y"],
+            },
+        ),
+        Tool(
+            name="revit_create_columns",
+            description=(
+                "Create many structural columns of one type in one call, at points given as parallel x and y arrays. "
+                "Non-finite and repeated points are skipped; ids[i] is the column created for row i."
+            ),
+            inputSchema=_bulk_instance_schema(),
+        ),
+        Tool(
+            name="revit_place_family_instances",
+            description=(
+                "Place many instances of one family type in one call, at points given as parallel x, y (and z) arrays. "
+                "Non-finite and repeated points are skipped; ids[i] is the instance created for row i."
+            ),
+            inputSchema=_bulk_instance_schema(),
+        ),
         Tool(name="revit_create_beam", description="Create structural beam", inputSchema={"type": "object", "properties": {"family_name": {"type": "string"}, "type_name": {"type": "string"}, "level": {"type": "string"}, "start_x": {"type": "number"}, "start_y": {"type": "number"}, "end_x": {"type": "number"}, "end_y": {"type": "number"}}, "required": ["family_name", "type_name", "level", "start_x", "start_y", "end_x", "end_y"]}),
         Tool(name="revit_create_foundation", description="Create foundation", inputSchema={"type": "object", "properties": {"family_name": {"type": "string"}, "type_name": {"type": "string"}, "level": {"type": "string"}, "x": {"type": "number"}, "y": {"type": "number"}, "z": {"type": "number", "default": 0}}, "required": ["family_name", "type_name", "level", "x", "y"]}),
         # Batch 2: MEP
@@ -460,6 +615,94 @@ async def list_tools() -> list[Tool]:
         Tool(name="revit_create_new_document", description="Create new project", inputSchema={"type": "object", "properties": {"template_path": {"type": "string"}}}),
         Tool(name="revit_export_dwg", description="Export view to DWG", inputSchema={"type": "object", "properties": {"view_id": {"type": "integer"}, "output_path": {"type": "string"}}, "required": ["view_id", "output_path"]}),
         Tool(name="revit_export_ifc", description="Export to IFC", inputSchema={"type": "object", "properties": {"output_path": {"type": "string"}}, "required": ["output_path"]}),
+        Tool(
+            name="revit_bridge_metrics",
+            description=(
+                "Bridge traffic counters for this server process: calls, requests actually sent to Revit, "
+                "identical in-flight reads collapsed into one request, requests in flight, time spent "
+                "and, when enabled, persistent query cache hits and size."
+            ),
+            inputSchema={"type": "object", "properties": {}, "required": []}
+        ),
+        Tool(
+            name="revit_convert_units",
+            description=(
+                "Convert a value or a list of values between units, locally. Units are names such as m, mm, ft, in, "
+                "m2, ft3, deg, rad, 'internal' (Revit's feet, square feet, cubic feet, radians) or 'project' "
+                "(the open document's display unit for unit_type)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "value": {"anyOf": [{"type": "number"}, {"type": "array", "items": {"type": "number"}}]},
+                    "from_unit": {"type": "string"},
+                    "to_unit": {"type": "string"},
+                    "unit_type": {"type": "string", "enum": ["length", "area", "volume", "angle"], "default": "length"},
+                },
+                "required": ["value", "from_unit", "to_unit"],
+            },
+        ),
+        Tool(
+            name="revit_format_value",
+            description="Format values in Revit internal units as the open document displays them (units, accuracy, symbol), locally.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "value": {"anyOf": [{"type": "number"}, {"type": "array", "items": {"type": "number"}}]},
+                    "unit_type": {"type": "string", "enum": ["length", "area", "volume", "angle"], "default": "length"},
+                    "include_symbol": {"type": "boolean", "default": True},
+                },
+                "required": ["value"],
+            },
+        ),
+        Tool(
+            name="revit_begin_batch",
+            description=(
+                "Start buffering model edits. Until revit_commit_batch, write tools are queued instead of run and "
+                "return their index in the batch; reads still run at once and see the model before the batch. "
+                "The commit runs every queued edit in one Revit transaction: one regeneration, one undo step."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "default": "MCP Batch", "description": "Undo history label"},
+                    "atomic": {"type": "boolean", "default": True, "description": "Roll back every edit if any fails"},
+                },
+            },
+        ),
+        Tool(
+            name="revit_commit_batch",
+            description="Run the edits queued since revit_begin_batch in one transaction and return each edit's result by index.",
+            inputSchema={"type": "object", "properties": {}},
+        ),
+        Tool(
+            name="revit_discard_batch",
+            description="Drop the edits queued since revit_begin_batch without running them.",
+            inputSchema={"type": "object", "properties": {}},
+        ),
+        Tool(
+            name="revit_publish_sheets",
+            description=(
+                "Publish sheets to PDF or DWG (one file per sheet, named '<number> - <name>'), or the model to IFC. "
+                "Work is split across every connected Revit session. A manifest in the output directory records "
+                "each sheet; re-running skips sheets unchanged since the last publish and retries failures."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {"type": "string", "enum": ["pdf", "dwg", "ifc"], "default": "pdf"},
+                    "output_dir": {"type": "string", "description": "Directory inside the workspace"},
+                    "sheet_numbers": {"type": "array", "items": {"type": "string"}, "description": "Default: all sheets"},
+                    "csv_path": {"type": "string", "description": "CSV with a sheet_number column selecting sheets"},
+                    "name": {"type": "string", "default": "publish", "description": "Base name for merged, zipped and IFC outputs"},
+                    "merge": {"type": "boolean", "default": False, "description": "Also merge PDFs into <name>.pdf"},
+                    "zip": {"type": "boolean", "default": False, "description": "Also zip the outputs"},
+                    "force": {"type": "boolean", "default": False, "description": "Re-export unchanged sheets"},
+                    "ifc_view_id": {"type": "integer", "description": "Limit IFC export to one view"}
+                },
+                "required": []
+            }
+        ),
         Tool(name="revit_export_navisworks", description="Export to NWC", inputSchema={"type": "object", "properties": {"output_path": {"type": "string"}}, "required": ["output_path"]}),
         Tool(name="revit_export_image", description="Export view to Image", inputSchema={"type": "object", "properties": {"view_id": {"type": "integer"}, "output_path": {"type": "string"}, "width": {"type": "integer"}, "height": {"type": "integer"}}, "required": ["view_id", "output_path"]}),
         Tool(name="revit_render_3d", description="Render 3D view to image", inputSchema={"type": "object", "properties": {"view_id": {"type": "integer"}, "output_path": {"type": "string"}, "quality": {"type": "string", "enum": ["Draft", "Medium", "High"]}}, "required": ["view_id", "output_path"]}),
@@ -476,7 +719,25 @@ async def list_tools() -> list[Tool]:
         Tool(name="revit_get_worksets", description="Get all worksets", inputSchema={"type": "object", "properties": {}}),
         # Batch 3: Schedules & Geo
         Tool(name="revit_create_schedule", description="Create a schedule", inputSchema={"type": "object", "properties": {"category_name": {"type": "string"}, "name": {"type": "string"}}, "required": ["category_name", "name"]}),
-        Tool(name="revit_get_schedule_data", description="Get schedule data", inputSchema={"type": "object", "properties": {"schedule_id": {"type": "integer"}}, "required": ["schedule_id"]}),
+        Tool(name="revit_get_schedule_data", description="Get one page of schedule rows", inputSchema={"type": "object", "properties": {"schedule_id": {"type": "integer"}, "offset": {"type": "integer", "default": 0}, "limit": {"type": "integer", "default": 500, "description": "Rows per page (max 2000)"}}, "required": ["schedule_id"]}),
+        Tool(
+            name="revit_export_schedules",
+            description=(
+                "Export schedules to CSV or XLSX in the workspace. Rows are streamed to disk page by page; "
+                "the reply only summarises row counts, file paths and SHA-256 checksums. A directory gets "
+                "one CSV per schedule, a .csv path takes a single schedule, an .xlsx path one sheet per schedule."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output_path": {"type": "string", "description": "Directory, .csv or .xlsx path inside the workspace"},
+                    "schedule_ids": {"type": "array", "items": {"type": "integer"}, "description": "Schedules to export (default: all)"},
+                    "schedule_names": {"type": "array", "items": {"type": "string"}, "description": "Schedules to export by name"},
+                    "page_size": {"type": "integer", "default": 1000, "description": "Rows fetched per bridge call (max 2000)"}
+                },
+                "required": ["output_path"]
+            }
+        ),
         Tool(name="revit_get_element_bounding_box", description="Get element bounding box", inputSchema={"type": "object", "properties": {"element_id": {"type": "integer"}}, "required": ["element_id"]}),
         # Batch 4: Phasing
         Tool(name="revit_get_phases", description="Get project phases", inputSchema={"type": "object", "properties": {}}),
@@ -511,7 +772,7 @@ async def list_tools() -> list[Tool]:
         Tool(name="revit_get_view_templates", description="Get list of view templates", inputSchema={"type": "object", "properties": {}}),
         Tool(name="revit_apply_view_template", description="Apply view template to a view", inputSchema={"type": "object", "properties": {"view_id": {"type": "integer"}, "template_id": {"type": "integer"}}, "required": ["view_id", "template_id"]}),
         Tool(name="revit_calculate_material_quantities", description="Calculate material volumes for a category", inputSchema={"type": "object", "properties": {"category": {"type": "string"}}, "required": ["category"]}),
-        Tool(name="revit_get_room_boundary", description="Get room geometric boundary loops", inputSchema={"type": "object", "properties": {"room_id": {"type": "integer"}}, "required": ["room_id"]}),
+        Tool(name="revit_get_room_boundary", description="Get room geometric boundary loops as flat [x0, y0, x1, y1, ...] rings in feet", inputSchema={"type": "object", "properties": {"room_id": {"type": "integer"}, "boundary_location": {"type": "string", "enum": ["finish", "center", "core_center", "core_boundary"], "default": "finish"}}, "required": ["room_id"]}),
         Tool(name="revit_get_project_location", description="Get project base and survey points", inputSchema={"type": "object", "properties": {}}),
         Tool(name="revit_get_warnings", description="Get current project warnings", inputSchema={"type": "object", "properties": {}}),
         # Batch 9: Universal Reflection Bridge (10k+ Tools)
@@ -641,20 +902,644 @@ async def list_tools() -> list[Tool]:
                 "required": ["element_id"]
             }
         ),
+        Tool(
+            name="revit_get_element_mesh",
+            description=(
+                "Triangulate elements into one indexed mesh with shared vertices welded: float32 xyz vertices (feet) "
+                "and uint32 triangle indices. With output_path the buffers go to a binary file in the workspace and the "
+                "answer carries only bounds, counts and the path; otherwise they are returned as base64."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "element_ids": {"type": "array", "items": {"type": "integer"}, "minItems": 1},
+                    "detail_level": {"type": "string", "enum": ["coarse", "medium", "fine"], "default": "medium"},
+                    "output_path": {"type": "string", "description": "Mesh file inside the workspace"},
+                },
+                "required": ["element_ids"],
+            },
+        ),
+        Tool(
+            name="revit_room_geometry",
+            description=(
+                "Area, perimeter and centroid of every room, computed locally from boundary polygons pulled once per "
+                "document. With adjacency, also the pairs of rooms that face each other across a wall and the length "
+                "they share. Lengths in feet, areas in square feet."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "level": {"type": "string", "description": "Only rooms on this level"},
+                    "adjacency": {"type": "boolean", "default": False},
+                    "max_gap": {"type": "number", "default": 1.5, "description": "Widest wall between adjacent rooms, feet"},
+                    "refresh": {"type": "boolean", "default": False, "description": "Pull boundaries from Revit again"},
+                },
+            },
+        ),
+        Tool(
+            name="revit_locate_rooms",
+            description=(
+                "Find the room containing each [x, y] point (MCP_REVIT_INPUT_UNITS), tested locally against cached room boundaries. "
+                "Points outside every room get null."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "points": {
+                        "type": "array", "minItems": 1,
+                        "items": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 3},
+                    },
+                    "level": {"type": "string", "description": "Only rooms on this level"},
+                    "refresh": {"type": "boolean", "default": False},
+                },
+                "required": ["points"],
+            },
+        ),
+        Tool(
+            name="revit_room_space_completeness_report",
+            description=(
+                "Audit rooms from their boundaries: unplaced, not enclosed, too small or overlapping rooms, missing or "
+                "duplicate numbers, missing names, and boundaries whose area disagrees with Revit's."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "levels": {"type": "array", "items": {"type": "string"}},
+                    "min_area": {"type": "number", "minimum": 0, "default": 1.0, "description": "Square feet"},
+                    "area_tolerance": {"type": "number", "minimum": 0, "default": 0.02},
+                    "refresh": {"type": "boolean", "default": False},
+                },
+            },
+        ),
+        Tool(
+            name="revit_run_audit",
+            description=(
+                "Audit the model locally against rules: model_health_summary, naming_standards_audit, "
+                "parameter_compliance_audit, tag_coverage_audit or view_template_compliance_check, or custom rule "
+                "specs. Runs over the model replica (pulled first if needed), never on Revit's UI thread. Every "
+                "finding goes to the JSON Lines output_path; the answer has counts and the first findings."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "audit": {"type": "string", "enum": sorted(AUDITS)},
+                    "rules": {
+                        "type": "array",
+                        "items": {"type": "object", "properties": {"kind": {"type": "string"}}, "required": ["kind"]},
+                        "description": (
+                            "Rule specs replacing the audit's defaults, e.g. {\"kind\": \"pattern\", \"column\": "
+                            "\"name\", \"pattern\": \"^[A-Z]{2}_\", \"categories\": [\"Walls\"]}. Kinds: missing_value, "
+                            "pattern, range, duplicate, tag_coverage"
+                        ),
+                    },
+                    "required_parameters": {"type": "array", "items": {"type": "string"}},
+                    "categories": {"type": "array", "items": {"type": "string"}, "description": "Only audit these categories"},
+                    "output_path": {"type": "string", "description": "Report file inside the workspace"},
+                    "workers": {"type": "integer", "minimum": 1, "description": "Processes for large models (default: CPU count)"},
+                    "refresh": {"type": "boolean", "default": False, "description": "Pull the replica again first"},
+                },
+            },
+        ),
+        Tool(
+            name="revit_replica_refresh",
+            description=(
+                "Pull element data from Revit into the local model replica. Run once per session "
+                "(or when the replica is stale); replica queries then answer without touching Revit."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "categories": {
+                        "type": "array", "items": {"type": "string"},
+                        "description": "Categories to pull (default: every model element)"
+                    },
+                    "parameters": {
+                        "type": "array", "items": {"type": "string"},
+                        "description": "Extra parameter names to pull as queryable columns"
+                    }
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="revit_replica_sync",
+            description=(
+                "Apply only the elements added, modified or deleted in Revit since the last pull or sync "
+                "to the local model replica. Queries do this automatically once the replica is older "
+                "than MCP_REVIT_REPLICA_MAX_AGE."
+            ),
+            inputSchema={"type": "object", "properties": {}, "required": []}
+        ),
+        Tool(
+            name="revit_replica_status",
+            description="Show what the local model replica holds and when it was pulled",
+            inputSchema={"type": "object", "properties": {}, "required": []}
+        ),
+        Tool(
+            name="revit_replica_query",
+            description=(
+                "Filter and page elements from the local model replica. Columns: id, category, name, "
+                "level, type_id, length, area, volume and any pulled parameters. Results include "
+                "pulled_at/age_seconds so you can judge freshness."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filters": _FILTERS_SCHEMA,
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "Columns to return"},
+                    "count_only": {"type": "boolean", "default": False},
+                    "offset": {"type": "integer", "default": 0},
+                    "limit": {"type": "integer", "default": 200}
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="revit_replica_group_by",
+            description="Count elements, and optionally sum length/area/volume, per value of a replica column",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "by": {"type": "string", "description": "Column to group by, e.g. 'category' or 'level'"},
+                    "filters": _FILTERS_SCHEMA,
+                    "sum": {
+                        "type": "array", "items": {"type": "string", "enum": ["length", "area", "volume"]},
+                        "description": "Numeric columns to total per group"
+                    }
+                },
+                "required": ["by"]
+            }
+        ),
+        Tool(
+            name="revit_replica_in_box",
+            description=(
+                "Find elements whose bounding box overlaps a box, from the local model replica's "
+                "spatial index. Coordinates are in MCP_REVIT_INPUT_UNITS (feet by default)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "box": {
+                        "type": "array", "items": {"type": "number"}, "minItems": 6, "maxItems": 6,
+                        "description": "[min_x, min_y, min_z, max_x, max_y, max_z]"
+                    },
+                    "filters": _FILTERS_SCHEMA,
+                    "tolerance": {"type": "number", "default": 0},
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "Columns to return"},
+                    "limit": {"type": "integer", "default": 200}
+                },
+                "required": ["box"]
+            }
+        ),
+        Tool(
+            name="revit_replica_at_point",
+            description="Find elements whose bounding box contains a point, from the local model replica",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "point": _POINT_SCHEMA,
+                    "filters": _FILTERS_SCHEMA,
+                    "tolerance": {"type": "number", "default": 0},
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "Columns to return"},
+                    "limit": {"type": "integer", "default": 200}
+                },
+                "required": ["point"]
+            }
+        ),
+        Tool(
+            name="revit_replica_nearest",
+            description="Find the k elements whose bounding boxes are closest to a point, from the local model replica",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "point": _POINT_SCHEMA,
+                    "k": {"type": "integer", "default": 10},
+                    "filters": _FILTERS_SCHEMA,
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "Columns to return"}
+                },
+                "required": ["point"]
+            }
+        ),
+        Tool(
+            name="revit_replica_clashes",
+            description=(
+                "Clash-check two sets of elements (or one set against itself). Bounding-box overlaps are "
+                "found locally from the model replica; only those candidate pairs are sent to Revit for an "
+                "exact geometry check."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filters_a": _FILTERS_SCHEMA,
+                    "filters_b": _FILTERS_SCHEMA,
+                    "tolerance": {"type": "number", "default": 0, "description": "Clearance in feet"},
+                    "verify": {
+                        "type": "boolean", "default": True,
+                        "description": "Confirm candidates with Revit geometry; false returns box overlaps only"
+                    },
+                    "limit": {"type": "integer", "default": 500, "description": "Maximum clashes to list"}
+                },
+                "required": []
+            }
+        ),
     ]
 
 
+def _replica_refresh(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    return pull_full(
+        replica,
+        bridge,
+        categories=arguments.get("categories"),
+        parameter_names=arguments.get("parameters") or (),
+    )
+
+
+def _replica_sync(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    return sync_changes(replica, bridge)
+
+
+def _export_schedules(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    return export_schedules({"request_id": "mcp", **arguments}, workspace, bridge)
+
+
+def _batch_create_sheets(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    return sheet_batch_from_csv({"request_id": "mcp", **arguments}, workspace, bridge)
+
+
+_PUBLISH_TOOLS = {
+    "pdf": "revit.export_pdf_by_sheet_set",
+    "dwg": "revit.export_dwg_by_sheet_set",
+    "ifc": "revit.export_ifc_named_setup",
+}
+
+
+def _publish_sheets(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    arguments = dict(arguments)
+    handler = TOOL_HANDLERS[_PUBLISH_TOOLS[arguments.pop("format", "pdf")]]
+    return handler({"request_id": "mcp", **arguments}, workspace, bridge)
+
+
+def _sync_if_stale() -> None:
+    """Delta-sync the replica when it is older than the configured age."""
+    age = replica.freshness()["age_seconds"]
+    if bridge and config.replica_max_age > 0 and age is not None and age > config.replica_max_age:
+        try:
+            sync_changes(replica, bridge)
+        except BridgeError as exc:
+            # Answer from the snapshot; age_seconds tells the caller it is stale.
+            logger.warning("Replica sync failed, answering from snapshot: %s", exc)
+
+
+def _replica_query(arguments: dict) -> dict:
+    _sync_if_stale()
+    if arguments.get("count_only"):
+        return replica.count(arguments.get("filters"))
+    return replica.query(
+        arguments.get("filters"),
+        arguments.get("fields"),
+        arguments.get("offset", 0),
+        arguments.get("limit", 200),
+    )
+
+
+def _replica_group_by(arguments: dict) -> dict:
+    _sync_if_stale()
+    return replica.group_by(arguments["by"], arguments.get("filters"), arguments.get("sum") or ())
+
+
+def _replica_in_box(arguments: dict) -> dict:
+    _sync_if_stale()
+    return replica.in_box(
+        arguments["box"],
+        arguments.get("filters"),
+        arguments.get("tolerance", 0.0),
+        arguments.get("fields"),
+        arguments.get("limit", 200),
+    )
+
+
+def _replica_at_point(arguments: dict) -> dict:
+    _sync_if_stale()
+    return replica.at_point(
+        arguments["point"],
+        arguments.get("filters"),
+        arguments.get("tolerance", 0.0),
+        arguments.get("fields"),
+        arguments.get("limit", 200),
+    )
+
+
+def _replica_nearest(arguments: dict) -> dict:
+    _sync_if_stale()
+    return replica.nearest(arguments["point"], arguments.get("k", 10), arguments.get("filters"), arguments.get("fields"))
+
+
+def _replica_clashes(arguments: dict) -> dict:
+    _sync_if_stale()
+    return find_clashes(
+        replica,
+        bridge,
+        arguments.get("filters_a"),
+        arguments.get("filters_b"),
+        arguments.get("tolerance", 0.0),
+        arguments.get("verify", True),
+        arguments.get("limit", 500),
+    )
+
+
+def _begin_batch(arguments: dict) -> dict:
+    global write_batch
+    if bridge is None:
+        raise BatchError("Bridge not configured; there is nothing to batch against")
+    if write_batch is not None:
+        raise BatchError(f"Batch '{write_batch.name}' is already open with {len(write_batch)} edits; commit or discard it first")
+    write_batch = WriteBatch(bridge, arguments.get("name") or "MCP Batch", arguments.get("atomic", True))
+    return {"batch": write_batch.name, "atomic": write_batch.atomic}
+
+
+def _open_batch() -> WriteBatch:
+    if write_batch is None:
+        raise BatchError("No batch is open; call revit_begin_batch first")
+    return write_batch
+
+
+def _commit_batch(arguments: dict) -> dict:
+    global write_batch
+    batch = _open_batch()
+    payload = batch.payload()
+    # A failed commit leaves the batch open with its writes, to retry or discard.
+    result = batch.commit()
+    write_batch = None
+    _record_call(BATCH_TOOL, payload)
+    if room_boundaries is not None:
+        room_boundaries.invalidate()
+    return result
+
+
+def _discard_batch(arguments: dict) -> dict:
+    global write_batch
+    batch, write_batch = _open_batch(), None
+    return {"batch": batch.name, "discarded": batch.discard()}
+
+
+def _record_call(tool: str, payload: dict) -> None:
+    if audit is not None:
+        audit.record(tool, "mcp", payload)
+
+
+def _audited_call(tool: str, payload: dict) -> dict:
+    result = bridge.call_tool(tool, payload)
+    _record_call(tool, payload)
+    if room_boundaries is not None and not is_read_only(tool):
+        room_boundaries.invalidate()
+    return result
+
+
+def _project_units() -> ProjectUnits:
+    if project_units is None:
+        raise BridgeError("Bridge not configured; project units come from the open document")
+    return project_units.get()
+
+
+def _length_factor(units: str | None = None) -> float:
+    """Feet per unit of incoming lengths: ``units`` if given, else MCP_REVIT_INPUT_UNITS."""
+    units = units or config.input_units
+    if units == PROJECT:
+        return float(_project_units().to_internal(1.0))
+    return unit_factor(units, "length")
+
+
+def _to_internal(value: Any, unit: str, spec: str) -> Any:
+    return _project_units().to_internal(value, spec) if unit == PROJECT else to_internal(value, unit, spec)
+
+
+def _convert_units(arguments: dict) -> dict:
+    spec = arguments.get("unit_type") or "length"
+    from_unit, to_unit = arguments["from_unit"], arguments["to_unit"]
+    internal = _to_internal(arguments["value"], from_unit, spec)
+    value = _project_units().from_internal(internal, spec) if to_unit == PROJECT else from_internal(internal, to_unit, spec)
+    return {"value": value, "unit": to_unit, "unit_type": spec}
+
+
+def _format_value(arguments: dict) -> dict:
+    units = _project_units()
+    spec = arguments.get("unit_type") or "length"
+    symbol = arguments.get("include_symbol", True)
+    value = arguments["value"]
+    if isinstance(value, list):
+        return {"formatted": [units.format(item, spec, symbol) for item in value], "document": units.document}
+    return {"formatted": units.format(value, spec, symbol), "document": units.document}
+
+
+def _element_mesh(arguments: dict) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    payload = {"element_ids": arguments["element_ids"], "detail_level": arguments.get("detail_level") or "medium"}
+    result = bridge.call_tool("revit.get_element_mesh", payload)
+    mesh = ElementMesh.from_result(result)
+    response: dict[str, Any] = {**mesh.stats(), "missing": result.get("missing") or []}
+    output = arguments.get("output_path")
+    if not output:
+        buffers = {key: result.get(key) for key in ("elements", "vertices", "indices")}
+        return {**response, "encoding": "base64", **buffers}
+    path = Path(output)
+    path = workspace.assert_in_workspace(path if path.is_absolute() else config.workspace_dir / path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return {**response, "output_path": str(path), "file_bytes": mesh.write(path)}
+
+
+def _rooms(arguments: dict) -> RoomSet:
+    if room_boundaries is None:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    return room_boundaries.refresh() if arguments.get("refresh") else room_boundaries.get()
+
+
+def _room_geometry(arguments: dict) -> dict:
+    rooms = _rooms(arguments)
+    level = arguments.get("level")
+    selected = [i for i in range(len(rooms)) if level is None or rooms.levels[i] == level]
+    areas, perimeters, centroids = rooms.areas(), rooms.perimeters(), rooms.centroids()
+    response: dict[str, Any] = {
+        "document": rooms.document,
+        "rooms": [
+            {
+                **rooms.summary(i),
+                "area": round(float(areas[i]), 4),
+                "perimeter": round(float(perimeters[i]), 4),
+                "centroid": None if np.isnan(centroids[i, 0]) else centroids[i].round(4).tolist(),
+            }
+            for i in selected
+        ],
+    }
+    if arguments.get("adjacency"):
+        pairs, shared = rooms.adjacency(gap=arguments.get("max_gap", 1.5))
+        keep = np.isin(pairs, selected).all(axis=1)
+        response["adjacency"] = [
+            {"rooms": rooms.ids[pair].tolist(), "shared_length": round(float(length), 4)}
+            for pair, length in zip(pairs[keep], shared[keep])
+        ]
+    return response
+
+
+def _locate_rooms(arguments: dict) -> dict:
+    rooms = _rooms(arguments)
+    points = np.asarray([point[:2] for point in arguments["points"]], dtype=np.float64)
+    found = rooms.locate(points, arguments.get("level"))
+    return {"document": rooms.document, "rooms": [rooms.summary(i) if i >= 0 else None for i in found.tolist()]}
+
+
+def _room_completeness(arguments: dict) -> dict:
+    return completeness_report(
+        _rooms(arguments),
+        levels=arguments.get("levels"),
+        min_area=arguments.get("min_area", 1.0),
+        area_tolerance=arguments.get("area_tolerance", 0.02),
+    )
+
+
+def _run_audit(arguments: dict) -> dict:
+    rules = audit_rules(
+        arguments.get("audit"),
+        arguments.get("rules") or (),
+        arguments.get("required_parameters") or (),
+        arguments.get("categories"),
+    )
+    if not rules:
+        raise SchemaValidationError("Name an audit or give rules")
+    # Rules read replica columns; parameters they need are pulled alongside.
+    missing = parameter_columns(rules, AuditData.from_replica(replica) if replica.loaded else None)
+    if bridge and (arguments.get("refresh") or not replica.loaded or missing):
+        pull_full(
+            replica,
+            bridge,
+            categories=replica.categories if replica.loaded else None,
+            parameter_names=sorted({*replica.parameter_names, *missing}),
+        )
+    else:
+        _sync_if_stale()
+    if not replica.loaded:
+        raise ReplicaError("The model replica is empty; run revit_replica_refresh first")
+    data = AuditData.from_replica(replica)
+    path = None
+    if arguments.get("output_path"):
+        path = Path(arguments["output_path"])
+        path = workspace.assert_in_workspace(path if path.is_absolute() else config.workspace_dir / path)
+    return run_audit(rules, data, path, arguments.get("workers"))
+
+
+def _create_bulk(plan: BulkPlan) -> dict:
+    if not bridge:
+        raise BridgeError("Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file.")
+    if write_batch is not None:
+        queued = [write_batch.add(plan.tool, payload) for payload in plan.payloads()]
+        return {**plan.summary(), "queued": queued, "batch": write_batch.name, "pending": len(write_batch)}
+    return create_bulk(plan, _audited_call)
+
+
+# MCP tools answered in this process rather than by the bridge.
+LOCAL_TOOLS = {
+    "revit_replica_refresh": _replica_refresh,
+    "revit_replica_sync": _replica_sync,
+    "revit_replica_status": lambda arguments: replica.status(),
+    "revit_bridge_metrics": lambda arguments: {
+        **metrics.snapshot(),
+        "cache": query_cache.stats() if query_cache else None,
+        "prefetch": prefetcher.stats() if prefetcher else None,
+    },
+    "revit_replica_query": _replica_query,
+    "revit_replica_group_by": _replica_group_by,
+    "revit_replica_in_box": _replica_in_box,
+    "revit_replica_at_point": _replica_at_point,
+    "revit_replica_nearest": _replica_nearest,
+    "revit_replica_clashes": _replica_clashes,
+    "revit_export_schedules": _export_schedules,
+    "revit_batch_create_sheets_from_csv": _batch_create_sheets,
+    "revit_publish_sheets": _publish_sheets,
+    "revit_create_walls": lambda arguments: _create_bulk(
+        plan_walls(arguments, _length_factor(arguments.get("units")))
+    ),
+    "revit_create_columns": lambda arguments: _create_bulk(
+        plan_columns(arguments, _length_factor(arguments.get("units")))
+    ),
+    "revit_place_family_instances": lambda arguments: _create_bulk(
+        plan_family_instances(arguments, _length_factor(arguments.get("units")))
+    ),
+    "revit_get_element_mesh": _element_mesh,
+    "revit_room_geometry": _room_geometry,
+    "revit_locate_rooms": _locate_rooms,
+    "revit_room_space_completeness_report": _room_completeness,
+    "revit_run_audit": _run_audit,
+    "revit_convert_units": _convert_units,
+    "revit_format_value": _format_value,
+    "revit_begin_batch": _begin_batch,
+    "revit_commit_batch": _commit_batch,
+    "revit_discard_batch": _discard_batch,
+}
+
+
+# Local tools that only read or set in-process state run on the event loop.
+# Every other one may call the bridge or crunch a whole model, so it goes to a
+# thread like bridge calls do.
+_INLINE_LOCAL_TOOLS = frozenset(
+    {"revit_replica_status", "revit_bridge_metrics", "revit_begin_batch", "revit_discard_batch"}
+)
+
+
+def _format_result(name: str, result: Any) -> list[TextContent]:
+    response_text = f"✓ {name} executed successfully\n\n"
+    response_text += f"Result:\n{codec.dumps_pretty(result)}"
+    return [TextContent(type="text", text=response_text)]
+
+
+_validator: ArgumentValidator | None = None
+
+
+async def _argument_validator() -> ArgumentValidator:
+    """Every tool's inputSchema, compiled on first use."""
+    global _validator
+    if _validator is None:
+        _validator = ArgumentValidator({tool.name: tool.inputSchema for tool in await list_tools()})
+    return _validator
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Execute a Revit tool."""
 
-    if not bridge:
+    # Reject malformed calls here rather than after a queued round trip to Revit.
+    try:
+        (await _argument_validator()).validate(name, arguments or {})
+    except SchemaValidationError as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+    local_tool = LOCAL_TOOLS.get(name)
+    if not bridge and local_tool is None:
         return [TextContent(
             type="text",
             text="Error: Bridge not configured. Set MCP_REVIT_BRIDGE_URL in your .env file."
         )]
 
     try:
+        # Coordinates arrive in MCP_REVIT_INPUT_UNITS; Revit and the replica take feet.
+        if config.input_units != "ft" and name in LENGTH_ARGUMENTS:
+            factor = await asyncio.to_thread(_length_factor)
+            arguments = scale_lengths(name, arguments or {}, factor)
+
+        if local_tool is not None:
+            if name in _INLINE_LOCAL_TOOLS:
+                return _format_result(name, local_tool(arguments or {}))
+            return _format_result(name, await asyncio.to_thread(local_tool, arguments or {}))
+
         # Map MCP tool names to Revit bridge tools
         tool_mapping = {
             # Existing Core Tools
@@ -806,10 +1691,6 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 "view_id": arguments.get("view_id"),
                 "location": {"x": arguments.get("x"), "y": arguments.get("y"), "z": 0}
             }),
-            "revit_batch_create_sheets_from_csv": ("revit.batch_create_sheets_from_csv", {
-                "csv_path": arguments.get("csv_path"),
-                "titleblock_name": arguments.get("titleblock_name")
-            }),
             "revit_populate_titleblock": ("revit.populate_titleblock", {
                 "sheet_id": arguments.get("sheet_id"),
                 "parameters": arguments.get("parameters")
@@ -864,7 +1745,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             "revit_get_worksets": ("revit.get_worksets", {}),
             # Batch 3: Schedules & Geo
             "revit_create_schedule": ("revit.create_schedule", {"category_name": arguments.get("category_name"), "name": arguments.get("name")}),
-            "revit_get_schedule_data": ("revit.get_schedule_data", {"schedule_id": arguments.get("schedule_id")}),
+            "revit_get_schedule_data": ("revit.get_schedule_data", {"schedule_id": arguments.get("schedule_id"), "offset": arguments.get("offset", 0), "limit": arguments.get("limit", 500)}),
             "revit_get_element_bounding_box": ("revit.get_element_bounding_box", {"element_id": arguments.get("element_id")}),
             # Batch 4: Phasing
             "revit_get_phases": ("revit.get_phases", {}),
@@ -951,7 +1832,10 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 "template_id": arguments.get("template_id")
             }),
             "revit_calculate_material_quantities": ("revit.calculate_material_quantities", {"category": arguments.get("category")}),
-            "revit_get_room_boundary": ("revit.get_room_boundary", {"room_id": arguments.get("room_id")}),
+            "revit_get_room_boundary": ("revit.get_room_boundary", {
+                "room_id": arguments.get("room_id"),
+                "boundary_location": arguments.get("boundary_location") or "finish",
+            }),
             "revit_get_project_location": ("revit.get_project_location", {}),
             "revit_get_warnings": ("revit.get_warnings", {}),
             # Batch 9: Universal Reflection Bridge
@@ -1013,14 +1897,29 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         bridge_tool, payload = tool_mapping[name]
 
-        # Call the bridge
-        result = bridge.call_tool(bridge_tool, payload)
+        if write_batch is not None and not is_read_only(bridge_tool):
+            index = write_batch.add(bridge_tool, payload)
+            return _format_result(name, {"queued": index, "batch": write_batch.name, "pending": len(write_batch)})
+
+        # Call the bridge off the event loop, so concurrent requests overlap
+        # (and identical reads among them collapse into one).
+        if prefetcher is not None:
+            prefetcher.observe(bridge_tool, payload)
+        result = await asyncio.to_thread(_audited_call, bridge_tool, payload)
+        if project_units is not None and bridge_tool in _DOCUMENT_SWITCHES:
+            project_units.invalidate()
+        if room_boundaries is not None and bridge_tool in _DOCUMENT_SWITCHES:
+            room_boundaries.invalidate()
+        if bridge_tool in _DOCUMENT_SWITCHES:
+            # The replica holds the previous document; queries ask for a refresh.
+            replica.clear()
+        if prefetcher is not None:
+            prefetcher.after(bridge_tool, payload, result)
 
-        # Format the response
-        response_text = f"✓ {name} executed successfully\n\n"
-        response_text += f"Result:\n{json.dumps(result, indent=2)}"
+        return _format_result(name, result)
 
-        return [TextContent(type="text", text=response_text)]
+    except ReplicaError as e:
+        return [TextContent(type="text", text=f"Replica Error: {str(e)}")]
 
     except BridgeError as e:
         error_msg = f"Revit Bridge Error: {str(e)}\n\n"
@@ -1041,12 +1940,18 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    if prefetcher is not None:
+        prefetcher.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
 
 
 def run_mcp_server():
@@ -0,0 +1,5 @@
+from .spatial import BoxIndex
+from .store import ModelReplica
+from .sync import find_clashes, pull_full, sync_changes
+
+__all__ = ["BoxIndex", "ModelReplica", "find_clashes", "pull_full", "sync_changes"]
@@ -0,0 +1,248 @@
+"""Sorted-grid spatial index over element bounding boxes.
+
+Boxes are bucketed into a uniform 3-D grid whose cell size follows the
+typical element size. Each ``(cell, box)`` entry is kept in one array sorted by
+packed cell key, so finding the boxes near a query is a ``searchsorted`` over
+that array, and joining two sets of boxes is a merge of their key arrays.
+Boxes far larger than a cell (site topography, whole-floor slabs) are kept
+aside and tested directly instead of being smeared over thousands of cells.
+
+Coordinates are Revit internal units (feet), as reported by the bridge.
+"""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+# Boxes covering more cells than this are tested by brute force instead.
+MAX_CELLS_PER_BOX = 64
+# Cell coordinates are packed into one int64 key, 21 bits per axis.
+_AXIS_BITS = 21
+_AXIS_LIMIT = (1 << _AXIS_BITS) - 1
+
+
+class BoxIndex:
+    """Overlap, point and nearest-neighbour queries over axis-aligned boxes.
+
+    ``boxes`` is an ``(n, 6)`` array of ``min_x, min_y, min_z, max_x, max_y,
+    max_z``. Query results are row positions into ``boxes``.
+    """
+
+    def __init__(self, boxes: np.ndarray, cell_size: float | Sequence[float] | None = None) -> None:
+        # Column-major, so the per-axis comparisons below read contiguous memory.
+        self.boxes = np.asfortranarray(np.asarray(boxes, dtype=np.float64).reshape(-1, 6))
+        lows, highs = self.boxes[:, :3], self.boxes[:, 3:]
+        if len(self.boxes):
+            self.bounds = np.concatenate([lows.min(axis=0), highs.max(axis=0)])
+            typical = np.median(highs - lows, axis=0)
+        else:
+            self.bounds = np.zeros(6)
+            typical = np.zeros(3)
+        if cell_size is None:
+            # Cells twice the median element extent along each axis keep most
+            # boxes within 8 cells, even for long thin runs of duct or pipe.
+            span = self.bounds[3:] - self.bounds[:3]
+            cell_size = np.maximum(2.0 * typical, np.maximum(span / _AXIS_LIMIT, 1e-6))
+        self.cell_size = np.broadcast_to(np.asarray(cell_size, dtype=np.float64), (3,))
+        self.origin = self.bounds[:3]
+        self.dims = self._cells(self.bounds[3:]) + 1
+
+        first, last = self._cells(lows), self._cells(highs)
+        cells = np.prod(last - first + 1, axis=1)
+        large = cells > MAX_CELLS_PER_BOX
+        self.large = np.flatnonzero(large)
+        small = np.flatnonzero(~large)
+        keys, rows = _expand(first[small], last[small], small)
+        order = np.argsort(keys, kind="stable")
+        self._keys, self._rows = keys[order], rows[order]
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    # -- queries -----------------------------------------------------------
+
+    def overlapping(self, box: Sequence[float], tolerance: float = 0.0) -> np.ndarray:
+        """Rows whose box overlaps ``box`` grown by ``tolerance``, in row order."""
+        query = np.asarray(box, dtype=np.float64) + np.repeat([-tolerance, tolerance], 3)
+        first = np.maximum(self._cells(query[:3]), 0)
+        last = np.minimum(self._cells(query[3:]), self.dims - 1)
+        if np.any(last < first):
+            candidates = self.large
+        elif np.prod(last - first + 1) > len(self._keys):
+            # The query covers more cells than there are entries; scan instead.
+            candidates = np.arange(len(self.boxes))
+        else:
+            keys, _ = _expand(first[None], last[None], np.zeros(1, dtype=np.int64))
+            candidates = np.concatenate([self._rows_in(keys), self.large])
+        candidates = np.unique(candidates)
+        return candidates[_overlaps(self.boxes[candidates], query)]
+
+    def containing(self, point: Sequence[float], tolerance: float = 0.0) -> np.ndarray:
+        """Rows whose box contains ``point``."""
+        x, y, z = point
+        return self.overlapping((x, y, z, x, y, z), tolerance)
+
+    def nearest(self, point: Sequence[float], k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """The ``k`` rows whose boxes are closest to ``point``, with distances.
+
+        Searches a window around the point that doubles until it holds ``k``
+        boxes within its radius; a point inside a box is at distance 0.
+        """
+        k = min(k, len(self.boxes))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        centre = np.asarray(point, dtype=np.float64)
+        reach = float(np.abs(np.concatenate([self.bounds[:3] - centre, self.bounds[3:] - centre])).max())
+        radius = float(self.cell_size.max())
+        while True:
+            rows = self.overlapping(np.concatenate([centre, centre]), radius)
+            distances = box_distances(self.boxes[rows], centre)
+            if np.count_nonzero(distances <= radius) >= k or radius >= reach:
+                break
+            radius *= 2
+        order = np.argsort(distances, kind="stable")[:k]
+        return rows[order], distances[order]
+
+    def pairs(self, other: "BoxIndex | None" = None, tolerance: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+        """All overlapping ``(row in self, row in other)`` pairs.
+
+        With ``other`` omitted the index is joined with itself and each pair
+        is reported once, with the smaller row first.
+        """
+        target = self if other is None else other
+        grown = np.asfortranarray(target.boxes + np.repeat([-tolerance, tolerance], 3))
+        first, last = self._cells(grown[:, :3]), self._cells(grown[:, 3:])
+        # Cells outside this grid hold none of our boxes.
+        first, last = np.maximum(first, 0), np.minimum(last, self.dims - 1)
+        inside = np.all(last >= first, axis=1)
+        small = inside & (np.prod(last - first + 1, axis=1) <= MAX_CELLS_PER_BOX)
+        rows = np.flatnonzero(small)
+        keys, target_rows = _expand(first[rows], last[rows], rows)
+        order = np.argsort(keys, kind="stable")
+        left, right, cell = _join(self._keys, self._rows, keys[order], target_rows[order])
+        # Overlapping boxes share several cells; keep the pair only in the cell
+        # holding the low corner of their intersection.
+        corner = np.maximum(self.boxes[left, :3], grown[right, :3])
+        keep = _pack(np.maximum(self._cells(corner), 0)) == cell
+        left, right = left[keep], right[keep]
+
+        # Large boxes on either side, against everything on the other.
+        extra_left, extra_right = [left], [right]
+        all_target = np.arange(len(target.boxes))
+        for row in self.large.tolist():
+            hits = all_target[_overlaps(grown, self.boxes[row])]
+            extra_left.append(np.full(len(hits), row))
+            extra_right.append(hits)
+        # Boxes only oversized once grown are missing from the cell join. Joined
+        # with itself, pairs of such a box and a small one were found from the
+        # small side and pairs with ``self.large`` above, but two of them still
+        # have to be tested directly; ``np.unique`` below drops the repeats.
+        oversized = np.flatnonzero(~small & inside)
+        if other is None:
+            oversized = np.setdiff1d(oversized, self.large, assume_unique=True)
+        for row in oversized.tolist():
+            hits = self.overlapping(grown[row])
+            extra_left.append(hits)
+            extra_right.append(np.full(len(hits), row))
+        left, right = np.concatenate(extra_left), np.concatenate(extra_right)
+        keep = _overlaps_pairwise(self.boxes[left], grown[right])
+        left, right = left[keep], right[keep]
+
+        if other is None:
+            left, right = np.minimum(left, right), np.maximum(left, right)
+            distinct = left != right
+            left, right = left[distinct], right[distinct]
+        codes = np.unique(left * len(target.boxes) + right)
+        return codes // max(len(target.boxes), 1), codes % max(len(target.boxes), 1)
+
+    # -- internals ---------------------------------------------------------
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+
+    def _rows_in(self, keys: np.ndarray) -> np.ndarray:
+        starts = np.searchsorted(self._keys, keys, side="left")
+        stops = np.searchsorted(self._keys, keys, side="right")
+        return self._rows[_ranges(starts, stops)]
+
+
+def box_distances(boxes: np.ndarray, point: np.ndarray) -> np.ndarray:
+    """Euclidean distance from ``point`` to each box (0 inside)."""
+    gap = np.maximum(np.maximum(boxes[:, :3] - point, point - boxes[:, 3:]), 0.0)
+    return np.sqrt(np.einsum("ij,ij->i", gap, gap))
+
+
+def boxes_from_records(records: Sequence[dict[str, Any]]) -> np.ndarray:
+    """``(n, 6)`` array from ``bounding_box`` fields; missing boxes are NaN."""
+    boxes = np.full((len(records), 6), np.nan)
+    for row, record in enumerate(records):
+        box = record.get("bounding_box")
+        if box:
+            boxes[row] = box
+    return boxes
+
+
+def _overlaps(boxes: np.ndarray, box: np.ndarray) -> np.ndarray:
+    mask = boxes[:, 0] <= box[3]
+    for axis in range(3):
+        if axis:
+            mask &= boxes[:, axis] <= box[axis + 3]
+        mask &= boxes[:, axis + 3] >= box[axis]
+    return mask
+
+
+def _overlaps_pairwise(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    mask = left[:, 0] <= right[:, 3]
+    for axis in range(3):
+        if axis:
+            mask &= left[:, axis] <= right[:, axis + 3]
+        mask &= left[:, axis + 3] >= right[:, axis]
+    return mask
+
+
+def _pack(cells: np.ndarray) -> np.ndarray:
+    cells = np.minimum(cells, _AXIS_LIMIT)
+    return (cells[..., 0] << (2 * _AXIS_BITS)) | (cells[..., 1] << _AXIS_BITS) | cells[..., 2]
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenation of ``arange(start, stop)`` for each pair, vectorized."""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+def _expand(first: np.ndarray, last: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """One ``(cell key, row)`` entry per cell each box covers."""
+    spans = last - first + 1
+    counts = np.prod(spans, axis=1)
+    owner = np.repeat(np.arange(len(rows)), counts)
+    local = _ranges(np.zeros(len(rows), dtype=np.int64), counts)
+    span = spans[owner]
+    offset = np.stack(
+        [local // (span[:, 1] * span[:, 2]), (local // span[:, 2]) % span[:, 1], local % span[:, 2]], axis=1
+    )
+    return _pack(first[owner] + offset), rows[owner]
+
+
+def _join(
+    left_keys: np.ndarray, left_rows: np.ndarray, right_keys: np.ndarray, right_rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Every ``(left row, right row, key)`` combination sharing a key; both sides sorted by key."""
+    keys, left_start, left_count = np.unique(left_keys, return_index=True, return_counts=True)
+    right_unique, right_start, right_count = np.unique(right_keys, return_index=True, return_counts=True)
+    _, in_left, in_right = np.intersect1d(keys, right_unique, assume_unique=True, return_indices=True)
+    left_start, left_count = left_start[in_left], left_count[in_left]
+    right_start, right_count = right_start[in_right], right_count[in_right]
+
+    sizes = left_count * right_count
+    local = _ranges(np.zeros(len(sizes), dtype=np.int64), sizes)
+    group = np.repeat(np.arange(len(sizes)), sizes)
+    width = right_count[group]
+    left = left_rows[left_start[group] + local // width]
+    right = right_rows[right_start[group] + local % width]
+    return left, right, keys[in_left][group]
@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .. import codec
+from ..errors import ReplicaError
+from .spatial import BoxIndex, boxes_from_records
+
+# Columns every replica row has, in the order the bridge reports them.
+TEXT_COLUMNS = ("category", "name", "level")
+INT_COLUMNS = ("type_id",)
+FLOAT_COLUMNS = ("length", "area", "volume")
+BUILTIN_COLUMNS = ("id", *TEXT_COLUMNS, *INT_COLUMNS, *FLOAT_COLUMNS)
+# Bounding box corners, unpacked from the bridge's ``bounding_box`` field into
+# float columns. Queryable like any other column but not returned by default.
+BOX_COLUMNS = ("min_x", "min_y", "min_z", "max_x", "max_y", "max_z")
+# Spatial indexes kept per replica, keyed by the filters they were built for.
+_SPATIAL_CACHE_SIZE = 8
+
+# Placeholder values the add-in uses for "no value".
+_MISSING_TEXT = frozenset({"", "N/A"})
+
+
+class Categorical:
+    """A string column stored as ``int32`` codes into a label table.
+
+    Code ``-1`` means missing. Filters compare codes, so matching a category
+    against 300k rows is a single vectorized comparison.
+    """
+
+    __slots__ = ("codes", "labels", "_lookup")
+
+    def __init__(self, codes: np.ndarray, labels: list[str]) -> None:
+        self.codes = codes
+        self.labels = labels
+        self._lookup = {label: code for code, label in enumerate(labels)}
+
+    @classmethod
+    def encode(cls, values: Iterable[Any]) -> "Categorical":
+        column = cls(np.empty(0, dtype=np.int32), [])
+        column.codes = column.codes_for(values)
+        return column
+
+    def codes_for(self, values: Iterable[Any]) -> np.ndarray:
+        """Codes for ``values``, extending the label table as needed."""
+        values = values if isinstance(values, list) else list(values)
+        # Fast path: every value is already a known label or a missing marker.
+        known = {None: -1, **dict.fromkeys(_MISSING_TEXT, -1), **self._lookup}
+        try:
+            return np.array([known[value] for value in values], dtype=np.int32)
+        except (KeyError, TypeError):  # new labels, or values that are not strings
+            pass
+        lookup = self._lookup
+        labels = self.labels
+        codes = []
+        for value in values:
+            if value is None or (label := str(value)) in _MISSING_TEXT:
+                codes.append(-1)
+                continue
+            code = lookup.get(label)
+            if code is None:
+                code = lookup[label] = len(labels)
+                labels.append(label)
+            codes.append(code)
+        return np.fromiter(codes, dtype=np.int32, count=len(codes))
+
+    def code_of(self, label: Any) -> int | None:
+        return self._lookup.get(str(label))
+
+    def decode(self, code: int) -> str | None:
+        return self.labels[code] if code >= 0 else None
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(label) for label in self.labels)
+
+
+class ModelReplica:
+    """Columnar, in-memory copy of element data pulled from Revit.
+
+    Rows are kept sorted by element ID. Built-in columns come from
+    ``revit.get_elements_by_type``; any parameters pulled alongside them are
+    stored as extra categorical columns. Every answer carries ``pulled_at`` and
+    ``age_seconds`` so callers can judge whether the snapshot is fresh enough.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.text: dict[str, Categorical] = {}
+        self.ints: dict[str, np.ndarray] = {}
+        self.floats: dict[str, np.ndarray] = {}
+        self.parameters: dict[str, Categorical] = {}
+        self.pulled_at: datetime | None = None
+        self.full_pull_at: datetime | None = None
+        self.document: str | None = None
+        # Where incremental sync resumes, and what the last full pull covered.
+        self.cursor: str | None = None
+        self.categories: list[str] | None = None
+        self.parameter_names: list[str] = []
+        self._spatial: OrderedDict[bytes, tuple[np.ndarray, BoxIndex]] = OrderedDict()
+
+    # -- loading -----------------------------------------------------------
+
+    def load(
+        self,
+        records: Sequence[Mapping[str, Any]],
+        parameters: Mapping[int, Mapping[str, Any]] | None = None,
+        *,
+        document: str | None = None,
+        pulled_at: datetime | None = None,
+    ) -> None:
+        """Replace the replica with ``records`` (element dicts from the bridge).
+
+        ``parameters`` maps element IDs to ``{parameter name: value}``.
+        """
+        ids, records = _sorted_by_id(records)
+        parameter_names = sorted({name for values in (parameters or {}).values() for name in values})
+        text = {name: Categorical.encode(()) for name in TEXT_COLUMNS}
+        params = {name: Categorical.encode(()) for name in parameter_names}
+        codes, ints, floats, param_codes = _encode_rows(records, ids, parameters, text, params)
+        for name, column in text.items():
+            column.codes = codes[name]
+        for name, column in params.items():
+            column.codes = param_codes[name]
+
+        with self._lock:
+            self.ids = ids
+            self.text, self.ints, self.floats, self.parameters = text, ints, floats, params
+            self.document = document
+            self.pulled_at = pulled_at or datetime.now(timezone.utc)
+            self.full_pull_at = self.pulled_at
+            self._spatial.clear()
+
+    def clear(self) -> None:
+        """Drop every row and the sync state, e.g. when another document becomes active."""
+        with self._lock:
+            self.ids = np.empty(0, dtype=np.int64)
+            self.text, self.ints, self.floats, self.parameters = {}, {}, {}, {}
+            self.pulled_at = self.full_pull_at = None
+            self.document = self.cursor = None
+            self.categories = None
+            self.parameter_names = []
+            self._spatial.clear()
+
+    def apply_changes(
+        self,
+        records: Sequence[Mapping[str, Any]],
+        parameters: Mapping[int, Mapping[str, Any]] | None = None,
+        deleted: Iterable[int] = (),
+        *,
+        synced_at: datetime | None = None,
+    ) -> dict[str, int]:
+        """Patch the replica in place: drop ``deleted`` IDs, upsert ``records``.
+
+        Existing rows are overwritten where they sit and new rows are inserted
+        at their sorted position, so no column is rebuilt from scratch.
+        Parameter columns keep the set pulled originally.
+        """
+        with self._lock:
+            self._require_loaded()
+            removed = np.asarray(list(deleted), dtype=np.int64)
+            before = len(self.ids)
+            if len(removed):
+                self._take(~np.isin(self.ids, removed))
+            deleted_count = before - len(self.ids)
+
+            ids, records = _sorted_by_id(records)
+            codes, ints, floats, param_codes = _encode_rows(
+                records, ids, parameters, self.text, self.parameters
+            )
+            positions = np.searchsorted(self.ids, ids)
+            existing = np.zeros(len(ids), dtype=bool)
+            in_range = positions < len(self.ids)
+            existing[in_range] = self.ids[positions[in_range]] == ids[in_range]
+
+            rows, fresh, slots = positions[existing], ~existing, positions[~existing]
+
+            def patch(column: np.ndarray, values: np.ndarray) -> np.ndarray:
+                column[rows] = values[existing]
+                return np.insert(column, slots, values[fresh])
+
+            for name, column in self.text.items():
+                column.codes = patch(column.codes, codes[name])
+            for name, column in self.parameters.items():
+                column.codes = patch(column.codes, param_codes[name])
+            for name in self.ints:
+                self.ints[name] = patch(self.ints[name], ints[name])
+            for name in self.floats:
+                self.floats[name] = patch(self.floats[name], floats[name])
+            self.ids = np.insert(self.ids, slots, ids[fresh])
+
+            self.pulled_at = synced_at or datetime.now(timezone.utc)
+            self._spatial.clear()
+            return {
+                "updated": int(np.count_nonzero(existing)),
+                "added": int(np.count_nonzero(fresh)),
+                "deleted": deleted_count,
+            }
+
+    # -- queries -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def loaded(self) -> bool:
+        return self.pulled_at is not None
+
+    def freshness(self) -> dict[str, Any]:
+        if self.pulled_at is None:
+            return {"pulled_at": None, "age_seconds": None}
+        age = (datetime.now(timezone.utc) - self.pulled_at).total_seconds()
+        return {"pulled_at": self.pulled_at.isoformat(), "age_seconds": round(age, 3)}
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "document": self.document,
+                "elements": len(self.ids),
+                "categories": len(self.text["category"].labels) if self.text else 0,
+                "parameters": sorted(self.parameters),
+                "memory_bytes": self.nbytes,
+                "full_pull_at": self.full_pull_at.isoformat() if self.full_pull_at else None,
+                "incremental_sync": self.cursor is not None,
+                **self.freshness(),
+            }
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.ids.nbytes
+            + sum(column.nbytes for column in self.text.values())
+            + sum(column.nbytes for column in self.parameters.values())
+            + sum(column.nbytes for column in self.ints.values())
+            + sum(column.nbytes for column in self.floats.values())
+        )
+
+    def mask(self, filters: Mapping[str, Any] | None = None) -> np.ndarray:
+        """Boolean row mask for ``filters``.
+
+        A filter value may be a scalar (equality), a list (membership) or, for
+        numeric columns, ``{"min": ..., "max": ...}`` (inclusive range).
+        """
+        self._require_loaded()
+        mask = np.ones(len(self.ids), dtype=bool)
+        for field, condition in (filters or {}).items():
+            mask &= self._match(field, condition)
+        return mask
+
+    def count(self, filters: Mapping[str, Any] | None = None) -> dict[str, Any]:
+        with self._lock:
+            return {"count": int(np.count_nonzero(self.mask(filters))), **self.freshness()}
+
+    def query(
+        self,
+        filters: Mapping[str, Any] | None = None,
+        fields: Sequence[str] | None = None,
+        offset: int = 0,
+        limit: int = 200,
+    ) -> dict[str, Any]:
+        with self._lock:
+            rows = np.flatnonzero(self.mask(filters))
+            page = rows[offset : offset + limit]
+            elements = self._elements(page, fields)
+            return {
+                "total": int(len(rows)),
+                "returned": len(elements),
+                "offset": offset,
+                "elements": elements,
+                **self.freshness(),
+            }
+
+    def group_by(
+        self,
+        by: str,
+        filters: Mapping[str, Any] | None = None,
+        sum_fields: Sequence[str] = (),
+    ) -> dict[str, Any]:
+        """Count rows, and optionally sum numeric columns, per value of ``by``."""
+        with self._lock:
+            mask = self.mask(filters)
+            column = self._categorical(by)
+            if column is not None:
+                codes, labels = column.codes[mask], column.labels
+                # Shift so missing (-1) lands in bucket 0.
+                buckets = codes + 1
+                size = len(labels) + 1
+                label_of = lambda bucket: labels[bucket - 1] if bucket else None  # noqa: E731
+            elif by in self.ints:
+                values, buckets = np.unique(self.ints[by][mask], return_inverse=True)
+                size = len(values)
+                label_of = lambda bucket: int(values[bucket])  # noqa: E731
+            else:
+                raise ReplicaError(f"Cannot group by '{by}'; use a text, parameter or integer column")
+
+            counts = np.bincount(buckets, minlength=size)
+            sums = {}
+            for field in sum_fields:
+                if field not in self.floats:
+                    raise ReplicaError(f"Cannot sum '{field}'; numeric columns are {list(self.floats)}")
+                weights = np.nan_to_num(self.floats[field][mask])
+                sums[field] = np.bincount(buckets, weights=weights, minlength=size)
+
+            groups = [
+                {
+                    by: label_of(bucket),
+                    "count": int(counts[bucket]),
+                    **{f"sum_{field}": float(total[bucket]) for field, total in sums.items()},
+                }
+                for bucket in np.flatnonzero(counts)
+            ]
+            groups.sort(key=lambda group: group["count"], reverse=True)
+            return {"by": by, "groups": groups, **self.freshness()}
+
+    # -- spatial queries ---------------------------------------------------
+
+    def spatial_index(self, filters: Mapping[str, Any] | None = None) -> tuple[np.ndarray, BoxIndex]:
+        """Rows matching ``filters`` that have a bounding box, and an index over them.
+
+        Built on first use and reused until the replica is reloaded or synced.
+        """
+        with self._lock:
+            key = codec.dumps(filters or {})
+            cached = self._spatial.get(key)
+            if cached is not None:
+                self._spatial.move_to_end(key)
+                return cached
+            boxes = np.column_stack([self.floats[name] for name in BOX_COLUMNS])
+            has_box = ~np.isnan(boxes).any(axis=1)
+            if len(boxes) and not has_box.any():
+                raise ReplicaError("The model replica holds no bounding boxes; run revit_replica_refresh again")
+            rows = np.flatnonzero(self.mask(filters) & has_box)
+            cached = self._spatial[key] = (rows, BoxIndex(boxes[rows]))
+            if len(self._spatial) > _SPATIAL_CACHE_SIZE:
+                self._spatial.popitem(last=False)
+            return cached
+
+    def in_box(
+        self,
+        box: Sequence[float],
+        filters: Mapping[str, Any] | None = None,
+        tolerance: float = 0.0,
+        fields: Sequence[str] | None = None,
+        limit: int = 200,
+    ) -> dict[str, Any]:
+        """Elements whose bounding box overlaps ``box`` (min x/y/z, max x/y/z)."""
+        with self._lock:
+            rows, index = self.spatial_index(filters)
+            hits = rows[index.overlapping(box, tolerance)]
+            return {"total": int(len(hits)), "elements": self._elements(hits[:limit], fields), **self.freshness()}
+
+    def at_point(
+        self,
+        point: Sequence[float],
+        filters: Mapping[str, Any] | None = None,
+        tolerance: float = 0.0,
+        fields: Sequence[str] | None = None,
+        limit: int = 200,
+    ) -> dict[str, Any]:
+        """Elements whose bounding box contains ``point``."""
+        with self._lock:
+            rows, index = self.spatial_index(filters)
+            hits = rows[index.containing(point, tolerance)]
+            return {"total": int(len(hits)), "elements": self._elements(hits[:limit], fields), **self.freshness()}
+
+    def nearest(
+        self,
+        point: Sequence[float],
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> dict[str, Any]:
+        """The ``k`` elements whose bounding boxes are closest to ``point``."""
+        with self._lock:
+            rows, index = self.spatial_index(filters)
+            found, distances = index.nearest(point, k)
+            elements = self._elements(rows[found], fields)
+            for element, distance in zip(elements, distances.tolist()):
+                element["distance"] = distance
+            return {"elements": elements, **self.freshness()}
+
+    def clash_candidates(
+        self,
+        filters_a: Mapping[str, Any] | None = None,
+        filters_b: Mapping[str, Any] | None = None,
+        tolerance: float = 0.0,
+    ) -> np.ndarray:
+        """Element ID pairs, shape ``(n, 2)``, whose boxes overlap within ``tolerance``.
+
+        With ``filters_b`` omitted, set A is checked against itself.
+        """
+        with self._lock:
+            rows_a, index_a = self.spatial_index(filters_a)
+            if filters_b is None:
+                left, right = index_a.pairs(tolerance=tolerance)
+                rows_b = rows_a
+            else:
+                rows_b, index_b = self.spatial_index(filters_b)
+                left, right = index_a.pairs(index_b, tolerance)
+            pairs = np.column_stack([self.ids[rows_a[left]], self.ids[rows_b[right]]])
+            # The same element in both sets is not a clash.
+            return pairs[pairs[:, 0] != pairs[:, 1]]
+
+    # -- internals ---------------------------------------------------------
+
+    def _require_loaded(self) -> None:
+        if not self.loaded:
+            raise ReplicaError("The model replica is empty; run revit_replica_refresh first")
+
+    def _take(self, keep: np.ndarray) -> None:
+        self.ids = self.ids[keep]
+        for column in (*self.text.values(), *self.parameters.values()):
+            column.codes = column.codes[keep]
+        for columns in (self.ints, self.floats):
+            for name in columns:
+                columns[name] = columns[name][keep]
+
+    def _elements(self, rows: np.ndarray, fields: Sequence[str] | None) -> list[dict[str, Any]]:
+        columns = list(fields) if fields else [*BUILTIN_COLUMNS, *self.parameters]
+        for field in columns:
+            self._column_kind(field)
+        return [dict(zip(columns, values)) for values in zip(*(self._values(f, rows) for f in columns))]
+
+    def _categorical(self, field: str) -> Categorical | None:
+        return self.text.get(field) or self.parameters.get(field)
+
+    def _column_kind(self, field: str) -> str:
+        if field == "id" or field == "element_id":
+            return "id"
+        if self._categorical(field) is not None:
+            return "text"
+        if field in self.ints:
+            return "int"
+        if field in self.floats:
+            return "float"
+        raise ReplicaError(f"Unknown replica column '{field}'")
+
+    def _match(self, field: str, condition: Any) -> np.ndarray:
+        kind = self._column_kind(field)
+        if kind == "text":
+            column = self._categorical(field)
+            labels = condition if isinstance(condition, list) else [condition]
+            codes = [code for code in (column.code_of(label) for label in labels) if code is not None]
+            return np.isin(column.codes, codes)
+
+        values = self.ids if kind == "id" else self.ints.get(field, self.floats.get(field))
+        if isinstance(condition, Mapping):
+            mask = np.ones(len(values), dtype=bool)
+            if condition.get("min") is not None:
+                mask &= values >= condition["min"]
+            if condition.get("max") is not None:
+                mask &= values <= condition["max"]
+            return mask
+        if isinstance(condition, list):
+            return np.isin(values, condition)
+        return values == condition
+
+    def _values(self, field: str, rows: np.ndarray) -> list[Any]:
+        kind = self._column_kind(field)
+        if kind == "id":
+            return self.ids[rows].tolist()
+        if kind == "text":
+            column = self._categorical(field)
+            return [column.decode(code) for code in column.codes[rows].tolist()]
+        if kind == "int":
+            return [value if value >= 0 else None for value in self.ints[field][rows].tolist()]
+        return [None if value != value else value for value in self.floats[field][rows].tolist()]
+
+
+def _sorted_by_id(records: Sequence[Mapping[str, Any]]) -> tuple[np.ndarray, list[Mapping[str, Any]]]:
+    # Overlapping pages can repeat an element; the last copy wins.
+    unique = list({int(record["id"]): record for record in records}.items())
+    ids = np.fromiter((element_id for element_id, _ in unique), dtype=np.int64, count=len(unique))
+    order = np.argsort(ids)
+    return ids[order], [unique[index][1] for index in order]
+
+
+def _encode_rows(
+    records: Sequence[Mapping[str, Any]],
+    ids: np.ndarray,
+    parameters: Mapping[int, Mapping[str, Any]] | None,
+    text: Mapping[str, Categorical],
+    params: Mapping[str, Categorical],
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray], dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Column arrays for ``records``, coded against the given label tables."""
+    count = len(records)
+    codes = {name: column.codes_for(record.get(name) for record in records) for name, column in text.items()}
+    ints = {
+        name: np.fromiter((_as_int(record.get(name)) for record in records), dtype=np.int64, count=count)
+        for name in INT_COLUMNS
+    }
+    floats = {
+        name: np.fromiter((_as_float(record.get(name)) for record in records), dtype=np.float64, count=count)
+        for name in FLOAT_COLUMNS
+    }
+    floats.update(zip(BOX_COLUMNS, boxes_from_records(records).T.copy()))
+    values = parameters or {}
+    param_codes = {
+        name: column.codes_for(values.get(element_id, {}).get(name) for element_id in ids.tolist())
+        for name, column in params.items()
+    }
+    return codes, ints, floats, param_codes
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
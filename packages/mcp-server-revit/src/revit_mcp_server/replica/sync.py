@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Mapping, Protocol, Sequence
+
+from ..errors import BridgeError
+from .store import FLOAT_COLUMNS, INT_COLUMNS, TEXT_COLUMNS, ModelReplica
+
+logger = logging.getLogger(__name__)
+
+# The add-in caps get_elements_by_type pages at 500 rows.
+PAGE_SIZE = 500
+# Element IDs per batch_export_to_csv call when pulling parameter values.
+PARAMETER_BATCH = 2000
+# Candidate pairs per revit.check_clashes call when verifying clashes.
+CLASH_BATCH = 500
+
+_FIELDS = [*TEXT_COLUMNS, *INT_COLUMNS, *FLOAT_COLUMNS, "bounding_box"]
+
+
+class ToolCaller(Protocol):
+    def call_tool(self, tool: str, payload: dict[str, Any]) -> dict[str, Any]:
+        ...
+
+
+def iter_element_pages(
+    call: Callable[[str, dict[str, Any]], dict[str, Any]],
+    categories: Sequence[str | None] | None = None,
+    fields: Sequence[str] = _FIELDS,
+    page_size: int = PAGE_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield ``revit.get_elements_by_type`` pages for the given categories.
+
+    ``call`` is the bridge's ``call_tool`` (or ``send_tool``); pages are
+    yielded as they arrive so callers can stream them to disk.
+    """
+    for category in categories or [None]:
+        offset = 0
+        while True:
+            page = call(
+                "revit.get_elements_by_type",
+                {"category": category, "fields": list(fields), "offset": offset, "limit": page_size},
+            )
+            elements = page.get("elements", [])
+            if elements:
+                yield elements
+            offset += len(elements)
+            if not elements or not page.get("truncated"):
+                break
+
+
+def fetch_elements(
+    bridge: ToolCaller,
+    categories: Sequence[str] | None = None,
+    page_size: int = PAGE_SIZE,
+) -> list[dict[str, Any]]:
+    """Page through ``revit.get_elements_by_type`` for the given categories."""
+    return [
+        record
+        for page in iter_element_pages(bridge.call_tool, categories, page_size=page_size)
+        for record in page
+    ]
+
+
+def fetch_elements_by_id(
+    bridge: ToolCaller,
+    element_ids: Sequence[int],
+    categories: Sequence[str] | None = None,
+    page_size: int = PAGE_SIZE,
+) -> list[dict[str, Any]]:
+    """Re-read specific elements; IDs that no longer exist are simply absent."""
+    records: list[dict[str, Any]] = []
+    for category in categories or [None]:
+        for start in range(0, len(element_ids), page_size):
+            page = bridge.call_tool(
+                "revit.get_elements_by_type",
+                {
+                    "element_ids": list(element_ids[start : start + page_size]),
+                    "category": category,
+                    "fields": _FIELDS,
+                    "limit": page_size,
+                },
+            )
+            records.extend(page.get("elements", []))
+    return records
+
+
+def fetch_parameters(
+    call: Callable[[str, dict[str, Any]], dict[str, Any]],
+    element_ids: Sequence[int],
+    parameter_names: Sequence[str],
+    batch_size: int = PARAMETER_BATCH,
+) -> dict[int, dict[str, Any]]:
+    """Pull parameter values with ``revit.batch_export_to_csv``, in batches.
+
+    ``call`` is the bridge's ``call_tool`` (or ``send_tool``), as for
+    :func:`iter_element_pages`.
+    """
+    values: dict[int, dict[str, Any]] = {}
+    for start in range(0, len(element_ids), batch_size):
+        result = call(
+            "revit.batch_export_to_csv",
+            {"element_ids": list(element_ids[start : start + batch_size]), "parameter_names": list(parameter_names)},
+        )
+        for row in result.get("data", []):
+            values[int(row["ElementId"])] = {name: row.get(name) for name in parameter_names}
+    return values
+
+
+def pull_full(
+    replica: ModelReplica,
+    bridge: ToolCaller,
+    categories: Sequence[str] | None = None,
+    parameter_names: Sequence[str] = (),
+    document: str | None = None,
+) -> dict[str, Any]:
+    """Rebuild ``replica`` from a complete bulk pull and report what was loaded.
+
+    ``document`` defaults to the active document the change journal reports.
+    """
+    started = datetime.now(timezone.utc)
+    # Take the change cursor before paging so edits made mid-pull are replayed
+    # by the next sync rather than lost.
+    cursor, active = _current_cursor(bridge)
+    document = document or active
+    records = fetch_elements(bridge, categories)
+    parameters = None
+    if parameter_names:
+        parameters = fetch_parameters(bridge.call_tool, [int(record["id"]) for record in records], parameter_names)
+    # Stamp the snapshot with the start of the pull: edits made while paging
+    # may or may not be included, so it is only guaranteed fresh up to here.
+    replica.load(records, parameters, document=document, pulled_at=started)
+    replica.cursor = cursor
+    replica.categories = list(categories) if categories else None
+    replica.parameter_names = list(parameter_names)
+    logger.info("Model replica loaded %d elements", len(replica))
+    return replica.status()
+
+
+def sync_changes(replica: ModelReplica, bridge: ToolCaller) -> dict[str, Any]:
+    """Bring ``replica`` up to date with ``revit.get_document_changes``.
+
+    Only elements added, modified or deleted since the replica's cursor are
+    fetched. Falls back to a full pull when the bridge cannot serve a delta
+    (no cursor yet, Revit restarted, the change journal overflowed, or
+    another document is active now).
+    """
+    started = datetime.now(timezone.utc)
+    if replica.cursor is None:
+        return {"mode": "full", **pull_full(replica, bridge, replica.categories, replica.parameter_names)}
+
+    changes = bridge.call_tool("revit.get_document_changes", {"cursor": replica.cursor})
+    active = changes.get("document")
+    if active is not None and replica.document is not None and active != replica.document:
+        logger.info("Active document is now %r; re-pulling the model replica", active)
+        return {"mode": "full", **pull_full(replica, bridge, replica.categories, replica.parameter_names)}
+    if changes.get("reset"):
+        logger.info("Change cursor expired; re-pulling the model replica")
+        return {"mode": "full", **pull_full(replica, bridge, replica.categories, replica.parameter_names)}
+
+    changed = [int(element_id) for element_id in changes.get("changed", [])]
+    records = fetch_elements_by_id(bridge, changed, replica.categories) if changed else []
+    parameters = None
+    if records and replica.parameter_names:
+        parameters = fetch_parameters(
+            bridge.call_tool, [int(record["id"]) for record in records], replica.parameter_names
+        )
+    # Changed IDs that came back empty were deleted since, or fall outside the
+    # replica's categories; either way they must not linger.
+    returned = {int(record["id"]) for record in records}
+    deleted = [int(element_id) for element_id in changes.get("deleted", [])]
+    deleted += [element_id for element_id in changed if element_id not in returned]
+
+    counts = replica.apply_changes(records, parameters, deleted, synced_at=started)
+    replica.cursor = changes.get("cursor", replica.cursor)
+    return {"mode": "incremental", **counts, **replica.freshness()}
+
+
+def find_clashes(
+    replica: ModelReplica,
+    bridge: ToolCaller | None,
+    filters_a: Mapping[str, Any] | None = None,
+    filters_b: Mapping[str, Any] | None = None,
+    tolerance: float = 0.0,
+    verify: bool = True,
+    limit: int = 500,
+) -> dict[str, Any]:
+    """Clashes between two element sets, prefiltered on the replica's bounding boxes.
+
+    Only box-overlap candidates are sent to ``revit.check_clashes`` for the
+    exact geometry test, in batches. Without ``verify`` (or a bridge) the
+    candidates themselves are returned.
+    """
+    candidates = replica.clash_candidates(filters_a, filters_b, tolerance)
+    result: dict[str, Any] = {"candidates": int(len(candidates)), "verified": bool(verify and bridge)}
+    if not result["verified"]:
+        result["clashes"] = [
+            {"element1_id": a, "element2_id": b, "clash_type": "bounding_box_intersection"}
+            for a, b in candidates[:limit].tolist()
+        ]
+        result["clash_count"] = result["candidates"]
+        return {**result, **replica.freshness()}
+
+    clashes: list[dict[str, Any]] = []
+    count = 0
+    for start in range(0, len(candidates), CLASH_BATCH):
+        batch = bridge.call_tool(
+            "revit.check_clashes",
+            {"pairs": candidates[start : start + CLASH_BATCH].tolist(), "tolerance": tolerance},
+        )
+        count += batch.get("clash_count", 0)
+        clashes.extend(batch.get("clashes", [])[: max(limit - len(clashes), 0)])
+    return {**result, "clash_count": count, "clashes": clashes, **replica.freshness()}
+
+
+def _current_cursor(bridge: ToolCaller) -> tuple[str | None, str | None]:
+    """The change cursor and the document it belongs to."""
+    try:
+        result = bridge.call_tool("revit.get_document_changes", {"cursor": None})
+    except BridgeError as exc:
+        # Older add-ins: every later sync becomes a full pull.
+        logger.info("Bridge has no change journal, incremental sync disabled: %s", exc)
+        return None, None
+    return result.get("cursor"), result.get("document")
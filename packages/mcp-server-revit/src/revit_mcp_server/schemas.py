@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -53,55 +53,145 @@ class ListViewsOutput(BaseModel):
 
 class ExportSchedulesInput(RequestPayload):
     output_path: str
+    schedule_ids: Optional[List[int]] = None
+    schedule_names: Optional[List[str]] = None
+    page_size: int = Field(default=1000, ge=1, le=2000)
+
+
+class ExportedSchedule(BaseModel):
+    schedule_id: int
+    name: str
+    rows: int
+    columns: int
+    file: str
+
+
+class ExportedFile(BaseModel):
+    path: str
+    sha256: str
+    bytes: int
 
 
 class ExportSchedulesOutput(BaseModel):
     schedules: List[str]
     output_path: str
+    rows: int = 0
+    exported: List[ExportedSchedule] = Field(default_factory=list)
+    files: List[ExportedFile] = Field(default_factory=list)
 
 
 class ExportQuantitiesInput(RequestPayload):
     output_path: str
+    categories: Optional[List[str]] = None
+    group_by: List[Literal["category", "level", "material", "phase"]] = Field(
+        default_factory=lambda: ["category", "level", "material", "phase"]
+    )
 
 
 class ExportQuantitiesOutput(BaseModel):
     categories_exported: int
     output_path: str
+    format: str = "csv"
+    elements: int = 0
+    rows: int = 0
+    groups: int = 0
 
 
 class BaselineExportInput(RequestPayload):
     output_path: str
+    categories: Optional[List[str]] = None
 
 
 class BaselineExportOutput(BaseModel):
     snapshot_id: str
     output_path: str
+    element_count: int = 0
 
 
 class BaselineDiffInput(RequestPayload):
     baseline_a: str
     baseline_b: str
+    report_path: Optional[str] = None
+    max_differences: int = 200
 
 
 class BaselineDiffOutput(BaseModel):
     differences: List[str]
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    changed_parameters: Dict[str, int] = Field(default_factory=dict)
+    report_path: Optional[str] = None
+
+
+class BaselineHistoryInput(RequestPayload):
+    baselines: List[str]
+    unique_ids: List[str]
+
+
+class BaselineHistoryOutput(BaseModel):
+    history: List[Dict[str, Any]]
 
 
 class SheetBatchInput(RequestPayload):
     csv_path: str
 
 
+class SheetBatchFromCsvInput(SheetBatchInput):
+    titleblock_name: Optional[str] = None
+    chunk_size: int = Field(default=50, ge=1, le=500)
+    target_seconds: float = Field(default=10.0, gt=0, le=25)
+    resume: bool = False
+    checkpoint_path: Optional[str] = None
+    max_errors: int = Field(default=100, ge=0)
+
+
 class SheetBatchOutput(BaseModel):
     sheets_created: int
+    complete: bool = True
+    rows_read: int = 0
+    skipped_existing: int = 0
+    skipped_duplicate: int = 0
+    invalid: int = 0
+    failed: int = 0
+    chunks: int = 0
+    chunk_size: int = 0
+    errors: List[str] = Field(default_factory=list)
+    checkpoint_path: Optional[str] = None
 
 
 class PrintSetInput(RequestPayload):
     sheet_set: str
 
 
+class PublishInput(RequestPayload):
+    csv_path: Optional[str] = None
+    sheet_numbers: Optional[List[str]] = None
+    output_dir: Optional[str] = None
+    name: str = "publish"
+    sheets_per_call: int = Field(default=4, ge=1, le=20)
+    force: bool = False
+    merge: bool = False
+    zip: bool = False
+    dwg_version: str = "AutoCAD2018"
+    ifc_version: str = "IFC2x3"
+    ifc_view_id: Optional[int] = None
+    max_errors: int = Field(default=100, ge=0)
+
+
 class ExportResult(BaseModel):
     file_path: str
     status: str
+    units: int = 0
+    exported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bridges: int = 0
+    manifest_path: Optional[str] = None
+    merged_path: Optional[str] = None
+    archive_path: Optional[str] = None
+    errors: List[str] = Field(default_factory=list)
 
 
 class GenericAuditInput(RequestPayload):
@@ -113,4 +203,36 @@ class GenericAuditOutput(BaseModel):
     severity: str = "info"
 
 
+class AuditInput(GenericAuditInput):
+    categories: Optional[List[str]] = None
+    rules: List[Dict[str, Any]] = Field(default_factory=list, description="Rule specs replacing the audit's defaults")
+    required_parameters: List[str] = Field(default_factory=list)
+    output_path: Optional[str] = Field(default=None, description="JSON Lines report of every finding")
+    workers: Optional[int] = Field(default=None, ge=1)
+
+
+class AuditOutput(GenericAuditOutput):
+    elements: int = 0
+    rules: int = 0
+    by_rule: Dict[str, int] = Field(default_factory=dict)
+    by_category: Dict[str, int] = Field(default_factory=dict)
+    by_severity: Dict[str, int] = Field(default_factory=dict)
+    issues: List[Dict[str, Any]] = Field(default_factory=list)
+    report_path: Optional[str] = None
+
+
+class RoomCompletenessInput(GenericAuditInput):
+    levels: Optional[List[str]] = None
+    min_area: float = Field(default=1.0, ge=0, description="Smallest acceptable room area, square feet")
+    area_tolerance: float = Field(default=0.02, ge=0, description="Allowed relative gap between boundary and Revit areas")
+
+
+class RoomCompletenessOutput(GenericAuditOutput):
+    document: Optional[str] = None
+    rooms: int = 0
+    by_issue: Dict[str, int] = Field(default_factory=dict)
+    area_by_level: Dict[str, float] = Field(default_factory=dict)
+    issues: List[Dict[str, Any]] = Field(default_factory=list)
+
+
 """: Additional tool schemas can follow this pattern and reuse GenericAuditInput/Output when appropriate."""
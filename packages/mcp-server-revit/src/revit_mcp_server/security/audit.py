@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .. import codec
 from ..schemas import HealthOutput
 
 class AuditRecorder:
@@ -11,13 +11,14 @@ class AuditRecorder:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
-    def record(self, tool: str, request_id: str, payload: dict, response: dict) -> None:
+    def record(self, tool: str, request_id: str, payload: dict, response: dict | None = None) -> None:
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "tool": tool,
             "request_id": request_id,
             "payload": payload,
-            "response": response,
         }
-        with self.path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(entry) + "\n")
+        if response is not None:
+            entry["response"] = response
+        with self.path.open("ab") as fh:
+            fh.write(codec.dumps(entry) + b"\n")
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import io
-import json
 import sys
 from typing import Callable, Dict, Protocol
 
-from .bridge import BridgeClient, MockBridge
+from . import codec
+from .bridge import BridgeClient, BridgePool, MockBridge, QueryCache
+from .bridge.cache import CACHE_FILE
 from .config import BridgeMode, Config, config
 from .security.audit import AuditRecorder
 from .security.workspace import WorkspaceMonitor
-from .tools import TOOL_HANDLERS
+from .tools import LOCAL_TOOLS, TOOL_HANDLERS, validate_payload
 
 
 class BridgeTransport(Protocol):
@@ -42,10 +43,36 @@ class MCPServer:
         factory: Callable[[str], BridgeTransport] | None,
     ) -> BridgeTransport:
         if self.config.mode == BridgeMode.bridge:
-            if not self.config.bridge_url:
-                raise ValueError("Bridge mode requires MCP_REVIT_BRIDGE_URL")
-            bridge_factory = factory or (lambda url: BridgeClient(url))
-            bridge = bridge_factory(self.config.bridge_url)
+            urls = self.config.resolved_bridge_urls()
+            if not urls:
+                raise ValueError("Bridge mode requires MCP_REVIT_BRIDGE_URL or MCP_REVIT_BRIDGE_URLS")
+            cache = (
+                QueryCache(self.config.workspace_dir / CACHE_FILE, self.config.query_cache_max_bytes)
+                if self.config.query_cache
+                else None
+            )
+            if len(urls) > 1:
+                bridge_factory = factory or (
+                    lambda url: BridgeClient(
+                        url,
+                        retries=1,
+                        compression_min_bytes=self.config.bridge_compression_min_bytes,
+                        cache=cache,
+                    )
+                )
+                bridge = BridgePool(
+                    [bridge_factory(url) for url in urls],
+                    health_interval=self.config.bridge_health_interval,
+                )
+            else:
+                bridge_factory = factory or (
+                    lambda url: BridgeClient(
+                        url,
+                        compression_min_bytes=self.config.bridge_compression_min_bytes,
+                        cache=cache,
+                    )
+                )
+                bridge = bridge_factory(urls[0])
             # Initialize bridge connection and fetch tool catalog
             if hasattr(bridge, 'initialize'):
                 bridge.initialize()
@@ -57,8 +84,12 @@ class MCPServer:
         if handler is None:
             raise ValueError(f"Unknown tool {tool_name}")
 
-        if self.config.mode == BridgeMode.bridge:
-            handler(payload, self.workspace)
+        if tool_name in LOCAL_TOOLS:
+            bridge = self.bridge if self.config.mode == BridgeMode.bridge else None
+            response = handler(payload, self.workspace, bridge)
+        elif self.config.mode == BridgeMode.bridge:
+            # Revit does the work; only check the payload and its paths here.
+            validate_payload(tool_name, payload, self.workspace)
             response = self.bridge.send_tool(tool_name, payload)
         else:
             response = handler(payload, self.workspace)
@@ -77,19 +108,30 @@ class MCPServer:
         stdout.write("Revit MCP server started. Awaiting JSON requests.\n")
         stdout.flush()
 
-        while line := stdin.readline():
+        # Work on the underlying byte streams when available so requests are
+        # decoded from, and responses encoded to, bytes without a str copy.
+        reader = getattr(stdin, "buffer", stdin)
+        writer = getattr(stdout, "buffer", None)
+
+        while line := reader.readline():
             line = line.strip()
             if not line:
                 continue
+            tool = None
             try:
-                request = json.loads(line)
+                request = codec.loads(line)
                 tool = request.get("tool")
                 payload = request.get("payload", {})
                 response = self.handle_tool(tool, payload)
             except Exception as exc:  # noqa: BLE001
                 response = {"status": "error", "message": str(exc)}
-            stdout.write(json.dumps({"tool": tool, "response": response}) + "\n")
-            stdout.flush()
+            message = {"tool": tool, "response": response}
+            if writer is not None:
+                writer.write(codec.dumps(message) + b"\n")
+                writer.flush()
+            else:
+                stdout.write(codec.dumps_str(message) + "\n")
+                stdout.flush()
 
 
 def run_server() -> None:
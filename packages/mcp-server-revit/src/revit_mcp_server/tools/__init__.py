@@ -1,3 +1,3 @@
-from .handlers import TOOL_HANDLERS
+from .handlers import LOCAL_TOOLS, TOOL_HANDLERS, TOOL_INPUTS, validate_payload
 
-__all__ = ["TOOL_HANDLERS"]
+__all__ = ["LOCAL_TOOLS", "TOOL_HANDLERS", "TOOL_INPUTS", "validate_payload"]
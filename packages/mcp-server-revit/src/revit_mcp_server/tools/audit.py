@@ -0,0 +1,582 @@
+"""Model audits as rules evaluated over local element and parameter data.
+
+An audit is a list of rules. Each rule is built once from a spec such as
+``{"kind": "pattern", "column": "name", "pattern": "^[A-Z]{2}_"}``; regexes are
+compiled at that point. A rule reads the columns of the model replica (or of
+one bulk pull, when no replica is at hand): ``category``, ``name``,
+``level``, ``type_id``, ``length``/``area``/``volume``, the bounding box
+and any pulled parameters. Rows are checked one category at a time with
+NumPy. Text rules test each distinct label once and index the result by
+code, so a naming rule costs one regex call per distinct name, not one per
+element.
+
+Rules are independent of each other. Over :data:`PARALLEL_MIN_ROWS`
+elements they are spread across a process pool, and each rule's findings
+are written to the JSON Lines report as soon as it finishes. Revit only
+serves the paged reads that fill the data; its UI thread is free again long
+before the rules run.
+
+New kinds of rule are added with :func:`register_rule`.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence, get_type_hints
+
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from .. import codec
+from ..errors import SchemaValidationError
+from ..replica.store import BOX_COLUMNS, Categorical, ModelReplica
+from ..replica.sync import fetch_parameters, iter_element_pages
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+SEVERITIES = ("info", "warning", "error")
+# Spawning workers and sending them the data takes a second or two, about
+# what the built-in rules cost in process on a million elements.
+PARALLEL_MIN_ROWS = 500_000
+# Findings returned inline; the report file has all of them.
+SAMPLE_SIZE = 100
+# Parameter values Revit shows for "nothing set", besides the empty string.
+MISSING_VALUES = frozenset({"<None>", "None"})
+
+# Categories whose elements should sit on a level and have geometry.
+MODEL_CATEGORIES = (
+    "Walls", "Floors", "Ceilings", "Roofs", "Doors", "Windows", "Columns", "Structural Columns",
+    "Structural Framing", "Stairs", "Railings", "Furniture", "Casework", "Generic Models",
+)
+
+
+@dataclass
+class AuditData:
+    """Element columns for an audit: text columns coded, numeric columns as arrays.
+
+    Plain arrays and label tables, so it pickles cheaply into pool workers.
+    """
+
+    ids: np.ndarray
+    text: dict[str, Categorical]
+    numbers: dict[str, np.ndarray]
+    document: str | None = None
+    # Text columns read as numbers, parsed once per distinct label.
+    _parsed: dict[str, np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_replica(cls, replica: ModelReplica) -> "AuditData":
+        return cls(
+            ids=replica.ids,
+            text={**replica.text, **replica.parameters},
+            # Integer columns use -1 for "none"; as floats that becomes NaN like the rest.
+            numbers={
+                **{name: np.where(column >= 0, column, np.nan) for name, column in replica.ints.items()},
+                **replica.floats,
+            },
+            document=replica.document,
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Mapping[str, Any]],
+        parameters: Mapping[int, Mapping[str, Any]] | None = None,
+        document: str | None = None,
+    ) -> "AuditData":
+        replica = ModelReplica()
+        replica.load(records, parameters, document=document)
+        return cls.from_replica(replica)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, rows: np.ndarray) -> "AuditData":
+        """The given rows (indices or mask); label tables stay shared."""
+        return AuditData(
+            ids=self.ids[rows],
+            text={name: Categorical(column.codes[rows], column.labels) for name, column in self.text.items()},
+            numbers={name: column[rows] for name, column in self.numbers.items()},
+            document=self.document,
+        )
+
+    @cached_property
+    def categories(self) -> dict[str, np.ndarray]:
+        """Row indices of each category, uncategorized rows under ``""``."""
+        codes = self.text["category"].codes if "category" in self.text else np.full(len(self), -1, dtype=np.int32)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else np.empty(0, int)
+        labels = self.text["category"].labels if "category" in self.text else []
+        return {
+            (labels[code] if code >= 0 else ""): rows
+            for code, rows in zip(sorted_codes[starts].tolist(), np.split(order, starts[1:]))
+        }
+
+    def has(self, column: str) -> bool:
+        return column in self.text or column in self.numbers
+
+    def missing(self, column: str) -> np.ndarray:
+        """Rows where ``column`` has no value."""
+        if column in self.numbers:
+            return np.isnan(self.numbers[column])
+        text = self._text(column)
+        blank = np.array([label in MISSING_VALUES for label in text.labels] + [True], dtype=bool)
+        return blank[text.codes]
+
+    def _text(self, column: str) -> Categorical:
+        try:
+            return self.text[column]
+        except KeyError:
+            raise SchemaValidationError(f"No column '{column}'; pull it as a parameter first") from None
+
+    def _numbers(self, column: str) -> np.ndarray:
+        """A numeric column as floats; pulled parameters arrive as text and are parsed (NaN if not a number)."""
+        if column in self.numbers:
+            return self.numbers[column]
+        if column not in self._parsed:
+            if column not in self.text:
+                raise SchemaValidationError(f"No numeric column '{column}'; pull it as a parameter first")
+            text = self.text[column]
+            values = np.array([_parse_number(label) for label in text.labels] + [np.nan], dtype=np.float64)
+            self._parsed[column] = values[text.codes]
+        return self._parsed[column]
+
+
+def _parse_number(label: str) -> float:
+    try:
+        return float(label)
+    except ValueError:
+        return np.nan
+
+
+@dataclass
+class Rule:
+    """One check. Subclasses implement :meth:`check` for a batch of rows of one category."""
+
+    name: str = ""
+    categories: tuple[str, ...] | None = None
+    severity: str = "warning"
+    message: str = ""
+
+    kind = ""
+
+    def __post_init__(self) -> None:
+        if self.severity not in SEVERITIES:
+            raise SchemaValidationError(f"Rule severity must be one of {SEVERITIES}")
+        self.name = self.name or self.kind
+        if self.categories is not None:
+            self.categories = tuple(self.categories)
+        self.compile()
+
+    def compile(self) -> None:
+        """Build what every batch reuses (regexes, lookups)."""
+
+    def columns(self) -> tuple[str, ...]:
+        """Columns the rule reads; those that are not built in get pulled as parameters."""
+        return ()
+
+    def scope(self) -> tuple[str, ...] | None:
+        """Categories whose rows the rule reads; ``None`` for every category."""
+        return self.categories
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        """Mask over ``rows`` (one category) of the rows that break the rule."""
+        raise NotImplementedError
+
+    def detail(self, data: AuditData, rows: np.ndarray) -> list[str] | None:
+        """Per-row messages for the failing ``rows``; ``None`` uses :attr:`message`."""
+        return None
+
+    def evaluate(self, data: AuditData) -> list[dict[str, Any]]:
+        """Every finding of this rule over ``data``."""
+        findings: list[dict[str, Any]] = []
+        names = data.text.get("name")
+        for category, rows in data.categories.items():
+            if self.categories is not None and category not in self.categories:
+                continue
+            failing = rows[self.check(data, rows)]
+            if not len(failing):
+                continue
+            details = self.detail(data, failing) or [self.message] * len(failing)
+            element_names = [names.decode(code) for code in names.codes[failing].tolist()] if names else [None] * len(failing)
+            findings.extend(
+                {
+                    "rule": self.name,
+                    "severity": self.severity,
+                    "category": category,
+                    "element_id": element_id,
+                    "name": name,
+                    "message": message,
+                }
+                for element_id, name, message in zip(data.ids[failing].tolist(), element_names, details)
+            )
+        return findings
+
+
+RULE_KINDS: dict[str, type[Rule]] = {}
+
+
+def register_rule(kind: str) -> Callable[[type[Rule]], type[Rule]]:
+    """Class decorator making a :class:`Rule` subclass available as ``{"kind": kind}``."""
+
+    def register(cls: type[Rule]) -> type[Rule]:
+        cls.kind = kind
+        RULE_KINDS[kind] = cls
+        return cls
+
+    return register
+
+
+def build_rule(spec: Mapping[str, Any]) -> Rule:
+    spec = dict(spec)
+    kind = spec.pop("kind", None)
+    try:
+        cls = RULE_KINDS[kind]
+    except KeyError:
+        raise SchemaValidationError(f"Unknown rule kind {kind!r}; use one of {sorted(RULE_KINDS)}") from None
+    adapters = _field_adapters(cls)
+    unknown = sorted(set(spec) - set(adapters))
+    if unknown:
+        raise SchemaValidationError(f"Rule '{kind}' does not take {unknown}")
+    # Coerces "1.5" to 1.5, and rejects "a" for a number or a bare string for a tuple.
+    for name, value in spec.items():
+        try:
+            spec[name] = adapters[name].validate_python(value)
+        except ValidationError as exc:
+            raise SchemaValidationError(f"Invalid '{kind}' rule: {name}: {exc.errors()[0]['msg']}") from None
+    try:
+        return cls(**spec)
+    except (TypeError, re.error) as exc:
+        raise SchemaValidationError(f"Invalid '{kind}' rule: {exc}") from None
+
+
+_ADAPTERS: dict[type[Rule], dict[str, TypeAdapter]] = {}
+
+
+def _field_adapters(cls: type[Rule]) -> dict[str, TypeAdapter]:
+    """A validator per field of ``cls``, built from its type annotations once."""
+    if cls not in _ADAPTERS:
+        hints = get_type_hints(cls)
+        _ADAPTERS[cls] = {field.name: TypeAdapter(hints[field.name]) for field in fields(cls)}
+    return _ADAPTERS[cls]
+
+
+@register_rule("missing_value")
+@dataclass
+class MissingValueRule(Rule):
+    """Flags elements where ``column`` is empty (``<None>`` counts as empty)."""
+
+    column: str = "level"
+
+    def compile(self) -> None:
+        self.message = self.message or f"{self.column} is not set"
+
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        return data.missing(self.column)[rows]
+
+
+@register_rule("pattern")
+@dataclass
+class PatternRule(Rule):
+    """Flags text values that do not match ``pattern`` (or that do, with ``must_match`` false).
+
+    Empty values are left to ``missing_value`` rules.
+    """
+
+    column: str = "name"
+    pattern: str = ".*"
+    must_match: bool = True
+
+    def compile(self) -> None:
+        self._regex = re.compile(self.pattern)
+        verb = "does not match" if self.must_match else "matches"
+        self.message = self.message or f"{self.column} {verb} {self.pattern}"
+
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        text = data._text(self.column)
+        # One regex call per distinct label; the trailing False is for code -1.
+        matches = np.fromiter(
+            (self._regex.search(label) is not None for label in text.labels), dtype=bool, count=len(text.labels)
+        )
+        broken = np.append(matches != self.must_match, False)
+        return broken[text.codes[rows]]
+
+
+@register_rule("range")
+@dataclass
+class RangeRule(Rule):
+    """Flags numeric values outside ``[min, max]``; missing values are not flagged."""
+
+    column: str = "length"
+    min: float | None = None
+    max: float | None = None
+
+    def compile(self) -> None:
+        self.message = self.message or f"{self.column} outside [{self.min}, {self.max}]"
+
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        values = data._numbers(self.column)[rows]
+        broken = np.zeros(len(rows), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if self.min is not None:
+                broken |= values < self.min
+            if self.max is not None:
+                broken |= values > self.max
+        return broken
+
+    def detail(self, data: AuditData, rows: np.ndarray) -> list[str]:
+        return [f"{self.column} is {value:g}" for value in data._numbers(self.column)[rows].tolist()]
+
+
+@register_rule("duplicate")
+@dataclass
+class DuplicateRule(Rule):
+    """Flags elements of one category that repeat an earlier element's ``keys`` columns.
+
+    Rows missing any of the columns are skipped.
+    """
+
+    keys: tuple[str, ...] = ("type_id", *BOX_COLUMNS)
+    decimals: int = 4
+
+    def compile(self) -> None:
+        self.keys = tuple(self.keys)
+        self.message = self.message or f"same {', '.join(self.keys)} as another element"
+
+    def columns(self) -> tuple[str, ...]:
+        return self.keys
+
+    def _keys(self, data: AuditData, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        parts = [
+            np.round(data.numbers[name][rows], self.decimals) if name in data.numbers else data._text(name).codes[rows]
+            for name in self.keys
+        ]
+        present = ~np.logical_or.reduce([data.missing(name)[rows] for name in self.keys])
+        return np.column_stack(parts).astype(np.float64), present
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        keys, present = self._keys(data, rows)
+        candidates = np.flatnonzero(present)
+        broken = np.zeros(len(rows), dtype=bool)
+        if len(candidates) > 1:
+            # A stable sort keeps the earliest row of each run of equal keys first.
+            order = np.lexsort(keys[candidates].T[::-1])
+            ordered = keys[candidates[order]]
+            repeat = np.r_[False, np.all(ordered[1:] == ordered[:-1], axis=1)]
+            broken[candidates[order[repeat]]] = True
+        return broken
+
+
+@register_rule("tag_coverage")
+@dataclass
+class TagCoverageRule(Rule):
+    """Compares the number of ``tags`` elements with the elements of ``categories``.
+
+    Tags do not record their host in the pulled data, so this is a count per
+    category rather than a list of untagged elements.
+    """
+
+    tags: str = ""
+    minimum: float = 1.0
+
+    def scope(self) -> tuple[str, ...] | None:
+        # Without host categories there is nothing to count.
+        return (*self.categories, self.tags) if self.categories else ()
+
+    def check(self, data: AuditData, rows: np.ndarray) -> np.ndarray:
+        return np.zeros(len(rows), dtype=bool)
+
+    def evaluate(self, data: AuditData) -> list[dict[str, Any]]:
+        groups = data.categories
+        tags = len(groups.get(self.tags, ()))
+        hosts = sum(len(groups.get(category, ())) for category in self.categories or ())
+        if not hosts or tags >= self.minimum * hosts:
+            return []
+        label = "/".join(self.categories or ())
+        return [
+            {
+                "rule": self.name,
+                "severity": self.severity,
+                "category": label,
+                "element_id": None,
+                "name": None,
+                "message": self.message or f"{tags} {self.tags} for {hosts} {label}",
+            }
+        ]
+
+
+AUDITS: dict[str, tuple[dict[str, Any], ...]] = {
+    "model_health_summary": (
+        {"kind": "missing_value", "name": "no_level", "column": "level", "categories": MODEL_CATEGORIES},
+        {"kind": "missing_value", "name": "no_geometry", "column": "min_x", "categories": MODEL_CATEGORIES,
+         "message": "element has no bounding box"},
+        {"kind": "range", "name": "short_wall", "column": "length", "min": 0.5, "categories": ("Walls",)},
+        {"kind": "duplicate", "name": "duplicate_instance", "severity": "error", "categories": MODEL_CATEGORIES,
+         "message": "identical instance in the same place"},
+    ),
+    "naming_standards_audit": (
+        {"kind": "pattern", "name": "untrimmed_name", "pattern": r"^\S(.*\S)?$"},
+        {"kind": "pattern", "name": "copied_name", "pattern": r"(?i)\bcopy\b|\s{2,}", "must_match": False},
+    ),
+    "parameter_compliance_audit": (
+        {"kind": "missing_value", "name": "missing_mark", "column": "Mark", "categories": ("Doors", "Windows")},
+        {"kind": "duplicate", "name": "duplicate_mark", "keys": ("Mark",), "categories": ("Doors", "Windows")},
+    ),
+    "tag_coverage_audit": (
+        {"kind": "tag_coverage", "name": "door_tags", "categories": ("Doors",), "tags": "Door Tags"},
+        {"kind": "tag_coverage", "name": "window_tags", "categories": ("Windows",), "tags": "Window Tags"},
+        {"kind": "tag_coverage", "name": "room_tags", "categories": ("Rooms",), "tags": "Room Tags"},
+    ),
+    "view_template_compliance_check": (
+        {"kind": "missing_value", "name": "no_view_template", "column": "View Template", "categories": ("Views",)},
+    ),
+}
+
+
+def audit_rules(
+    audit: str | None,
+    specs: Sequence[Mapping[str, Any]] = (),
+    required_parameters: Sequence[str] = (),
+    categories: Sequence[str] | None = None,
+) -> list[Rule]:
+    """The rules of ``audit`` plus ``specs``, with a ``missing_value`` rule per required parameter.
+
+    With custom ``specs`` for a named audit, the specs replace its defaults.
+    ``categories`` narrows what each rule checks, not the data it reads: a
+    tag coverage rule limited to Doors still counts the Door Tags.
+    """
+    if audit is not None and audit not in AUDITS:
+        raise SchemaValidationError(f"Unknown audit '{audit}'; use one of {sorted(AUDITS)}")
+    chosen = list(specs) if specs else list(AUDITS.get(audit, ()))
+    chosen += [
+        {"kind": "missing_value", "name": f"missing_{name}", "column": name, "categories": categories}
+        for name in required_parameters
+    ]
+    rules = [build_rule(spec) for spec in chosen]
+    names = Counter(rule.name for rule in rules)
+    for rule in rules:
+        if names[rule.name] > 1:
+            raise SchemaValidationError(f"Rule name '{rule.name}' is used twice")
+        if categories is not None:
+            scope = categories if rule.categories is None else rule.categories
+            rule.categories = tuple(category for category in scope if category in categories)
+    return rules
+
+
+def audit_categories(rules: Sequence[Rule]) -> list[str] | None:
+    """Categories the rules read rows of, to pull; ``None`` when one of them reads all."""
+    scopes = [rule.scope() for rule in rules]
+    if any(scope is None for scope in scopes):
+        return None
+    return sorted({category for scope in scopes for category in scope})
+
+
+def parameter_columns(rules: Sequence[Rule], data: AuditData | None = None) -> list[str]:
+    """Columns the rules read that are not built in (and not in ``data``): parameters to pull."""
+    builtin = {"id", "category", "name", "level", "type_id", "length", "area", "volume", *BOX_COLUMNS}
+    needed = {column for rule in rules for column in rule.columns()} - builtin
+    return sorted(column for column in needed if data is None or not data.has(column))
+
+
+def pull_audit_data(
+    call: ToolCall,
+    categories: Sequence[str] | None = None,
+    parameter_names: Sequence[str] = (),
+) -> AuditData:
+    """One paged element pull (plus parameter values) into :class:`AuditData`."""
+    records = [record for page in iter_element_pages(call, categories) for record in page]
+    parameters = None
+    if parameter_names:
+        parameters = fetch_parameters(call, [int(record["id"]) for record in records], parameter_names)
+    return AuditData.from_records(records, parameters)
+
+
+_worker_data: AuditData | None = None
+
+
+def _load_worker(data: AuditData) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _evaluate_in_worker(rule: Rule) -> list[dict[str, Any]]:
+    return rule.evaluate(_worker_data)
+
+
+def evaluate_rules(
+    rules: Sequence[Rule], data: AuditData, workers: int | None = None
+) -> Iterator[tuple[Rule, list[dict[str, Any]]]]:
+    """Yield each rule with its findings, in the order the rules finish.
+
+    The data is sent to each pool worker once, when it starts; after that
+    only rules and findings cross between processes.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(rules))
+    if workers < 2 or len(data) < PARALLEL_MIN_ROWS:
+        for rule in rules:
+            yield rule, rule.evaluate(data)
+        return
+    # Spawned workers import this module afresh, the same on every platform.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_load_worker, initargs=(data,)) as pool:
+        futures = {pool.submit(_evaluate_in_worker, rule): rule for rule in rules}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_audit(
+    rules: Sequence[Rule],
+    data: AuditData,
+    report_path: Path | None = None,
+    workers: int | None = None,
+    sample_size: int = SAMPLE_SIZE,
+) -> dict[str, Any]:
+    """Evaluate ``rules`` over ``data``, streaming findings to ``report_path`` (JSON Lines)."""
+    by_rule = {rule.name: 0 for rule in rules}
+    by_category: Counter[str] = Counter()
+    by_severity: Counter[str] = Counter()
+    samples: dict[str, list[dict[str, Any]]] = {}
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+    report = open(report_path, "wb") if report_path is not None else None
+    try:
+        for rule, findings in evaluate_rules(rules, data, workers):
+            by_rule[rule.name] = len(findings)
+            by_category.update(finding["category"] for finding in findings)
+            by_severity[rule.severity] += len(findings)
+            samples[rule.name] = findings[:sample_size]
+            if report is not None:
+                report.writelines(codec.dumps(finding) + b"\n" for finding in findings)
+                report.flush()
+    finally:
+        if report is not None:
+            report.close()
+    issues = [finding for rule in rules for finding in samples.get(rule.name, ())][:sample_size]
+    found = sum(by_rule.values())
+    return {
+        "issues_found": found,
+        "severity": max((s for s in SEVERITIES if by_severity[s]), key=SEVERITIES.index, default="info"),
+        "elements": len(data),
+        "rules": len(rules),
+        "by_rule": by_rule,
+        "by_category": dict(by_category),
+        "by_severity": dict(by_severity),
+        "issues": issues,
+        "report_path": str(report_path) if report_path is not None else None,
+    }
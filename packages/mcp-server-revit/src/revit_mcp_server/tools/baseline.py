@@ -0,0 +1,420 @@
+"""Baseline snapshots of a model and the diff engine that compares them.
+
+A snapshot stores, per element, its UniqueId, element ID, category, name, type,
+level, length, area and volume, a content hash and its parameter values. The file is laid out to be opened with
+``mmap``: a fixed-width index, sorted by a 64-bit hash of the UniqueId, is
+exposed as a zero-copy NumPy view, so joining two snapshots only reads the ID
+and hash columns. Names, UniqueIds and parameter values live in a heap of
+independently compressed blocks that is only paged in for the elements a diff
+or lookup actually reports.
+
+File layout (all integers little-endian)::
+
+    header | heap blocks | block offset table (u64) | index | metadata JSON
+
+Each index row points at its record by heap block number and offset within
+the decompressed block. Category and parameter names are coded against
+tables in the metadata.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+import numpy as np
+
+from .. import codec
+
+MAGIC = b"RMCPBASE"
+FORMAT_VERSION = 3
+# Heap records are packed into blocks of about this size before compression.
+# Small enough that a lookup decompresses little, large enough to compress well.
+HEAP_BLOCK_BYTES = 1 << 16
+COMPRESSION_LEVEL = 1
+# Decompressed heap blocks a reader keeps around.
+BLOCK_CACHE_SIZE = 32
+
+# Fields requested from revit.get_elements_by_type for a snapshot.
+SNAPSHOT_FIELDS = (
+    "unique_id", "name", "category", "type_id", "level", "length", "area", "volume", "parameters",
+)
+# Fields that contribute to the content hash (IDs identify, they don't change).
+_HASHED_FIELDS = ("name", "category", "type_id", "level", "length", "area", "volume")
+# Hashed fields kept in the heap blob; name and category have slots of their own.
+_BLOB_FIELDS = ("type_id", "level", "length", "area", "volume")
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("uid_hash", "<u8"),
+        ("digest", "<u8", (2,)),
+        ("element_id", "<i8"),
+        ("block", "<u4"),
+        ("block_offset", "<u4"),
+        ("uid_length", "<u4"),
+        ("name_length", "<u4"),
+        ("blob_length", "<u4"),
+        ("category", "<i4"),
+    ]
+)
+# magic, version, reserved, element count, block count, block table offset,
+# index offset, metadata offset, metadata length
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+_DIGEST = struct.Struct("<QQ")
+
+
+def element_digest(record: Mapping[str, Any]) -> bytes:
+    """Stable 128-bit content hash of an element record from the bridge.
+
+    Hashes canonical JSON (sorted keys, no whitespace) rather than the codec's
+    output, so the digest does not depend on which JSON library is installed.
+    """
+    canonical = {
+        "fields": {name: record.get(name) for name in _HASHED_FIELDS},
+        "parameters": record.get("parameters") or {},
+    }
+    text = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def uid_hash(unique_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(unique_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class SnapshotWriter:
+    """Streams element records into a snapshot file.
+
+    Heap blocks go to disk as they fill; only the fixed-width index (56 bytes
+    per element) is held in memory until it is sorted and written on close.
+    The file is written under a temporary name and renamed into place.
+    """
+
+    def __init__(self, path: Path, metadata: Mapping[str, Any] | None = None) -> None:
+        self.path = Path(path)
+        self.metadata = dict(metadata or {})
+        self.count = 0
+        self._index = np.zeros(4096, dtype=INDEX_DTYPE)
+        self._block = bytearray()
+        self._block_offsets: list[int] = []
+        self._categories: dict[str, int] = {}
+        self._parameters: dict[str, int] = {}
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp, "wb")
+        self._file.write(bytes(_HEADER.size))
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        unique_id = str(record.get("unique_id") or record["id"])
+        uid = unique_id.encode("utf-8")
+        name = (record.get("name") or "").encode("utf-8")
+        codes = self._parameters
+        blob = codec.dumps(
+            [
+                [record.get(name) for name in _BLOB_FIELDS],
+                [[codes.setdefault(key, len(codes)), value] for key, value in (record.get("parameters") or {}).items()],
+            ]
+        )
+        category = record.get("category")
+        category_code = self._categories.setdefault(category, len(self._categories)) if category else -1
+
+        if self.count == len(self._index):
+            self._index = np.resize(self._index, 2 * len(self._index))
+        self._index[self.count] = (
+            uid_hash(unique_id),
+            _DIGEST.unpack(element_digest(record)),
+            int(record["id"]),
+            len(self._block_offsets),
+            len(self._block),
+            len(uid),
+            len(name),
+            len(blob),
+            category_code,
+        )
+        self.count += 1
+        self._block += uid + name + blob
+        if len(self._block) >= HEAP_BLOCK_BYTES:
+            self._flush_block()
+
+    def add_many(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for record in records:
+            self.add(record)
+
+    def close(self) -> None:
+        self._flush_block()
+        handle = self._file
+        block_table = handle.tell()
+        handle.write(np.asarray([*self._block_offsets, block_table], dtype="<u8").tobytes())
+
+        index = self._index[: self.count]
+        index = index[np.argsort(index["uid_hash"], kind="stable")]
+        index_offset = _align(handle)
+        handle.write(index.tobytes())
+
+        metadata = codec.dumps(
+            {
+                "metadata": self.metadata,
+                "categories": list(self._categories),
+                "parameters": list(self._parameters),
+            }
+        )
+        metadata_offset = handle.tell()
+        handle.write(metadata)
+        handle.seek(0)
+        handle.write(
+            _HEADER.pack(
+                MAGIC, FORMAT_VERSION, 0, self.count, len(self._block_offsets),
+                block_table, index_offset, metadata_offset, len(metadata),
+            )
+        )
+        handle.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _flush_block(self) -> None:
+        if not self._block:
+            return
+        self._block_offsets.append(self._file.tell())
+        self._file.write(zlib.compress(self._block, COMPRESSION_LEVEL))
+        self._block = bytearray()
+
+
+def _align(handle, boundary: int = 8) -> int:
+    padding = -handle.tell() % boundary
+    handle.write(bytes(padding))
+    return handle.tell()
+
+
+class Snapshot:
+    """A memory-mapped snapshot file.
+
+    ``index`` is a read-only structured array backed directly by the mapping;
+    slicing its ``uid_hash``, ``digest`` or ``element_id`` columns copies
+    nothing. Records are decoded from the heap on demand.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            self._file.close()
+            raise ValueError(f"{self.path} is not a baseline snapshot") from exc
+        (
+            magic, version, _, count, blocks, block_table, index_offset, metadata_offset, metadata_length,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a baseline snapshot")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} uses baseline format {version}; re-export it")
+
+        self.index = np.frombuffer(self._map, INDEX_DTYPE, count, index_offset)
+        self._block_table = np.frombuffer(self._map, "<u8", blocks + 1, block_table)
+        info = codec.loads(self._map[metadata_offset : metadata_offset + metadata_length])
+        self.metadata: dict[str, Any] = info["metadata"]
+        self.categories: list[str] = info["categories"]
+        self.parameter_names: list[str] = info["parameters"]
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def uid_hashes(self) -> np.ndarray:
+        return self.index["uid_hash"]
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Decode the element at index position ``row``."""
+        entry = self.index[row]
+        block = self._heap_block(int(entry["block"]))
+        start = int(entry["block_offset"])
+        uid_end = start + int(entry["uid_length"])
+        name_end = uid_end + int(entry["name_length"])
+        blob_end = name_end + int(entry["blob_length"])
+        names = self.parameter_names
+        category = int(entry["category"])
+        values, parameters = codec.loads(block[name_end:blob_end])
+        return {
+            "unique_id": block[start:uid_end].decode("utf-8"),
+            "element_id": int(entry["element_id"]),
+            "category": self.categories[category] if category >= 0 else None,
+            "name": block[uid_end:name_end].decode("utf-8"),
+            **dict(zip(_BLOB_FIELDS, values)),
+            "parameters": {names[code]: value for code, value in parameters},
+        }
+
+    def heap_order(self, rows: np.ndarray) -> np.ndarray:
+        """``rows`` reordered by where their records sit in the heap."""
+        return rows[np.argsort(self.index["block"][rows], kind="stable")]
+
+    def find(self, unique_id: str) -> dict[str, Any] | None:
+        """Look up one element by UniqueId with a binary search of the index."""
+        hashes, key = self.uid_hashes, np.uint64(uid_hash(unique_id))
+        row = int(np.searchsorted(hashes, key))
+        while row < len(hashes) and hashes[row] == key:
+            record = self.record(row)
+            if record["unique_id"] == unique_id:
+                return record
+            row += 1
+        return None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.record(row)
+
+    def close(self) -> None:
+        # NumPy views pin the mapping; drop ours before unmapping.
+        self.index = self._block_table = None
+        self._blocks.clear()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # a caller still holds a view; the mapping closes when it is released
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _heap_block(self, number: int) -> bytes:
+        block = self._blocks.get(number)
+        if block is None:
+            start, end = int(self._block_table[number]), int(self._block_table[number + 1])
+            block = zlib.decompress(self._map[start:end])
+            self._blocks[number] = block
+            if len(self._blocks) > BLOCK_CACHE_SIZE:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(number)
+        return block
+
+
+@dataclass
+class DiffSummary:
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    changed_parameters: dict[str, int] = field(default_factory=dict)
+
+
+def _parameter_changes(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, list[Any]]:
+    return {
+        name: [old.get(name), new.get(name)]
+        for name in old.keys() | new.keys()
+        if old.get(name) != new.get(name)
+    }
+
+
+def _entry(change: str, record: Mapping[str, Any], **extra: Any) -> dict[str, Any]:
+    return {
+        "change": change,
+        "unique_id": record["unique_id"],
+        "element_id": record["element_id"],
+        "category": record["category"],
+        "name": record["name"],
+        **extra,
+    }
+
+
+def match_rows(old: Snapshot, new: Snapshot) -> tuple[np.ndarray, np.ndarray]:
+    """Index positions of elements present in both snapshots, as two aligned arrays.
+
+    Both indexes are sorted by UniqueId hash, so this is a vectorized merge
+    over the two ``uid_hash`` columns.
+    """
+    old_hashes, new_hashes = old.uid_hashes, new.uid_hashes
+    positions = np.searchsorted(new_hashes, old_hashes)
+    found = positions < len(new_hashes)
+    found[found] = new_hashes[positions[found]] == old_hashes[found]
+    return np.flatnonzero(found), positions[found]
+
+
+def diff_snapshots(
+    before: Path,
+    after: Path,
+    on_difference: Callable[[dict[str, Any]], None] | None = None,
+) -> DiffSummary:
+    """Join two snapshots on UniqueId and report what changed.
+
+    The join and the hash comparison run on the mapped index columns; heap
+    records are decoded only for added, removed and changed elements.
+    ``on_difference`` receives one dict per difference as it is found.
+    """
+    emit = on_difference or (lambda entry: None)
+    summary = DiffSummary()
+    with Snapshot(before) as old, Snapshot(after) as new:
+        old_rows, new_rows = match_rows(old, new)
+        differs = np.any(old.index["digest"][old_rows] != new.index["digest"][new_rows], axis=1)
+        removed = np.ones(len(old), dtype=bool)
+        removed[old_rows] = False
+        added = np.ones(len(new), dtype=bool)
+        added[new_rows] = False
+
+        summary.unchanged = int(len(old_rows) - np.count_nonzero(differs))
+        old_rows, new_rows = old_rows[differs], new_rows[differs]
+        # Index order is hash order, which scatters across the heap; decode in
+        # heap order so each compressed block is inflated about once.
+        order = np.lexsort((old.index["block"][old_rows], new.index["block"][new_rows]))
+        for old_row, new_row in zip(old_rows[order].tolist(), new_rows[order].tolist()):
+            previous, current = old.record(old_row), new.record(new_row)
+            changes = _parameter_changes(previous["parameters"], current["parameters"])
+            fields = {
+                name: [previous[name], current[name]]
+                for name in _HASHED_FIELDS
+                if previous[name] != current[name]
+            }
+            if not fields and not changes:
+                # Hashes can differ without a visible change (e.g. 1 vs 1.0).
+                summary.unchanged += 1
+                continue
+            for name in changes:
+                summary.changed_parameters[name] = summary.changed_parameters.get(name, 0) + 1
+            summary.changed += 1
+            emit(_entry("changed", current, fields=fields, parameters=changes))
+        for row in new.heap_order(np.flatnonzero(added)).tolist():
+            summary.added += 1
+            emit(_entry("added", new.record(row)))
+        for row in old.heap_order(np.flatnonzero(removed)).tolist():
+            summary.removed += 1
+            emit(_entry("removed", old.record(row)))
+    return summary
+
+
+def element_history(paths: Iterable[Path], unique_ids: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield the state of each element in each snapshot, one file mapped at a time."""
+    wanted = list(unique_ids)
+    for path in paths:
+        with Snapshot(path) as snapshot:
+            for unique_id in wanted:
+                record = snapshot.find(unique_id)
+                yield {
+                    "snapshot": str(path),
+                    "snapshot_id": snapshot.metadata.get("snapshot_id"),
+                    "unique_id": unique_id,
+                    "present": record is not None,
+                    **({"element": record} if record is not None else {}),
+                }
@@ -0,0 +1,220 @@
+"""Bulk element creation from columnar coordinates.
+
+Placing a grid of walls or columns one MCP call at a time builds a point
+dict and makes a bridge round trip per element. The bulk tools take one
+array per coordinate instead (``start_x``, ``start_y``, ... or ``x``, ``y``).
+NumPy validates and converts them to feet, and drops rows Revit would
+reject: non-finite values, walls shorter than Revit's short-curve tolerance,
+and repeats of an earlier row. What remains goes to ``revit.create_walls``,
+``revit.create_columns`` or ``revit.place_family_instances``. Each command
+creates up to :data:`CHUNK_SIZE` elements in one transaction. The arrays
+are encoded straight from NumPy, without building Python lists.
+
+Results keep the caller's order: ``ids[i]`` is the element created for row
+``i``, or ``None`` when that row was skipped or failed.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Mapping
+
+import numpy as np
+
+from ..errors import BridgeError, SchemaValidationError
+from ..units import unit_factor
+
+logger = logging.getLogger(__name__)
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+# Elements per command. A chunk is one transaction, which must finish well
+# inside the add-in's 30 s command timeout.
+CHUNK_SIZE = 1000
+# Revit rejects curves shorter than Application.ShortCurveTolerance (feet).
+SHORT_CURVE_TOLERANCE = 0.00256
+# Rows whose coordinates agree to this many feet are duplicates.
+DUPLICATE_TOLERANCE = 1e-4
+
+
+@dataclass
+class BulkPlan:
+    """Converted, filtered rows for one bulk command, plus what was dropped."""
+
+    tool: str
+    common: dict[str, Any]
+    columns: dict[str, np.ndarray]
+    # Input index of each kept row.
+    rows: np.ndarray
+    requested: int
+    skipped: dict[str, list[int]] = field(default_factory=dict)
+
+    def payloads(self, chunk_size: int = CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+        for start in range(0, len(self.rows), chunk_size):
+            yield {**self.common, **{name: column[start : start + chunk_size] for name, column in self.columns.items()}}
+
+    def summary(self) -> dict[str, Any]:
+        return {"requested": self.requested, "sent": len(self.rows), "skipped": self.skipped}
+
+
+def _columns(
+    arguments: Mapping[str, Any],
+    required: tuple[str, ...],
+    optional: Mapping[str, float] = {},
+) -> dict[str, np.ndarray]:
+    """One float64 array per column; optional columns may be a single number."""
+    columns: dict[str, np.ndarray] = {}
+    for name in required:
+        if name not in arguments:
+            raise SchemaValidationError(f"'{name}' is required")
+        columns[name] = np.asarray(arguments[name], dtype=np.float64)
+    count = len(columns[required[0]])
+    for name, column in columns.items():
+        if column.ndim != 1 or len(column) != count:
+            raise SchemaValidationError(f"'{name}' must be a list of {count} numbers")
+    for name, default in optional.items():
+        value = arguments.get(name)
+        column = np.asarray(default if value is None else value, dtype=np.float64)
+        if column.ndim == 0:
+            column = np.full(count, float(column))
+        elif column.shape != (count,):
+            raise SchemaValidationError(f"'{name}' must be a number or a list of {count} numbers")
+        columns[name] = column
+    return columns
+
+
+def _scale(arguments: Mapping[str, Any], scale: float | None) -> float:
+    """Feet per input unit: ``scale`` when the caller resolved it, else ``units``."""
+    if scale is not None:
+        return scale
+    return unit_factor(arguments.get("units") or "ft", "length")
+
+
+def _plan(
+    tool: str,
+    common: dict[str, Any],
+    columns: dict[str, np.ndarray],
+    key: tuple[str, ...],
+    degenerate: np.ndarray | None = None,
+) -> BulkPlan:
+    """Drop non-finite, degenerate and repeated rows; ``key`` columns identify a row."""
+    requested = len(next(iter(columns.values())))
+    finite = np.logical_and.reduce([np.isfinite(column) for column in columns.values()])
+    keep = finite.copy()
+    if degenerate is not None:
+        degenerate = degenerate & finite
+        keep &= ~degenerate
+
+    # The first occurrence of each rounded key survives; later ones are repeats.
+    candidates = np.flatnonzero(keep)
+    grid = np.round(np.column_stack([columns[name][candidates] for name in key]) / DUPLICATE_TOLERANCE)
+    _, first = np.unique(grid, axis=0, return_index=True)
+    unique = np.zeros(requested, dtype=bool)
+    unique[candidates[first]] = True
+    duplicate = keep & ~unique
+    keep &= unique
+
+    skipped = {
+        reason: np.flatnonzero(mask).tolist()
+        for reason, mask in (("non_finite", ~finite), ("degenerate", degenerate), ("duplicate", duplicate))
+        if mask is not None and mask.any()
+    }
+    rows = np.flatnonzero(keep)
+    return BulkPlan(
+        tool=tool,
+        common=common,
+        columns={name: np.ascontiguousarray(column[rows]) for name, column in columns.items()},
+        rows=rows,
+        requested=requested,
+        skipped=skipped,
+    )
+
+
+def plan_walls(arguments: Mapping[str, Any], scale: float | None = None) -> BulkPlan:
+    """Straight walls from ``start_x``/``start_y``/``end_x``/``end_y`` arrays on one level."""
+    scale = _scale(arguments, scale)
+    columns = _columns(arguments, ("start_x", "start_y", "end_x", "end_y"), {"height": 10.0})
+    for column in columns.values():
+        column *= scale
+    length = np.hypot(columns["end_x"] - columns["start_x"], columns["end_y"] - columns["start_y"])
+    # A wall from A to B duplicates one from B to A; compare them in one direction.
+    flip = (columns["start_x"] > columns["end_x"]) | (
+        (columns["start_x"] == columns["end_x"]) & (columns["start_y"] > columns["end_y"])
+    )
+    ordered = {
+        "ax": np.where(flip, columns["end_x"], columns["start_x"]),
+        "ay": np.where(flip, columns["end_y"], columns["start_y"]),
+        "bx": np.where(flip, columns["start_x"], columns["end_x"]),
+        "by": np.where(flip, columns["start_y"], columns["end_y"]),
+    }
+    common = {"level": arguments.get("level") or "L1"}
+    if arguments.get("wall_type"):
+        common["wall_type"] = arguments["wall_type"]
+    plan = _plan(
+        "revit.create_walls",
+        common,
+        {**columns, **ordered},
+        ("ax", "ay", "bx", "by"),
+        degenerate=length < SHORT_CURVE_TOLERANCE,
+    )
+    for name in ordered:
+        del plan.columns[name]
+    return plan
+
+
+def _plan_instances(tool: str, arguments: Mapping[str, Any], common: dict[str, Any], scale: float | None) -> BulkPlan:
+    scale = _scale(arguments, scale)
+    columns = _columns(arguments, ("x", "y"), {"z": 0.0, "rotation": 0.0})
+    for name in ("x", "y", "z"):
+        columns[name] *= scale
+    # Degrees in, radians out: the add-in passes rotation straight to Revit.
+    columns["rotation"] = np.radians(columns["rotation"])
+    return _plan(tool, common, columns, ("x", "y", "z"))
+
+
+def plan_columns(arguments: Mapping[str, Any], scale: float | None = None) -> BulkPlan:
+    """Structural columns at ``x``/``y`` points; ``rotation`` is in degrees."""
+    return _plan_instances("revit.create_columns", arguments, _family(arguments), scale)
+
+
+def plan_family_instances(arguments: Mapping[str, Any], scale: float | None = None) -> BulkPlan:
+    """Non-structural family instances at ``x``/``y``/``z`` points; ``rotation`` is in degrees."""
+    return _plan_instances("revit.place_family_instances", arguments, _family(arguments), scale)
+
+
+def _family(arguments: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "family_name": arguments["family_name"],
+        "type_name": arguments["type_name"],
+        "level": arguments.get("level") or "L1",
+    }
+
+
+def create_bulk(plan: BulkPlan, call: ToolCall, chunk_size: int = CHUNK_SIZE) -> dict[str, Any]:
+    """Send ``plan`` chunk by chunk and map the add-in's results back to input rows.
+
+    A chunk that fails outright stops the run. Its rows and every later row
+    are reported as failed; chunks already created stay in the model.
+    """
+    ids: list[Any] = [None] * plan.requested
+    failed: list[dict[str, Any]] = []
+    commands = 0
+    for start, payload in zip(range(0, len(plan.rows), chunk_size), plan.payloads(chunk_size)):
+        rows = plan.rows[start : start + chunk_size]
+        try:
+            result = call(plan.tool, payload)
+        except BridgeError as exc:
+            logger.warning("%s stopped at row %d: %s", plan.tool, int(rows[0]), exc)
+            failed.extend({"index": int(row), "error": str(exc)} for row in plan.rows[start:])
+            break
+        commands += 1
+        for row, element_id in zip(rows.tolist(), result.get("ids") or []):
+            ids[row] = element_id
+        failed.extend({"index": int(rows[item["index"]]), "error": item["error"]} for item in result.get("failed") or [])
+    return {
+        **plan.summary(),
+        "created": sum(element_id is not None for element_id in ids),
+        "commands": commands,
+        "ids": ids,
+        "failed": failed,
+    }
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Sequence
 
+from .. import codec
 from ..schemas import (
+    AuditInput,
+    AuditOutput,
     BaselineDiffInput,
     BaselineDiffOutput,
     BaselineExportInput,
     BaselineExportOutput,
+    BaselineHistoryInput,
+    BaselineHistoryOutput,
     ExportQuantitiesInput,
     ExportQuantitiesOutput,
     ExportResult,
@@ -23,11 +30,22 @@ from ..schemas import (
     ListViewsOutput,
     OpenDocumentInput,
     OpenDocumentOutput,
+    PublishInput,
     RequestPayload,
-    SheetBatchInput,
+    RoomCompletenessInput,
+    RoomCompletenessOutput,
+    SheetBatchFromCsvInput,
     SheetBatchOutput,
 )
+from ..geometry.rooms import BOUNDARY_LOCATION, RoomSet, completeness_report
+from ..replica.sync import iter_element_pages
 from ..security.workspace import WorkspaceMonitor
+from .audit import AuditData, audit_categories, audit_rules, parameter_columns, pull_audit_data, run_audit
+from .baseline import SNAPSHOT_FIELDS, SnapshotWriter, diff_snapshots, element_history
+from .quantities import MEASURES, QUANTITY_FIELDS, QuantityTable, aggregate, write_quantities
+from .publish import publish
+from .schedules import select_schedules, stream_schedules
+from .sheets import BatchState, read_sheet_numbers, run_sheet_batch, validate_sheet_csv
 
 ToolHandler = Callable[[dict, WorkspaceMonitor], dict]
 
@@ -61,88 +79,275 @@ def list_views(payload: dict, _: WorkspaceMonitor) -> dict:
     return ListViewsOutput(views=views).model_dump()
 
 
-def export_schedules(payload: dict, workspace: WorkspaceMonitor) -> dict:
+def export_schedules(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
     input_model = ExportSchedulesInput(**payload)
-    output_marker = WorkspaceMonitor(workspace.allowed_directories).assert_in_workspace(
-        Path(input_model.output_path)
-    )
-    data = ["Schedule A", "Schedule B"]
-    return ExportSchedulesOutput(schedules=data, output_path=str(output_marker)).model_dump()
+    path = workspace.assert_in_workspace(Path(input_model.output_path))
+    # Mock mode has no model to read and exports nothing.
+    if bridge is None:
+        return ExportSchedulesOutput(schedules=[], output_path=str(path)).model_dump()
+    schedules = select_schedules(bridge.send_tool, input_model.schedule_ids, input_model.schedule_names)
+    exported, files = stream_schedules(bridge.send_tool, schedules, path, input_model.page_size)
+    return ExportSchedulesOutput(
+        schedules=[entry["name"] for entry in exported],
+        output_path=str(path),
+        rows=sum(entry["rows"] for entry in exported),
+        exported=exported,
+        files=files,
+    ).model_dump()
 
 
-def export_quantities(payload: dict, workspace: WorkspaceMonitor) -> dict:
+def export_quantities(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
     input_model = ExportQuantitiesInput(**payload)
-    output_marker = workspace.assert_in_workspace(Path(input_model.output_path))
-    return ExportQuantitiesOutput(categories_exported=5, output_path=str(output_marker)).model_dump()
+    path = workspace.assert_in_workspace(Path(input_model.output_path))
+    table = QuantityTable()
+    # Mock mode has no model to read and writes an empty take-off.
+    if bridge is not None:
+        for page in iter_element_pages(bridge.send_tool, input_model.categories, QUANTITY_FIELDS):
+            table.add(page)
+    rows = aggregate(table, input_model.group_by)
+    output_format = write_quantities(path, rows, [*input_model.group_by, "elements", *MEASURES])
+    categories = table.labels["category"].labels
+    return ExportQuantitiesOutput(
+        categories_exported=len(categories),
+        output_path=str(path),
+        format=output_format,
+        elements=table.element_count,
+        rows=len(table),
+        groups=len(rows),
+    ).model_dump()
 
 
-def baseline_export(payload: dict, workspace: WorkspaceMonitor) -> dict:
+def baseline_export(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
     input_model = BaselineExportInput(**payload)
     path = workspace.assert_in_workspace(Path(input_model.output_path))
-    return BaselineExportOutput(snapshot_id=f"baseline-{datetime.utcnow().isoformat()}", output_path=str(path)).model_dump()
+    snapshot_id = f"baseline-{datetime.utcnow().isoformat()}"
+    metadata = {"snapshot_id": snapshot_id, "categories": input_model.categories}
+    with SnapshotWriter(path, metadata) as writer:
+        # Mock mode has no model to read and writes an empty snapshot.
+        if bridge is not None:
+            for page in iter_element_pages(bridge.send_tool, input_model.categories, SNAPSHOT_FIELDS):
+                writer.add_many(page)
+    return BaselineExportOutput(
+        snapshot_id=snapshot_id, output_path=str(path), element_count=writer.count
+    ).model_dump()
 
 
-def baseline_diff(payload: dict, _: WorkspaceMonitor) -> dict:
-    input_model = BaselineDiffInput(**payload)
-    return BaselineDiffOutput(differences=[f"diff between {input_model.baseline_a} and {input_model.baseline_b}"]).model_dump()
+def _describe_difference(entry: dict) -> str:
+    label = f"{entry['change']} {entry['category'] or 'element'} {entry['element_id']} ({entry['unique_id']})"
+    details = [
+        f"{name}: {old!r} -> {new!r}"
+        for name, (old, new) in {**entry.get("fields", {}), **entry.get("parameters", {})}.items()
+    ]
+    return f"{label}: {'; '.join(details)}" if details else label
 
 
-def sheet_batch_from_csv(payload: dict, workspace: WorkspaceMonitor) -> dict:
-    input_model = SheetBatchInput(**payload)
-    workspace.assert_in_workspace(Path(input_model.csv_path))
-    return SheetBatchOutput(sheets_created=3).model_dump()
+def baseline_diff(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    input_model = BaselineDiffInput(**payload)
+    before = workspace.assert_in_workspace(Path(input_model.baseline_a))
+    after = workspace.assert_in_workspace(Path(input_model.baseline_b))
+    report_path = (
+        workspace.assert_in_workspace(Path(input_model.report_path)) if input_model.report_path else None
+    )
 
+    differences: list[str] = []
+    # Like SnapshotWriter: a diff that fails part way never replaces an
+    # earlier report, and leaves no half-written file behind.
+    temporary = report_path.with_name(report_path.name + ".tmp") if report_path else None
+    if temporary is not None:
+        temporary.parent.mkdir(parents=True, exist_ok=True)
+    report = open(temporary, "wb") if temporary is not None else None
 
-def export_pdf_by_sheet(payload: dict, workspace: WorkspaceMonitor) -> dict:
-    input_model = SheetBatchInput(**payload)
-    workspace.assert_in_workspace(Path(input_model.csv_path))
-    return ExportResult(
-        file_path=str(Path(workspace.allowed_directories[0]) / "export.pdf"),
-        status="mocked",
+    def collect(entry: dict) -> None:
+        if len(differences) < input_model.max_differences:
+            differences.append(_describe_difference(entry))
+        if report is not None:
+            report.write(codec.dumps(entry) + b"\n")
+
+    try:
+        summary = diff_snapshots(before, after, collect)
+    except BaseException:
+        if report is not None:
+            report.close()
+            temporary.unlink(missing_ok=True)
+        raise
+    if report is not None:
+        report.close()
+        os.replace(temporary, report_path)
+    return BaselineDiffOutput(
+        differences=differences,
+        added=summary.added,
+        removed=summary.removed,
+        changed=summary.changed,
+        unchanged=summary.unchanged,
+        changed_parameters=summary.changed_parameters,
+        report_path=str(report_path) if report_path else None,
     ).model_dump()
 
 
-def export_dwg_by_sheet(payload: dict, workspace: WorkspaceMonitor) -> dict:
-    input_model = SheetBatchInput(**payload)
-    workspace.assert_in_workspace(Path(input_model.csv_path))
-    return ExportResult(
-        file_path=str(Path(workspace.allowed_directories[0]) / "export.dwg"),
-        status="mocked",
-    ).model_dump()
+def baseline_history(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    input_model = BaselineHistoryInput(**payload)
+    paths = [workspace.assert_in_workspace(Path(path)) for path in input_model.baselines]
+    return BaselineHistoryOutput(history=list(element_history(paths, input_model.unique_ids))).model_dump()
 
 
-def export_ifc_named_setup(payload: dict, workspace: WorkspaceMonitor) -> dict:
-    input_model = SheetBatchInput(**payload)
-    workspace.assert_in_workspace(Path(input_model.csv_path))
-    return ExportResult(
-        file_path=str(Path(workspace.allowed_directories[0]) / "setup.ifc"),
-        status="mocked",
+def sheet_batch_from_csv(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    input_model = SheetBatchFromCsvInput(**payload)
+    csv_path = workspace.assert_in_workspace(Path(input_model.csv_path))
+    # Mock mode has no model to write to and only validates the CSV.
+    if bridge is None:
+        state = validate_sheet_csv(csv_path, input_model.titleblock_name, input_model.max_errors)
+        return SheetBatchOutput(sheets_created=0, chunk_size=input_model.chunk_size, **_batch_counts(state)).model_dump()
+    checkpoint = workspace.assert_in_workspace(
+        Path(input_model.checkpoint_path or csv_path.with_name(csv_path.name + ".progress.json"))
+    )
+    state, complete = run_sheet_batch(
+        bridge.send_tool,
+        csv_path,
+        checkpoint,
+        titleblock_name=input_model.titleblock_name,
+        chunk_size=input_model.chunk_size,
+        target_seconds=input_model.target_seconds,
+        resume=input_model.resume,
+        max_errors=input_model.max_errors,
+    )
+    return SheetBatchOutput(
+        sheets_created=state.created,
+        complete=complete,
+        chunk_size=state.chunk_size,
+        checkpoint_path=str(checkpoint),
+        **_batch_counts(state),
     ).model_dump()
 
 
+def _batch_counts(state: BatchState) -> dict:
+    return {
+        "rows_read": state.rows_read,
+        "skipped_existing": state.skipped_existing,
+        "skipped_duplicate": state.skipped_duplicate,
+        "invalid": state.invalid,
+        "failed": state.failed,
+        "chunks": state.chunks,
+        "errors": state.errors,
+    }
+
+
+def _publish(payload: dict, workspace: WorkspaceMonitor, bridge: Any, fmt: str) -> dict:
+    input_model = PublishInput(**payload)
+    output_dir = workspace.assert_in_workspace(
+        Path(input_model.output_dir or Path(workspace.allowed_directories[0]) / "publish")
+    )
+    sheet_numbers = input_model.sheet_numbers
+    if input_model.csv_path:
+        csv_path = workspace.assert_in_workspace(Path(input_model.csv_path))
+        sheet_numbers = [*(sheet_numbers or ()), *read_sheet_numbers(csv_path)]
+    # Mock mode has no model to export.
+    if bridge is None:
+        return ExportResult(file_path=str(output_dir / f"{input_model.name}.{fmt}"), status="mocked").model_dump()
+    summary = publish(
+        bridge,
+        output_dir,
+        (fmt,),
+        sheet_numbers=sheet_numbers,
+        sheets_per_call=input_model.sheets_per_call,
+        force=input_model.force,
+        merged_name=f"{input_model.name}.pdf" if input_model.merge and fmt == "pdf" else None,
+        archive_name=f"{input_model.name}-{fmt}.zip" if input_model.zip else None,
+        ifc_name=input_model.name,
+        ifc_view_id=input_model.ifc_view_id,
+        options={"dwg_version": input_model.dwg_version, "ifc_version": input_model.ifc_version},
+        max_errors=input_model.max_errors,
+    )
+    file_path = summary.get("merged_path") or summary.get("archive_path") or str(output_dir)
+    if fmt == "ifc":
+        file_path = str(output_dir / f"{input_model.name}.ifc")
+    return ExportResult(file_path=file_path, **summary).model_dump()
+
+
+def export_pdf_by_sheet(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    return _publish(payload, workspace, bridge, "pdf")
+
+
+def export_dwg_by_sheet(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    return _publish(payload, workspace, bridge, "dwg")
+
+
+def export_ifc_named_setup(payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    return _publish(payload, workspace, bridge, "ifc")
+
+
 def generic_audit(payload: dict, _: WorkspaceMonitor) -> dict:
     input_model = GenericAuditInput(**payload)
     return GenericAuditOutput(issues_found=0).model_dump()
 
 
+def rule_audit(audit: str, payload: dict, workspace: WorkspaceMonitor, bridge: Any = None) -> dict:
+    input_model = AuditInput(**payload)
+    rules = audit_rules(audit, input_model.rules, input_model.required_parameters, input_model.categories)
+    path = workspace.assert_in_workspace(Path(input_model.output_path)) if input_model.output_path else None
+    # One paged pull, then every rule runs here. Mock mode audits an empty model.
+    if bridge is not None:
+        data = pull_audit_data(bridge.send_tool, audit_categories(rules), parameter_columns(rules))
+    else:
+        data = AuditData.from_records([])
+    return AuditOutput(**run_audit(rules, data, path, input_model.workers)).model_dump()
+
+
+def room_space_completeness_report(payload: dict, _: WorkspaceMonitor, bridge: Any = None) -> dict:
+    input_model = RoomCompletenessInput(**payload)
+    # One bulk boundary pull; every check runs here. Mock mode has no rooms.
+    result = {}
+    if bridge is not None:
+        result = bridge.send_tool("revit.get_room_boundaries", {"boundary_location": BOUNDARY_LOCATION})
+    report = completeness_report(
+        RoomSet.from_result(result),
+        levels=input_model.levels,
+        min_area=input_model.min_area,
+        area_tolerance=input_model.area_tolerance,
+    )
+    return RoomCompletenessOutput(**report).model_dump()
+
+
+# Tools implemented in Python in every mode. Their handlers take the bridge as a
+# third argument (None in mock mode) and read the model through it themselves.
+LOCAL_TOOLS = frozenset(
+    {
+        "revit.export_schedules",
+        "revit.export_quantities",
+        "revit.baseline_export",
+        "revit.baseline_diff",
+        "revit.baseline_history",
+        "revit.batch_create_sheets_from_csv",
+        "revit.export_pdf_by_sheet_set",
+        "revit.export_dwg_by_sheet_set",
+        "revit.export_ifc_named_setup",
+        "revit.room_space_completeness_report",
+        "revit.model_health_summary",
+        "revit.naming_standards_audit",
+        "revit.parameter_compliance_audit",
+        "revit.tag_coverage_audit",
+        "revit.view_template_compliance_check",
+    }
+)
+
 TOOL_HANDLERS: Dict[str, ToolHandler] = {
     "revit.health": revit_health,
     "revit.open_document": open_document,
     "revit.list_views": list_views,
-    "revit.model_health_summary": generic_audit,
+    "revit.model_health_summary": partial(rule_audit, "model_health_summary"),
     "revit.warning_triage_report": generic_audit,
-    "revit.naming_standards_audit": generic_audit,
-    "revit.parameter_compliance_audit": generic_audit,
+    "revit.naming_standards_audit": partial(rule_audit, "naming_standards_audit"),
+    "revit.parameter_compliance_audit": partial(rule_audit, "parameter_compliance_audit"),
     "revit.shared_parameter_binding_audit": generic_audit,
-    "revit.view_template_compliance_check": generic_audit,
-    "revit.tag_coverage_audit": generic_audit,
-    "revit.room_space_completeness_report": generic_audit,
+    "revit.view_template_compliance_check": partial(rule_audit, "view_template_compliance_check"),
+    "revit.tag_coverage_audit": partial(rule_audit, "tag_coverage_audit"),
+    "revit.room_space_completeness_report": room_space_completeness_report,
     "revit.link_monitor_report": generic_audit,
     "revit.coordinate_sanity_check": generic_audit,
     "revit.export_schedules": export_schedules,
     "revit.export_quantities": export_quantities,
     "revit.baseline_export": baseline_export,
     "revit.baseline_diff": baseline_diff,
+    "revit.baseline_history": baseline_history,
     "revit.batch_create_sheets_from_csv": sheet_batch_from_csv,
     "revit.batch_place_views_on_sheets": generic_audit,
     "revit.titleblock_fill_from_csv": generic_audit,
@@ -153,3 +358,48 @@ TOOL_HANDLERS: Dict[str, ToolHandler] = {
     "revit.publish_package_builder": generic_audit,
     "revit.export_report": generic_audit,
 }
+
+# Input model and workspace path fields of every tool. Bridge mode validates
+# payloads against these instead of running the mock handler and discarding
+# its result.
+TOOL_INPUTS: Dict[str, tuple[type[RequestPayload], tuple[str, ...]]] = {
+    "revit.health": (HealthInput, ()),
+    "revit.open_document": (OpenDocumentInput, ("file_path",)),
+    "revit.list_views": (ListViewsInput, ()),
+    "revit.model_health_summary": (AuditInput, ("output_path",)),
+    "revit.warning_triage_report": (GenericAuditInput, ()),
+    "revit.naming_standards_audit": (AuditInput, ("output_path",)),
+    "revit.parameter_compliance_audit": (AuditInput, ("output_path",)),
+    "revit.shared_parameter_binding_audit": (GenericAuditInput, ()),
+    "revit.view_template_compliance_check": (AuditInput, ("output_path",)),
+    "revit.tag_coverage_audit": (AuditInput, ("output_path",)),
+    "revit.room_space_completeness_report": (RoomCompletenessInput, ()),
+    "revit.link_monitor_report": (GenericAuditInput, ()),
+    "revit.coordinate_sanity_check": (GenericAuditInput, ()),
+    "revit.export_schedules": (ExportSchedulesInput, ("output_path",)),
+    "revit.export_quantities": (ExportQuantitiesInput, ("output_path",)),
+    "revit.baseline_export": (BaselineExportInput, ("output_path",)),
+    "revit.baseline_diff": (BaselineDiffInput, ("baseline_a", "baseline_b", "report_path")),
+    "revit.baseline_history": (BaselineHistoryInput, ("baselines",)),
+    "revit.batch_create_sheets_from_csv": (SheetBatchFromCsvInput, ("csv_path", "checkpoint_path")),
+    "revit.batch_place_views_on_sheets": (GenericAuditInput, ()),
+    "revit.titleblock_fill_from_csv": (GenericAuditInput, ()),
+    "revit.create_print_set": (GenericAuditInput, ()),
+    "revit.export_pdf_by_sheet_set": (PublishInput, ("csv_path", "output_dir")),
+    "revit.export_dwg_by_sheet_set": (PublishInput, ("csv_path", "output_dir")),
+    "revit.export_ifc_named_setup": (PublishInput, ("csv_path", "output_dir")),
+    "revit.publish_package_builder": (GenericAuditInput, ()),
+    "revit.export_report": (GenericAuditInput, ()),
+}
+
+
+def validate_payload(tool_name: str, payload: dict, workspace: WorkspaceMonitor) -> RequestPayload:
+    """Validate ``payload`` and its workspace paths without running the tool."""
+    model, path_fields = TOOL_INPUTS[tool_name]
+    input_model = model.model_validate(payload)
+    for name in path_fields:
+        value = getattr(input_model, name)
+        paths: Sequence[str] = value if isinstance(value, list) else () if value is None else (value,)
+        for path in paths:
+            workspace.assert_in_workspace(Path(path))
+    return input_model
@@ -0,0 +1,401 @@
+"""Sheet publishing: PDF, DWG and IFC exports split into resumable work units.
+
+A publish run turns the selected sheets into work units (one per sheet and
+format, or one per IFC export) with deterministic file names, and hands them
+out in small batches to every bridge instance that has the document open, so
+several Revit sessions export in parallel. Each Revit session still runs one
+command at a time.
+
+Every unit is tracked in ``publish-manifest.json`` in the output directory.
+A unit is skipped when its sheet fingerprint (``revit.get_sheet_fingerprints``)
+matches the previous run and its file is still there, so re-running a publish
+only exports what changed or what failed last time. Checksums, PDF merging
+and zipping run afterwards in a process pool.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from .. import codec
+from ..errors import BridgeError, BridgeUnavailable
+from .schedules import file_digest
+
+try:  # Merging PDFs is optional
+    import pypdf
+except ImportError:  # pragma: no cover - depends on the environment
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+SHEET_FORMATS = ("pdf", "dwg")
+MANIFEST_NAME = "publish-manifest.json"
+MANIFEST_VERSION = 1
+# Sheets per bridge call; a PDF or DWG sheet can take several seconds and the
+# add-in gives each command 30 s.
+SHEETS_PER_CALL = 4
+
+_UNSAFE_FILENAME = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    key: str
+    format: str
+    file: str
+    fingerprint: str
+    sheet_id: int | None = None
+    sheet_number: str | None = None
+    view_id: int | None = None
+
+
+def sheet_file_stem(sheet: dict[str, Any]) -> str:
+    """``<number> - <name>``, with characters Windows rejects replaced."""
+    return _UNSAFE_FILENAME.sub("_", f"{sheet['sheet_number']} - {sheet['sheet_name']}").strip(" .")
+
+
+def plan_units(
+    sheets: Sequence[dict[str, Any]],
+    formats: Iterable[str],
+    ifc_name: str | None = None,
+    ifc_view_id: int | None = None,
+    document_token: str = "",
+) -> list[WorkUnit]:
+    """Work units for ``sheets`` (fingerprinted records) in each sheet format, plus IFC.
+
+    Units come out ordered by format and sheet number, so file names and
+    batches are the same from one run to the next.
+    """
+    units = []
+    ordered = sorted(sheets, key=lambda sheet: sheet["sheet_number"])
+    for fmt in formats:
+        if fmt == "ifc":
+            continue
+        if fmt not in SHEET_FORMATS:
+            raise ValueError(f"Unknown publish format {fmt!r}; choose from {[*SHEET_FORMATS, 'ifc']}")
+        units.extend(
+            WorkUnit(
+                key=f"{fmt}:{sheet['sheet_number']}",
+                format=fmt,
+                file=f"{sheet_file_stem(sheet)}.{fmt}",
+                fingerprint=sheet["fingerprint"],
+                sheet_id=sheet["id"],
+                sheet_number=sheet["sheet_number"],
+            )
+            for sheet in ordered
+        )
+    if "ifc" in formats:
+        name = _UNSAFE_FILENAME.sub("_", ifc_name or "model")
+        units.append(
+            WorkUnit(
+                key=f"ifc:{name}",
+                format="ifc",
+                file=f"{name}.ifc",
+                # The whole model goes out, so any change to it counts.
+                fingerprint=f"{document_token}|view={ifc_view_id}",
+                view_id=ifc_view_id,
+            )
+        )
+    return units
+
+
+class Manifest:
+    """Per-unit publish status, saved atomically after every batch."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.units: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        try:
+            saved = codec.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return
+        if saved.get("version") == MANIFEST_VERSION:
+            self.units = saved.get("units", {})
+
+    def is_current(self, unit: WorkUnit) -> bool:
+        """True when ``unit`` was exported with the same fingerprint and its file is intact."""
+        entry = self.units.get(unit.key)
+        if not entry or entry.get("status") != "done" or entry.get("fingerprint") != unit.fingerprint:
+            return False
+        try:
+            return (self.path.parent / unit.file).stat().st_size == entry.get("bytes")
+        except OSError:
+            return False
+
+    def record(self, unit: WorkUnit, status: str, **details: Any) -> None:
+        with self._lock:
+            self.units[unit.key] = {
+                "format": unit.format,
+                "sheet_id": unit.sheet_id,
+                "sheet_number": unit.sheet_number,
+                "file": unit.file,
+                "fingerprint": unit.fingerprint,
+                "status": status,
+                **details,
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            temporary.write_bytes(codec.dumps({"version": MANIFEST_VERSION, "units": self.units}))
+            os.replace(temporary, self.path)
+
+
+def bridge_workers(bridge: Any) -> list[ToolCall]:
+    """One tool call per bridge instance that can take work.
+
+    A pool contributes each healthy member with the same document open as the
+    first healthy one; anything else is a single worker.
+    """
+    members = getattr(bridge, "members", None)
+    if not members:
+        return [bridge.send_tool]
+    if hasattr(bridge, "check_health"):
+        bridge.check_health()
+    healthy = [member for member in members if member.healthy]
+    if not healthy:
+        return [bridge.send_tool]
+    document = healthy[0].active_document
+    return [member.client.call_tool for member in healthy if member.active_document == document]
+
+
+def _batches(units: Sequence[WorkUnit], size: int) -> list[list[WorkUnit]]:
+    batches: list[list[WorkUnit]] = []
+    for fmt in dict.fromkeys(unit.format for unit in units):
+        same = [unit for unit in units if unit.format == fmt]
+        # IFC exports the whole model per unit, so those always go one at a time.
+        step = 1 if fmt == "ifc" else size
+        batches.extend(same[i : i + step] for i in range(0, len(same), step))
+    return batches
+
+
+def _export_batch(
+    call: ToolCall, batch: Sequence[WorkUnit], output_dir: Path, options: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """Run one batch on one bridge; returns ``{unit key: {"status", "message"}}``."""
+    fmt = batch[0].format
+    if fmt == "pdf":
+        result = call(
+            "revit.export_pdf_by_sheet_set",
+            {
+                "output_directory": str(output_dir),
+                "sheets": [{"sheet_id": unit.sheet_id, "file_name": Path(unit.file).stem} for unit in batch],
+            },
+        )
+        by_id = {entry.get("sheet_id"): entry for entry in result.get("files", [])}
+        return {unit.key: by_id.get(unit.sheet_id, {"status": "error", "message": "not reported"}) for unit in batch}
+    if fmt == "dwg":
+        result = call(
+            "revit.export_dwg_by_view",
+            {
+                "output_directory": str(output_dir),
+                "view_ids": [unit.sheet_id for unit in batch],
+                "file_names": [Path(unit.file).stem for unit in batch],
+                "dwg_version": options.get("dwg_version", "AutoCAD2018"),
+            },
+        )
+        by_id = {entry.get("view_id"): entry for entry in result.get("files", [])}
+        return {unit.key: by_id.get(unit.sheet_id, {"status": "error", "message": "not reported"}) for unit in batch}
+    (unit,) = batch
+    payload = {"output_path": str(output_dir / unit.file), "ifc_version": options.get("ifc_version", "IFC2x3")}
+    if unit.view_id is not None:
+        payload["view_id"] = unit.view_id
+    result = call("revit.export_ifc_with_settings", payload)
+    return {unit.key: {"status": result.get("status", "error"), "message": result.get("message")}}
+
+
+def run_units(
+    workers: Sequence[ToolCall],
+    units: Sequence[WorkUnit],
+    output_dir: Path,
+    manifest: Manifest,
+    *,
+    sheets_per_call: int = SHEETS_PER_CALL,
+    options: dict[str, Any] | None = None,
+) -> dict[str, str]:
+    """Export ``units`` across ``workers`` in parallel; returns ``{unit key: status}``.
+
+    Each worker thread takes the next batch from a shared queue. A bridge
+    failing at the transport level hands its batch back and drops out, since
+    re-exporting only overwrites the same files; other errors fail the batch.
+    Batches handed back after every other worker has finished are marked
+    failed, so the next run picks them up.
+    """
+    options = options or {}
+    pending: queue.Queue[list[WorkUnit]] = queue.Queue()
+    for batch in _batches(units, sheets_per_call):
+        pending.put(batch)
+    outcome: dict[str, str] = {}
+    dropped: list[str] = []
+
+    def work(index: int, call: ToolCall) -> None:
+        while True:
+            try:
+                batch = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results = _export_batch(call, batch, output_dir, options)
+            except BridgeUnavailable as exc:
+                logger.warning("Bridge %d dropped out of publishing: %s", index, exc)
+                pending.put(batch)
+                dropped.append(str(exc))
+                return
+            except BridgeError as exc:
+                results = {unit.key: {"status": "error", "message": str(exc)} for unit in batch}
+            for unit in batch:
+                entry = results[unit.key]
+                path = output_dir / unit.file
+                if entry.get("status") == "success" and path.exists():
+                    manifest.record(unit, "done", bytes=path.stat().st_size, bridge=index)
+                    outcome[unit.key] = "done"
+                else:
+                    manifest.record(unit, "failed", error=entry.get("message") or "no file written", bridge=index)
+                    outcome[unit.key] = "failed"
+            manifest.save()
+
+    threads = [
+        threading.Thread(target=work, args=(index, call), name=f"revit-publish-{index}", daemon=True)
+        for index, call in enumerate(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if not pending.empty():
+        _fail_remaining(pending, manifest, outcome, f"no bridge left to take it: {dropped[-1]}")
+    return outcome
+
+
+def _fail_remaining(pending: queue.Queue, manifest: Manifest, outcome: dict[str, str], message: str) -> None:
+    while True:
+        try:
+            batch = pending.get_nowait()
+        except queue.Empty:
+            break
+        for unit in batch:
+            manifest.record(unit, "failed", error=message)
+            outcome[unit.key] = "failed"
+    manifest.save()
+
+
+def merge_pdfs(paths: Sequence[str], target: str) -> str:
+    """Concatenate ``paths`` into ``target`` in the given order."""
+    if pypdf is None:
+        raise ValueError("Merging PDFs needs pypdf; install the 'publish' extra")
+    writer = pypdf.PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(target, "wb") as handle:
+        writer.write(handle)
+    return target
+
+
+def zip_files(paths: Sequence[str], target: str) -> str:
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in paths:
+            archive.write(path, arcname=Path(path).name)
+    return target
+
+
+def post_process(
+    manifest: Manifest,
+    units: Sequence[WorkUnit],
+    *,
+    merged_name: str | None = None,
+    archive_name: str | None = None,
+    processes: int | None = None,
+) -> dict[str, str]:
+    """Checksum new outputs, then merge PDFs and zip, in a process pool.
+
+    Only units whose manifest entry lacks a checksum are hashed, so files
+    skipped as unchanged cost nothing. Returns the paths of any merged PDF
+    and archive.
+    """
+    output_dir = manifest.path.parent
+    done = [unit for unit in units if manifest.units.get(unit.key, {}).get("status") == "done"]
+    unhashed = [unit for unit in done if not manifest.units[unit.key].get("sha256")]
+    outputs: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        digests = pool.map(file_digest, [output_dir / unit.file for unit in unhashed])
+        merged = archived = None
+        pdfs = [str(output_dir / unit.file) for unit in done if unit.format == "pdf"]
+        if merged_name and pdfs:
+            merged = pool.submit(merge_pdfs, pdfs, str(output_dir / merged_name))
+        if archive_name and done:
+            archived = pool.submit(zip_files, [str(output_dir / unit.file) for unit in done], str(output_dir / archive_name))
+        for unit, digest in zip(unhashed, digests):
+            manifest.units[unit.key]["sha256"] = digest
+        if merged is not None:
+            outputs["merged_path"] = merged.result()
+        if archived is not None:
+            outputs["archive_path"] = archived.result()
+    manifest.save()
+    return outputs
+
+
+def publish(
+    bridge: Any,
+    output_dir: Path,
+    formats: Sequence[str],
+    *,
+    sheet_numbers: Iterable[str] | None = None,
+    sheets_per_call: int = SHEETS_PER_CALL,
+    force: bool = False,
+    merged_name: str | None = None,
+    archive_name: str | None = None,
+    ifc_name: str | None = None,
+    ifc_view_id: int | None = None,
+    options: dict[str, Any] | None = None,
+    max_errors: int = 100,
+) -> dict[str, Any]:
+    """Plan, export and post-process one publish run; returns a summary."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    call = bridge.send_tool
+
+    # Also returns the document's change token, which fingerprints IFC units.
+    listing = call("revit.get_sheet_fingerprints", {})
+    sheets, document = listing.get("sheets", []), listing.get("document", "")
+    missing: list[str] = []
+    if sheet_numbers is not None:
+        wanted = {number.casefold(): number for number in sheet_numbers}
+        found = {sheet["sheet_number"].casefold() for sheet in sheets}
+        missing = sorted(number for key, number in wanted.items() if key not in found)
+        sheets = [sheet for sheet in sheets if sheet["sheet_number"].casefold() in wanted]
+
+    units = plan_units(sheets, formats, ifc_name, ifc_view_id, document)
+    todo = units if force else [unit for unit in units if not manifest.is_current(unit)]
+    workers = bridge_workers(bridge)
+    logger.info("Publishing %d of %d units on %d bridge(s)", len(todo), len(units), len(workers))
+    outcome = run_units(workers, todo, output_dir, manifest, sheets_per_call=sheets_per_call, options=options)
+    manifest.save()
+    outputs = post_process(manifest, units, merged_name=merged_name, archive_name=archive_name)
+
+    errors = [f"sheet {number}: not in the model" for number in missing]
+    errors += [
+        f"{key}: {manifest.units[key].get('error')}" for key, status in sorted(outcome.items()) if status == "failed"
+    ]
+    failed = sum(status == "failed" for status in outcome.values())
+    return {
+        "units": len(units),
+        "exported": sum(status == "done" for status in outcome.values()),
+        "skipped": len(units) - len(todo),
+        "failed": failed,
+        "bridges": len(workers),
+        "manifest_path": str(manifest.path),
+        "errors": errors[:max_errors],
+        "status": "complete" if not failed and not missing else "incomplete",
+        **outputs,
+    }
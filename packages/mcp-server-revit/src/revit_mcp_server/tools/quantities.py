@@ -0,0 +1,158 @@
+"""Quantity take-off: pull raw element quantities once, aggregate with NumPy.
+
+The bridge reports, per element, its category, level, phase of creation,
+length and a list of materials with their area and volume. Those are
+flattened into one row per (element, material), with labels coded through
+``Categorical`` as in the model replica, so a group-by over any combination of
+category, level, material and phase is a handful of ``bincount`` calls.
+
+An element's length is counted once, on its first material row. Elements
+without materials get one row with no material and the element's own area and
+volume. Quantities are Revit internal units: feet, square feet, cubic feet.
+"""
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .. import codec
+from ..replica.store import Categorical
+
+try:  # Parquet output is optional
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+DIMENSIONS = ("category", "level", "material", "phase")
+MEASURES = ("length", "area", "volume")
+# Fields requested from revit.get_elements_by_type for a take-off.
+QUANTITY_FIELDS = ("category", "level", "phase", "length", "area", "volume", "materials")
+
+_NO_MATERIAL: list[dict[str, Any]] = [{}]
+
+
+class QuantityTable:
+    """Columnar (element, material) rows, filled page by page."""
+
+    def __init__(self) -> None:
+        self.labels = {name: Categorical.encode(()) for name in DIMENSIONS}
+        self._chunks: list[dict[str, np.ndarray]] = []
+
+    def add(self, records: Sequence[Mapping[str, Any]]) -> None:
+        """Append one page of element records from the bridge."""
+        # Element-level columns are coded once per element and repeated per
+        # material row; only material columns are built row by row.
+        layers = [record.get("materials") or _NO_MATERIAL for record in records]
+        counts = np.fromiter(map(len, layers), dtype=np.int64, count=len(layers))
+        chunk = {"element_id": np.repeat(np.fromiter((r["id"] for r in records), np.int64, len(records)), counts)}
+        for name in ("category", "level", "phase"):
+            chunk[name] = np.repeat(self.labels[name].codes_for(r.get(name) for r in records), counts)
+        chunk["material"] = self.labels["material"].codes_for(
+            layer.get("material") for materials in layers for layer in materials
+        )
+        # Rows without a material carry the element's own area and volume.
+        for name in ("area", "volume"):
+            chunk[name] = _floats(
+                (layer or record).get(name)
+                for record, materials in zip(records, layers)
+                for layer in materials
+            )
+        # Length belongs to the element, so only its first row carries it.
+        length = np.zeros(int(counts.sum()))
+        length[np.cumsum(counts) - counts] = _floats(r.get("length") for r in records)
+        chunk["length"] = length
+        self._chunks.append(chunk)
+
+    def add_arrays(
+        self, element_ids: np.ndarray, codes: Mapping[str, np.ndarray], measures: Mapping[str, np.ndarray]
+    ) -> None:
+        """Append pre-coded rows; ``codes`` index into ``self.labels``."""
+        self._chunks.append({"element_id": element_ids, **codes, **measures})
+
+    def column(self, name: str) -> np.ndarray:
+        if not self._chunks:
+            return np.empty(0, dtype=np.int32 if name in DIMENSIONS else np.float64)
+        if len(self._chunks) > 1:
+            self._chunks = [{key: np.concatenate([chunk[key] for chunk in self._chunks]) for key in self._chunks[0]}]
+        return self._chunks[0][name]
+
+    def __len__(self) -> int:
+        return sum(len(chunk["element_id"]) for chunk in self._chunks)
+
+    @property
+    def element_count(self) -> int:
+        return int(len(np.unique(self.column("element_id"))))
+
+
+def _floats(values: Iterable[Any]) -> np.ndarray:
+    # None becomes NaN; sums treat it as zero.
+    return np.array([value if value is not None else np.nan for value in values], dtype=np.float64)
+
+
+def aggregate(table: QuantityTable, by: Sequence[str] = DIMENSIONS) -> list[dict[str, Any]]:
+    """One row per distinct combination of ``by``, with element counts and summed measures.
+
+    Groups come back sorted by their labels, with missing labels last.
+    """
+    unknown = set(by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Cannot group quantities by {sorted(unknown)}; choose from {list(DIMENSIONS)}")
+    element_ids = table.column("element_id")
+    if not len(element_ids):
+        return []
+
+    # Shift codes so missing (-1) becomes 0, then fold all dimensions into one key.
+    shape = tuple(len(table.labels[name].labels) + 1 for name in by)
+    if by:
+        key = np.ravel_multi_index([table.column(name) + 1 for name in by], shape)
+    else:
+        key = np.zeros(len(element_ids), dtype=np.int64)
+    groups, inverse = np.unique(key, return_inverse=True)
+    size = len(groups)
+
+    # An element split over several materials counts once per group.
+    order = np.lexsort((element_ids, inverse))
+    ordered_groups, ordered_ids = inverse[order], element_ids[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (ordered_groups[1:] != ordered_groups[:-1]) | (ordered_ids[1:] != ordered_ids[:-1])
+    elements = np.bincount(ordered_groups[first], minlength=size)
+    sums = {
+        name: np.bincount(inverse, weights=np.nan_to_num(table.column(name)), minlength=size)
+        for name in MEASURES
+    }
+
+    codes = np.unravel_index(groups, shape) if by else ()
+    rows = []
+    for group in range(size):
+        row: dict[str, Any] = {
+            name: table.labels[name].decode(int(codes[axis][group]) - 1) for axis, name in enumerate(by)
+        }
+        row["elements"] = int(elements[group])
+        row.update({name: round(float(sums[name][group]), 6) for name in MEASURES})
+        rows.append(row)
+    rows.sort(key=lambda row: [(row[name] is None, row[name] or "") for name in by])
+    return rows
+
+
+def write_quantities(path: Path, rows: Sequence[Mapping[str, Any]], columns: Sequence[str]) -> str:
+    """Write aggregated rows as CSV, JSON or Parquet, chosen by the file suffix."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        if pyarrow is None:
+            raise ValueError("Parquet output needs pyarrow; install the 'parquet' extra or write .csv")
+        table = pyarrow.table({name: [row.get(name) for row in rows] for name in columns})
+        pyarrow.parquet.write_table(table, path)
+        return "parquet"
+    if suffix == ".json":
+        path.write_bytes(codec.dumps(list(rows)))
+        return "json"
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(columns))
+        writer.writeheader()
+        writer.writerows(rows)
+    return "csv"
@@ -0,0 +1,244 @@
+"""Streaming schedule export.
+
+Schedule rows are paged from ``revit.get_schedule_data`` and written straight
+to CSV files or an XLSX workbook, one page at a time, so memory stays flat no
+matter how long the schedule is. Callers get back a summary: row counts, file
+paths and SHA-256 checksums.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+# Rows per revit.get_schedule_data call; the add-in caps pages at 2000.
+SCHEDULE_PAGE = 1000
+# Schedules are views of this type in revit.list_views.
+SCHEDULE_VIEW_TYPE = "Schedule"
+
+_UNSAFE_FILENAME = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_UNSAFE_SHEET_NAME = re.compile(r"[\[\]:*?/\\]")
+# XML 1.0 forbids most control characters, even escaped.
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def select_schedules(
+    call: ToolCall, ids: Sequence[int] | None = None, names: Sequence[str] | None = None
+) -> list[dict[str, Any]]:
+    """Schedules in the model, optionally narrowed to ``ids`` or ``names``."""
+    views = call("revit.list_views", {}).get("views", [])
+    schedules = [view for view in views if view.get("type") == SCHEDULE_VIEW_TYPE]
+    if ids or names:
+        wanted_ids, wanted_names = set(ids or ()), {name.casefold() for name in names or ()}
+        schedules = [s for s in schedules if s["id"] in wanted_ids or s["name"].casefold() in wanted_names]
+    return schedules
+
+
+def iter_schedule_pages(call: ToolCall, schedule_id: int, page_size: int = SCHEDULE_PAGE) -> Iterator[dict[str, Any]]:
+    """Yield ``revit.get_schedule_data`` pages until the schedule is exhausted."""
+    offset = 0
+    while True:
+        page = call("revit.get_schedule_data", {"schedule_id": schedule_id, "offset": offset, "limit": page_size})
+        yield page
+        rows = page.get("rows") or []
+        offset += len(rows)
+        if not rows or not page.get("truncated"):
+            break
+
+
+def _split(pages: Iterator[dict[str, Any]]) -> tuple[list[str], Iterator[list[list[str]]]]:
+    """Column headings from the first page, and an iterator over every page's rows."""
+    first = next(pages)
+
+    def rows() -> Iterator[list[list[str]]]:
+        yield first.get("rows") or []
+        for page in pages:
+            yield page.get("rows") or []
+
+    return list(first.get("columns") or []), rows()
+
+
+def write_csv(path: Path, columns: Sequence[str], pages: Iterable[list[list[str]]]) -> int:
+    """Write a header and every page of rows; returns the row count."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        for rows in pages:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+class XlsxWriter:
+    """Minimal streaming XLSX workbook: one sheet per schedule, inline strings.
+
+    Each sheet's XML is written through ``ZipFile.open(..., "w")`` as rows
+    arrive; the workbook parts that list the sheets are added on close.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+        self._sheets: list[str] = []
+
+    def add_sheet(self, name: str, columns: Sequence[str], pages: Iterable[list[list[str]]]) -> int:
+        title = self._sheet_title(name)
+        self._sheets.append(title)
+        count = 0
+        part = f"xl/worksheets/sheet{len(self._sheets)}.xml"
+        with self._zip.open(part, "w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(columns))
+            for rows in pages:
+                sheet.write(b"".join(_xlsx_row(row) for row in rows))
+                count += len(rows)
+            sheet.write(b"</sheetData></worksheet>")
+        return count
+
+    def close(self) -> None:
+        sheets = range(1, len(self._sheets) + 1)
+        self._zip.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for n in sheets
+            )
+            + "</Types>",
+        )
+        self._zip.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="xl/workbook.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            "</Relationships>",
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(
+                f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+                for n, title in zip(sheets, self._sheets)
+            )
+            + "</sheets></workbook>",
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+                for n in sheets
+            )
+            + "</Relationships>",
+        )
+        self._zip.close()
+
+    def __enter__(self) -> "XlsxWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _sheet_title(self, name: str) -> str:
+        base = _UNSAFE_SHEET_NAME.sub("_", name).strip("'")[:31] or "Schedule"
+        title, suffix = base, 2
+        while title.casefold() in (existing.casefold() for existing in self._sheets):
+            tail = f" ({suffix})"
+            title, suffix = base[: 31 - len(tail)] + tail, suffix + 1
+        return title
+
+
+def _xlsx_row(values: Iterable[Any]) -> bytes:
+    cells = "".join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_XML_ILLEGAL.sub("", str(value)))}</t></is></c>'
+        for value in values
+    )
+    return f"<row>{cells}</row>".encode("utf-8")
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stream_schedules(
+    call: ToolCall,
+    schedules: Sequence[dict[str, Any]],
+    output: Path,
+    page_size: int = SCHEDULE_PAGE,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Stream ``schedules`` to ``output`` and describe what was written.
+
+    ``output`` ending in ``.xlsx`` gets one sheet per schedule; ending in
+    ``.csv`` it takes exactly one schedule; anything else is a directory that
+    receives one CSV per schedule. Returns per-schedule summaries and the
+    files written, with their SHA-256 checksums.
+    """
+    suffix = output.suffix.lower()
+    if suffix == ".csv" and len(schedules) != 1:
+        raise ValueError(
+            f"A .csv output holds one schedule but {len(schedules)} matched; pass a directory or an .xlsx path"
+        )
+    exported: list[dict[str, Any]] = []
+    paths: list[Path] = []
+
+    if suffix == ".xlsx":
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with XlsxWriter(output) as workbook:
+            for schedule in schedules:
+                columns, pages = _split(iter_schedule_pages(call, schedule["id"], page_size))
+                rows = workbook.add_sheet(schedule["name"], columns, pages)
+                exported.append(_summary(schedule, rows, columns, output))
+        paths.append(output)
+    else:
+        directory = output.parent if suffix == ".csv" else output
+        directory.mkdir(parents=True, exist_ok=True)
+        taken: set[str] = set()
+        for schedule in schedules:
+            path = output if suffix == ".csv" else directory / _csv_name(schedule["name"], taken)
+            columns, pages = _split(iter_schedule_pages(call, schedule["id"], page_size))
+            rows = write_csv(path, columns, pages)
+            exported.append(_summary(schedule, rows, columns, path))
+            paths.append(path)
+
+    files = [{"path": str(path), "sha256": file_digest(path), "bytes": path.stat().st_size} for path in paths]
+    return exported, files
+
+
+def _csv_name(name: str, taken: set[str]) -> str:
+    # Same " (2)" scheme as XlsxWriter._sheet_title; case-insensitive because
+    # Windows file systems are, and two schedules must never share a file.
+    base = _UNSAFE_FILENAME.sub("_", name) or "Schedule"
+    stem, suffix = base, 2
+    while stem.casefold() in taken:
+        stem, suffix = f"{base} ({suffix})", suffix + 1
+    taken.add(stem.casefold())
+    return f"{stem}.csv"
+
+
+def _summary(schedule: dict[str, Any], rows: int, columns: Sequence[str], path: Path) -> dict[str, Any]:
+    return {"schedule_id": schedule["id"], "name": schedule["name"], "rows": rows, "columns": len(columns), "file": str(path)}
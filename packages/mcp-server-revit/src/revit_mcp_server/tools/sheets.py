@@ -0,0 +1,302 @@
+"""Sheet creation from CSV, streamed and submitted to Revit in chunks.
+
+Rows are read and validated one at a time, checked against the sheet numbers
+already in the model, and sent to ``revit.batch_create_sheets_from_csv`` in
+chunks whose size adapts so each Revit transaction finishes well inside the
+add-in's 30 s command timeout.
+
+Progress is checkpointed after every chunk. Re-running with ``resume``
+continues after the last chunk that committed; a plain re-run is also safe,
+because sheets that already exist are skipped.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+from .. import codec
+from ..errors import BridgeError
+
+logger = logging.getLogger(__name__)
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+CHUNK_SIZE = 50
+MAX_CHUNK_SIZE = 500
+# Aim for chunks that take about a third of the add-in's command timeout.
+TARGET_SECONDS = 10.0
+# Attempts per chunk, halving it each time, before the batch stops.
+CHUNK_ATTEMPTS = 3
+
+# Accepted spellings of each column, after lower-casing and replacing spaces.
+_COLUMNS = {
+    "sheet_number": ("sheet_number", "number", "sheet_no", "sheet"),
+    "sheet_name": ("sheet_name", "name", "title"),
+    "titleblock_name": ("titleblock_name", "titleblock", "title_block"),
+}
+# Characters Revit rejects in sheet numbers and names.
+_PROHIBITED = re.compile(r"[\\:{}\[\]|;<>?`~]")
+
+
+@dataclass
+class SheetRow:
+    line: int
+    sheet_number: str
+    sheet_name: str
+    titleblock_name: str | None = None
+    error: str | None = None
+
+    def payload(self) -> dict[str, Any]:
+        row = {"sheet_number": self.sheet_number, "sheet_name": self.sheet_name}
+        if self.titleblock_name:
+            row["titleblock_name"] = self.titleblock_name
+        return row
+
+
+@dataclass
+class BatchState:
+    """Counters for one batch; saved as the checkpoint after each chunk."""
+
+    next_line: int = 2
+    rows_read: int = 0
+    created: int = 0
+    skipped_existing: int = 0
+    skipped_duplicate: int = 0
+    invalid: int = 0
+    failed: int = 0
+    chunks: int = 0
+    chunk_size: int = CHUNK_SIZE
+    errors: list[str] = field(default_factory=list)
+
+
+def read_sheet_rows(path: Path, titleblock_name: str | None = None, start_line: int = 2) -> Iterator[SheetRow]:
+    """Yield validated rows from ``path``; rows that fail carry ``error``.
+
+    ``line`` is the 1-based line number of the record, the header being
+    line 1. Rows before ``start_line`` are skipped without validation.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{path} is empty")
+        positions = _column_positions(header)
+        for row in reader:
+            line = reader.line_num
+            if line < start_line or not any(cell.strip() for cell in row):
+                continue
+            values = {name: row[index].strip() if index < len(row) else "" for name, index in positions.items()}
+            yield _validate(line, values, titleblock_name)
+
+
+def read_sheet_numbers(path: Path) -> Iterator[str]:
+    """Non-empty values of the sheet number column, e.g. to pick sheets to publish."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{path} is empty")
+        index = _column_positions(header, required=("sheet_number",))["sheet_number"]
+        for row in reader:
+            if index < len(row) and row[index].strip():
+                yield row[index].strip()
+
+
+def _column_positions(header: Sequence[str], required: Sequence[str] = ("sheet_number", "sheet_name")) -> dict[str, int]:
+    normalized = [cell.strip().lower().replace(" ", "_") for cell in header]
+    positions = {}
+    for name, spellings in _COLUMNS.items():
+        index = next((normalized.index(s) for s in spellings if s in normalized), None)
+        if index is not None:
+            positions[name] = index
+    missing = set(required) - positions.keys()
+    if missing:
+        raise ValueError(f"CSV header needs columns {sorted(missing)}; found {list(header)}")
+    return positions
+
+
+def _validate(line: int, values: dict[str, str], titleblock_name: str | None) -> SheetRow:
+    row = SheetRow(
+        line,
+        values["sheet_number"],
+        values["sheet_name"],
+        values.get("titleblock_name") or titleblock_name,
+    )
+    for name in ("sheet_number", "sheet_name"):
+        value = getattr(row, name)
+        if not value:
+            row.error = f"line {line}: {name} is empty"
+        elif _PROHIBITED.search(value):
+            row.error = f"line {line}: {name} {value!r} contains characters Revit does not allow"
+    return row
+
+
+class ChunkSizer:
+    """Grows or shrinks the chunk size towards ``target_seconds`` per chunk."""
+
+    def __init__(self, size: int = CHUNK_SIZE, target_seconds: float = TARGET_SECONDS) -> None:
+        self.size = max(1, min(size, MAX_CHUNK_SIZE))
+        self.target_seconds = target_seconds
+
+    def record(self, rows: int, seconds: float) -> None:
+        if rows < self.size or seconds <= 0:
+            return
+        ideal = self.target_seconds * rows / seconds
+        # Grow at most twofold per chunk so one fast chunk cannot overshoot.
+        self.size = max(1, min(int(ideal), 2 * self.size, MAX_CHUNK_SIZE))
+
+    def shrink(self) -> None:
+        self.size = max(1, self.size // 2)
+
+
+def existing_sheet_numbers(call: ToolCall) -> set[str]:
+    return {sheet["sheet_number"].casefold() for sheet in call("revit.list_sheets", {}).get("sheets", [])}
+
+
+def load_checkpoint(path: Path, csv_path: Path) -> BatchState | None:
+    """The saved state for ``csv_path``, or None if absent or the CSV has changed."""
+    try:
+        saved = codec.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if saved.pop("source", None) != _fingerprint(csv_path):
+        return None
+    return BatchState(**saved)
+
+
+def _save_checkpoint(path: Path, csv_path: Path, state: BatchState) -> None:
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(codec.dumps({"source": _fingerprint(csv_path), **asdict(state)}))
+    os.replace(temporary, path)
+
+
+def _fingerprint(csv_path: Path) -> dict[str, Any]:
+    stat = csv_path.stat()
+    return {"path": str(csv_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def run_sheet_batch(
+    call: ToolCall,
+    csv_path: Path,
+    checkpoint_path: Path,
+    *,
+    titleblock_name: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    target_seconds: float = TARGET_SECONDS,
+    resume: bool = False,
+    max_errors: int = 100,
+    progress: Callable[[BatchState], None] | None = None,
+) -> tuple[BatchState, bool]:
+    """Create the sheets listed in ``csv_path``; returns the final state and whether it finished.
+
+    Only one chunk of rows is held at a time. Sheet numbers are compared
+    case-insensitively against the model and against earlier rows. A chunk
+    that fails is retried in halves after re-listing the model's sheets, so a
+    chunk that committed after a timeout is not created twice. If it still
+    fails, the batch stops and the checkpoint points at that chunk.
+    """
+    state = (load_checkpoint(checkpoint_path, csv_path) if resume else None) or BatchState(chunk_size=chunk_size)
+    sizer = ChunkSizer(state.chunk_size, target_seconds)
+    existing = existing_sheet_numbers(call)
+    seen: set[str] = set()
+    pending: list[SheetRow] = []
+    last_line = state.next_line - 1
+
+    def note(message: str) -> None:
+        if len(state.errors) < max_errors:
+            state.errors.append(message)
+
+    def submit() -> bool:
+        queue = deque([pending[:]])
+        attempts = 0
+        while queue:
+            part = queue.popleft()
+            start = time.perf_counter()
+            try:
+                result = call("revit.batch_create_sheets_from_csv", {"sheets": [row.payload() for row in part]})
+            except BridgeError as exc:
+                attempts += 1
+                if attempts >= CHUNK_ATTEMPTS:
+                    note(f"lines {part[0].line}-{part[-1].line}: {exc}")
+                    return False
+                logger.warning("Sheet chunk of %d failed, retrying smaller: %s", len(part), exc)
+                sizer.shrink()
+                # The failed call may still have committed some sheets.
+                try:
+                    existing.update(existing_sheet_numbers(call))
+                except BridgeError:
+                    return False
+                created = [row for row in part if row.sheet_number.casefold() in existing]
+                state.created += len(created)
+                part = [row for row in part if row.sheet_number.casefold() not in existing]
+                queue.extendleft(reversed([part[i : i + sizer.size] for i in range(0, len(part), sizer.size)]))
+                continue
+            sizer.record(len(part), time.perf_counter() - start)
+            for outcome in result.get("results", []):
+                if outcome.get("status") == "success":
+                    state.created += 1
+                    existing.add(str(outcome.get("sheet_number", "")).casefold())
+                else:
+                    state.failed += 1
+                    note(f"sheet {outcome.get('sheet_number')}: {outcome.get('message', 'not created')}")
+        state.chunks += 1
+        state.chunk_size = sizer.size
+        state.next_line = last_line + 1
+        _save_checkpoint(checkpoint_path, csv_path, state)
+        logger.info(
+            "Sheet batch: %d created, %d skipped, %d failed after %d rows",
+            state.created, state.skipped_existing + state.skipped_duplicate, state.failed, state.rows_read,
+        )
+        if progress is not None:
+            progress(state)
+        return True
+
+    for row in read_sheet_rows(csv_path, titleblock_name, state.next_line):
+        last_line = row.line
+        state.rows_read += 1
+        if row.error:
+            state.invalid += 1
+            note(row.error)
+            continue
+        key = row.sheet_number.casefold()
+        if key in existing:
+            state.skipped_existing += 1
+        elif key in seen:
+            state.skipped_duplicate += 1
+        else:
+            seen.add(key)
+            pending.append(row)
+            if len(pending) >= sizer.size:
+                if not submit():
+                    return state, False
+                pending.clear()
+    if pending and not submit():
+        return state, False
+    state.next_line = last_line + 1
+    _save_checkpoint(checkpoint_path, csv_path, state)
+    return state, True
+
+
+def validate_sheet_csv(csv_path: Path, titleblock_name: str | None = None, max_errors: int = 100) -> BatchState:
+    """Dry run: validate and de-duplicate ``csv_path`` without a model."""
+    state = BatchState()
+    seen: set[str] = set()
+    for row in read_sheet_rows(csv_path, titleblock_name):
+        state.rows_read += 1
+        state.next_line = row.line + 1
+        if row.error:
+            state.invalid += 1
+            if len(state.errors) < max_errors:
+                state.errors.append(row.error)
+        elif row.sheet_number.casefold() in seen:
+            state.skipped_duplicate += 1
+        else:
+            seen.add(row.sheet_number.casefold())
+    return state
@@ -0,0 +1,289 @@
+"""Unit conversion and formatting done locally instead of over the bridge.
+
+Revit stores lengths in feet, areas in square feet, volumes in cubic feet
+and angles in radians. Converting to and from those is arithmetic, yet the
+add-in's unit commands spend a queued UI-thread round trip on every value.
+This module does the arithmetic here, on scalars and NumPy arrays alike:
+
+* named units (``m``, ``mm``, ``ft``, ``deg``, ...) convert with the fixed
+  factors below;
+* a document's display units come from one ``revit.get_project_units``
+  call, which reports each spec's unit as ``display = internal * scale +
+  offset``. :class:`ProjectUnitsSource` fetches it once and keeps it until
+  another document is opened.
+
+:func:`scale_lengths` applies a length factor to the coordinate arguments
+of MCP tools, listed per tool in :data:`LENGTH_ARGUMENTS`, so agents can
+work in metres or in project units.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from .errors import SchemaValidationError
+
+ToolCall = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+_FOOT = 0.3048
+
+# Unit name -> (spec, internal units per unit).
+UNITS: dict[str, tuple[str, float]] = {
+    **dict.fromkeys(("ft", "feet"), ("length", 1.0)),
+    **dict.fromkeys(("in", "inches"), ("length", 1 / 12)),
+    **dict.fromkeys(("m", "meters"), ("length", 1 / _FOOT)),
+    **dict.fromkeys(("cm", "centimeters"), ("length", 0.01 / _FOOT)),
+    **dict.fromkeys(("mm", "millimeters"), ("length", 0.001 / _FOOT)),
+    **dict.fromkeys(("ft2", "square_feet"), ("area", 1.0)),
+    **dict.fromkeys(("in2", "square_inches"), ("area", 1 / 144)),
+    **dict.fromkeys(("m2", "square_meters"), ("area", 1 / _FOOT**2)),
+    **dict.fromkeys(("mm2", "square_millimeters"), ("area", 1e-6 / _FOOT**2)),
+    **dict.fromkeys(("ft3", "cubic_feet"), ("volume", 1.0)),
+    **dict.fromkeys(("m3", "cubic_meters"), ("volume", 1 / _FOOT**3)),
+    **dict.fromkeys(("l", "liters"), ("volume", 1e-3 / _FOOT**3)),
+    **dict.fromkeys(("rad", "radians"), ("angle", 1.0)),
+    **dict.fromkeys(("deg", "degrees"), ("angle", math.pi / 180)),
+    **dict.fromkeys(("grad", "gradians"), ("angle", math.pi / 200)),
+}
+# Words that stand for "Revit's own unit" in any spec.
+INTERNAL = "internal"
+PROJECT = "project"
+
+_POINT = ("x", "y", "z")
+_SEGMENT = ("start_x", "start_y", "start_z", "end_x", "end_y", "end_z")
+
+# Length arguments of each MCP tool, with the default the tool applies when
+# one is omitted (None: no default). Defaults are in the caller's units like
+# any given value, so they are filled in before scaling. Lists are scaled
+# item by item, and dict items on their x, y and z keys.
+LENGTH_ARGUMENTS: dict[str, dict[str, float | None]] = {
+    "revit_create_wall": {**dict.fromkeys(_SEGMENT, 0.0), "height": 10.0},
+    "revit_create_floor": {"points": None},
+    "revit_create_roof": {"points": None},
+    "revit_create_level": {"elevation": 10.0},
+    "revit_create_grid": dict.fromkeys(_SEGMENT),
+    "revit_create_room": dict.fromkeys(("x", "y")),
+    "revit_place_family_instance": dict.fromkeys(_POINT),
+    "revit_place_door": dict.fromkeys(_POINT),
+    "revit_place_window": dict.fromkeys(_POINT),
+    "revit_create_section_view": {**dict.fromkeys(_SEGMENT), "height": None},
+    "revit_place_viewport_on_sheet": dict.fromkeys(("x", "y")),
+    "revit_create_text_note": dict.fromkeys(("x", "y")),
+    "revit_create_tag": dict.fromkeys(("x", "y")),
+    "revit_create_column": dict.fromkeys(("x", "y")),
+    "revit_create_beam": dict.fromkeys(("start_x", "start_y", "end_x", "end_y")),
+    "revit_create_foundation": {"x": None, "y": None, "z": 0.0},
+    "revit_create_duct": {**dict.fromkeys(("start_x", "start_y", "end_x", "end_y")), "z": 10.0},
+    "revit_create_pipe": {**dict.fromkeys(("start_x", "start_y", "end_x", "end_y")), "z": 0.0},
+    "revit_move_element": {"x": None, "y": None, "z": 0.0},
+    "revit_copy_element": {"x": None, "y": None, "z": 0.0},
+    "revit_rotate_element": {"center_x": None, "center_y": None, "center_z": 0.0},
+    "revit_mirror_element": {"plane_origin_x": None, "plane_origin_y": None, "plane_origin_z": 0.0},
+    "revit_create_cable_tray": {
+        **dict.fromkeys(("start_x", "start_y", "end_x", "end_y")),
+        "start_z": 10.0, "end_z": 10.0, "width": 1.0, "height": 0.33,
+    },
+    "revit_create_conduit": {
+        **dict.fromkeys(("start_x", "start_y", "end_x", "end_y")), "start_z": 10.0, "end_z": 10.0, "diameter": 0.0625,
+    },
+    "revit_create_revision_cloud": {"points": None},
+    # Answered locally from the replica and the room boundary cache.
+    "revit_replica_in_box": {"box": None, "tolerance": None},
+    "revit_replica_at_point": {"point": None, "tolerance": None},
+    "revit_replica_nearest": {"point": None},
+    "revit_replica_clashes": {"tolerance": None},
+    "revit_locate_rooms": {"points": None},
+}
+
+Number = float | np.ndarray
+
+
+def _numeric(value: Any) -> Number:
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, (list, tuple)):
+        return np.asarray(value, dtype=np.float64)
+    return float(value)
+
+
+def unit_factor(unit: str, spec: str | None = None) -> float:
+    """Internal units per ``unit``; ``spec`` guards against mixing, say, area and length."""
+    if unit == INTERNAL:
+        return 1.0
+    try:
+        unit_spec, factor = UNITS[unit.lower()]
+    except KeyError:
+        raise SchemaValidationError(f"Unknown unit '{unit}'; use one of {sorted(UNITS)}") from None
+    if spec is not None and unit_spec != spec:
+        raise SchemaValidationError(f"'{unit}' is a unit of {unit_spec}, not {spec}")
+    return factor
+
+
+def to_internal(value: Any, unit: str, spec: str | None = None) -> Number:
+    return _numeric(value) * unit_factor(unit, spec)
+
+
+def from_internal(value: Any, unit: str, spec: str | None = None) -> Number:
+    return _numeric(value) / unit_factor(unit, spec)
+
+
+def convert(value: Any, from_unit: str, to_unit: str) -> Number:
+    """``value`` in ``from_unit`` expressed in ``to_unit``; both must be of one spec."""
+    spec = UNITS.get(from_unit.lower(), (None, 1.0))[0]
+    return _numeric(value) * (unit_factor(from_unit, spec) / unit_factor(to_unit, spec))
+
+
+@dataclass(frozen=True)
+class SpecUnits:
+    """A document's display unit for one spec: ``display = internal * scale + offset``."""
+
+    unit: str
+    label: str
+    symbol: str
+    scale: float
+    offset: float = 0.0
+    accuracy: float = 0.01
+
+    @property
+    def feet_and_inches(self) -> bool:
+        return "feetFractionalInches" in self.unit
+
+    @property
+    def fractional_inches(self) -> bool:
+        return "fractionalInches" in self.unit and not self.feet_and_inches
+
+
+# What an imperial template shows, for documents whose units are unknown.
+_DEFAULT_SPECS = {
+    "length": SpecUnits("autodesk.unit.unit:feetFractionalInches-1.0.1", "Feet and fractional inches", "", 1.0, 0.0, 1 / 3072),
+    "area": SpecUnits("autodesk.unit.unit:squareFeet-1.0.1", "Square feet", "SF", 1.0, 0.0, 0.01),
+    "volume": SpecUnits("autodesk.unit.unit:cubicFeet-1.0.1", "Cubic feet", "CF", 1.0, 0.0, 0.01),
+    "angle": SpecUnits("autodesk.unit.unit:degrees-1.0.1", "Degrees", "°", 180 / math.pi, 0.0, 0.01),
+}
+
+
+class ProjectUnits:
+    """A document's display units, as reported by ``revit.get_project_units``."""
+
+    def __init__(self, specs: Mapping[str, SpecUnits], document: str | None = None, decimal_symbol: str = ".") -> None:
+        self.specs = dict(specs)
+        self.document = document
+        self.decimal_symbol = decimal_symbol
+
+    @classmethod
+    def from_result(cls, result: Mapping[str, Any]) -> "ProjectUnits":
+        specs = {**_DEFAULT_SPECS}
+        for name, spec in (result.get("specs") or {}).items():
+            specs[name] = SpecUnits(
+                unit=spec.get("unit", ""),
+                label=spec.get("label", ""),
+                symbol=spec.get("symbol", ""),
+                scale=float(spec["scale"]),
+                offset=float(spec.get("offset", 0.0)),
+                accuracy=float(spec.get("accuracy") or 0.01),
+            )
+        return cls(specs, result.get("document"), result.get("decimal_symbol") or ".")
+
+    @classmethod
+    def default(cls) -> "ProjectUnits":
+        return cls(_DEFAULT_SPECS)
+
+    def spec(self, spec: str) -> SpecUnits:
+        try:
+            return self.specs[spec]
+        except KeyError:
+            raise SchemaValidationError(f"No project units for '{spec}'; known: {sorted(self.specs)}") from None
+
+    def to_internal(self, value: Any, spec: str = "length") -> Number:
+        units = self.spec(spec)
+        return (_numeric(value) - units.offset) / units.scale
+
+    def from_internal(self, value: Any, spec: str = "length") -> Number:
+        units = self.spec(spec)
+        return _numeric(value) * units.scale + units.offset
+
+    def format(self, value: float, spec: str = "length", symbol: bool = True) -> str:
+        """``value`` (internal units) as Revit would display it in this document."""
+        units = self.spec(spec)
+        if units.feet_and_inches or units.fractional_inches:
+            return _format_inches(float(value), units)
+        shown = float(self.from_internal(value, spec))
+        accuracy = units.accuracy if units.accuracy > 0 else 0.01
+        digits = max(0, -math.floor(math.log10(accuracy) + 1e-9))
+        text = f"{round(shown / accuracy) * accuracy:.{digits}f}".replace(".", self.decimal_symbol)
+        if not symbol or not units.symbol:
+            return text
+        return f"{text}{units.symbol}" if units.symbol == "°" else f"{text} {units.symbol}"
+
+
+def _format_inches(feet: float, units: SpecUnits) -> str:
+    # Accuracy is in feet; 1/3072 ft is 1/256".
+    denominator = max(1, round(1 / (units.accuracy * 12))) if units.accuracy > 0 else 256
+    sign = "-" if feet < 0 else ""
+    steps = round(abs(feet) * 12 * denominator)
+    whole_inches, numerator = divmod(steps, denominator)
+    if numerator:
+        divisor = math.gcd(numerator, denominator)
+        fraction = f" {numerator // divisor}/{denominator // divisor}"
+    else:
+        fraction = ""
+    if units.fractional_inches:
+        return f'{sign}{whole_inches}{fraction}"'
+    foot, inches = divmod(whole_inches, 12)
+    return f"{sign}{foot}' - {inches}{fraction}\""
+
+
+class ProjectUnitsSource:
+    """Project units of the active document, fetched once per document.
+
+    :meth:`invalidate` is called when a tool opens, creates or closes a
+    document. A document switched to in the Revit UI itself is only noticed
+    after that, or after an explicit :meth:`refresh`.
+    """
+
+    def __init__(self, call: ToolCall) -> None:
+        self.call = call
+        self._units: ProjectUnits | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProjectUnits:
+        with self._lock:
+            if self._units is None:
+                self._units = ProjectUnits.from_result(self.call("revit.get_project_units", {}))
+            return self._units
+
+    def refresh(self) -> ProjectUnits:
+        self.invalidate()
+        return self.get()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._units = None
+
+
+def scale_lengths(tool: str, arguments: Mapping[str, Any], factor: float) -> dict[str, Any]:
+    """``arguments`` of ``tool`` with every model-space length multiplied by ``factor``."""
+    scaled = dict(arguments)
+    if factor == 1.0:
+        return scaled
+    for name, default in LENGTH_ARGUMENTS.get(tool, {}).items():
+        value = scaled.get(name, default)
+        if value is not None:
+            scaled[name] = _scale(value, factor)
+    return scaled
+
+
+def _scale(value: Any, factor: float) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value * factor
+    if isinstance(value, list):
+        return [_scale(item, factor) for item in value]
+    if isinstance(value, dict):
+        return {key: _scale(item, factor) if key in _POINT else item for key, item in value.items()}
+    return value
@@ -0,0 +1,261 @@
+"""Compiled checks of MCP tool arguments against their declared ``inputSchema``.
+
+Each schema is turned once into nested closures, so a call costs a few dict
+lookups and ``isinstance`` checks rather than a walk over the schema. Only
+the JSON Schema keywords the tool declarations use are supported.
+Annotations such as ``description`` and ``default`` are ignored. Any other
+assertion keyword fails at compile time instead of being silently skipped.
+
+Errors name the offending argument by path, e.g. ``points[2].x: expected
+number, got string``, and every problem in a call is reported at once.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Mapping
+
+from .errors import SchemaValidationError
+
+# A path is a linked tuple, (parent, key), with () at the root; it is only
+# rendered to text when an error is reported.
+Location = tuple
+# check(value, path, errors): append a message per problem found.
+Check = Callable[[Any, Location, list[str]], None]
+
+_ANNOTATIONS = frozenset({"description", "default", "title", "examples", "format", "$schema"})
+_SUPPORTED = frozenset(
+    {
+        "type", "properties", "required", "additionalProperties", "items", "enum",
+        "minItems", "maxItems", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+        "minLength", "maxLength", "pattern", "anyOf",
+    }
+)
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def _label(path: Location) -> str:
+    if not path:
+        return "arguments"
+    keys = []
+    while path:
+        path, key = path
+        keys.append(key)
+    text = ""
+    for key in reversed(keys):
+        text += f"[{key}]" if isinstance(key, int) else f".{key}" if text else key
+    return text
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Check:
+    """Compile ``schema`` into a check; raises ValueError on unsupported keywords."""
+    unknown = set(schema) - _SUPPORTED - _ANNOTATIONS
+    if unknown:
+        raise ValueError(f"Unsupported JSON Schema keywords: {sorted(unknown)}")
+
+    checks: list[Check] = []
+    declared = schema.get("type")
+    if declared is not None:
+        names = [declared] if isinstance(declared, str) else list(declared)
+        tests = [_TYPES[name] for name in names]
+        test = tests[0] if len(tests) == 1 else lambda value: any(test(value) for test in tests)
+        expected = " or ".join(names)
+
+        def check_type(value: Any, path: Location, errors: list[str]) -> bool:
+            if test(value):
+                return True
+            errors.append(f"{_label(path)}: expected {expected}, got {_type_name(value)}")
+            return False
+    else:
+        check_type = None
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: Any, path: Location, errors: list[str]) -> None:
+            if value not in allowed:
+                errors.append(f"{_label(path)}: {value!r} is not one of {allowed}")
+
+        checks.append(check_enum)
+
+    checks.extend(_bounds(schema))
+    checks.extend(_string_checks(schema))
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        checks.append(_object_check(schema))
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        checks.append(_array_check(schema))
+    if "anyOf" in schema:
+        checks.append(_any_of(schema["anyOf"]))
+
+    if check_type is None and len(checks) == 1:
+        return checks[0]
+
+    def check(value: Any, path: Location, errors: list[str]) -> None:
+        # Further checks on a value of the wrong type would only add noise.
+        if check_type is not None and not check_type(value, path, errors):
+            return
+        for item_check in checks:
+            item_check(value, path, errors)
+
+    return check
+
+
+def _bounds(schema: Mapping[str, Any]) -> list[Check]:
+    checks: list[Check] = []
+    for keyword, fails, word in (
+        ("minimum", lambda value, bound: value < bound, ">="),
+        ("maximum", lambda value, bound: value > bound, "<="),
+        ("exclusiveMinimum", lambda value, bound: value <= bound, ">"),
+        ("exclusiveMaximum", lambda value, bound: value >= bound, "<"),
+    ):
+        if keyword not in schema:
+            continue
+        bound = schema[keyword]
+
+        def check_bound(value: Any, path: Location, errors: list[str], fails=fails, bound=bound, word=word) -> None:
+            if _is_number(value) and fails(value, bound):
+                errors.append(f"{_label(path)}: {value} must be {word} {bound}")
+
+        checks.append(check_bound)
+    return checks
+
+
+def _string_checks(schema: Mapping[str, Any]) -> list[Check]:
+    checks: list[Check] = []
+    low, high = schema.get("minLength"), schema.get("maxLength")
+    if low is not None or high is not None:
+
+        def check_length(value: Any, path: Location, errors: list[str]) -> None:
+            if not isinstance(value, str):
+                return
+            if low is not None and len(value) < low:
+                errors.append(f"{_label(path)}: must be at least {low} characters")
+            if high is not None and len(value) > high:
+                errors.append(f"{_label(path)}: must be at most {high} characters")
+
+        checks.append(check_length)
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value: Any, path: Location, errors: list[str]) -> None:
+            if isinstance(value, str) and not pattern.search(value):
+                errors.append(f"{_label(path)}: {value!r} does not match {pattern.pattern!r}")
+
+        checks.append(check_pattern)
+    return checks
+
+
+def _object_check(schema: Mapping[str, Any]) -> Check:
+    properties = {name: compile_schema(sub) for name, sub in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", ()))
+    extra = schema.get("additionalProperties", True)
+    extra_check = compile_schema(extra) if isinstance(extra, Mapping) else None
+
+    def check_object(value: Any, path: Location, errors: list[str]) -> None:
+        if not isinstance(value, dict):
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"{_label((path, name))}: required")
+        for name, item in value.items():
+            sub = properties.get(name)
+            if sub is not None:
+                # JSON null for an optional argument means "not given".
+                if item is not None or name in required:
+                    sub(item, (path, name), errors)
+            elif extra is False:
+                errors.append(f"{_label((path, name))}: unexpected argument")
+            elif extra_check is not None:
+                extra_check(item, (path, name), errors)
+
+    return check_object
+
+
+def _array_check(schema: Mapping[str, Any]) -> Check:
+    items = compile_schema(schema["items"]) if "items" in schema else None
+    low, high = schema.get("minItems"), schema.get("maxItems")
+
+    def check_array(value: Any, path: Location, errors: list[str]) -> None:
+        if not isinstance(value, list):
+            return
+        if low is not None and len(value) < low:
+            errors.append(f"{_label(path)}: needs at least {low} items, got {len(value)}")
+        if high is not None and len(value) > high:
+            errors.append(f"{_label(path)}: takes at most {high} items, got {len(value)}")
+        if items is not None:
+            for index, item in enumerate(value):
+                items(item, (path, index), errors)
+
+    return check_array
+
+
+def _any_of(schemas: list[Mapping[str, Any]]) -> Check:
+    options = [compile_schema(sub) for sub in schemas]
+
+    def check_any_of(value: Any, path: Location, errors: list[str]) -> None:
+        for option in options:
+            attempt: list[str] = []
+            option(value, path, attempt)
+            if not attempt:
+                return
+        errors.append(f"{_label(path)}: matches none of the allowed forms")
+
+    return check_any_of
+
+
+class ArgumentValidator:
+    """Compiled input schemas of a set of tools, keyed by tool name."""
+
+    def __init__(self, schemas: Mapping[str, Mapping[str, Any]]) -> None:
+        self._checks = {name: compile_schema(schema) for name, schema in schemas.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._checks
+
+    def errors(self, name: str, arguments: Any) -> list[str]:
+        check = self._checks.get(name)
+        if check is None:
+            return []
+        errors: list[str] = []
+        check(arguments, (), errors)
+        return errors
+
+    def validate(self, name: str, arguments: Any) -> None:
+        errors = self.errors(name, arguments)
+        if errors:
+            raise SchemaValidationError(f"Invalid arguments for {name}: " + "; ".join(errors))
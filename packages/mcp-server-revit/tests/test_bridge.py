@@ -0,0 +1,370 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from revit_mcp_server import codec
+from revit_mcp_server.bridge import compression
+from revit_mcp_server.bridge.cache import QueryCache
+from revit_mcp_server.bridge.client import BridgeClient
+from revit_mcp_server.bridge.metrics import BridgeMetrics
+from revit_mcp_server.bridge.pool import BridgePool
+from revit_mcp_server.bridge.prefetch import Prefetcher, TransitionModel
+from revit_mcp_server.bridge.responses import LazyJSON, decode_response
+from revit_mcp_server.bridge.session import WriteBatch
+from revit_mcp_server.bridge.singleflight import SingleFlight
+from revit_mcp_server.security.audit import AuditRecorder
+from revit_mcp_server.errors import BatchError, BridgeError, BridgeUnavailable
+
+
+class FakeClient:
+    def __init__(self, url: str, document: str = "none", up: bool = True) -> None:
+        self.base_url = url
+        self.document = document
+        self.up = up
+        self.calls: list[str] = []
+
+    def initialize(self) -> None:
+        if not self.up:
+            raise BridgeUnavailable(f"{self.base_url} down")
+
+    def health(self, timeout=None) -> dict:
+        if not self.up:
+            raise BridgeUnavailable(f"{self.base_url} down")
+        return {"status": "healthy", "active_document": self.document}
+
+    def call_tool(self, tool: str, payload: dict) -> dict:
+        if not self.up:
+            raise BridgeUnavailable(f"{self.base_url} down")
+        self.calls.append(tool)
+        return {"served_by": self.base_url}
+
+
+def test_pool_routes_by_document():
+    a = FakeClient("http://a", document="Tower.rvt")
+    b = FakeClient("http://b", document="Podium")
+    pool = BridgePool([a, b])
+    pool.check_health()
+
+    assert pool.call_tool("revit.list_levels", {}, document="podium")["served_by"] == "http://b"
+    assert pool.call_tool("revit.create_wall", {"document_id": "Tower"})["served_by"] == "http://a"
+    with pytest.raises(BridgeError):
+        pool.call_tool("revit.list_levels", {}, document="Missing")
+
+
+def test_pool_balances_reads_and_fails_over():
+    a = FakeClient("http://a")
+    b = FakeClient("http://b")
+    pool = BridgePool([a, b])
+    pool.check_health()
+
+    served = {pool.call_tool("revit.list_views", {})["served_by"] for _ in range(4)}
+    assert served == {"http://a", "http://b"}
+
+    a.up = False
+    assert pool.call_tool("revit.create_level", {})["served_by"] == "http://b"
+    assert not pool.members[0].healthy
+
+
+def test_pool_skips_a_member_whose_health_check_fails(monkeypatch):
+    def answer(status: int, body: bytes):
+        def get(path: str, timeout=None) -> dict:
+            response = httpx.Response(status, content=body, request=httpx.Request("GET", f"http://x{path}"))
+            response.raise_for_status()
+            return codec.loads(response.content)
+
+        return get
+
+    a, b, c = BridgeClient("http://a"), BridgeClient("http://b"), BridgeClient("http://c")
+    monkeypatch.setattr(a, "_get", answer(503, b"Service Unavailable"))
+    monkeypatch.setattr(b, "_get", answer(200, b"<html>proxy</html>"))
+    monkeypatch.setattr(c, "_get", answer(200, b'{"status": "healthy", "active_document": "Tower"}'))
+    pool = BridgePool([a, b, c])
+    pool.check_health()
+    assert [member.healthy for member in pool.members] == [False, False, True]
+    assert pool.members[2].active_document is not None
+
+
+class GatedClient(FakeClient):
+    def __init__(self, url: str) -> None:
+        super().__init__(url)
+        self.gate = threading.Event()
+
+    def call_tool(self, tool: str, payload: dict) -> dict:
+        self.gate.wait(5)
+        return super().call_tool(tool, payload)
+
+
+def test_pool_collapses_identical_in_flight_reads():
+    client = GatedClient("http://a")
+    pool = BridgePool([client])
+    pool.check_health()
+    pool._flights = SingleFlight(BridgeMetrics())
+    results: list[dict] = []
+
+    def read() -> None:
+        results.append(pool.call_tool("revit.get_element_parameters", {"element_id": 7}))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while pool._flights.metrics.count("bridge.singleflight.collapsed") < 7 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    client.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert client.calls == ["revit.get_element_parameters"]
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    # Once finished, the same read goes out again, and writes never collapse.
+    pool.call_tool("revit.get_element_parameters", {"element_id": 7})
+    pool.call_tool("revit.create_level", {})
+    assert len(client.calls) == 3
+
+
+def test_singleflight_shares_errors():
+    flights = SingleFlight(BridgeMetrics())
+    started, release = threading.Event(), threading.Event()
+    errors: list[Exception] = []
+
+    def fail() -> None:
+        started.set()
+        release.wait(5)
+        raise BridgeError("boom")
+
+    def call() -> None:
+        try:
+            flights.do("key", fail)
+        except BridgeError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flights.metrics.count("bridge.singleflight.collapsed") < 1:
+        time.sleep(0.005)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flights.in_flight() == 0
+
+
+class RecordingClient(BridgeClient):
+    """BridgeClient over an in-memory add-in that records every request."""
+
+    version = 1
+
+    def __init__(self, cache: QueryCache) -> None:
+        super().__init__("http://fake", cache=cache, cache_max_staleness=60)
+        self.requests: list[str] = []
+
+    def _get(self, path: str, timeout=None) -> dict:
+        self.requests.append(path)
+        if path == "/tools":
+            return {"tools": ["revit.list_levels", "revit.create_level", "revit.get_selection"]}
+        return {
+            "status": "healthy",
+            "version": "1.0",
+            "session": "s1",
+            "active_document": "Tower",
+            "document_version": f"s1:{RecordingClient.version}",
+        }
+
+    def _execute_with_retries(self, tool: str, payload: dict) -> dict:
+        self.requests.append(tool)
+        if tool.startswith("revit.create_"):
+            RecordingClient.version += 1
+        return {"levels": [{"id": 1, "name": f"L{RecordingClient.version}"}]}
+
+
+def test_query_cache_answers_warm_restart_until_the_document_changes(tmp_path):
+    metrics = BridgeMetrics()
+    cold = RecordingClient(QueryCache(tmp_path / "cache.sqlite3", metrics=metrics))
+    cold.initialize()
+    first = cold.call_tool("revit.list_levels", {})
+    cold.cache.close()
+
+    warm = RecordingClient(QueryCache(tmp_path / "cache.sqlite3", metrics=metrics))
+    warm.initialize()
+    assert warm.call_tool("revit.list_levels", {}) == first
+    warm.call_tool("revit.get_selection", {})
+    # Only the health probe: the catalog and the listing came from the file.
+    assert warm.requests == ["/health", "revit.get_selection"]
+    assert metrics.count("cache.hits") == 2
+
+    warm.call_tool("revit.create_level", {"elevation": 3})
+    assert warm.call_tool("revit.list_levels", {})["levels"][0]["name"] == "L2"
+    assert warm.requests[-3:] == ["revit.create_level", "/health", "revit.list_levels"]
+
+
+def test_query_cache_evicts_least_recently_used(tmp_path):
+    metrics = BridgeMetrics()
+    cache = QueryCache(tmp_path / "cache.sqlite3", max_bytes=8000, metrics=metrics)
+    for index in range(10):
+        assert cache.put("doc|v1", "revit.list_views", {"page": index}, {"views": ["x" * 900]})
+        cache.get("doc|v1", "revit.list_views", {"page": 0})
+
+    assert cache.stats()["bytes"] <= 8000
+    assert metrics.count("cache.evictions") > 0
+    assert cache.get("doc|v1", "revit.list_views", {"page": 0}) is not None
+    assert cache.get("doc|v1", "revit.list_views", {"page": 1}) is None
+    assert not cache.put("doc|v1", "revit.get_element_geometry", {}, {"mesh": "x" * 2000})
+
+
+def test_prefetch_learns_from_audit_log_and_warms_follow_ups(tmp_path):
+    audit = AuditRecorder(tmp_path / "audit.log")
+    for _ in range(3):
+        audit.record("revit.list_sheets", "r", {}, {})
+        audit.record("revit.get_sheet_info", "r", {"sheet_id": 7}, {})
+        audit.record("revit.list_levels", "r", {}, {})
+        audit.record("revit.list_views", "r", {"view_type": "FloorPlan"}, {})
+    model = TransitionModel.from_audit_log(tmp_path / "audit.log")
+    assert [tool for tool, _ in model.predict("revit.list_levels")] == ["revit.list_views"]
+
+    calls: list[tuple[str, dict]] = []
+    done = threading.Event()
+
+    def call(tool: str, payload: dict) -> dict:
+        calls.append((tool, payload))
+        if len(calls) == 3:
+            done.set()
+        return {}
+
+    metrics = BridgeMetrics()
+    prefetcher = Prefetcher(call, model, metrics, fan_out=2, idle_seconds=0.01)
+    prefetcher.observe("revit.list_sheets", {"request_id": "a"})
+    prefetcher.after("revit.list_sheets", {}, {"sheets": [{"id": 11}, {"id": 12}, {"id": 13}]})
+    prefetcher.observe("revit.list_levels", {})
+    prefetcher.after("revit.list_levels", {}, {"levels": []})
+    prefetcher.start()
+    try:
+        assert done.wait(5)
+    finally:
+        prefetcher.close()
+
+    # The newest prediction goes first; listings supply IDs, others replay the last payload.
+    assert calls == [
+        ("revit.list_views", {"view_type": "FloorPlan"}),
+        ("revit.get_sheet_info", {"sheet_id": 11}),
+        ("revit.get_sheet_info", {"sheet_id": 12}),
+    ]
+    prefetcher.observe("revit.get_sheet_info", {"sheet_id": 12, "request_id": "b"})
+    prefetcher.observe("revit.get_sheet_info", {"sheet_id": 99})
+    assert prefetcher.stats()["hit_rate"] == round(1 / 3, 4)
+
+
+def test_write_batch_sends_buffered_writes_as_one_request():
+    class BatchBridge:
+        def __init__(self) -> None:
+            self.requests: list[tuple[str, dict]] = []
+
+        def call_tool(self, tool: str, payload: dict) -> dict:
+            self.requests.append((tool, payload))
+            return {"committed": True, "executed": len(payload["commands"]), "results": []}
+
+    bridge = BatchBridge()
+    with WriteBatch(bridge, "Grid walls") as batch:
+        for x in range(3):
+            assert batch.add("revit.create_wall", {"start_x": x, "end_x": x + 1}) == x
+        with pytest.raises(BatchError):
+            batch.add("revit.list_levels", {})
+        with pytest.raises(BatchError):
+            batch.add("revit.save_document", {})
+        assert bridge.requests == []
+
+    [(tool, payload)] = bridge.requests
+    assert tool == "revit.execute_batch"
+    assert payload["name"] == "Grid walls" and payload["atomic"] is True
+    assert [command["payload"]["start_x"] for command in payload["commands"]] == [0, 1, 2]
+    assert batch.result["executed"] == 3
+
+    with pytest.raises(RuntimeError):
+        with WriteBatch(bridge) as batch:
+            batch.add("revit.delete_element", {"element_id": 1})
+            raise RuntimeError("agent gave up")
+    assert len(bridge.requests) == 1 and len(batch) == 0
+
+
+def test_write_batch_keeps_writes_when_the_commit_fails():
+    class DownBridge:
+        def call_tool(self, tool: str, payload: dict) -> dict:
+            raise BridgeUnavailable("Revit is not responding")
+
+    batch = WriteBatch(DownBridge(), "Doors")
+    batch.add("revit.delete_element", {"element_id": 1})
+    batch.add("revit.delete_element", {"element_id": 2})
+    with pytest.raises(BridgeUnavailable):
+        batch.commit()
+    assert len(batch) == 2 and batch.result is None
+
+    sent = []
+    batch.bridge = SimpleNamespace(call_tool=lambda tool, payload: sent.append(payload) or {"committed": True})
+    assert batch.commit() == {"committed": True}
+    assert [command["payload"]["element_id"] for command in sent[0]["commands"]] == [1, 2] and len(batch) == 0
+
+
+def test_write_batch_refuses_writes_while_committing():
+    batch = WriteBatch(None, "Walls")
+
+    def call_tool(tool: str, payload: dict) -> dict:
+        with pytest.raises(BatchError, match="committing"):
+            batch.add("revit.create_wall", {"start_x": 9})
+        return {"committed": True, "executed": len(payload["commands"])}
+
+    batch.bridge = SimpleNamespace(call_tool=call_tool)
+    batch.add("revit.create_wall", {"start_x": 0})
+    assert batch.commit()["executed"] == 1 and len(batch) == 0
+    assert batch.add("revit.create_wall", {"start_x": 1}) == 0
+
+
+def test_compression_negotiates_gzip_round_trip():
+    assert compression.negotiate(["GZIP"]) == compression.GZIP
+    assert compression.negotiate([]) is None
+    body = b'{"faces": [' + b'{"x": 1.0, "y": 2.0, "z": 3.0},' * 500 + b"{}]}"
+    packed = compression.compress(body, compression.GZIP)
+    assert len(packed) < len(body) // 10
+    assert compression.decompress(packed, compression.GZIP) == body
+
+
+def test_decode_response_accepts_both_casings():
+    pascal = decode_response(b'{"Status": "error", "Message": "boom", "StackTrace": "at X"}')
+    assert pascal.is_error and pascal.message == "boom" and pascal.stack_trace == "at X"
+    snake = decode_response(b'{"status": "ok", "result": {"count": 2}}', "revit.list_levels")
+    assert not snake.is_error and snake.result == {"count": 2}
+
+
+def test_lazy_geometry_fields_are_forwarded_undecoded():
+    pytest.importorskip("msgspec")
+    body = b'{"Status": "ok", "Result": {"element_id": 7, "faces": [{"area": 1.5}]}}'
+    result = decode_response(body, "revit.get_element_faces").result
+    assert isinstance(result["faces"], LazyJSON) and not result["faces"].decoded
+    assert codec.loads(codec.dumps(result)) == {"element_id": 7, "faces": [{"area": 1.5}]}
+    assert result["faces"][0]["area"] == 1.5
+
+
+def test_element_ids_are_normalized_along_tool_paths():
+    body = codec.dumps(
+        {
+            "status": "ok",
+            "result": {
+                "families": [{"family_id": 5, "types": [{"type_id": 6}, {"type_id": 7}]}],
+                "count": 1,
+            },
+        }
+    )
+    families = decode_response(body, "revit.list_families").result["families"]
+    assert families[0]["element_id"] == 5
+    assert [t["element_id"] for t in families[0]["types"]] == [6, 7]
+
+    created = decode_response(b'{"status": "ok", "result": {"wall_id": 42}}', "revit.create_wall")
+    assert created.result["element_id"] == 42
+    listing = decode_response(b'{"result": {"elements": [{"id": 1}, {"id": 2}]}}', "revit.custom_tool")
+    assert [e["element_id"] for e in listing.result["elements"]] == [1, 2]
+    categories = decode_response(b'{"result": {"categories": [{"id": -2000011}]}}', "revit.get_categories")
+    assert "element_id" not in categories.result["categories"][0]
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+
+from revit_mcp_server import codec
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    previous = codec.BACKEND
+    codec.use_backend(request.param)
+    yield request.param
+    codec.use_backend(previous)
+
+
+def test_round_trip_encodes_to_bytes(backend):
+    document = {"name": "Façade", "ids": [1, 2, 3], "path": Path("model.rvt")}
+    encoded = codec.dumps(document)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == {"name": "Façade", "ids": [1, 2, 3], "path": "model.rvt"}
+    assert codec.loads(memoryview(encoded))["ids"] == [1, 2, 3]
+    assert codec.loads(codec.dumps_pretty(document))["name"] == "Façade"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        codec.use_backend("simdjson")
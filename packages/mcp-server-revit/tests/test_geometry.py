@@ -0,0 +1,97 @@
+import base64
+
+import numpy as np
+import pytest
+
+from revit_mcp_server.geometry import ElementMesh, RoomBoundaryCache, RoomSet, completeness_report
+
+
+def cube_result(element_id: int = 42, size: float = 2.0) -> dict:
+    corners = np.array([[x, y, z] for x in (0, size) for y in (0, size) for z in (0, size)], dtype="<f4")
+    quads = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    triangles = np.array([tri for a, b, c, d in quads for tri in ((a, b, c), (a, c, d))], dtype="<u4")
+    return {
+        "vertex_count": len(corners),
+        "triangle_count": len(triangles),
+        "elements": [{"element_id": element_id, "first_triangle": 0, "triangle_count": len(triangles)}],
+        "vertices": base64.b64encode(corners.tobytes()).decode(),
+        "indices": base64.b64encode(triangles.tobytes()).decode(),
+    }
+
+
+def test_mesh_buffers_are_zero_copy_and_round_trip_through_a_file(tmp_path):
+    mesh = ElementMesh.from_result(cube_result())
+    assert mesh.vertices.shape == (8, 3) and mesh.triangles.shape == (12, 3)
+    assert not mesh.vertices.flags.owndata and not mesh.vertices.flags.writeable
+    stats = mesh.stats()
+    assert stats["surface_area"] == pytest.approx(24.0)
+    assert stats["bounds"] == {"min": [0.0, 0.0, 0.0], "max": [2.0, 2.0, 2.0]}
+
+    path = tmp_path / "cube.rmesh"
+    assert mesh.write(path) == path.stat().st_size
+    loaded = ElementMesh.read(path)
+    assert np.array_equal(loaded.triangles, mesh.triangles)
+    assert loaded.element(42).stats()["triangles"] == 12
+    with pytest.raises(KeyError):
+        loaded.element(7)
+
+
+def test_mesh_rejects_mismatched_counts():
+    result = cube_result()
+    result["vertex_count"] = 9
+    with pytest.raises(ValueError):
+        ElementMesh.from_result(result)
+
+
+def rectangle(x0: float, y0: float, x1: float, y1: float, clockwise: bool = False) -> list[float]:
+    corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    return [value for corner in (corners[::-1] if clockwise else corners) for value in corner]
+
+
+def rooms_result() -> dict:
+    # 101 and 102 share a 0.5 ft wall at x = 10; 103 has a 2x2 column hole and
+    # is reported clockwise; 104 duplicates 101's number inside 103; 105 is unplaced.
+    return {
+        "document": "Clinic",
+        "rooms": [
+            {"id": 1, "number": "101", "name": "Office", "level": "L1", "area": 100.0, "loops": [rectangle(0, 0, 10, 10)]},
+            {"id": 2, "number": "102", "name": "Office", "level": "L1", "area": 95.0, "loops": [rectangle(10.5, 0, 20.5, 10)]},
+            {
+                "id": 3, "number": "103", "name": "", "level": "L1", "area": 196.0,
+                "loops": [rectangle(30, 0, 40, 20, clockwise=True), rectangle(34, 9, 36, 11)],
+            },
+            {"id": 4, "number": "101", "name": "Store", "level": "L1", "area": 4.0, "loops": [rectangle(31, 1, 33, 3)]},
+            {"id": 5, "number": "105", "name": "Lobby", "level": "L1", "placed": False, "area": 0.0, "loops": []},
+        ],
+    }
+
+
+def test_room_measures_and_queries_are_local():
+    rooms = RoomSet.from_result(rooms_result())
+    assert np.allclose(rooms.areas(), [100, 100, 196, 4, 0])
+    assert np.allclose(rooms.perimeters(), [40, 40, 68, 8, 0])
+    assert np.allclose(rooms.centroids()[:3], [[5, 5], [15.5, 5], [35, 10]])
+    assert rooms.locate([[5, 5], [35, 10], [35, 2], [25, 5]]).tolist() == [0, -1, 2, -1]
+
+    pairs, shared = rooms.adjacency()
+    assert pairs.tolist() == [[0, 1]] and shared.tolist() == [10.0]
+    assert rooms.adjacency(gap=0.25)[0].size == 0
+
+
+def test_room_completeness_report_flags_each_issue():
+    calls = []
+    cache = RoomBoundaryCache(lambda tool, payload: calls.append(tool) or rooms_result())
+    rooms = cache.get()
+    assert cache.get() is rooms and calls == ["revit.get_room_boundaries"]
+
+    report = completeness_report(rooms)
+    found = {(issue["id"], issue["issue"]) for issue in report["issues"]}
+    assert found == {
+        (5, "unplaced"),
+        (4, "overlapping"),
+        (3, "missing_name"),
+        (1, "duplicate_number"),
+        (4, "duplicate_number"),
+        (2, "area_mismatch"),
+    }
+    assert report["severity"] == "error" and report["area_by_level"] == {"L1": 400.0}
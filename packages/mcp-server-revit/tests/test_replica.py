@@ -0,0 +1,216 @@
+import numpy as np
+import pytest
+
+from revit_mcp_server.errors import ReplicaError
+from revit_mcp_server.replica import BoxIndex, ModelReplica, find_clashes, pull_full, sync_changes
+
+
+class StubBridge:
+    """Serves element pages, parameter exports and a change journal from a list."""
+
+    def __init__(self, elements: list[dict]) -> None:
+        self.elements = {element["id"]: element for element in elements}
+        self.journal: list[tuple[int, bool]] = []
+        self.calls: list[str] = []
+        self.document = "Tower"
+
+    def edit(self, element: dict) -> None:
+        self.elements[element["id"]] = element
+        self.journal.append((element["id"], False))
+
+    def delete(self, element_id: int) -> None:
+        del self.elements[element_id]
+        self.journal.append((element_id, True))
+
+    def call_tool(self, tool: str, payload: dict) -> dict:
+        self.calls.append(tool)
+        if tool == "revit.get_document_changes":
+            # Like the add-in: one sequence for every document, which the cursor names.
+            current = f"{len(self.journal)}:{self.document}"
+            cursor = payload["cursor"]
+            if cursor is None or cursor.partition(":")[2] != self.document:
+                return {"cursor": current, "document": self.document, "reset": True, "changed": [], "deleted": []}
+            latest = dict(self.journal[int(cursor.partition(":")[0]):])
+            return {
+                "cursor": current,
+                "document": self.document,
+                "reset": False,
+                "changed": [i for i, gone in latest.items() if not gone],
+                "deleted": [i for i, gone in latest.items() if gone],
+            }
+        if tool == "revit.get_elements_by_type":
+            pool = self.elements.values()
+            if "element_ids" in payload:
+                pool = [self.elements[i] for i in payload["element_ids"] if i in self.elements]
+            matching = [e for e in pool if payload["category"] in (None, e["category"])]
+            start = payload.get("offset", 0)
+            stop = start + payload["limit"]
+            return {"total": len(matching), "elements": matching[start:stop], "truncated": len(matching) > stop}
+        if tool == "revit.check_clashes":
+            # Pretend only pairs involving element 20 really intersect.
+            clashes = [{"element1_id": a, "element2_id": b} for a, b in payload["pairs"] if 20 in (a, b)]
+            return {"clashes": clashes, "clash_count": len(clashes)}
+        if tool == "revit.batch_export_to_csv":
+            return {
+                "data": [
+                    {"ElementId": element_id, "Fire Rating": "2 HR" if element_id % 2 else "N/A"}
+                    for element_id in payload["element_ids"]
+                ]
+            }
+        raise AssertionError(tool)
+
+
+def _elements() -> list[dict]:
+    return [
+        {"id": 10 + i, "name": f"E{i}", "category": category, "level": level, "type_id": 7, "length": float(i), "area": None}
+        for i, (category, level) in enumerate(
+            [("Walls", "L1"), ("Walls", "L2"), ("Doors", "L1"), ("Walls", "L1"), ("Doors", "")]
+        )
+    ]
+
+
+def test_pull_and_query_locally():
+    replica = ModelReplica()
+    bridge = StubBridge(_elements())
+    status = pull_full(replica, bridge, parameter_names=["Fire Rating"])
+    assert status["elements"] == 5 and status["parameters"] == ["Fire Rating"]
+
+    assert replica.count({"category": "Walls", "length": {"min": 1}})["count"] == 2
+    page = replica.query({"level": ["L1"]}, fields=["id", "category", "Fire Rating"], limit=2)
+    assert page["total"] == 3
+    assert page["elements"] == [
+        {"id": 10, "category": "Walls", "Fire Rating": None},
+        {"id": 12, "category": "Doors", "Fire Rating": None},
+    ]
+    assert page["pulled_at"] is not None
+
+    groups = replica.group_by("level", sum_fields=["length"])["groups"]
+    assert groups[0] == {"level": "L1", "count": 3, "sum_length": 5.0}
+    assert {"level": None, "count": 1, "sum_length": 4.0} in groups
+    assert replica.group_by("Fire Rating")["groups"][0] == {"Fire Rating": None, "count": 3}
+
+    calls = len(bridge.calls)
+    replica.count({"category": "Doors"})
+    assert len(bridge.calls) == calls
+
+
+def test_empty_replica_and_unknown_columns_raise():
+    replica = ModelReplica()
+    with pytest.raises(ReplicaError):
+        replica.count()
+    replica.load(_elements())
+    with pytest.raises(ReplicaError):
+        replica.query({"colour": "red"})
+
+
+def test_sync_applies_only_the_delta():
+    replica = ModelReplica()
+    bridge = StubBridge(_elements())
+    pull_full(replica, bridge, categories=["Walls", "Doors"], parameter_names=["Fire Rating"])
+
+    bridge.edit({"id": 11, "name": "E1", "category": "Walls", "level": "L3", "type_id": 7, "length": 9.0})
+    bridge.edit({"id": 3, "name": "New", "category": "Doors", "level": "L1", "type_id": 8, "length": 2.0})
+    bridge.edit({"id": 99, "name": "Slab", "category": "Floors", "level": "L1", "type_id": 9})
+    bridge.delete(12)
+    bridge.calls.clear()
+
+    summary = sync_changes(replica, bridge)
+    assert summary["mode"] == "incremental"
+    assert (summary["updated"], summary["added"], summary["deleted"]) == (1, 1, 1)
+    assert "revit.get_elements_by_type" in bridge.calls
+
+    rows = replica.query(fields=["id", "level", "length", "Fire Rating"])["elements"]
+    assert [row["id"] for row in rows] == [3, 10, 11, 13, 14]
+    assert rows[0] == {"id": 3, "level": "L1", "length": 2.0, "Fire Rating": "2 HR"}
+    assert rows[2]["level"] == "L3" and rows[2]["length"] == 9.0
+
+    bridge.calls.clear()
+    assert sync_changes(replica, bridge)["added"] == 0
+    assert bridge.calls == ["revit.get_document_changes"]
+
+
+def test_sync_re_pulls_when_another_document_is_active():
+    replica = ModelReplica()
+    bridge = StubBridge(_elements())
+    pull_full(replica, bridge)
+    assert replica.document == "Tower"
+
+    # Another open document becomes active and is edited; its journal shares
+    # the sequence, so the old cursor must not replay its edits onto this copy.
+    bridge.document = "Podium"
+    bridge.elements = {50: {"id": 50, "name": "P", "category": "Walls", "level": "L1", "type_id": 7}}
+    bridge.edit({"id": 51, "name": "Q", "category": "Walls", "level": "L1", "type_id": 7})
+    summary = sync_changes(replica, bridge)
+    assert summary["mode"] == "full" and replica.document == "Podium"
+    assert replica.ids.tolist() == [50, 51]
+
+    # Even a cursor that looks current is not applied across documents.
+    bridge.document = "Tower"
+    replica.cursor = f"{len(bridge.journal)}:Tower"
+    assert sync_changes(replica, bridge)["mode"] == "full" and replica.document == "Tower"
+
+    replica.clear()
+    assert not replica.loaded and replica.cursor is None and replica.document is None
+
+
+def test_box_index_matches_brute_force():
+    rng = np.random.default_rng(3)
+    lows = rng.uniform(0, 200, (400, 3))
+    boxes = np.hstack([lows, lows + rng.uniform(0.5, 4, (400, 3))])
+    boxes[0, 3:] = boxes[0, :3] + 150  # one box far larger than a grid cell
+    index = BoxIndex(boxes)
+
+    overlap = np.all(boxes[:, None, :3] <= boxes[None, :, 3:] + 1, axis=2) & np.all(
+        boxes[:, None, 3:] >= boxes[None, :, :3] - 1, axis=2
+    )
+    expected = set(zip(*(axis.tolist() for axis in np.nonzero(np.triu(overlap, 1)))))
+    left, right = index.pairs(tolerance=1.0)
+    assert set(zip(left.tolist(), right.tolist())) == expected
+
+    # Boxes just under the cell limit spill over it once grown by the tolerance.
+    near = np.vstack([boxes, [[0, 0, 0, 14, 14, 10], [2, 2, 1, 15, 15, 11]]])
+    near_index = BoxIndex(near, cell_size=4.0)
+    assert near_index.large.tolist() == [0]
+    grown = near_index.pairs(tolerance=2.0)
+    overlap = np.all(near[:, None, :3] <= near[None, :, 3:] + 2, axis=2) & np.all(
+        near[:, None, 3:] >= near[None, :, :3] - 2, axis=2
+    )
+    expected = set(zip(*(axis.tolist() for axis in np.nonzero(np.triu(overlap, 1)))))
+    assert set(zip(grown[0].tolist(), grown[1].tolist())) == expected
+    assert (400, 401) in expected
+
+    query = np.array([50, 50, 50, 80, 80, 80.0])
+    brute = np.all(boxes[:, :3] <= query[3:], axis=1) & np.all(boxes[:, 3:] >= query[:3], axis=1)
+    assert index.overlapping(query).tolist() == np.flatnonzero(brute).tolist()
+
+    rows, distances = index.nearest((100.0, 100.0, 100.0), k=5)
+    gap = np.maximum(np.maximum(boxes[:, :3] - 100.0, 100.0 - boxes[:, 3:]), 0)
+    assert np.allclose(distances, np.sort(np.linalg.norm(gap, axis=1))[:5])
+
+
+def test_spatial_queries_and_clash_prefilter():
+    elements = [
+        {"id": 20, "category": "Ducts", "bounding_box": [0, 0, 0, 10, 1, 1]},
+        {"id": 21, "category": "Ducts", "bounding_box": [20, 0, 0, 30, 1, 1]},
+        {"id": 30, "category": "Structural Framing", "bounding_box": [5, -1, 0.5, 6, 2, 3]},
+        {"id": 31, "category": "Structural Framing", "bounding_box": [25, 1.5, 0, 26, 3, 1]},
+        {"id": 40, "category": "Rooms"},
+    ]
+    replica = ModelReplica()
+    bridge = StubBridge(elements)
+    pull_full(replica, bridge)
+
+    assert [e["id"] for e in replica.in_box([4, 0, 0, 7, 1, 1], fields=["id"])["elements"]] == [20, 30]
+    assert [e["id"] for e in replica.at_point([25.5, 2, 0.5], fields=["id"])["elements"]] == [31]
+    nearest = replica.nearest([24, 0.5, 0.5], k=2, filters={"category": "Ducts"}, fields=["id"])["elements"]
+    assert nearest == [{"id": 21, "distance": 0.0}, {"id": 20, "distance": 14.0}]
+
+    ducts, framing = {"category": "Ducts"}, {"category": "Structural Framing"}
+    assert replica.clash_candidates(ducts, framing).tolist() == [[20, 30]]
+    assert replica.clash_candidates(ducts, framing, tolerance=0.5).tolist() == [[20, 30], [21, 31]]
+
+    bridge.calls.clear()
+    result = find_clashes(replica, bridge, ducts, framing, tolerance=0.5)
+    assert (result["candidates"], result["clash_count"], result["verified"]) == (2, 1, True)
+    assert bridge.calls == ["revit.check_clashes"]
+    assert find_clashes(replica, None, ducts, framing, tolerance=0.5)["clash_count"] == 2
@@ -1,7 +1,15 @@
+import io
+import json
 from pathlib import Path
 
+import pytest
+from pydantic import ValidationError
+
 from revit_mcp_server.config import BridgeMode, Config
+from revit_mcp_server.errors import SchemaValidationError, WorkspaceViolation
 from revit_mcp_server.server import MCPServer
+from revit_mcp_server.tools import TOOL_HANDLERS, TOOL_INPUTS
+from revit_mcp_server.validation import ArgumentValidator
 
 
 class DummyBridge:
@@ -37,3 +45,62 @@ def test_handle_tool_bridge_mode(tmp_path: Path):
     response = server.handle_tool("revit.health", {"request_id": "req-bridge"})
     assert response["echo"] == "revit.health"
     assert bridge.calls
+
+
+def test_bridge_mode_validates_without_running_handlers(tmp_path: Path):
+    assert TOOL_INPUTS.keys() == TOOL_HANDLERS.keys()
+    cfg = create_config(tmp_path, bridge_url="http://bridge", mode=BridgeMode.bridge)
+    bridge = DummyBridge(cfg.bridge_url)
+    server = MCPServer(config=cfg, bridge_factory=lambda _: bridge)
+
+    response = server.handle_tool("revit.list_views", {"request_id": "r1", "document_id": "Tower"})
+    assert response["echo"] == "revit.list_views"
+    with pytest.raises(WorkspaceViolation):
+        server.handle_tool("revit.open_document", {"request_id": "r2", "file_path": "/elsewhere/Tower.rvt"})
+    with pytest.raises(ValidationError):
+        server.handle_tool("revit.open_document", {"request_id": "r3"})
+    assert [tool for tool, _ in bridge.calls] == ["revit.list_views"]
+
+
+def test_argument_validator_reports_every_problem_by_path():
+    point = {"type": "object", "properties": {"x": {"type": "number"}, "y": {"type": "number"}}, "required": ["x"]}
+    validator = ArgumentValidator(
+        {
+            "revit_create_floor": {
+                "type": "object",
+                "properties": {
+                    "points": {"type": "array", "items": point, "minItems": 3},
+                    "level": {"type": "string"},
+                    "quality": {"type": "string", "enum": ["Draft", "High"]},
+                    "page_size": {"type": "integer", "minimum": 1, "maximum": 2000},
+                },
+                "required": ["points"],
+            }
+        }
+    )
+
+    good = {"points": [{"x": 0, "y": 0}, {"x": 1.5}, {"x": 2, "y": 3}], "level": None, "page_size": 10.0}
+    assert validator.errors("revit_create_floor", good) == []
+    assert validator.errors("revit_create_floor", {"points": [{"y": "1"}], "quality": "Low", "page_size": 0}) == [
+        "points: needs at least 3 items, got 1",
+        "points[0].x: required",
+        "points[0].y: expected number, got string",
+        "quality: 'Low' is not one of ['Draft', 'High']",
+        "page_size: 0 must be >= 1",
+    ]
+    with pytest.raises(SchemaValidationError, match="level: expected string, got number"):
+        validator.validate("revit_create_floor", {"points": [{"x": 0}] * 3, "level": 2})
+    with pytest.raises(ValueError):
+        ArgumentValidator({"bad": {"type": "string", "oneOf": []}})
+
+
+def test_run_answers_json_lines(tmp_path: Path):
+    server = MCPServer(config=create_config(tmp_path))
+    stdin = io.StringIO('{"tool": "revit.health", "payload": {"request_id": "r1"}}\nnot json\n')
+    stdout = io.StringIO()
+    server.run(stdin=stdin, stdout=stdout)
+    lines = stdout.getvalue().splitlines()[1:]
+    assert json.loads(lines[0])["response"]["status"] == "healthy"
+    error = json.loads(lines[1])
+    assert error["tool"] is None
+    assert error["response"]["status"] == "error"
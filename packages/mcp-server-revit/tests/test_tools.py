@@ -1,7 +1,21 @@
+import csv
+import hashlib
+import json
+import threading
+import time
+import zipfile
 from pathlib import Path
+from types import SimpleNamespace
 
+import pytest
+
+from revit_mcp_server.errors import BridgeError, BridgeUnavailable, SchemaValidationError
 from revit_mcp_server.security.workspace import WorkspaceMonitor
 from revit_mcp_server.tools import TOOL_HANDLERS
+from revit_mcp_server.tools.audit import AuditData, audit_categories, audit_rules, parameter_columns, run_audit
+from revit_mcp_server.tools.baseline import element_digest
+from revit_mcp_server.tools.bulk import create_bulk, plan_columns, plan_walls
+from revit_mcp_server.tools.publish import Manifest, plan_units, run_units
 
 
 def test_all_handlers_registered():
@@ -15,5 +29,442 @@ def test_export_quantities_uses_workspace(tmp_path):
     handler = TOOL_HANDLERS["revit.export_quantities"]
     payload = {"request_id": "test", "output_path": str(tmp_path / "quantities.json")}
     response = handler(payload, workspace)
-    assert response["categories_exported"] == 5
+    assert response["categories_exported"] == 0 and response["format"] == "json"
     assert str(tmp_path) in response["output_path"]
+
+
+class PagedBridge:
+    def __init__(self, elements: list[dict]) -> None:
+        self.elements = elements
+
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        assert tool_name == "revit.get_elements_by_type"
+        page = self.elements[payload["offset"] : payload["offset"] + payload["limit"]]
+        return {"elements": page, "truncated": payload["offset"] + payload["limit"] < len(self.elements)}
+
+
+def test_export_quantities_aggregates_per_material(tmp_path):
+    concrete = {"material": "Concrete", "area": 10.0, "volume": 2.0}
+    insulation = {"material": "Insulation", "area": 10.0, "volume": 0.5}
+    elements = [
+        {"id": 1, "category": "Walls", "level": "L1", "length": 5.0, "materials": [concrete, insulation]},
+        {"id": 2, "category": "Walls", "level": "L1", "length": 3.0, "materials": [concrete]},
+        {"id": 3, "category": "Floors", "level": "L2", "phase": "Existing", "area": 40.0, "volume": 8.0},
+    ]
+    workspace = WorkspaceMonitor([tmp_path])
+    response = TOOL_HANDLERS["revit.export_quantities"](
+        {"request_id": "q", "output_path": str(tmp_path / "takeoff.csv"), "group_by": ["category", "material"]},
+        workspace,
+        PagedBridge(elements),
+    )
+    assert (response["elements"], response["rows"], response["groups"]) == (3, 4, 3)
+
+    lines = (tmp_path / "takeoff.csv").read_text().splitlines()
+    assert lines[0] == "category,material,elements,length,area,volume"
+    assert lines[1:] == [
+        "Floors,,1,0.0,40.0,8.0",
+        "Walls,Concrete,2,8.0,20.0,4.0",
+        "Walls,Insulation,1,0.0,10.0,0.5",
+    ]
+
+
+class SnapshotBridge(PagedBridge):
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        assert "unique_id" in payload["fields"]
+        return super().send_tool(tool_name, payload)
+
+
+def _element(index: int, **overrides) -> dict:
+    element = {
+        "id": index,
+        "unique_id": f"uid-{index}",
+        "name": f"Wall {index}",
+        "category": "Walls",
+        "length": 10.0,
+        "parameters": {"Mark": f"W{index}", "Comments": ""},
+    }
+    element.update(overrides)
+    return element
+
+
+def test_baseline_export_and_diff(tmp_path):
+    workspace = WorkspaceMonitor([tmp_path])
+    export = TOOL_HANDLERS["revit.baseline_export"]
+    before = [_element(i) for i in range(1200)]
+    after = [e for e in before if e["id"] != 5]
+    after[0] = _element(0, parameters={"Mark": "W0", "Comments": "Moved"})
+    after[1] = _element(1, length=12.5)
+    after.append(_element(5000))
+
+    first = export({"request_id": "a", "output_path": str(tmp_path / "a.rmcpb")}, workspace, SnapshotBridge(before))
+    export({"request_id": "b", "output_path": str(tmp_path / "b.rmcpb")}, workspace, SnapshotBridge(after))
+    assert first["element_count"] == 1200
+
+    diff = TOOL_HANDLERS["revit.baseline_diff"](
+        {
+            "request_id": "d",
+            "baseline_a": first["output_path"],
+            "baseline_b": str(tmp_path / "b.rmcpb"),
+            "report_path": str(tmp_path / "diff.jsonl"),
+        },
+        workspace,
+    )
+    assert (diff["added"], diff["removed"], diff["changed"], diff["unchanged"]) == (1, 1, 2, 1197)
+    assert diff["changed_parameters"] == {"Comments": 1}
+    assert any("Comments: '' -> 'Moved'" in line for line in diff["differences"])
+    assert any("length: 10.0 -> 12.5" in line for line in diff["differences"])
+    shuffled = {**_element(7), "parameters": {"Comments": "", "Mark": "W7"}}
+    assert element_digest(shuffled) == element_digest(_element(7))
+    assert len((tmp_path / "diff.jsonl").read_text().splitlines()) == 4
+
+    with pytest.raises(FileNotFoundError):
+        TOOL_HANDLERS["revit.baseline_diff"](
+            {
+                "request_id": "e",
+                "baseline_a": str(tmp_path / "missing.rmcpb"),
+                "baseline_b": str(tmp_path / "b.rmcpb"),
+                "report_path": str(tmp_path / "diff.jsonl"),
+            },
+            workspace,
+        )
+    assert len((tmp_path / "diff.jsonl").read_text().splitlines()) == 4
+    assert not (tmp_path / "diff.jsonl.tmp").exists()
+    TOOL_HANDLERS["revit.baseline_diff"](
+        {
+            "request_id": "n",
+            "baseline_a": first["output_path"],
+            "baseline_b": str(tmp_path / "b.rmcpb"),
+            "report_path": str(tmp_path / "reports" / "diff.jsonl"),
+        },
+        workspace,
+    )
+    assert len((tmp_path / "reports" / "diff.jsonl").read_text().splitlines()) == 4
+
+    history = TOOL_HANDLERS["revit.baseline_history"](
+        {
+            "request_id": "h",
+            "baselines": [first["output_path"], str(tmp_path / "b.rmcpb")],
+            "unique_ids": ["uid-0", "uid-5"],
+        },
+        workspace,
+    )["history"]
+    assert [entry["present"] for entry in history] == [True, True, True, False]
+    assert history[2]["element"]["parameters"]["Comments"] == "Moved"
+
+
+class ScheduleBridge:
+    def __init__(self, schedules: dict[int, tuple[str, int]]) -> None:
+        self.schedules = schedules
+        self.pages = 0
+
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        if tool_name == "revit.list_views":
+            views = [{"id": sid, "name": name, "type": "Schedule"} for sid, (name, _) in self.schedules.items()]
+            return {"views": [{"id": 1, "name": "Level 1", "type": "FloorPlan"}, *views]}
+        assert tool_name == "revit.get_schedule_data"
+        self.pages += 1
+        name, total = self.schedules[payload["schedule_id"]]
+        stop = min(payload["offset"] + payload["limit"], total)
+        rows = [[f"{name}-{i}", f"<{i} & co>"] for i in range(payload["offset"], stop)]
+        return {"columns": ["Mark", "Comments"], "rows": rows, "total": total, "truncated": stop < total}
+
+
+def test_export_schedules_streams_pages(tmp_path):
+    workspace = WorkspaceMonitor([tmp_path])
+    handler = TOOL_HANDLERS["revit.export_schedules"]
+    bridge = ScheduleBridge({10: ("Door Schedule", 2500), 11: ("Room/Area", 3)})
+
+    response = handler(
+        {"request_id": "s", "output_path": str(tmp_path / "schedules"), "page_size": 1000}, workspace, bridge
+    )
+    assert response["schedules"] == ["Door Schedule", "Room/Area"] and response["rows"] == 2503
+    assert bridge.pages == 4
+    with open(tmp_path / "schedules" / "Door Schedule.csv", newline="", encoding="utf-8-sig") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ["Mark", "Comments"] and len(rows) == 2501 and rows[-1][0] == "Door Schedule-2499"
+    for entry in response["files"]:
+        assert entry["sha256"] == hashlib.sha256(Path(entry["path"]).read_bytes()).hexdigest()
+
+    response = handler(
+        {"request_id": "x", "output_path": str(tmp_path / "all.xlsx"), "schedule_ids": [11]}, workspace, bridge
+    )
+    assert response["exported"][0]["rows"] == 3 and len(response["files"]) == 1
+    with zipfile.ZipFile(tmp_path / "all.xlsx") as book:
+        assert 'name="Room_Area"' in book.read("xl/workbook.xml").decode()
+        sheet = book.read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row>") == 4 and "&lt;2 &amp; co&gt;" in sheet
+
+
+def test_export_schedules_keeps_colliding_csv_names_apart(tmp_path):
+    workspace = WorkspaceMonitor([tmp_path])
+    handler = TOOL_HANDLERS["revit.export_schedules"]
+    bridge = ScheduleBridge({10: ("Doors", 2), 11: ("DOORS", 3), 12: ("Doors", 4)})
+
+    response = handler({"request_id": "d", "output_path": str(tmp_path / "out")}, workspace, bridge)
+    names = [Path(entry["path"]).name for entry in response["files"]]
+    assert names == ["Doors.csv", "DOORS (2).csv", "Doors (3).csv"]
+    assert [entry["rows"] for entry in response["exported"]] == [2, 3, 4]
+    with open(tmp_path / "out" / "Doors.csv", newline="", encoding="utf-8-sig") as handle:
+        assert len(list(csv.reader(handle))) == 3
+
+
+class SheetBridge:
+    def __init__(self, existing: list[str], fail_after: int | None = None) -> None:
+        self.sheets = list(existing)
+        self.chunks: list[int] = []
+        self.fail_after = fail_after
+
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        if tool_name == "revit.list_sheets":
+            return {"sheets": [{"sheet_number": number} for number in self.sheets]}
+        assert tool_name == "revit.batch_create_sheets_from_csv"
+        if self.fail_after is not None and len(self.chunks) >= self.fail_after:
+            raise BridgeError("Command timed out")
+        self.chunks.append(len(payload["sheets"]))
+        self.sheets.extend(sheet["sheet_number"] for sheet in payload["sheets"])
+        results = [{"sheet_number": sheet["sheet_number"], "status": "success"} for sheet in payload["sheets"]]
+        return {"results": results}
+
+
+def test_sheet_batch_streams_chunks_and_resumes(tmp_path):
+    lines = ["Sheet Number,Sheet Name"] + [f"A{i:03d},Plan {i}" for i in range(120)]
+    lines += ["A000,Duplicate", "A200,", "A201,Bad: name"]
+    csv_path = tmp_path / "sheets.csv"
+    csv_path.write_text("\n".join(lines) + "\n")
+    workspace = WorkspaceMonitor([tmp_path])
+    handler = TOOL_HANDLERS["revit.batch_create_sheets_from_csv"]
+
+    dry_run = handler({"request_id": "v", "csv_path": str(csv_path)}, workspace)
+    assert (dry_run["sheets_created"], dry_run["skipped_duplicate"], dry_run["invalid"]) == (0, 1, 2)
+
+    bridge = SheetBridge(["A005"], fail_after=2)
+    payload = {"request_id": "s", "csv_path": str(csv_path), "chunk_size": 20}
+    first = handler(payload, workspace, bridge)
+    assert not first["complete"] and first["sheets_created"] == 60
+    # Fast chunks grow towards the time target, at most doubling each time.
+    assert bridge.chunks == [20, 40] and "timed out" in first["errors"][-1]
+
+    bridge.fail_after = None
+    second = handler({**payload, "resume": True}, workspace, bridge)
+    assert second["complete"] and second["sheets_created"] == 119
+    assert (second["skipped_existing"], second["skipped_duplicate"], second["invalid"]) == (2, 0, 2)
+    assert sorted(bridge.sheets) == sorted({f"A{i:03d}" for i in range(120)})
+
+
+class ExportClient:
+    def __init__(self, sheets: dict[int, dict]) -> None:
+        self.sheets = sheets
+        self.exported: list[int] = []
+
+    def call_tool(self, tool_name: str, payload: dict) -> dict:
+        assert tool_name == "revit.export_pdf_by_sheet_set"
+        files = []
+        for entry in payload["sheets"]:
+            path = Path(payload["output_directory"]) / f"{entry['file_name']}.pdf"
+            path.write_text(f"%PDF {self.sheets[entry['sheet_id']]['fingerprint']}")
+            self.exported.append(entry["sheet_id"])
+            files.append({"sheet_id": entry["sheet_id"], "file_path": str(path), "status": "success"})
+        return {"files": files}
+
+
+class PublishPool:
+    """Two healthy members with the same document open."""
+
+    def __init__(self, count: int) -> None:
+        self.sheets = {
+            100 + i: {"id": 100 + i, "sheet_number": f"A{i:02d}", "sheet_name": "Plan/Level", "fingerprint": "v1"}
+            for i in range(count)
+        }
+        self.members = [
+            SimpleNamespace(healthy=True, active_document="tower", client=ExportClient(self.sheets)) for _ in range(2)
+        ]
+
+    def send_tool(self, tool_name: str, payload: dict) -> dict:
+        assert tool_name == "revit.get_sheet_fingerprints"
+        return {"document": "session:1", "sheets": list(self.sheets.values())}
+
+
+def test_publish_spreads_units_and_skips_unchanged(tmp_path):
+    workspace = WorkspaceMonitor([tmp_path])
+    handler = TOOL_HANDLERS["revit.export_pdf_by_sheet_set"]
+    pool = PublishPool(10)
+    payload = {"request_id": "p", "output_dir": str(tmp_path / "out"), "sheets_per_call": 2, "zip": True}
+
+    first = handler(payload, workspace, pool)
+    assert (first["units"], first["exported"], first["skipped"], first["bridges"]) == (10, 10, 0, 2)
+    exported = [client.exported for client in (member.client for member in pool.members)]
+    assert sorted(exported[0] + exported[1]) == sorted(pool.sheets)
+    assert (tmp_path / "out" / "A03 - Plan_Level.pdf").exists()
+    with zipfile.ZipFile(first["archive_path"]) as archive:
+        assert len(archive.namelist()) == 10
+    manifest = json.loads((tmp_path / "out" / "publish-manifest.json").read_text())
+    assert all(entry["status"] == "done" and len(entry["sha256"]) == 64 for entry in manifest["units"].values())
+
+    pool.sheets[104]["fingerprint"] = "v2"
+    second = handler({**payload, "sheet_numbers": ["A04", "A05", "Z99"]}, workspace, pool)
+    assert (second["units"], second["exported"], second["skipped"]) == (2, 1, 1)
+    assert second["status"] == "incomplete" and second["errors"] == ["sheet Z99: not in the model"]
+
+
+def test_publish_fails_batches_left_by_a_late_dropout(tmp_path):
+    pool = PublishPool(2)
+    units = plan_units(list(pool.sheets.values()), ["pdf"])
+    manifest = Manifest(tmp_path / "publish-manifest.json")
+    started = threading.Event()
+
+    def steady(tool: str, payload: dict) -> dict:
+        started.wait(5)
+        return pool.members[0].client.call_tool(tool, payload)
+
+    def flaky(tool: str, payload: dict) -> dict:
+        # Drops out only once the other bridge has finished and left.
+        started.set()
+        while any(thread.name == "revit-publish-0" for thread in threading.enumerate()):
+            time.sleep(0.01)
+        raise BridgeUnavailable("connection reset")
+
+    outcome = run_units([steady, flaky], units, tmp_path, manifest, sheets_per_call=1)
+    assert sorted(outcome.values()) == ["done", "failed"]
+    failed = next(key for key, status in outcome.items() if status == "failed")
+    assert "connection reset" in manifest.units[failed]["error"]
+
+
+def test_bulk_walls_filter_convert_and_map_ids_back():
+    plan = plan_walls(
+        {
+            # metres; row 1 is zero-length, row 2 repeats row 0 reversed, row 3 has a NaN
+            "start_x": [0.0, 5.0, 3.0, float("nan"), 0.0, 0.0],
+            "start_y": [0.0, 5.0, 0.0, 0.0, 0.0, 3.0],
+            "end_x": [3.0, 5.0, 0.0, 1.0, 0.0, 3.0],
+            "end_y": [0.0, 5.0, 0.0, 0.0, 3.0, 3.0],
+            "height": 3.0,
+            "units": "m",
+            "level": "L2",
+        }
+    )
+    assert plan.rows.tolist() == [0, 4, 5]
+    assert plan.skipped == {"non_finite": [3], "degenerate": [1], "duplicate": [2]}
+    assert plan.columns["end_x"][0] == pytest.approx(3 / 0.3048)
+
+    sent: list[dict] = []
+
+    def call(tool: str, payload: dict) -> dict:
+        assert tool == "revit.create_walls" and payload["level"] == "L2"
+        sent.append(payload)
+        count = len(payload["start_x"])
+        if len(sent) == 1:
+            return {"ids": [100 + i for i in range(count)], "failed": []}
+        return {"ids": [None] * count, "failed": [{"index": 0, "error": "Wall overlaps"}]}
+
+    result = create_bulk(plan, call, chunk_size=2)
+    assert result["commands"] == 2 and result["created"] == 2
+    assert result["ids"] == [100, None, None, None, 101, None]
+    assert result["failed"] == [{"index": 5, "error": "Wall overlaps"}]
+
+
+def test_bulk_columns_stop_at_a_failed_chunk():
+    plan = plan_columns({"x": [0, 10, 20, 30], "y": [0, 0, 0, 0], "rotation": 90, "family_name": "Col", "type_name": "W10"})
+    assert plan.columns["rotation"][0] == pytest.approx(1.5707963)
+
+    def call(tool: str, payload: dict) -> dict:
+        if payload["x"][0] >= 20:
+            raise BridgeError("timed out")
+        return {"ids": [1, 2]}
+
+    result = create_bulk(plan, call, chunk_size=2)
+    assert result["ids"] == [1, 2, None, None]
+    assert [item["index"] for item in result["failed"]] == [2, 3]
+
+
+def test_room_completeness_report_runs_on_one_boundary_pull(tmp_path):
+    calls = []
+    result = {
+        "rooms": [
+            {"id": 1, "number": "101", "name": "Office", "level": "L1", "area": 100.0, "loops": [[0, 0, 10, 0, 10, 10, 0, 10]]},
+            {"id": 2, "number": "", "name": "Office", "level": "L1", "area": 0.0, "loops": []},
+        ]
+    }
+    bridge = SimpleNamespace(send_tool=lambda tool, payload: calls.append((tool, payload)) or result)
+    handler = TOOL_HANDLERS["revit.room_space_completeness_report"]
+    report = handler({"request_id": "rooms"}, WorkspaceMonitor([tmp_path]), bridge)
+    # The same finish-face boundaries the MCP server's room cache measures.
+    assert calls == [("revit.get_room_boundaries", {"boundary_location": "finish"})]
+    assert report["rooms"] == 2 and report["by_issue"] == {"not_enclosed": 1, "missing_number": 1}
+    assert handler({"request_id": "mock"}, WorkspaceMonitor([tmp_path]))["issues_found"] == 0
+
+
+def audit_model() -> AuditData:
+    box = [0, 0, 0, 1, 1, 1]
+    records = [
+        {"id": 1, "category": "Doors", "name": "Single 900", "level": "L1", "type_id": 10, "bounding_box": box},
+        {"id": 2, "category": "Doors", "name": "Single 900 Copy", "level": "L1", "type_id": 10, "bounding_box": box},
+        {"id": 3, "category": "Doors", "name": " Double", "level": None, "type_id": 11},
+        {"id": 4, "category": "Door Tags", "name": "Door Tag", "level": None, "type_id": 12},
+        {"id": 5, "category": "Walls", "name": "Generic 200", "level": "L1", "type_id": 13, "length": 0.2},
+    ]
+    parameters = {1: {"Mark": "D1"}, 2: {"Mark": "D1"}, 3: {"Mark": ""}, 4: {"Mark": ""}, 5: {"Mark": ""}}
+    return AuditData.from_records(records, parameters)
+
+
+def test_rule_audits_find_issues_per_category_and_stream_a_report(tmp_path):
+    data = audit_model()
+    health = run_audit(audit_rules("model_health_summary"), data)
+    assert health["by_rule"] == {"no_level": 1, "no_geometry": 2, "short_wall": 1, "duplicate_instance": 1}
+    assert health["severity"] == "error"
+
+    naming = run_audit(audit_rules("naming_standards_audit"), data)
+    assert {(issue["element_id"], issue["rule"]) for issue in naming["issues"]} == {
+        (3, "untrimmed_name"),
+        (2, "copied_name"),
+    }
+
+    report = tmp_path / "audits" / "marks.jsonl"
+    marks = run_audit(audit_rules("parameter_compliance_audit"), data, report)
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert marks["issues_found"] == len(lines) == 2
+    assert {(line["rule"], line["element_id"]) for line in lines} == {("missing_mark", 3), ("duplicate_mark", 2)}
+
+    tags = run_audit(audit_rules("tag_coverage_audit"), data)
+    assert tags["by_rule"]["door_tags"] == 1 and tags["issues"][0]["message"] == "1 Door Tags for 3 Doors"
+
+    # A category filter narrows the rules, not the rows: door tags are still counted.
+    doors = audit_rules("tag_coverage_audit", categories=["Doors"])
+    assert audit_categories(doors) == ["Door Tags", "Doors"]
+    assert run_audit(doors, data)["by_rule"] == {"door_tags": 1, "window_tags": 0, "room_tags": 0}
+    assert run_audit(audit_rules("tag_coverage_audit", categories=["Walls"]), data)["issues_found"] == 0
+
+    mock = TOOL_HANDLERS["revit.model_health_summary"]({"request_id": "mock"}, WorkspaceMonitor([tmp_path]))
+    assert mock["issues_found"] == 0 and mock["rules"] == 4
+
+
+def test_rule_audits_run_in_a_process_pool(monkeypatch):
+    from revit_mcp_server.tools import audit
+
+    monkeypatch.setattr(audit, "PARALLEL_MIN_ROWS", 1)
+    rules = audit_rules(None, [{"kind": "pattern", "pattern": "^Single"}, {"kind": "range", "column": "length", "max": 0.1}])
+    summary = run_audit(rules, audit_model(), workers=2)
+    assert summary["by_rule"] == {"pattern": 3, "range": 1}
+
+
+def test_range_rules_read_numeric_parameters():
+    rules = audit_rules(None, [{"kind": "range", "name": "door_width", "column": "Width", "min": 3.0, "categories": ["Doors"]}])
+    assert parameter_columns(rules) == ["Width"]
+    records = [{"id": i, "category": "Doors", "name": "Door"} for i in (1, 2, 3, 4)]
+    data = AuditData.from_records(records, {1: {"Width": 3.5}, 2: {"Width": "2.5"}, 3: {"Width": "wide"}, 4: {}})
+    summary = run_audit(rules, data)
+    assert [(issue["element_id"], issue["message"]) for issue in summary["issues"]] == [(2, "Width is 2.5")]
+
+
+def test_rule_specs_are_checked():
+    with pytest.raises(SchemaValidationError):
+        audit_rules(None, [{"kind": "pattern", "pattern": "("}])
+    with pytest.raises(SchemaValidationError):
+        audit_rules(None, [{"kind": "spelling"}])
+    with pytest.raises(SchemaValidationError):
+        audit_rules("naming_standards_audit", required_parameters=["Mark", "Mark"])
+    with pytest.raises(SchemaValidationError, match="min"):
+        audit_rules(None, [{"kind": "range", "min": "a"}])
+    with pytest.raises(SchemaValidationError, match="keys"):
+        audit_rules(None, [{"kind": "duplicate", "keys": "Mark"}])
+    (rule,) = audit_rules(None, [{"kind": "range", "min": "0.5", "categories": ["Walls"]}])
+    assert rule.min == 0.5 and rule.categories == ("Walls",)
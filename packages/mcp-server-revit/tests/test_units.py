@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from revit_mcp_server.errors import SchemaValidationError
+from revit_mcp_server.units import ProjectUnits, ProjectUnitsSource, convert, scale_lengths, to_internal
+
+METRIC = {
+    "document": "Tower",
+    "decimal_symbol": ",",
+    "specs": {
+        "length": {"unit": "autodesk.unit.unit:millimeters-1.0.1", "symbol": "mm", "scale": 304.8, "accuracy": 1},
+        "angle": {"unit": "autodesk.unit.unit:degrees-1.0.1", "symbol": "°", "scale": 57.29577951308232, "accuracy": 0.01},
+    },
+}
+
+
+def test_named_units_convert_scalars_and_arrays():
+    assert to_internal(1, "m") == pytest.approx(3.280839895)
+    assert np.allclose(to_internal([0, 1000, 2500], "mm", "length"), [0, 3.280839895, 8.202099738])
+    assert convert(90, "deg", "rad") == pytest.approx(np.pi / 2)
+    assert convert(1, "m2", "ft2") == pytest.approx(10.7639104)
+    with pytest.raises(SchemaValidationError):
+        convert(1, "m", "m2")
+
+
+def test_project_units_are_fetched_once_and_format_locally():
+    calls = []
+
+    def call(tool, payload):
+        calls.append(tool)
+        return METRIC
+
+    source = ProjectUnitsSource(call)
+    units = source.get()
+    assert source.get() is units and calls == ["revit.get_project_units"]
+    assert units.to_internal(3048.0) == pytest.approx(10.0)
+    assert units.format(10.0) == "3048 mm"
+    assert units.format(np.pi / 4, "angle") == "45,00°"
+
+    source.invalidate()
+    source.get()
+    assert len(calls) == 2
+
+    imperial = ProjectUnits.default()
+    assert imperial.format(5 + 3.5 / 12) == "5' - 3 1/2\""
+
+
+def test_scale_lengths_touches_only_coordinates():
+    arguments = {"start_x": 1.0, "height": 3.0, "level": "L1", "element_id": 7}
+    scaled = scale_lengths("revit_create_section_view", arguments, 10.0)
+    assert scaled == {"start_x": 10.0, "height": 30.0, "level": "L1", "element_id": 7}
+    floor = scale_lengths("revit_create_floor", {"points": [{"x": 2.0, "y": 0, "z": 1}], "level": "L1"}, 10.0)
+    assert floor["points"] == [{"x": 20.0, "y": 0, "z": 10}]
+
+
+def test_scale_lengths_is_per_tool_and_scales_defaults():
+    # Image sizes are pixels, however the tool names them.
+    image = {"view_id": 1, "width": 1920, "height": 1080}
+    assert scale_lengths("revit_export_image", image, 0.5) == image
+    tray = scale_lengths("revit_create_cable_tray", {"start_x": 2.0, "start_y": 0.0, "end_x": 4.0, "end_y": 0.0}, 0.5)
+    assert (tray["start_x"], tray["start_z"], tray["end_z"], tray["width"]) == (1.0, 5.0, 5.0, 0.5)
+    assert "end_z" not in scale_lengths("revit_create_grid", {"start_x": 1.0}, 0.5)
+    rooms = scale_lengths("revit_locate_rooms", {"points": [[2, 4], [6, 8, 1]], "level": "L1"}, 0.5)
+    assert rooms == {"points": [[1.0, 2.0], [3.0, 4.0, 0.5]], "level": "L1"}
+    box = scale_lengths("revit_replica_in_box", {"box": [0, 0, 0, 2, 2, 2], "limit": 10}, 0.5)
+    assert box == {"box": [0.0, 0.0, 0.0, 1.0, 1.0, 1.0], "limit": 10}
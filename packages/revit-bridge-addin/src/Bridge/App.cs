@@ -28,9 +28,8 @@ namespace RevitBridge.Bridge
                 var handler = new RevitCommandExecutor(_queue);
                 _externalEvent = ExternalEvent.Create(handler);
 
-                _server = new BridgeServer(_queue, _externalEvent);
+                _server = StartBridgeServer(_queue, _externalEvent);
                 Server = _server; // Expose statically
-                _server.Start();
 
                 // Create Modern Ribbon UI with Icons
                 CreateModernRibbonInterface(application);
@@ -39,6 +38,17 @@ namespace RevitBridge.Bridge
                 {
                     ActiveDocumentName = args.GetDocument()?.Title;
                 };
+                application.ControlledApplication.DocumentChanged += ChangeTracker.OnDocumentChanged;
+                application.ControlledApplication.DocumentOpened += ChangeTracker.OnDocumentOpened;
+                application.ControlledApplication.DocumentOpened += (sender, args) =>
+                {
+                    ActiveDocumentName = args.Document?.Title;
+                };
+                // Switching between open documents fires no DocumentChanged.
+                application.ViewActivated += (sender, args) =>
+                {
+                    ActiveDocumentName = args.Document?.Title;
+                };
 
                 Log.Information("RevitMCP Bridge started for Revit {Version}", RevitVersion);
                 return Result.Succeeded;
@@ -50,6 +60,29 @@ namespace RevitBridge.Bridge
             }
         }
 
+        private static BridgeServer StartBridgeServer(CommandQueue queue, ExternalEvent externalEvent)
+        {
+            // A session can pin its port; otherwise take the first free one so
+            // several Revit sessions on one workstation each host a bridge.
+            var configuredPort = Environment.GetEnvironmentVariable("REVITMCP_BRIDGE_PORT");
+            if (int.TryParse(configuredPort, out var pinnedPort))
+            {
+                var pinned = new BridgeServer(queue, externalEvent, $"http://127.0.0.1:{pinnedPort}/");
+                pinned.Start();
+                return pinned;
+            }
+
+            BridgeServer? server = null;
+            for (var port = 3000; port < 3010; port++)
+            {
+                server = new BridgeServer(queue, externalEvent, $"http://127.0.0.1:{port}/");
+                server.Start();
+                if (server.IsListening)
+                    break;
+            }
+            return server!;
+        }
+
         private void CreateModernRibbonInterface(UIControlledApplication app)
         {
             string tabName = "RevitMCP";
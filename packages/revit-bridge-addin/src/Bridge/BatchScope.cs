@@ -0,0 +1,87 @@
+using System;
+using Autodesk.Revit.DB;
+
+namespace RevitBridge.Bridge;
+
+/// <summary>
+/// One Transaction shared by every command of a revit.execute_batch call.
+/// While it is open, <see cref="BridgeTransaction"/> runs each command as a
+/// SubTransaction of it, so the batch commits, regenerates and lands on the
+/// undo stack once instead of once per command.
+/// </summary>
+public sealed class BatchScope : IDisposable
+{
+    // Commands only run on Revit's UI thread, one batch at a time.
+    private static BatchScope? _current;
+
+    private readonly Document _doc;
+    private readonly Transaction _transaction;
+
+    private BatchScope(Document doc, string name)
+    {
+        _doc = doc;
+        _transaction = new Transaction(doc, name);
+        _transaction.Start();
+    }
+
+    public static BatchScope Begin(Document doc, string name)
+    {
+        if (_current != null)
+            throw new InvalidOperationException("A batch is already running");
+        _current = new BatchScope(doc, name);
+        return _current;
+    }
+
+    public static bool IsActive(Document doc) => _current != null && _current._doc.Equals(doc);
+
+    public TransactionStatus Commit() => _transaction.Commit();
+
+    public void RollBack()
+    {
+        if (_transaction.GetStatus() == TransactionStatus.Started)
+            _transaction.RollBack();
+    }
+
+    public void Dispose()
+    {
+        RollBack();
+        _transaction.Dispose();
+        _current = null;
+    }
+}
+
+/// <summary>
+/// The transaction bridge commands open around their edits: a plain
+/// Transaction normally, a SubTransaction of the running batch otherwise.
+/// Exposes the subset of the Transaction API the commands use.
+/// </summary>
+public sealed class BridgeTransaction : IDisposable
+{
+    private readonly Transaction? _transaction;
+    private readonly SubTransaction? _subTransaction;
+
+    public BridgeTransaction(Document doc, string name)
+    {
+        if (BatchScope.IsActive(doc))
+            _subTransaction = new SubTransaction(doc);
+        else
+            _transaction = new Transaction(doc, name);
+    }
+
+    public TransactionStatus Start() => _subTransaction?.Start() ?? _transaction!.Start();
+
+    public TransactionStatus Commit() => _subTransaction?.Commit() ?? _transaction!.Commit();
+
+    public TransactionStatus RollBack() => _subTransaction?.RollBack() ?? _transaction!.RollBack();
+
+    public TransactionStatus GetStatus() => _subTransaction?.GetStatus() ?? _transaction!.GetStatus();
+
+    public void Dispose()
+    {
+        // A command that threw mid-edit must not leave its part of a batch applied.
+        if (GetStatus() == TransactionStatus.Started)
+            RollBack();
+        _subTransaction?.Dispose();
+        _transaction?.Dispose();
+    }
+}
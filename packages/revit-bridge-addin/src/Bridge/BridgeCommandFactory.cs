@@ -69,6 +69,7 @@ public static class BridgeCommandFactory
 
             // Sheets & Documentation (10 new)
             "revit.list_sheets" => ExecuteListSheets(app),
+            "revit.get_sheet_fingerprints" => ExecuteGetSheetFingerprints(app, payload),
             "revit.create_sheet" => ExecuteCreateSheet(app, payload),
             "revit.delete_sheet" => ExecuteDeleteSheet(app, payload),
             "revit.place_viewport_on_sheet" => ExecutePlaceViewportOnSheet(app, payload),
@@ -165,7 +166,7 @@ public static class BridgeCommandFactory
             "revit.get_view_templates" => ExecuteGetViewTemplates(app),
             "revit.apply_view_template" => ExecuteApplyViewTemplate(app, payload),
             "revit.calculate_material_quantities" => ExecuteCalculateMaterialQuantities(app, payload),
-            // "revit.get_room_boundary" => ExecuteGetRoomBoundary(app, payload), // Temp disabled - API compat issue
+            "revit.get_room_boundary" => ExecuteGetRoomBoundary(app, payload),
             // "revit.get_project_location" => ExecuteGetProjectLocation(app), // Temp disabled - API compat issue
             "revit.get_warnings" => ExecuteGetWarnings(app),
 
@@ -181,6 +182,14 @@ public static class BridgeCommandFactory
             "revit.batch_set_parameters_by_filter" => ExecuteBatchSetParametersByFilter(app, payload),
             "revit.replace_family_type" => ExecuteReplaceFamilyType(app, payload),
             "revit.get_element_geometry" => ExecuteGetElementGeometry(app, payload),
+            "revit.get_document_changes" => ExecuteGetDocumentChanges(app, payload),
+            "revit.execute_batch" => ExecuteBatch(app, payload),
+            "revit.create_walls" => ExecuteCreateWalls(app, payload),
+            "revit.create_columns" => ExecuteCreateColumns(app, payload),
+            "revit.place_family_instances" => ExecutePlaceFamilyInstances(app, payload),
+            "revit.get_project_units" => ExecuteGetProjectUnits(app, payload),
+            "revit.get_element_mesh" => ExecuteGetElementMesh(app, payload),
+            "revit.get_room_boundaries" => ExecuteGetRoomBoundaries(app, payload),
 
             _ => new { status = "error", message = $"Unknown tool: {tool}" }
         };
@@ -239,6 +248,7 @@ public static class BridgeCommandFactory
 
             // Sheets & Documentation
             "revit.list_sheets",
+            "revit.get_sheet_fingerprints",
             "revit.create_sheet",
             "revit.delete_sheet",
             "revit.place_viewport_on_sheet",
@@ -351,7 +361,15 @@ public static class BridgeCommandFactory
             "revit.get_elements_by_type",
             "revit.batch_set_parameters_by_filter",
             "revit.replace_family_type",
-            "revit.get_element_geometry"
+            "revit.get_element_geometry",
+            "revit.get_document_changes",
+            "revit.execute_batch",
+            "revit.create_walls",
+            "revit.create_columns",
+            "revit.place_family_instances",
+            "revit.get_project_units",
+            "revit.get_element_mesh",
+            "revit.get_room_boundaries"
         };
     }
 
@@ -430,7 +448,7 @@ public static class BridgeCommandFactory
 
         var exported = new List<string>();
 
-        using (var trans = new Transaction(doc, "Export Schedules"))
+        using (var trans = new BridgeTransaction(doc, "Export Schedules"))
         {
             trans.Start();
 
@@ -468,6 +486,9 @@ public static class BridgeCommandFactory
         if (doc == null)
             throw new InvalidOperationException("No active document");
 
+        if (payload.TryGetProperty("sheets", out var sheetsProp) && sheetsProp.ValueKind == JsonValueKind.Array)
+            return ExportPdfPerSheet(doc, payload, sheetsProp);
+
         var outputPath = payload.GetProperty("output_path").GetString();
         if (string.IsNullOrEmpty(outputPath))
             throw new ArgumentException("Missing 'output_path' parameter");
@@ -507,6 +528,43 @@ public static class BridgeCommandFactory
         };
     }
 
+    /// <summary>
+    /// One PDF per entry of <c>sheets</c> ({sheet_id, file_name}), named by
+    /// the caller so repeated publishes overwrite the same files.
+    /// </summary>
+    private static object ExportPdfPerSheet(Document doc, JsonElement payload, JsonElement sheetsProp)
+    {
+        var outputDirectory = payload.GetProperty("output_directory").GetString();
+        if (string.IsNullOrEmpty(outputDirectory))
+            throw new ArgumentException("Missing 'output_directory' parameter");
+        System.IO.Directory.CreateDirectory(outputDirectory);
+
+        var files = new List<object>();
+        foreach (var item in sheetsProp.EnumerateArray())
+        {
+            var sheetId = item.GetProperty("sheet_id").GetInt64();
+            var fileName = SanitizeFileName(item.GetProperty("file_name").GetString() ?? sheetId.ToString());
+            var filePath = System.IO.Path.Combine(outputDirectory, $"{fileName}.pdf");
+            if (doc.GetElement(new ElementId(sheetId)) is not ViewSheet sheet)
+            {
+                files.Add(new { sheet_id = sheetId, status = "error", message = "Sheet not found" });
+                continue;
+            }
+            try
+            {
+                var options = new PDFExportOptions { FileName = fileName, Combine = true };
+                doc.Export(outputDirectory, new List<ElementId> { sheet.Id }, options);
+                files.Add(new { sheet_id = sheetId, file_path = filePath, status = "success" });
+            }
+            catch (Exception ex)
+            {
+                files.Add(new { sheet_id = sheetId, status = "error", message = ex.Message });
+            }
+        }
+
+        return new { output_directory = outputDirectory, files };
+    }
+
     // ==================== DOCUMENT MANAGEMENT (5 NEW) ====================
 
     private static object ExecuteSaveDocument(UIApplication app, JsonElement payload)
@@ -631,7 +689,7 @@ public static class BridgeCommandFactory
         var levelName = payload.GetProperty("level").GetString();
         var wallTypeName = payload.TryGetProperty("wall_type", out var wt) ? wt.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Wall"))
+        using (var trans = new BridgeTransaction(doc, "Create Wall"))
         {
             trans.Start();
 
@@ -677,7 +735,7 @@ public static class BridgeCommandFactory
         var levelName = payload.GetProperty("level").GetString();
         var floorTypeName = payload.TryGetProperty("floor_type", out var ft) ? ft.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Floor"))
+        using (var trans = new BridgeTransaction(doc, "Create Floor"))
         {
             trans.Start();
 
@@ -734,7 +792,7 @@ public static class BridgeCommandFactory
         var levelName = payload.GetProperty("level").GetString();
         var roofTypeName = payload.TryGetProperty("roof_type", out var rt) ? rt.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Roof"))
+        using (var trans = new BridgeTransaction(doc, "Create Roof"))
         {
             trans.Start();
 
@@ -777,7 +835,7 @@ public static class BridgeCommandFactory
         var name = payload.GetProperty("name").GetString();
         var elevation = payload.GetProperty("elevation").GetDouble();
 
-        using (var trans = new Transaction(doc, "Create Level"))
+        using (var trans = new BridgeTransaction(doc, "Create Level"))
         {
             trans.Start();
 
@@ -807,7 +865,7 @@ public static class BridgeCommandFactory
         var endPoint = ParseXYZ(payload.GetProperty("end_point"));
         var name = payload.TryGetProperty("name", out var n) ? n.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Grid"))
+        using (var trans = new BridgeTransaction(doc, "Create Grid"))
         {
             trans.Start();
 
@@ -841,7 +899,7 @@ public static class BridgeCommandFactory
         var roomName = payload.TryGetProperty("name", out var n) ? n.GetString() : "Room";
         var roomNumber = payload.TryGetProperty("number", out var num) ? num.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Room"))
+        using (var trans = new BridgeTransaction(doc, "Create Room"))
         {
             trans.Start();
 
@@ -909,7 +967,7 @@ public static class BridgeCommandFactory
 
         var elementId = payload.GetProperty("element_id").GetInt32();
 
-        using (var trans = new Transaction(doc, "Delete Element"))
+        using (var trans = new BridgeTransaction(doc, "Delete Element"))
         {
             trans.Start();
 
@@ -939,7 +997,7 @@ public static class BridgeCommandFactory
         var typeName = payload.GetProperty("type_name").GetString();
         var levelName = payload.GetProperty("level").GetString();
 
-        using (var trans = new Transaction(doc, "Place Family Instance"))
+        using (var trans = new BridgeTransaction(doc, "Place Family Instance"))
         {
             trans.Start();
 
@@ -977,7 +1035,7 @@ public static class BridgeCommandFactory
         var familyName = payload.TryGetProperty("family_name", out var fn) ? fn.GetString() : "Single-Flush";
         var typeName = payload.TryGetProperty("type_name", out var tn) ? tn.GetString() : "0915 x 2134mm";
 
-        using (var trans = new Transaction(doc, "Place Door"))
+        using (var trans = new BridgeTransaction(doc, "Place Door"))
         {
             trans.Start();
 
@@ -1018,7 +1076,7 @@ public static class BridgeCommandFactory
         var familyName = payload.TryGetProperty("family_name", out var fn) ? fn.GetString() : "Fixed";
         var typeName = payload.TryGetProperty("type_name", out var tn) ? tn.GetString() : "1200 x 1500mm";
 
-        using (var trans = new Transaction(doc, "Place Window"))
+        using (var trans = new BridgeTransaction(doc, "Place Window"))
         {
             trans.Start();
 
@@ -1088,7 +1146,7 @@ public static class BridgeCommandFactory
         var levelName = payload.GetProperty("level").GetString();
         var viewName = payload.TryGetProperty("name", out var n) ? n.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Floor Plan View"))
+        using (var trans = new BridgeTransaction(doc, "Create Floor Plan View"))
         {
             trans.Start();
 
@@ -1122,7 +1180,7 @@ public static class BridgeCommandFactory
 
         var viewName = payload.TryGetProperty("name", out var n) ? n.GetString() : "3D View";
 
-        using (var trans = new Transaction(doc, "Create 3D View"))
+        using (var trans = new BridgeTransaction(doc, "Create 3D View"))
         {
             trans.Start();
 
@@ -1151,7 +1209,7 @@ public static class BridgeCommandFactory
         var endPoint = ParseXYZ(payload.GetProperty("end_point"));
         var viewName = payload.TryGetProperty("name", out var n) ? n.GetString() : "Section";
 
-        using (var trans = new Transaction(doc, "Create Section View"))
+        using (var trans = new BridgeTransaction(doc, "Create Section View"))
         {
             trans.Start();
 
@@ -1365,7 +1423,7 @@ public static class BridgeCommandFactory
         if (element == null)
             throw new ArgumentException($"Element with ID {elementId} not found");
 
-        using (var trans = new Transaction(doc, "Set Parameter Value"))
+        using (var trans = new BridgeTransaction(doc, "Set Parameter Value"))
         {
             trans.Start();
 
@@ -1522,7 +1580,7 @@ public static class BridgeCommandFactory
         var successCount = 0;
         var errorCount = 0;
 
-        using (var trans = new Transaction(doc, "Batch Set Parameters"))
+        using (var trans = new BridgeTransaction(doc, "Batch Set Parameters"))
         {
             trans.Start();
 
@@ -1622,7 +1680,7 @@ public static class BridgeCommandFactory
         if (elementType == null)
             throw new ArgumentException($"Element type with ID {typeId} not found");
 
-        using (var trans = new Transaction(doc, "Set Type Parameter"))
+        using (var trans = new BridgeTransaction(doc, "Set Type Parameter"))
         {
             trans.Start();
 
@@ -1760,6 +1818,93 @@ public static class BridgeCommandFactory
         };
     }
 
+    /// <summary>
+    /// A hash per sheet of what it shows: number, name, revisions, viewport
+    /// placement, and every element visible on the sheet and its views along
+    /// with the latest change journaled for it this session. Publishing
+    /// compares these with the previous run to skip unchanged sheets.
+    /// </summary>
+    private static object ExecuteGetSheetFingerprints(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null)
+            throw new InvalidOperationException("No active document");
+
+        HashSet<long>? wanted = null;
+        if (payload.ValueKind == JsonValueKind.Object &&
+            payload.TryGetProperty("sheet_ids", out var idsProp) && idsProp.ValueKind == JsonValueKind.Array)
+            wanted = new HashSet<long>(idsProp.EnumerateArray().Select(e => e.GetInt64()));
+
+        var sheets = new FilteredElementCollector(doc)
+            .OfClass(typeof(ViewSheet))
+            .Cast<ViewSheet>()
+            .Where(sheet => !sheet.IsPlaceholder && (wanted == null || wanted.Contains(sheet.Id.Value)))
+            .ToList();
+
+        var results = new List<object>();
+        using (var sha = System.Security.Cryptography.SHA256.Create())
+        {
+            foreach (var sheet in sheets)
+            {
+                var text = new StringBuilder();
+                text.Append(sheet.SheetNumber).Append('\n').Append(sheet.Name).Append('\n');
+                foreach (var revisionId in sheet.GetAllRevisionIds())
+                    text.Append(revisionId.Value).Append(',');
+                text.Append('\n');
+
+                var viewIds = new List<ElementId> { sheet.Id };
+                foreach (var viewportId in sheet.GetAllViewports())
+                {
+                    if (doc.GetElement(viewportId) is not Viewport viewport)
+                        continue;
+                    var centre = viewport.GetBoxCenter();
+                    viewIds.Add(viewport.ViewId);
+                    text.Append(viewport.ViewId.Value)
+                        .Append('@').Append(Math.Round(centre.X, 6).ToString(System.Globalization.CultureInfo.InvariantCulture))
+                        .Append(',').Append(Math.Round(centre.Y, 6).ToString(System.Globalization.CultureInfo.InvariantCulture))
+                        .Append(';');
+                }
+                text.Append('\n');
+
+                var elementIds = new SortedSet<long>();
+                foreach (var viewId in viewIds)
+                {
+                    elementIds.Add(viewId.Value);
+                    foreach (var id in new FilteredElementCollector(doc, viewId).ToElementIds())
+                        elementIds.Add(id.Value);
+                }
+                var changes = ChangeTracker.LastChanges(doc, elementIds);
+                foreach (var id in elementIds)
+                {
+                    text.Append(id);
+                    if (changes.TryGetValue(id, out var sequence))
+                        text.Append('#').Append(sequence);
+                    text.Append(';');
+                }
+                // Change sequences only mean something within one session.
+                if (changes.Count > 0)
+                    text.Append('\n').Append(ChangeTracker.Session);
+
+                var hash = sha.ComputeHash(Encoding.UTF8.GetBytes(text.ToString()));
+                results.Add(new
+                {
+                    id = sheet.Id.Value,
+                    sheet_number = sheet.SheetNumber,
+                    sheet_name = sheet.Name,
+                    fingerprint = BitConverter.ToString(hash).Replace("-", "").ToLowerInvariant(),
+                    element_count = elementIds.Count
+                });
+            }
+        }
+
+        return new
+        {
+            document = ChangeTracker.DocumentToken(doc),
+            count = results.Count,
+            sheets = results
+        };
+    }
+
     private static object ExecuteCreateSheet(UIApplication app, JsonElement payload)
     {
         var doc = app.ActiveUIDocument?.Document;
@@ -1772,7 +1917,7 @@ public static class BridgeCommandFactory
             ? tbName.GetString()
             : null;
 
-        using (var trans = new Transaction(doc, "Create Sheet"))
+        using (var trans = new BridgeTransaction(doc, "Create Sheet"))
         {
             trans.Start();
 
@@ -1822,7 +1967,7 @@ public static class BridgeCommandFactory
 
         var sheetId = payload.GetProperty("sheet_id").GetInt32();
 
-        using (var trans = new Transaction(doc, "Delete Sheet"))
+        using (var trans = new BridgeTransaction(doc, "Delete Sheet"))
         {
             trans.Start();
 
@@ -1859,7 +2004,7 @@ public static class BridgeCommandFactory
             ? ParseXYZ(loc)
             : new XYZ(0.5, 0.5, 0);
 
-        using (var trans = new Transaction(doc, "Place Viewport"))
+        using (var trans = new BridgeTransaction(doc, "Place Viewport"))
         {
             trans.Start();
 
@@ -1915,27 +2060,30 @@ public static class BridgeCommandFactory
         var successCount = 0;
         var errorCount = 0;
 
-        using (var trans = new Transaction(doc, "Batch Create Sheets"))
+        // Chunks usually share one or two titleblocks; collect the symbols once.
+        var titleblocks = new FilteredElementCollector(doc)
+            .OfCategory(BuiltInCategory.OST_TitleBlocks)
+            .OfClass(typeof(FamilySymbol))
+            .Cast<FamilySymbol>()
+            .ToList();
+
+        using (var trans = new BridgeTransaction(doc, "Batch Create Sheets"))
         {
             trans.Start();
 
             foreach (var sheetData in sheets)
             {
+                ViewSheet sheet = null;
                 try
                 {
-                    ViewSheet sheet;
                     if (string.IsNullOrEmpty(sheetData.TitleblockName))
                     {
                         sheet = ViewSheet.CreatePlaceholder(doc);
                     }
                     else
                     {
-                        var titleblock = new FilteredElementCollector(doc)
-                            .OfClass(typeof(FamilySymbol))
-                            .Cast<FamilySymbol>()
-                            .FirstOrDefault(fs =>
-                                fs.Family.FamilyCategory.Name == "Title Blocks" &&
-                                fs.Family.Name.Equals(sheetData.TitleblockName, StringComparison.OrdinalIgnoreCase));
+                        var titleblock = titleblocks.FirstOrDefault(fs =>
+                            fs.Family.Name.Equals(sheetData.TitleblockName, StringComparison.OrdinalIgnoreCase));
 
                         if (titleblock == null)
                         {
@@ -1960,6 +2108,9 @@ public static class BridgeCommandFactory
                 }
                 catch (Exception ex)
                 {
+                    // Don't leave an auto-numbered sheet behind when renaming fails.
+                    if (sheet != null)
+                        doc.Delete(sheet.Id);
                     results.Add(new { sheet_number = sheetData.SheetNumber, status = "error", message = ex.Message });
                     errorCount++;
                 }
@@ -1987,7 +2138,7 @@ public static class BridgeCommandFactory
         var parameters = payload.GetProperty("parameters").EnumerateObject()
             .ToDictionary(p => p.Name, p => p.Value);
 
-        using (var trans = new Transaction(doc, "Populate Titleblock"))
+        using (var trans = new BridgeTransaction(doc, "Populate Titleblock"))
         {
             trans.Start();
 
@@ -2118,7 +2269,7 @@ public static class BridgeCommandFactory
             ? dv.GetBoolean()
             : false;
 
-        using (var trans = new Transaction(doc, "Duplicate Sheet"))
+        using (var trans = new BridgeTransaction(doc, "Duplicate Sheet"))
         {
             trans.Start();
 
@@ -2228,7 +2379,7 @@ public static class BridgeCommandFactory
         var successCount = 0;
         var errorCount = 0;
 
-        using (var trans = new Transaction(doc, "Renumber Sheets"))
+        using (var trans = new BridgeTransaction(doc, "Renumber Sheets"))
         {
             trans.Start();
 
@@ -2288,6 +2439,10 @@ public static class BridgeCommandFactory
             .Select(e => new ElementId(e.GetInt64()))
             .ToList();
         var outputDirectory = payload.GetProperty("output_directory").GetString();
+        // Optional names, parallel to view_ids; default is the view name.
+        var fileNames = payload.TryGetProperty("file_names", out var namesProp) && namesProp.ValueKind == JsonValueKind.Array
+            ? namesProp.EnumerateArray().Select(e => e.GetString()).ToList()
+            : new List<string?>();
         var dwgVersion = payload.TryGetProperty("dwg_version", out var ver)
             ? ver.GetString()
             : "AutoCAD2018";
@@ -2307,12 +2462,13 @@ public static class BridgeCommandFactory
             }
         };
 
-        using (var trans = new Transaction(doc, "Export DWG"))
+        using (var trans = new BridgeTransaction(doc, "Export DWG"))
         {
             trans.Start();
 
-            foreach (var viewId in viewIds)
+            for (var index = 0; index < viewIds.Count; index++)
             {
+                var viewId = viewIds[index];
                 var view = doc.GetElement(viewId) as View;
                 if (view == null)
                 {
@@ -2320,7 +2476,8 @@ public static class BridgeCommandFactory
                     continue;
                 }
 
-                var fileName = SanitizeFileName(view.Name);
+                var fileName = SanitizeFileName(
+                    index < fileNames.Count && !string.IsNullOrEmpty(fileNames[index]) ? fileNames[index]! : view.Name);
                 var filePath = System.IO.Path.Combine(outputDirectory, $"{fileName}.dwg");
 
                 try
@@ -2382,8 +2539,11 @@ public static class BridgeCommandFactory
             WallAndColumnSplitting = true,
             SpaceBoundaryLevel = 1
         };
+        // Limit the export to what one view shows, e.g. a named 3D coordination view.
+        if (payload.TryGetProperty("view_id", out var viewProp) && viewProp.ValueKind == JsonValueKind.Number)
+            options.FilterViewId = new ElementId(viewProp.GetInt64());
 
-        using (var trans = new Transaction(doc, "Export IFC"))
+        using (var trans = new BridgeTransaction(doc, "Export IFC"))
         {
             trans.Start();
 
@@ -2442,7 +2602,7 @@ public static class BridgeCommandFactory
             options.ViewId = viewId;
         }
 
-        using (var trans = new Transaction(doc, "Export Navisworks"))
+        using (var trans = new BridgeTransaction(doc, "Export Navisworks"))
         {
             trans.Start();
 
@@ -2520,7 +2680,7 @@ public static class BridgeCommandFactory
 
         options.SetViewsAndSheets(new List<ElementId> { view.Id });
 
-        using (var trans = new Transaction(doc, "Export Image"))
+        using (var trans = new BridgeTransaction(doc, "Export Image"))
         {
             trans.Start();
 
@@ -2575,7 +2735,7 @@ public static class BridgeCommandFactory
             _ => ImageResolution.DPI_150
         };
 
-        using (var trans = new Transaction(doc, "Render 3D View"))
+        using (var trans = new BridgeTransaction(doc, "Render 3D View"))
         {
             trans.Start();
 
@@ -2640,7 +2800,7 @@ public static class BridgeCommandFactory
         var location = ParseXYZ(payload.GetProperty("location"));
         var viewId = payload.TryGetProperty("view_id", out var v) ? v.GetInt32() : doc.ActiveView.Id.Value;
 
-        using (var trans = new Transaction(doc, "Create Text Note"))
+        using (var trans = new BridgeTransaction(doc, "Create Text Note"))
         {
             trans.Start();
             var view = doc.GetElement(new ElementId((long)viewId)) as View;
@@ -2660,7 +2820,7 @@ public static class BridgeCommandFactory
         var location = ParseXYZ(payload.GetProperty("location"));
         var viewId = payload.TryGetProperty("view_id", out var v) ? v.GetInt32() : doc.ActiveView.Id.Value;
 
-        using (var trans = new Transaction(doc, "Create Tag"))
+        using (var trans = new BridgeTransaction(doc, "Create Tag"))
         {
             trans.Start();
             var view = doc.GetElement(new ElementId((long)viewId)) as View;
@@ -2686,7 +2846,7 @@ public static class BridgeCommandFactory
         var familyName = payload.GetProperty("family_name").GetString();
         var typeName = payload.GetProperty("type_name").GetString();
 
-        using (var trans = new Transaction(doc, "Create Structural Column"))
+        using (var trans = new BridgeTransaction(doc, "Create Structural Column"))
         {
              trans.Start();
              var level = GetLevelByName(doc, levelName);
@@ -2711,7 +2871,7 @@ public static class BridgeCommandFactory
         var familyName = payload.GetProperty("family_name").GetString();
         var typeName = payload.GetProperty("type_name").GetString();
 
-        using (var trans = new Transaction(doc, "Create Beam"))
+        using (var trans = new BridgeTransaction(doc, "Create Beam"))
         {
              trans.Start();
              var level = GetLevelByName(doc, levelName);
@@ -2736,7 +2896,7 @@ public static class BridgeCommandFactory
         var familyName = payload.GetProperty("family_name").GetString();
         var typeName = payload.GetProperty("type_name").GetString();
 
-        using (var trans = new Transaction(doc, "Create Foundation"))
+        using (var trans = new BridgeTransaction(doc, "Create Foundation"))
         {
              trans.Start();
              var level = GetLevelByName(doc, levelName);
@@ -2763,7 +2923,7 @@ public static class BridgeCommandFactory
         var systemTypeName = payload.TryGetProperty("system_type", out var s) ? s.GetString() : "Supply Air";
         var ductTypeName = payload.TryGetProperty("duct_type", out var d) ? d.GetString() : null; // Default to first available
 
-        using (var trans = new Transaction(doc, "Create Duct"))
+        using (var trans = new BridgeTransaction(doc, "Create Duct"))
         {
              trans.Start();
              var level = GetLevelByName(doc, levelName);
@@ -2801,7 +2961,7 @@ public static class BridgeCommandFactory
         var systemTypeName = payload.TryGetProperty("system_type", out var s) ? s.GetString() : "Hydronic Supply";
         var pipeTypeName = payload.TryGetProperty("pipe_type", out var p) ? p.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Pipe"))
+        using (var trans = new BridgeTransaction(doc, "Create Pipe"))
         {
              trans.Start();
              var level = GetLevelByName(doc, levelName);
@@ -2883,7 +3043,7 @@ public static class BridgeCommandFactory
         var elementId = new ElementId((long)payload.GetProperty("element_id").GetInt32());
         var vector = ParseXYZ(payload.GetProperty("vector"));
 
-        using (var trans = new Transaction(doc, "Move Element"))
+        using (var trans = new BridgeTransaction(doc, "Move Element"))
         {
             trans.Start();
             ElementTransformUtils.MoveElement(doc, elementId, vector);
@@ -2900,7 +3060,7 @@ public static class BridgeCommandFactory
         var elementId = new ElementId((long)payload.GetProperty("element_id").GetInt32());
         var vector = ParseXYZ(payload.GetProperty("vector"));
 
-        using (var trans = new Transaction(doc, "Copy Element"))
+        using (var trans = new BridgeTransaction(doc, "Copy Element"))
         {
             trans.Start();
             var newIds = ElementTransformUtils.CopyElement(doc, elementId, vector);
@@ -2918,7 +3078,7 @@ public static class BridgeCommandFactory
         var axisPoint = ParseXYZ(payload.GetProperty("axis_point"));
         var angleRadians = payload.GetProperty("angle_radians").GetDouble();
 
-        using (var trans = new Transaction(doc, "Rotate Element"))
+        using (var trans = new BridgeTransaction(doc, "Rotate Element"))
         {
             trans.Start();
             var axis = Line.CreateBound(axisPoint, axisPoint + XYZ.BasisZ); // Default to Z-axis rotation for now
@@ -2941,7 +3101,7 @@ public static class BridgeCommandFactory
         var planeOrigin = ParseXYZ(payload.GetProperty("plane_origin"));
         var planeNormal = ParseXYZ(payload.GetProperty("plane_normal")); // e.g., (1,0,0) for YZ plane
         
-        using (var trans = new Transaction(doc, "Mirror Element"))
+        using (var trans = new BridgeTransaction(doc, "Mirror Element"))
         {
              trans.Start();
              var plane = Plane.CreateByNormalAndOrigin(planeNormal, planeOrigin);
@@ -2958,7 +3118,7 @@ public static class BridgeCommandFactory
         
         var elementId = new ElementId((long)payload.GetProperty("element_id").GetInt32());
         
-        using (var trans = new Transaction(doc, "Pin Element"))
+        using (var trans = new BridgeTransaction(doc, "Pin Element"))
         {
              trans.Start();
              var el = doc.GetElement(elementId);
@@ -2975,7 +3135,7 @@ public static class BridgeCommandFactory
         
         var elementId = new ElementId((long)payload.GetProperty("element_id").GetInt32());
         
-        using (var trans = new Transaction(doc, "Unpin Element"))
+        using (var trans = new BridgeTransaction(doc, "Unpin Element"))
         {
              trans.Start();
              var el = doc.GetElement(elementId);
@@ -3058,7 +3218,7 @@ public static class BridgeCommandFactory
         
         var category = GetCategoryByName(doc, categoryName);
 
-        using (var trans = new Transaction(doc, "Create Schedule"))
+        using (var trans = new BridgeTransaction(doc, "Create Schedule"))
         {
              trans.Start();
              var schedule = ViewSchedule.CreateSchedule(doc, category.Id);
@@ -3071,23 +3231,51 @@ public static class BridgeCommandFactory
     
     private static object ExecuteGetScheduleData(UIApplication app, JsonElement payload)
     {
-        // Getting actual data rows from a ViewSchedule is surprisingly hard in the API (ViewSchedule.GetCellText is for header section mostly or specific calls).
-        // Best simplified way is TableData, but that's for parsing the visual table.
-        // A robust implementation would be: element collector of the schedule's category, formatted by schedule fields.
-        // For simplified v1: Just return fields.
-        
         var doc = app.ActiveUIDocument?.Document;
         if (doc == null) throw new InvalidOperationException("No active document");
-        
-        var scheduleId = new ElementId((long)payload.GetProperty("schedule_id").GetInt32());
+
+        var scheduleId = new ElementId(payload.GetProperty("schedule_id").GetInt64());
         var schedule = doc.GetElement(scheduleId) as ViewSchedule;
-        if(schedule == null) throw new ArgumentException("Schedule not found");
-        
-        var fields = schedule.Definition.GetSchedulableFields()
-             .Select(f => f.GetName(doc))
-             .ToList();
-             
-        return new { schedule_name = schedule.Name, fields = fields, note = "Data extraction limited to fields list in this version." };
+        if (schedule == null) throw new ArgumentException("Schedule not found");
+
+        // Rows are read from the schedule's body as displayed, a page at a time,
+        // so large schedules can be streamed to disk by the client.
+        int offset = payload.TryGetProperty("offset", out var oProp) ? oProp.GetInt32() : 0;
+        int limit = payload.TryGetProperty("limit", out var lProp) ? lProp.GetInt32() : 500;
+        limit = Math.Min(limit, 2000);
+
+        var body = schedule.GetTableData().GetSectionData(SectionType.Body);
+        int columnCount = body.NumberOfColumns;
+        int firstRow = body.FirstRowNumber;
+        // The first body row holds the column headings when headers are shown.
+        int headerRows = schedule.Definition.ShowHeaders ? 1 : 0;
+
+        var columns = Enumerable.Range(body.FirstColumnNumber, columnCount)
+            .Select(c => headerRows > 0 ? schedule.GetCellText(SectionType.Body, firstRow, c) : $"Column {c + 1}")
+            .ToList();
+
+        int total = Math.Max(body.NumberOfRows - headerRows, 0);
+        var rows = new List<List<string>>();
+        for (int r = offset; r < Math.Min(offset + limit, total); r++)
+        {
+            int row = firstRow + headerRows + r;
+            rows.Add(Enumerable.Range(body.FirstColumnNumber, columnCount)
+                .Select(c => schedule.GetCellText(SectionType.Body, row, c))
+                .ToList());
+        }
+
+        return new
+        {
+            schedule_id = scheduleId.Value,
+            schedule_name = schedule.Name,
+            columns,
+            total,
+            returned = rows.Count,
+            offset,
+            limit,
+            truncated = total > offset + limit,
+            rows
+        };
     }
     
     private static object ExecuteGetElementBoundingBox(UIApplication app, JsonElement payload)
@@ -3171,7 +3359,7 @@ public static class BridgeCommandFactory
             .ToList();
         var name = payload.TryGetProperty("name", out var n) ? n.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Group"))
+        using (var trans = new BridgeTransaction(doc, "Create Group"))
         {
              trans.Start();
              var group = doc.Create.NewGroup(elementIds);
@@ -3192,7 +3380,7 @@ public static class BridgeCommandFactory
 
         var groupId = new ElementId((long)payload.GetProperty("group_id").GetInt32());
 
-        using (var trans = new Transaction(doc, "Ungroup"))
+        using (var trans = new BridgeTransaction(doc, "Ungroup"))
         {
              trans.Start();
              var group = doc.GetElement(groupId) as Group;
@@ -3282,7 +3470,7 @@ public static class BridgeCommandFactory
         var diameter = payload.TryGetProperty("diameter", out var d) ? d.GetDouble() : 0.75 / 12.0; // Default 0.75 inches
         var conduitTypeName = payload.TryGetProperty("conduit_type", out var ct) ? ct.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Conduit"))
+        using (var trans = new BridgeTransaction(doc, "Create Conduit"))
         {
             trans.Start();
 
@@ -3356,9 +3544,14 @@ public static class BridgeCommandFactory
         var doc = app.ActiveUIDocument?.Document;
         if (doc == null) throw new InvalidOperationException("No active document");
 
+        var tolerance = payload.TryGetProperty("tolerance", out var tol) ? tol.GetDouble() : 0.01; // Default 0.01 ft
+
+        // Candidate pairs prefiltered by the client's spatial index get an exact geometry check
+        if (payload.TryGetProperty("pairs", out var pairsProp) && pairsProp.ValueKind == JsonValueKind.Array)
+            return CheckClashPairs(doc, pairsProp, tolerance);
+
         var category1Name = payload.GetProperty("category1").GetString();
         var category2Name = payload.GetProperty("category2").GetString();
-        var tolerance = payload.TryGetProperty("tolerance", out var tol) ? tol.GetDouble() : 0.01; // Default 0.01 ft
 
         // Get built-in categories
         var cat1 = GetBuiltInCategoryByName(category1Name);
@@ -3426,6 +3619,120 @@ public static class BridgeCommandFactory
         };
     }
 
+    private static object CheckClashPairs(Document doc, JsonElement pairs, double tolerance)
+    {
+        var clashes = new List<object>();
+        var missing = new List<long>();
+        var unsupported = new List<long>();
+        var filters = new Dictionary<ElementId, ElementIntersectsElementFilter?>();
+        var solids = new Dictionary<ElementId, List<Solid>>();
+        int checkedCount = 0;
+
+        foreach (var pair in pairs.EnumerateArray())
+        {
+            var id1 = new ElementId(pair[0].GetInt64());
+            var id2 = new ElementId(pair[1].GetInt64());
+            var elem1 = doc.GetElement(id1);
+            var elem2 = doc.GetElement(id2);
+            if (elem1 == null || elem2 == null)
+            {
+                if (elem1 == null) missing.Add(id1.Value);
+                if (elem2 == null) missing.Add(id2.Value);
+                continue;
+            }
+
+            if (!filters.TryGetValue(id1, out var filter))
+            {
+                // Elements without solid geometry cannot drive an intersection filter.
+                try { filter = new ElementIntersectsElementFilter(elem1); }
+                catch (Autodesk.Revit.Exceptions.ArgumentException) { filter = null; unsupported.Add(id1.Value); }
+                filters[id1] = filter;
+            }
+            if (filter == null)
+                continue;
+            checkedCount++;
+
+            // Exact solid intersection first; within tolerance, near misses count as soft clashes.
+            var clashType = filter.PassesFilter(elem2) ? "geometry_intersection"
+                : tolerance > 0 && SolidsWithin(SolidsOf(elem1, solids), SolidsOf(elem2, solids), tolerance) ? "clearance"
+                : null;
+            if (clashType != null)
+            {
+                clashes.Add(new
+                {
+                    element1_id = id1.Value,
+                    element1_name = elem1.Name,
+                    element1_category = elem1.Category?.Name,
+                    element2_id = id2.Value,
+                    element2_name = elem2.Name,
+                    element2_category = elem2.Category?.Name,
+                    clash_type = clashType
+                });
+            }
+        }
+
+        return new
+        {
+            clashes,
+            clash_count = clashes.Count,
+            pairs_checked = checkedCount,
+            missing_element_ids = missing.Distinct().ToList(),
+            unsupported_element_ids = unsupported,
+            tolerance_ft = tolerance
+        };
+    }
+
+    private static List<Solid> SolidsOf(Element element, Dictionary<ElementId, List<Solid>> cache)
+    {
+        if (cache.TryGetValue(element.Id, out var found))
+            return found;
+        var solids = new List<Solid>();
+        var geometry = element.get_Geometry(new Options());
+        if (geometry != null)
+            CollectSolids(geometry, solids);
+        cache[element.Id] = solids;
+        return solids;
+    }
+
+    private static void CollectSolids(GeometryElement geometry, List<Solid> solids)
+    {
+        foreach (var item in geometry)
+        {
+            if (item is Solid solid && solid.Faces.Size > 0)
+                solids.Add(solid);
+            else if (item is GeometryInstance instance)
+                CollectSolids(instance.GetInstanceGeometry(), solids);
+        }
+    }
+
+    // Clearance check for solids that do not intersect: tessellated edge points of
+    // each side are projected onto the other side's faces and edges.
+    private static bool SolidsWithin(List<Solid> first, List<Solid> second, double tolerance)
+    {
+        return PointsWithin(first, second, tolerance) || PointsWithin(second, first, tolerance);
+    }
+
+    private static bool PointsWithin(List<Solid> from, List<Solid> to, double tolerance)
+    {
+        foreach (var solid in from)
+        foreach (Edge edge in solid.Edges)
+        foreach (var point in edge.Tessellate())
+        foreach (var target in to)
+        {
+            foreach (Face face in target.Faces)
+            {
+                var hit = face.Project(point);
+                if (hit != null && hit.Distance <= tolerance) return true;
+            }
+            foreach (Edge other in target.Edges)
+            {
+                var hit = other.AsCurve().Project(point);
+                if (hit != null && hit.Distance <= tolerance) return true;
+            }
+        }
+        return false;
+    }
+
     // Helper method for bounding box intersection
     private static bool BoundingBoxesIntersect(BoundingBoxXYZ bb1, BoundingBoxXYZ bb2)
     {
@@ -3481,7 +3788,7 @@ public static class BridgeCommandFactory
         var shininess = payload.TryGetProperty("shininess", out var s) ? s.GetInt32() : 50;
         var smoothness = payload.TryGetProperty("smoothness", out var sm) ? sm.GetInt32() : 50;
 
-        using (var trans = new Transaction(doc, "Create Material"))
+        using (var trans = new BridgeTransaction(doc, "Create Material"))
         {
             trans.Start();
 
@@ -3521,7 +3828,7 @@ public static class BridgeCommandFactory
         var materialName = payload.GetProperty("material_name").GetString();
         var faceIndex = payload.TryGetProperty("face_index", out var fi) ? (int?)fi.GetInt32() : null;
 
-        using (var trans = new Transaction(doc, "Set Element Material"))
+        using (var trans = new BridgeTransaction(doc, "Set Element Material"))
         {
             trans.Start();
 
@@ -3665,7 +3972,7 @@ public static class BridgeCommandFactory
 
         var name = payload.TryGetProperty("name", out var n) ? n.GetString() : null;
 
-        using (var trans = new Transaction(doc, "Create Group"))
+        using (var trans = new BridgeTransaction(doc, "Create Group"))
         {
             trans.Start();
 
@@ -3767,7 +4074,7 @@ public static class BridgeCommandFactory
         var ref1Id = new ElementId((long)payload.GetProperty("element1_id").GetInt32());
         var ref2Id = new ElementId((long)payload.GetProperty("element2_id").GetInt32());
         
-        using (var trans = new Transaction(doc, "Create Dimension"))
+        using (var trans = new BridgeTransaction(doc, "Create Dimension"))
         {
             trans.Start();
 
@@ -3837,7 +4144,7 @@ public static class BridgeCommandFactory
         var category = GetBuiltInCategoryByName(categoryName);
         var view = doc.ActiveView;
 
-        using (var trans = new Transaction(doc, "Tag All Not Tagged"))
+        using (var trans = new BridgeTransaction(doc, "Tag All Not Tagged"))
         {
             trans.Start();
 
@@ -3903,7 +4210,7 @@ public static class BridgeCommandFactory
         var viewId = new ElementId((long)payload.GetProperty("view_id").GetInt32());
         var templateId = new ElementId((long)payload.GetProperty("template_id").GetInt32());
 
-        using (var trans = new Transaction(doc, "Apply View Template"))
+        using (var trans = new BridgeTransaction(doc, "Apply View Template"))
         {
             trans.Start();
 
@@ -3963,11 +4270,90 @@ public static class BridgeCommandFactory
 
     private static object ExecuteGetRoomBoundary(UIApplication app, JsonElement payload)
     {
-        // TODO: Revit 2024 API compatibility issue - Room type not found (namespace issue)
-        // Use Universal Bridge instead for room boundary queries
-        return new {
-            status = "not_implemented",
-            message = "Room boundary API not available in Revit 2024. Use Universal Bridge (revit.invoke_method) instead."
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var roomId = payload.GetProperty("room_id").GetInt64();
+        // Rooms are read as SpatialElement, which holds everything used here, so the
+        // Architecture.Room type is not needed.
+        if (doc.GetElement(new ElementId(roomId)) is not SpatialElement room || room.Category?.Id.Value != (long)BuiltInCategory.OST_Rooms)
+            throw new ArgumentException($"Element {roomId} is not a room");
+        return RoomBoundary(room, RoomBoundaryOptions(payload));
+    }
+
+    private static object ExecuteGetRoomBoundaries(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var options = RoomBoundaryOptions(payload);
+        var level = payload.TryGetProperty("level", out var levelProp) ? levelProp.GetString() : null;
+        var rooms = new FilteredElementCollector(doc)
+            .OfCategory(BuiltInCategory.OST_Rooms)
+            .WhereElementIsNotElementType()
+            .OfType<SpatialElement>()
+            .Where(room => level == null || room.Level?.Name == level)
+            .Select(room => RoomBoundary(room, options))
+            .ToList();
+
+        return new { document = doc.Title, boundary_location = options.SpatialElementBoundaryLocation.ToString(), rooms, count = rooms.Count };
+    }
+
+    private static SpatialElementBoundaryOptions RoomBoundaryOptions(JsonElement payload)
+    {
+        var location = payload.TryGetProperty("boundary_location", out var locationProp) ? locationProp.GetString() : "finish";
+        return new SpatialElementBoundaryOptions
+        {
+            SpatialElementBoundaryLocation = location switch
+            {
+                "center" => SpatialElementBoundaryLocation.Center,
+                "core_center" => SpatialElementBoundaryLocation.CoreCenter,
+                "core_boundary" => SpatialElementBoundaryLocation.CoreBoundary,
+                _ => SpatialElementBoundaryLocation.Finish
+            }
+        };
+    }
+
+    private static object RoomBoundary(SpatialElement room, SpatialElementBoundaryOptions options)
+    {
+        // Each loop is a flat [x0, y0, x1, y1, ...] ring, curves tessellated and the
+        // closing point left out. elements[i] bounds the edge from point i to i + 1.
+        var loops = new List<List<double>>();
+        var elements = new List<List<long>>();
+        var placed = room.Location != null;
+        if (placed)
+        {
+            foreach (var segments in room.GetBoundarySegments(options) ?? new List<IList<BoundarySegment>>())
+            {
+                var ring = new List<double>();
+                var bounding = new List<long>();
+                foreach (var segment in segments)
+                {
+                    var points = segment.GetCurve().Tessellate();
+                    for (var i = 0; i < points.Count - 1; i++)
+                    {
+                        ring.Add(points[i].X);
+                        ring.Add(points[i].Y);
+                        bounding.Add(segment.ElementId.Value);
+                    }
+                }
+                if (bounding.Count < 3) continue;
+                loops.Add(ring);
+                elements.Add(bounding);
+            }
+        }
+
+        return new
+        {
+            id = room.Id.Value,
+            number = room.Number,
+            name = room.Name,
+            level = room.Level?.Name,
+            placed,
+            area = room.Area,
+            perimeter = room.Perimeter,
+            loops,
+            elements
         };
     }
 
@@ -4009,7 +4395,7 @@ public static class BridgeCommandFactory
         JsonElement args = payload.GetProperty("arguments");
         string targetId = payload.TryGetProperty("target_id", out var t) ? t.GetString() : null;
 
-        using (var trans = new Transaction(doc, $"Invoke {methodName}"))
+        using (var trans = new BridgeTransaction(doc, $"Invoke {methodName}"))
         {
             if (payload.TryGetProperty("use_transaction", out var ut) && ut.GetBoolean())
                 trans.Start();
@@ -4066,7 +4452,7 @@ public static class BridgeCommandFactory
         string propertyName = payload.GetProperty("property_name").GetString();
         JsonElement valueElement = payload.GetProperty("value");
 
-        using (var trans = new Transaction(doc, $"Set {propertyName}"))
+        using (var trans = new BridgeTransaction(doc, $"Set {propertyName}"))
         {
             trans.Start();
             object target = ReflectionHelper.GetObject(targetId, doc);
@@ -4179,7 +4565,7 @@ public static class BridgeCommandFactory
         int changed = 0, failed = 0;
         var failedIds = new List<long>();
 
-        using (var tx = new Transaction(doc, "MCP: Change Element Type"))
+        using (var tx = new BridgeTransaction(doc, "MCP: Change Element Type"))
         {
             tx.Start();
             foreach (var el in elements)
@@ -4212,6 +4598,19 @@ public static class BridgeCommandFactory
 
         var collector = new FilteredElementCollector(doc).WhereElementIsNotElementType();
 
+        // Optional explicit IDs, used by incremental sync to re-read changed elements
+        if (payload.TryGetProperty("element_ids", out var idsProp) && idsProp.ValueKind == JsonValueKind.Array)
+        {
+            // The collector rejects IDs that no longer exist, so drop deleted ones first.
+            var ids = idsProp.EnumerateArray()
+                .Select(i => new ElementId(i.GetInt64()))
+                .Where(id => doc.GetElement(id) != null)
+                .ToList();
+            if (ids.Count == 0)
+                return new { total = 0, returned = 0, offset, limit, truncated = false, elements = new List<object>() };
+            collector = new FilteredElementCollector(doc, ids).WhereElementIsNotElementType();
+        }
+
         // Optional category filter (applied at collector level for best performance)
         if (payload.TryGetProperty("category", out var catProp) && catProp.ValueKind != JsonValueKind.Null)
         {
@@ -4279,6 +4678,46 @@ public static class BridgeCommandFactory
                 var p = el.get_Parameter(BuiltInParameter.HOST_VOLUME_COMPUTED);
                 d["volume"] = p?.AsDouble();
             }
+
+            // Heavier fields for snapshots, take-offs and the spatial index; only sent when asked for by name.
+            bool asked(string f) => fields != null && fields.Contains(f);
+            if (asked("unique_id")) d["unique_id"] = el.UniqueId;
+            if (asked("phase"))
+            {
+                var phaseId = el.CreatedPhaseId;
+                d["phase"] = phaseId != null && phaseId != ElementId.InvalidElementId
+                    ? doc.GetElement(phaseId)?.Name ?? ""
+                    : "";
+            }
+            if (asked("materials"))
+            {
+                // Per-material quantities for take-offs, in internal units (sq ft, cu ft)
+                d["materials"] = el.GetMaterialIds(false).Select(matId => new
+                {
+                    material_id = matId.Value,
+                    material = (doc.GetElement(matId) as Material)?.Name,
+                    area = el.GetMaterialArea(matId, false),
+                    volume = el.GetMaterialVolume(matId)
+                }).ToList();
+            }
+            if (asked("bounding_box"))
+            {
+                // Model coordinates, [min_x, min_y, min_z, max_x, max_y, max_z]
+                var bb = el.get_BoundingBox(null);
+                d["bounding_box"] = bb == null
+                    ? null
+                    : new[] { bb.Min.X, bb.Min.Y, bb.Min.Z, bb.Max.X, bb.Max.Y, bb.Max.Z };
+            }
+            if (asked("parameters"))
+            {
+                var values = new Dictionary<string, string?>();
+                foreach (Parameter p in el.Parameters)
+                {
+                    if (p.HasValue)
+                        values[p.Definition.Name] = GetParameterValueAsString(p);
+                }
+                d["parameters"] = values;
+            }
             return d;
         }).ToList();
 
@@ -4344,7 +4783,7 @@ public static class BridgeCommandFactory
         var elements = query.ToList();
         int updated = 0, failed = 0;
 
-        using (var tx = new Transaction(doc, "MCP: Batch Set Parameters by Filter"))
+        using (var tx = new BridgeTransaction(doc, "MCP: Batch Set Parameters by Filter"))
         {
             tx.Start();
             foreach (var el in elements)
@@ -4404,7 +4843,7 @@ public static class BridgeCommandFactory
         int changed = 0, failed = 0;
         var failedIds = new List<long>();
 
-        using (var tx = new Transaction(doc, "MCP: Replace Family Type"))
+        using (var tx = new BridgeTransaction(doc, "MCP: Replace Family Type"))
         {
             tx.Start();
             if (!newSymbol.IsActive)
@@ -4428,6 +4867,387 @@ public static class BridgeCommandFactory
         return new { success = true, changed, failed, failed_ids = failedIds };
     }
 
+    private static object ExecuteGetDocumentChanges(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        string? cursor = payload.TryGetProperty("cursor", out var cProp) && cProp.ValueKind == JsonValueKind.String
+            ? cProp.GetString()
+            : null;
+        return ChangeTracker.GetChanges(doc, cursor);
+    }
+
+    // Tools that open or close documents, export, or run their own code need
+    // the document outside any transaction and cannot join a batch.
+    private static readonly HashSet<string> UnbatchableTools = new HashSet<string>
+    {
+        "revit.execute_batch",
+        "revit.open_document", "revit.close_document", "revit.create_new_document", "revit.save_document",
+        "revit.sync_to_central", "revit.relinquish_all", "revit.edit_family", "revit.execute_python",
+        "revit.export_schedules", "revit.export_pdf_by_sheet_set", "revit.export_dwg_by_view",
+        "revit.export_ifc_with_settings", "revit.export_navisworks", "revit.export_image", "revit.render_3d_view"
+    };
+
+    private static object ExecuteBatch(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var name = payload.TryGetProperty("name", out var nameProp) && nameProp.ValueKind == JsonValueKind.String
+            ? nameProp.GetString()!
+            : "MCP Batch";
+        var atomic = !payload.TryGetProperty("atomic", out var atomicProp) || atomicProp.ValueKind != JsonValueKind.False;
+        var commands = payload.GetProperty("commands").EnumerateArray().ToList();
+
+        foreach (var command in commands)
+        {
+            var tool = command.GetProperty("tool").GetString() ?? "";
+            if (UnbatchableTools.Contains(tool))
+                return new { success = false, error = $"{tool} cannot run inside a batch", error_code = "NOT_BATCHABLE" };
+        }
+
+        var results = new List<object>();
+        var failed = 0;
+        // Every command runs as a SubTransaction of one Transaction, so the
+        // batch regenerates and commits once and is a single undo step.
+        using (var scope = BatchScope.Begin(doc, name))
+        {
+            for (var i = 0; i < commands.Count; i++)
+            {
+                var tool = commands[i].GetProperty("tool").GetString()!;
+                var inner = commands[i].TryGetProperty("payload", out var innerProp) ? innerProp : EmptyPayload;
+                string? error = null;
+                try
+                {
+                    var result = Execute(app, tool, inner);
+                    error = ReportedError(result);
+                    results.Add(new { index = i, tool, status = error == null ? "ok" : "error", result });
+                }
+                catch (Exception ex)
+                {
+                    error = ex.Message;
+                    results.Add(new { index = i, tool, status = "error", message = error });
+                }
+
+                if (error != null)
+                {
+                    failed++;
+                    if (atomic)
+                    {
+                        scope.RollBack();
+                        return new { success = false, committed = false, name, failed, failed_index = i, results };
+                    }
+                }
+            }
+
+            var status = scope.Commit();
+            if (status != TransactionStatus.Committed)
+                return new { success = false, committed = false, name, failed, error = $"Batch transaction ended as {status}", results };
+        }
+
+        return new { success = failed == 0, committed = true, name, executed = commands.Count, failed, results };
+    }
+
+    private static readonly JsonElement EmptyPayload = JsonDocument.Parse("{}").RootElement;
+
+    // Commands report some failures as a result rather than an exception.
+    private static string? ReportedError(object result)
+    {
+        var element = JsonSerializer.SerializeToElement(result);
+        if (element.ValueKind != JsonValueKind.Object)
+            return null;
+        var failed = (element.TryGetProperty("success", out var success) && success.ValueKind == JsonValueKind.False)
+            || (element.TryGetProperty("status", out var status) && status.ValueKind == JsonValueKind.String && status.GetString() == "error");
+        if (!failed)
+            return null;
+        if (element.TryGetProperty("error", out var error) && error.ValueKind == JsonValueKind.String)
+            return error.GetString();
+        if (element.TryGetProperty("message", out var message) && message.ValueKind == JsonValueKind.String)
+            return message.GetString();
+        return "Command reported failure";
+    }
+
+    // Bulk creation takes one array per coordinate (already in feet) and
+    // creates every row in one transaction. ids[i] is the element for row i,
+    // or null when that row failed; failures are listed with their index.
+    private static double[] ReadColumn(JsonElement payload, string name, int count, double? fallback = null)
+    {
+        if (!payload.TryGetProperty(name, out var prop) || prop.ValueKind == JsonValueKind.Null)
+        {
+            if (fallback == null) throw new ArgumentException($"Missing '{name}'");
+            return Enumerable.Repeat(fallback.Value, count).ToArray();
+        }
+        if (prop.ValueKind == JsonValueKind.Number)
+            return Enumerable.Repeat(prop.GetDouble(), count).ToArray();
+
+        var values = prop.EnumerateArray().Select(e => e.GetDouble()).ToArray();
+        if (values.Length != count)
+            throw new ArgumentException($"'{name}' has {values.Length} values, expected {count}");
+        return values;
+    }
+
+    private static object CreateRows(Document doc, string name, int count, Func<int, ElementId> create)
+    {
+        var ids = new long?[count];
+        var failed = new List<object>();
+        using (var trans = new BridgeTransaction(doc, name))
+        {
+            trans.Start();
+            for (var i = 0; i < count; i++)
+            {
+                try
+                {
+                    ids[i] = create(i).Value;
+                }
+                catch (Exception ex)
+                {
+                    failed.Add(new { index = i, error = ex.Message });
+                }
+            }
+            trans.Commit();
+        }
+        return new { success = failed.Count == 0, created = count - failed.Count, ids, failed };
+    }
+
+    private static object ExecuteCreateWalls(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var startX = payload.GetProperty("start_x").EnumerateArray().Select(e => e.GetDouble()).ToArray();
+        var count = startX.Length;
+        var startY = ReadColumn(payload, "start_y", count);
+        var endX = ReadColumn(payload, "end_x", count);
+        var endY = ReadColumn(payload, "end_y", count);
+        var heights = ReadColumn(payload, "height", count, 10.0);
+        var level = GetLevelByName(doc, payload.GetProperty("level").GetString());
+        var wallTypeId = payload.TryGetProperty("wall_type", out var wt) && wt.ValueKind == JsonValueKind.String
+            ? GetWallTypeByName(doc, wt.GetString()).Id
+            : doc.GetDefaultElementTypeId(ElementTypeGroup.WallType);
+
+        return CreateRows(doc, "Create Walls", count, i =>
+        {
+            var line = Line.CreateBound(new XYZ(startX[i], startY[i], level.Elevation), new XYZ(endX[i], endY[i], level.Elevation));
+            return Wall.Create(doc, line, wallTypeId, level.Id, heights[i], 0, false, false).Id;
+        });
+    }
+
+    private static object ExecuteCreateColumns(UIApplication app, JsonElement payload)
+    {
+        return PlaceInstances(app, payload, "Create Structural Columns", StructuralType.Column);
+    }
+
+    private static object ExecutePlaceFamilyInstances(UIApplication app, JsonElement payload)
+    {
+        return PlaceInstances(app, payload, "Place Family Instances", StructuralType.NonStructural);
+    }
+
+    private static object PlaceInstances(UIApplication app, JsonElement payload, string name, StructuralType structuralType)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var x = payload.GetProperty("x").EnumerateArray().Select(e => e.GetDouble()).ToArray();
+        var count = x.Length;
+        var y = ReadColumn(payload, "y", count);
+        var z = ReadColumn(payload, "z", count, 0.0);
+        var rotation = ReadColumn(payload, "rotation", count, 0.0);
+        var level = GetLevelByName(doc, payload.GetProperty("level").GetString());
+        var symbol = GetFamilySymbolByName(doc, payload.GetProperty("family_name").GetString(), payload.GetProperty("type_name").GetString());
+
+        return CreateRows(doc, name, count, i =>
+        {
+            if (!symbol.IsActive) { symbol.Activate(); doc.Regenerate(); }
+            var location = new XYZ(x[i], y[i], z[i]);
+            var instance = doc.Create.NewFamilyInstance(location, symbol, level, structuralType);
+            if (rotation[i] != 0)
+                ElementTransformUtils.RotateElement(doc, instance.Id, Line.CreateBound(location, location + XYZ.BasisZ), rotation[i]);
+            return instance.Id;
+        });
+    }
+
+    private static readonly (string Name, ForgeTypeId Spec)[] ProjectUnitSpecs =
+    {
+        ("length", SpecTypeId.Length),
+        ("area", SpecTypeId.Area),
+        ("volume", SpecTypeId.Volume),
+        ("angle", SpecTypeId.Angle),
+    };
+
+    // The document's display units, with the linear map from internal units
+    // (display = internal * scale + offset), so clients convert and format
+    // values locally instead of asking Revit for each one.
+    private static object ExecuteGetProjectUnits(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var units = doc.GetUnits();
+        var specs = new Dictionary<string, object>();
+        foreach (var (name, spec) in ProjectUnitSpecs)
+        {
+            var options = units.GetFormatOptions(spec);
+            var unit = options.GetUnitTypeId();
+            var symbol = options.GetSymbolTypeId();
+            var offset = UnitUtils.ConvertFromInternalUnits(0, unit);
+            specs[name] = new
+            {
+                unit = unit.TypeId,
+                label = LabelUtils.GetLabelForUnit(unit),
+                symbol = symbol.Empty() ? "" : LabelUtils.GetLabelForSymbol(symbol),
+                scale = UnitUtils.ConvertFromInternalUnits(1, unit) - offset,
+                offset,
+                accuracy = options.Accuracy
+            };
+        }
+
+        return new
+        {
+            document = doc.Title,
+            decimal_symbol = units.DecimalSymbol == DecimalSymbol.Comma ? "," : ".",
+            specs
+        };
+    }
+
+    // Indexed triangle mesh of one or more elements. Vertices shared between
+    // faces and elements are welded, and the buffers travel as base64 of
+    // little-endian float32 xyz triples and uint32 triangle indices, which
+    // is a fraction of the size of nested JSON points.
+    private static object ExecuteGetElementMesh(UIApplication app, JsonElement payload)
+    {
+        var doc = app.ActiveUIDocument?.Document;
+        if (doc == null) throw new InvalidOperationException("No active document");
+
+        var ids = payload.TryGetProperty("element_ids", out var idsProp)
+            ? idsProp.EnumerateArray().Select(e => e.GetInt64()).ToList()
+            : new List<long> { payload.GetProperty("element_id").GetInt64() };
+        var detail = payload.TryGetProperty("detail_level", out var detailProp) ? detailProp.GetString() : "medium";
+        var options = new Options
+        {
+            DetailLevel = detail switch
+            {
+                "coarse" => ViewDetailLevel.Coarse,
+                "fine" => ViewDetailLevel.Fine,
+                _ => ViewDetailLevel.Medium
+            }
+        };
+        var levelOfDetail = detail switch { "coarse" => 0.0, "fine" => 1.0, _ => 0.5 };
+
+        var mesh = new MeshBuilder();
+        var elements = new List<object>();
+        var missing = new List<long>();
+        foreach (var id in ids)
+        {
+            var element = doc.GetElement(new ElementId(id));
+            var geometry = element?.get_Geometry(options);
+            if (geometry == null)
+            {
+                missing.Add(id);
+                continue;
+            }
+            var first = mesh.TriangleCount;
+            mesh.AddGeometry(geometry, levelOfDetail);
+            elements.Add(new { element_id = id, first_triangle = first, triangle_count = mesh.TriangleCount - first });
+        }
+
+        return new
+        {
+            success = missing.Count == 0,
+            encoding = "base64",
+            vertex_count = mesh.VertexCount,
+            triangle_count = mesh.TriangleCount,
+            elements,
+            missing,
+            bounds = mesh.VertexCount == 0 ? null : new { min = mesh.Min, max = mesh.Max },
+            vertices = Convert.ToBase64String(mesh.VertexBytes()),
+            indices = Convert.ToBase64String(mesh.IndexBytes())
+        };
+    }
+
+    private sealed class MeshBuilder
+    {
+        // Points closer than a micro-foot are one vertex.
+        private const double Weld = 1e6;
+
+        private readonly Dictionary<(long, long, long), uint> _lookup = new Dictionary<(long, long, long), uint>();
+        private readonly List<float> _vertices = new List<float>();
+        private readonly List<uint> _indices = new List<uint>();
+        private readonly double[] _min = { double.MaxValue, double.MaxValue, double.MaxValue };
+        private readonly double[] _max = { double.MinValue, double.MinValue, double.MinValue };
+
+        public int VertexCount => _vertices.Count / 3;
+        public int TriangleCount => _indices.Count / 3;
+        public double[] Min => _min;
+        public double[] Max => _max;
+
+        public void AddGeometry(GeometryElement geometry, double levelOfDetail)
+        {
+            foreach (var item in geometry)
+            {
+                switch (item)
+                {
+                    case Solid solid when solid.Faces.Size > 0:
+                        foreach (Face face in solid.Faces)
+                            AddMesh(face.Triangulate(levelOfDetail));
+                        break;
+                    case Mesh mesh:
+                        AddMesh(mesh);
+                        break;
+                    case GeometryInstance instance:
+                        AddGeometry(instance.GetInstanceGeometry(), levelOfDetail);
+                        break;
+                }
+            }
+        }
+
+        private void AddMesh(Mesh? mesh)
+        {
+            if (mesh == null) return;
+            var local = new uint[mesh.Vertices.Count];
+            for (var i = 0; i < local.Length; i++)
+                local[i] = Vertex(mesh.Vertices[i]);
+            for (var t = 0; t < mesh.NumTriangles; t++)
+            {
+                var triangle = mesh.get_Triangle(t);
+                _indices.Add(local[triangle.get_Index(0)]);
+                _indices.Add(local[triangle.get_Index(1)]);
+                _indices.Add(local[triangle.get_Index(2)]);
+            }
+        }
+
+        private uint Vertex(XYZ point)
+        {
+            var key = ((long)Math.Round(point.X * Weld), (long)Math.Round(point.Y * Weld), (long)Math.Round(point.Z * Weld));
+            if (_lookup.TryGetValue(key, out var index))
+                return index;
+            index = (uint)VertexCount;
+            _lookup[key] = index;
+            _vertices.Add((float)point.X);
+            _vertices.Add((float)point.Y);
+            _vertices.Add((float)point.Z);
+            var coordinates = new[] { point.X, point.Y, point.Z };
+            for (var axis = 0; axis < 3; axis++)
+            {
+                _min[axis] = Math.Min(_min[axis], coordinates[axis]);
+                _max[axis] = Math.Max(_max[axis], coordinates[axis]);
+            }
+            return index;
+        }
+
+        public byte[] VertexBytes() => ToBytes(_vertices.ToArray(), sizeof(float));
+
+        public byte[] IndexBytes() => ToBytes(_indices.ToArray(), sizeof(uint));
+
+        private static byte[] ToBytes(Array values, int size)
+        {
+            // Windows is little-endian, which is what readers of the buffers expect.
+            var bytes = new byte[values.Length * size];
+            Buffer.BlockCopy(values, 0, bytes, 0, bytes.Length);
+            return bytes;
+        }
+    }
+
     private static object ExecuteGetElementGeometry(UIApplication app, JsonElement payload)
     {
         var doc = app.ActiveUIDocument?.Document;
@@ -1,5 +1,6 @@
 using System;
 using System.IO;
+using System.IO.Compression;
 using System.Net;
 using System.Text;
 using System.Text.Json;
@@ -12,6 +13,10 @@ namespace RevitBridge.Bridge;
 
 public class BridgeServer
 {
+    // Responses smaller than this are sent as-is; compressing them costs more
+    // CPU than it saves on a loopback connection.
+    private const int CompressionThresholdBytes = 8192;
+
     private readonly HttpListener _listener;
     private readonly CommandQueue _queue;
     private readonly ExternalEvent _externalEvent;
@@ -135,7 +140,7 @@ public class BridgeServer
     {
         var startTime = DateTime.UtcNow;
 
-        using var reader = new StreamReader(context.Request.InputStream);
+        using var reader = new StreamReader(OpenRequestBody(context.Request));
         var body = await reader.ReadToEndAsync();
         var doc = JsonDocument.Parse(body);
         var root = doc.RootElement;
@@ -173,7 +178,11 @@ public class BridgeServer
             version = System.Reflection.Assembly.GetExecutingAssembly().GetName().Version?.ToString(),
             uptime_seconds = (DateTime.UtcNow - _startTime).TotalSeconds,
             revit_version = App.RevitVersion ?? "unknown",
-            active_document = App.ActiveDocumentName ?? "none"
+            active_document = App.ActiveDocumentName ?? "none",
+            // Changes with every edit to the active document; clients key caches on it.
+            document_version = App.ActiveDocumentName == null ? null : ChangeTracker.DocumentToken(App.ActiveDocumentName),
+            session = ChangeTracker.Session,
+            compression = new[] { "gzip" }
         };
         Respond(context, 200, health);
         return Task.CompletedTask;
@@ -186,13 +195,39 @@ public class BridgeServer
         return Task.CompletedTask;
     }
 
+    private static Stream OpenRequestBody(HttpListenerRequest request)
+    {
+        var encoding = request.Headers["Content-Encoding"];
+        if (string.Equals(encoding, "gzip", StringComparison.OrdinalIgnoreCase))
+            return new GZipStream(request.InputStream, CompressionMode.Decompress);
+        return request.InputStream;
+    }
+
+    private static bool AcceptsGzip(HttpListenerRequest request)
+    {
+        var accepted = request.Headers["Accept-Encoding"];
+        return accepted != null && accepted.IndexOf("gzip", StringComparison.OrdinalIgnoreCase) >= 0;
+    }
+
     private void Respond(HttpListenerContext context, int statusCode, object data)
     {
         context.Response.StatusCode = statusCode;
         context.Response.ContentType = "application/json";
         var json = JsonSerializer.Serialize(data);
         var buffer = Encoding.UTF8.GetBytes(json);
-        context.Response.OutputStream.Write(buffer, 0, buffer.Length);
+
+        if (buffer.Length >= CompressionThresholdBytes && AcceptsGzip(context.Request))
+        {
+            context.Response.AddHeader("Content-Encoding", "gzip");
+            using (var gzip = new GZipStream(context.Response.OutputStream, CompressionLevel.Fastest, leaveOpen: true))
+            {
+                gzip.Write(buffer, 0, buffer.Length);
+            }
+        }
+        else
+        {
+            context.Response.OutputStream.Write(buffer, 0, buffer.Length);
+        }
         context.Response.Close();
     }
 }
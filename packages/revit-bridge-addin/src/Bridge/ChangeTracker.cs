@@ -0,0 +1,197 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Autodesk.Revit.DB;
+using Autodesk.Revit.DB.Events;
+
+namespace RevitBridge.Bridge;
+
+/// <summary>
+/// Journals element additions, modifications and deletions per document so
+/// clients can keep a local copy current with revit.get_document_changes
+/// instead of re-reading the whole model.
+/// </summary>
+public static class ChangeTracker
+{
+    // Beyond this many journaled changes per document the oldest are dropped;
+    // clients holding an older cursor are told to do a full pull.
+    private const int MaxEntriesPerDocument = 500_000;
+
+    // Cursors are only meaningful within one Revit session.
+    private static readonly string SessionId = Guid.NewGuid().ToString("N");
+    private static readonly object Gate = new();
+    private static readonly Dictionary<string, Journal> Journals = new();
+    private static long _sequence;
+
+    private sealed class Journal
+    {
+        public readonly List<(long Sequence, long ElementId, bool Deleted)> Entries = new();
+        // Latest sequence per element; survives trimming of Entries.
+        public readonly Dictionary<long, long> LastChange = new();
+        public long Floor;
+        public long Latest;
+    }
+
+    public static string Session => SessionId;
+
+    public static void OnDocumentChanged(object? sender, DocumentChangedEventArgs args)
+    {
+        var doc = args.GetDocument();
+        if (doc == null)
+            return;
+
+        lock (Gate)
+        {
+            if (!Journals.TryGetValue(doc.Title, out var journal))
+            {
+                journal = new Journal();
+                Journals[doc.Title] = journal;
+            }
+
+            foreach (var id in args.GetAddedElementIds().Concat(args.GetModifiedElementIds()))
+            {
+                journal.Entries.Add((++_sequence, id.Value, false));
+                journal.LastChange[id.Value] = _sequence;
+            }
+            foreach (var id in args.GetDeletedElementIds())
+            {
+                journal.Entries.Add((++_sequence, id.Value, true));
+                journal.LastChange[id.Value] = _sequence;
+            }
+            journal.Latest = _sequence;
+
+            var overflow = journal.Entries.Count - MaxEntriesPerDocument;
+            if (overflow > 0)
+            {
+                journal.Floor = journal.Entries[overflow - 1].Sequence;
+                journal.Entries.RemoveRange(0, overflow);
+            }
+        }
+    }
+
+    /// <summary>
+    /// Net changes since <paramref name="cursor"/>. An element touched several
+    /// times is reported once, in its final state. <c>reset</c> is true when
+    /// the cursor is missing, from another session or another document, or
+    /// older than the journal. The sequence is shared by every document, so
+    /// cursors carry the document title they were issued for.
+    /// </summary>
+    public static object GetChanges(Document doc, string? cursor)
+    {
+        lock (Gate)
+        {
+            var current = $"{SessionId}:{_sequence}:{doc.Title}";
+            Journals.TryGetValue(doc.Title, out var journal);
+
+            if (!TryParseCursor(cursor, doc.Title, out var since) || (journal != null && since < journal.Floor))
+            {
+                return new
+                {
+                    cursor = current,
+                    document = doc.Title,
+                    reset = true,
+                    changed = Array.Empty<long>(),
+                    deleted = Array.Empty<long>()
+                };
+            }
+
+            var latest = new Dictionary<long, bool>();
+            if (journal != null)
+            {
+                // Entries are in sequence order; binary search for the first unseen one.
+                var start = journal.Entries.BinarySearch((since + 1, 0, false), EntryComparer.Instance);
+                if (start < 0)
+                    start = ~start;
+                for (var i = start; i < journal.Entries.Count; i++)
+                    latest[journal.Entries[i].ElementId] = journal.Entries[i].Deleted;
+            }
+
+            return new
+            {
+                cursor = current,
+                document = doc.Title,
+                reset = false,
+                changed = latest.Where(pair => !pair.Value).Select(pair => pair.Key).ToList(),
+                deleted = latest.Where(pair => pair.Value).Select(pair => pair.Key).ToList()
+            };
+        }
+    }
+
+    /// <summary>
+    /// Sequence of the latest change to each of <paramref name="elementIds"/>
+    /// in this session; elements untouched since the add-in loaded are absent.
+    /// </summary>
+    public static Dictionary<long, long> LastChanges(Document doc, IEnumerable<long> elementIds)
+    {
+        lock (Gate)
+        {
+            var changes = new Dictionary<long, long>();
+            if (Journals.TryGetValue(doc.Title, out var journal))
+            {
+                foreach (var id in elementIds)
+                {
+                    if (journal.LastChange.TryGetValue(id, out var sequence))
+                        changes[id] = sequence;
+                }
+            }
+            return changes;
+        }
+    }
+
+    /// <summary>Session and latest change sequence of the document, as one token.</summary>
+    public static string DocumentToken(Document doc) => DocumentToken(doc.Title);
+
+    /// <summary>
+    /// Token for the document titled <paramref name="title"/>; changes with
+    /// every edit, reopen or Revit restart, so clients can key caches on it.
+    /// </summary>
+    public static string DocumentToken(string title)
+    {
+        lock (Gate)
+        {
+            Journals.TryGetValue(title, out var journal);
+            return $"{SessionId}:{journal?.Latest ?? 0}";
+        }
+    }
+
+    /// <summary>
+    /// A document (re)opened from disk may differ from what was journaled
+    /// under its title, so move its token on and expire older cursors.
+    /// </summary>
+    public static void OnDocumentOpened(object? sender, DocumentOpenedEventArgs args)
+    {
+        var doc = args.Document;
+        if (doc == null)
+            return;
+
+        lock (Gate)
+        {
+            if (!Journals.TryGetValue(doc.Title, out var journal))
+            {
+                journal = new Journal();
+                Journals[doc.Title] = journal;
+            }
+            journal.Entries.Clear();
+            journal.LastChange.Clear();
+            journal.Floor = journal.Latest = ++_sequence;
+        }
+    }
+
+    private static bool TryParseCursor(string? cursor, string title, out long sequence)
+    {
+        sequence = 0;
+        if (string.IsNullOrEmpty(cursor))
+            return false;
+        // session:sequence:title; the title itself may contain colons.
+        var parts = cursor!.Split(new[] { ':' }, 3);
+        return parts.Length == 3 && parts[0] == SessionId && parts[2] == title && long.TryParse(parts[1], out sequence);
+    }
+
+    private sealed class EntryComparer : IComparer<(long Sequence, long ElementId, bool Deleted)>
+    {
+        public static readonly EntryComparer Instance = new();
+
+        public int Compare((long Sequence, long ElementId, bool Deleted) x, (long Sequence, long ElementId, bool Deleted) y)
+            => x.Sequence.CompareTo(y.Sequence);
+    }
+}